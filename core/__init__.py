@@ -0,0 +1 @@
+# Core analysis engines for Contact Center AI Solutions (no Streamlit dependency)
@@ -0,0 +1,245 @@
+"""Parallel multi-factor authentication.
+
+Each factor check is an async callable returning (confidence, details),
+where confidence is the 0-100 probability that the caller is genuine. All
+selected checks run concurrently, each under its own timeout, so the
+sequence takes as long as the slowest check rather than the sum.
+
+Factor confidences are fused as weighted log-odds, Stouffer style: the
+weighted sum is divided by the root sum of squared weights of every
+selected factor. A single factor therefore keeps its own confidence, so
+the decision thresholds mean what they say, agreeing factors reinforce
+each other, and a selected factor that returns nothing pulls the result
+towards 50%. The result goes through a Platt calibration, the identity
+until fit_calibration() is run on labelled outcomes. After
+every completed check the fused confidence is bounded over everything the
+pending checks could still return; once both bounds give the same
+decision the pending checks are cancelled.
+"""
+import asyncio
+import math
+import time
+
+from .biometrics import authentication_decision
+from .deepfake import detect as detect_deepfake
+
+# Evidence weight per factor; unknown factors get DEFAULT_FACTOR_WEIGHT
+FACTOR_WEIGHTS = {
+    "Voice Biometrics": 0.7,
+    "Behavioral Analysis": 0.5,
+    "Device Fingerprinting": 0.4,
+    "Geographic Verification": 0.3
+}
+DEFAULT_FACTOR_WEIGHT = 0.5
+
+# Factor confidences are clipped to this range before fusion, which also
+# bounds what a pending check can still contribute
+MIN_FACTOR_CONFIDENCE = 1.0
+MAX_FACTOR_CONFIDENCE = 99.0
+
+# Platt calibration of the fused log-odds: sigmoid(scale * x + bias); the
+# normalised fusion is already on the factors' own scale, so start from identity
+CALIBRATION = (1.0, 0.0)
+
+DEFAULT_TIMEOUT = 2.0
+
+
+def _logit(confidence):
+    p = min(MAX_FACTOR_CONFIDENCE, max(MIN_FACTOR_CONFIDENCE, confidence)) / 100
+    return math.log(p / (1 - p))
+
+
+def _calibrated(log_odds, calibration=CALIBRATION):
+    scale, bias = calibration
+    return 100 / (1 + math.exp(-(scale * log_odds + bias)))
+
+
+def _norm(factors, weights):
+    return math.sqrt(sum(weights.get(name, DEFAULT_FACTOR_WEIGHT) ** 2 for name in factors)) or 1.0
+
+
+def fused_log_odds(confidences, weights=None, factors=None):
+    """Normalised weighted log-odds over {factor: confidence}.
+
+    factors lists every selected factor (default: those in confidences);
+    selected factors without a confidence add weight but no evidence.
+    """
+    weights = weights or FACTOR_WEIGHTS
+    total = sum(weights.get(name, DEFAULT_FACTOR_WEIGHT) * _logit(c) for name, c in confidences.items())
+    return total / _norm(set(confidences) | set(factors or ()), weights)
+
+
+def fuse(confidences, weights=None, calibration=CALIBRATION, factors=None):
+    """Calibrated overall confidence (0-100) for {factor: confidence}"""
+    return round(_calibrated(fused_log_odds(confidences, weights, factors), calibration), 1)
+
+
+def confidence_bounds(confidences, pending, weights=None, calibration=CALIBRATION):
+    """Lowest and highest overall confidence reachable once the pending factors report"""
+    weights = weights or FACTOR_WEIGHTS
+    norm = _norm(set(confidences) | set(pending), weights)
+    known = sum(weights.get(name, DEFAULT_FACTOR_WEIGHT) * _logit(c) for name, c in confidences.items())
+    spread = [weights.get(name, DEFAULT_FACTOR_WEIGHT) for name in pending]
+    low = known + sum(w * _logit(MIN_FACTOR_CONFIDENCE) for w in spread)
+    high = known + sum(w * _logit(MAX_FACTOR_CONFIDENCE) for w in spread)
+    return _calibrated(low / norm, calibration), _calibrated(high / norm, calibration)
+
+
+def fit_calibration(log_odds, outcomes, iterations=2000, learning_rate=0.1):
+    """Platt (scale, bias) fitted to fused log-odds and 0/1 genuine outcomes"""
+    scale, bias = 1.0, 0.0
+    pairs = list(zip(log_odds, outcomes))
+    for _ in range(iterations):
+        grad_scale = grad_bias = 0.0
+        for x, y in pairs:
+            error = 1 / (1 + math.exp(-(scale * x + bias))) - y
+            grad_scale += error * x
+            grad_bias += error
+        scale -= learning_rate * grad_scale / len(pairs)
+        bias -= learning_rate * grad_bias / len(pairs)
+    return scale, bias
+
+
+async def _run_check(name, check, timeout):
+    started = time.perf_counter()
+    try:
+        confidence, details = await asyncio.wait_for(check(), timeout)
+        status = "ok"
+    except asyncio.TimeoutError:
+        confidence, details, status = None, {"Status": f"⏱️ Timed out after {timeout}s"}, "timeout"
+    except Exception as exc:
+        confidence, details, status = None, {"Status": f"⚠️ Check failed: {exc}"}, "error"
+    return {
+        "name": name,
+        "status": status,
+        "confidence": confidence,
+        "details": details,
+        "elapsed": round(time.perf_counter() - started, 3)
+    }
+
+
+async def authenticate(checks, timeouts=None, weights=None, calibration=CALIBRATION, early_exit=True):
+    """Run {factor: async check} concurrently and fuse the results into a decision.
+
+    Timed-out or failed checks contribute no evidence, which pulls the
+    overall confidence down rather than counting as a pass.
+    """
+    timeouts = timeouts or {}
+    started = time.perf_counter()
+    tasks = {
+        asyncio.ensure_future(_run_check(name, check, timeouts.get(name, DEFAULT_TIMEOUT))): name
+        for name, check in checks.items()
+    }
+    results, confidences = {}, {}
+    pending = set(tasks)
+    exited_early = False
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            result = task.result()
+            results[result["name"]] = result
+            if result["confidence"] is not None:
+                confidences[result["name"]] = result["confidence"]
+        if early_exit and pending:
+            low, high = confidence_bounds(confidences, [tasks[t] for t in pending], weights, calibration)
+            if authentication_decision(low) == authentication_decision(high):
+                exited_early = True
+                break
+
+    for task in pending:
+        task.cancel()
+        results[tasks[task]] = {"name": tasks[task], "status": "skipped", "confidence": None,
+                                "details": {"Status": "⏭️ Skipped, decision already final"}, "elapsed": None}
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    overall = fuse(confidences, weights, calibration, factors=checks)
+    return {
+        "overall_confidence": overall,
+        "decision": authentication_decision(overall),
+        "factors": {name: results[name] for name in checks},
+        "early_exit": exited_early,
+        "elapsed": round(time.perf_counter() - started, 3)
+    }
+
+
+def run_authentication(checks, **kwargs):
+    """Blocking wrapper around authenticate() for callers without an event loop"""
+    return asyncio.run(authenticate(checks, **kwargs))
+
+
+# Factor adapters over the biometric engines
+
+def voice_check(audio, verify=None):
+    """Liveness from the deepfake detector, plus voiceprint verification when verify() is given"""
+    async def check():
+        liveness, verification = await asyncio.gather(
+            asyncio.to_thread(detect_deepfake, audio),
+            asyncio.to_thread(verify) if verify else asyncio.sleep(0)
+        )
+        if not liveness["ready"]:
+            raise ValueError("not enough speech for a liveness verdict")
+        synthetic = liveness["synthetic_score"]
+        confidence = 100 - synthetic
+        details = {}
+        if verification:
+            confidence = min(confidence, verification["confidence"])
+            details["Voiceprint Match"] = (f"✅ {verification['confidence']}% confidence" if verification["match"]
+                                           else f"❌ No match ({verification['confidence']}%)")
+        details["Liveness Detection"] = "✅ Live speaker confirmed" if liveness["live"] else "❌ Synthetic voice suspected"
+        details["Deepfake Score"] = f"{'🟢' if synthetic < 20 else '🟡' if synthetic < 50 else '🔴'} {synthetic}%"
+        return confidence, details
+    return check
+
+
+def behavioral_check(engine, session_id):
+    """Confidence from a live behavioral session scored against the customer profile"""
+    async def check():
+        assessment = engine.assess(session_id)
+        if assessment is None:
+            raise ValueError("no behavioral profile enrolled")
+        average_risk = assessment["total_risk"] / len(assessment["factors"])
+        details = {factor["factor"]: factor["status"] for factor in assessment["factors"]}
+        details["Risk Score"] = f"{assessment['risk_level'].split()[0]} {assessment['total_risk']}/{assessment['max_risk']}"
+        return 100 - average_risk, details
+    return check
+
+
+def device_check(registry, reputation, customer_id, fingerprint, ip):
+    """Known-device and IP reputation lookups; both are in-memory probes"""
+    async def check():
+        known = registry.known(customer_id, fingerprint)
+        categories = reputation.categories(ip)
+        confidence = 97.0 if known else 60.0
+        if "bad" in categories:
+            confidence = 3.0
+        elif "tor" in categories:
+            confidence = min(confidence, 15.0)
+        elif categories:
+            confidence = min(confidence, 70.0)
+        return confidence, {
+            "Device Recognition": "✅ Known device" if known else "🟡 New device",
+            "Browser Fingerprint": "✅ Matches previous sessions" if known else "🟡 Not seen for this customer",
+            "IP Reputation": f"🔴 Listed: {', '.join(categories)}" if categories else "✅ Clean IP address"
+        }
+    return check
+
+
+def geo_check(reputation, ip, expected_location):
+    """IP location against the customer's expected location, discounting VPN and proxy exits"""
+    async def check():
+        location = reputation.location(ip)
+        masked = [c for c in reputation.categories(ip) if c in ("tor", "vpn", "hosting")]
+        if location is None:
+            confidence, detail = 70.0, "⚪ Location unknown"
+        elif location == expected_location:
+            confidence, detail = 95.0, f"✅ {location} (Expected)"
+        else:
+            confidence, detail = 50.0, f"🟡 {location} (expected {expected_location})"
+        if masked:
+            confidence = min(confidence, 60.0)
+        return confidence, {
+            "Location": detail,
+            "VPN Detection": f"🟡 Anonymising exit detected ({masked[0]})" if masked else "🟢 No VPN detected"
+        }
+    return check
@@ -0,0 +1,365 @@
+"""Behavioral biometrics over keystroke and pointer event streams.
+
+Events are dicts with a "type" and a timestamp "t" in seconds:
+
+- key_down / key_up with "key"
+- move and click with "x" and "y"
+- page, field_focus and field_blur
+
+Each session keeps only fixed-size accumulators: log-spaced histograms for
+key dwell/flight and page dwell times, and running mean/variance for
+pointer velocity, curvature, click hesitation, navigation interval and
+form field duration. Observing an event is O(1). Scoring compares those
+accumulators with the customer's stored profile, which has the same
+fixed-size shape, so no raw event log is ever kept.
+"""
+import json
+import math
+import sqlite3
+
+from .biometrics import assess_risk_factors
+
+# Log-spaced histogram bins from 10 ms to ~80 s
+HISTOGRAM_BINS = 16
+HISTOGRAM_MIN_SECONDS = 0.01
+HISTOGRAM_RATIO = 1.75
+
+# Gaps longer than these start a new keystroke or pointer segment
+MAX_FLIGHT_SECONDS = 2.0
+MAX_MOVE_GAP_SECONDS = 0.5
+
+# Observations needed on both sides before a factor is scored
+MIN_SAMPLES = 5
+MAX_EFFECTIVE_SAMPLES = 10
+
+# Weight kept by the old profile when a new session is enrolled
+PROFILE_DECAY = 0.9
+
+# Factor score bands (0-100)
+ELEVATED_FACTOR_SCORE = 15
+HIGH_FACTOR_SCORE = 40
+
+_log_ratio = math.log(HISTOGRAM_RATIO)
+
+
+class RunningStats:
+    """Welford mean/variance that can be merged and decayed"""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0.0, mean=0.0, m2=0.0):
+        self.n, self.mean, self.m2 = n, mean, m2
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / self.n) if self.n > 1 else 0.0
+
+    def merge(self, other, decay=1.0):
+        n_a, m2_a = self.n * decay, self.m2 * decay
+        n = n_a + other.n
+        if n == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 = m2_a + other.m2 + delta * delta * n_a * other.n / n
+        self.n = n
+
+    def to_list(self):
+        return [self.n, self.mean, self.m2]
+
+
+class LogHistogram:
+    """Counts of durations in fixed log-spaced bins"""
+
+    __slots__ = ("counts",)
+
+    def __init__(self, counts=None):
+        self.counts = list(counts) if counts else [0.0] * HISTOGRAM_BINS
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def add(self, seconds):
+        if seconds <= HISTOGRAM_MIN_SECONDS:
+            index = 0
+        else:
+            index = min(HISTOGRAM_BINS - 1, int(math.log(seconds / HISTOGRAM_MIN_SECONDS) / _log_ratio))
+        self.counts[index] += 1
+
+    def merge(self, other, decay=1.0):
+        self.counts = [a * decay + b for a, b in zip(self.counts, other.counts)]
+
+    def hellinger(self, other):
+        """Hellinger distance (0 = identical shape, 1 = disjoint)"""
+        total_a, total_b = self.total, other.total
+        overlap = sum(math.sqrt(a / total_a * b / total_b) for a, b in zip(self.counts, other.counts))
+        return math.sqrt(max(0.0, 1 - overlap))
+
+
+HISTOGRAMS = ("key_dwell", "key_flight", "page_dwell")
+STATS = ("velocity", "curvature", "click_delay", "page_interval", "field_duration")
+
+
+class BehaviorFeatures:
+    """Fixed-size feature accumulators for a session or a customer profile"""
+
+    def __init__(self):
+        self.histograms = {name: LogHistogram() for name in HISTOGRAMS}
+        self.stats = {name: RunningStats() for name in STATS}
+        # Transient stream state, never persisted
+        self._keys_down = {}
+        self._last_key_up = None
+        self._last_point = None
+        self._last_heading = None
+        self._last_move = None
+        self._last_page = None
+        self._field_start = None
+
+    def observe(self, event):
+        """Fold one event into the accumulators"""
+        handler = _HANDLERS.get(event["type"])
+        if handler:
+            handler(self, event)
+
+    def _key_down(self, event):
+        t = event["t"]
+        if self._last_key_up is not None and 0 <= t - self._last_key_up <= MAX_FLIGHT_SECONDS:
+            self.histograms["key_flight"].add(t - self._last_key_up)
+        self._keys_down[event.get("key")] = t
+
+    def _key_up(self, event):
+        pressed = self._keys_down.pop(event.get("key"), None)
+        if pressed is not None:
+            self.histograms["key_dwell"].add(event["t"] - pressed)
+        self._last_key_up = event["t"]
+
+    def _move(self, event):
+        t, x, y = event["t"], event["x"], event["y"]
+        if self._last_point is not None:
+            last_t, last_x, last_y = self._last_point
+            dt = t - last_t
+            dx, dy = x - last_x, y - last_y
+            if 0 < dt <= MAX_MOVE_GAP_SECONDS and (dx or dy):
+                self.stats["velocity"].add(math.hypot(dx, dy) / dt)
+                heading = math.atan2(dy, dx)
+                if self._last_heading is not None:
+                    turn = abs(heading - self._last_heading)
+                    self.stats["curvature"].add(min(turn, 2 * math.pi - turn))
+                self._last_heading = heading
+            elif dt > MAX_MOVE_GAP_SECONDS:
+                self._last_heading = None
+        self._last_point = (t, x, y)
+        self._last_move = t
+
+    def _click(self, event):
+        if self._last_move is not None:
+            self.stats["click_delay"].add(event["t"] - self._last_move)
+
+    def _page(self, event):
+        if self._last_page is not None:
+            interval = event["t"] - self._last_page
+            self.histograms["page_dwell"].add(interval)
+            self.stats["page_interval"].add(math.log(max(interval, HISTOGRAM_MIN_SECONDS)))
+        self._last_page = event["t"]
+
+    def _field_focus(self, event):
+        self._field_start = event["t"]
+
+    def _field_blur(self, event):
+        if self._field_start is not None:
+            self.stats["field_duration"].add(math.log(max(event["t"] - self._field_start, HISTOGRAM_MIN_SECONDS)))
+            self._field_start = None
+
+    def merge(self, other, decay=1.0):
+        """Fold another accumulator set in, decaying this one first"""
+        for name in HISTOGRAMS:
+            self.histograms[name].merge(other.histograms[name], decay)
+        for name in STATS:
+            self.stats[name].merge(other.stats[name], decay)
+
+    def to_dict(self):
+        return {
+            "histograms": {name: h.counts for name, h in self.histograms.items()},
+            "stats": {name: s.to_list() for name, s in self.stats.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        features = cls()
+        for name, counts in data["histograms"].items():
+            features.histograms[name] = LogHistogram(counts)
+        for name, values in data["stats"].items():
+            features.stats[name] = RunningStats(*values)
+        return features
+
+
+_HANDLERS = {
+    "key_down": BehaviorFeatures._key_down,
+    "key_up": BehaviorFeatures._key_up,
+    "move": BehaviorFeatures._move,
+    "click": BehaviorFeatures._click,
+    "page": BehaviorFeatures._page,
+    "field_focus": BehaviorFeatures._field_focus,
+    "field_blur": BehaviorFeatures._field_blur
+}
+
+
+def _distance_score(distance):
+    return round(100 * (1 - math.exp(-distance)))
+
+
+def _histogram_distance(session, profile):
+    """Hellinger distance beyond what sampling noise alone would give"""
+    occupied = sum(1 for count in profile.counts if count)
+    return max(0.0, session.hellinger(profile) - math.sqrt(occupied / (8 * session.total)))
+
+
+def _histogram_score(session, profile, names):
+    pairs = [(session.histograms[n], profile.histograms[n]) for n in names]
+    pairs = [(s, p) for s, p in pairs if s.total >= MIN_SAMPLES and p.total >= MIN_SAMPLES]
+    if not pairs:
+        return None
+    # Excess Hellinger distance of 0.5 is already a very different rhythm
+    return _distance_score(2 * max(_histogram_distance(s, p) for s, p in pairs))
+
+
+def _shift(session, profile, name):
+    """Session mean shift in profile standard deviations, or None without data"""
+    s, p = session.stats[name], profile.stats[name]
+    if s.n < MIN_SAMPLES or p.n < MIN_SAMPLES:
+        return None
+    return (s.mean - p.mean) / max(p.std, 1e-6)
+
+
+def _stats_distance(session, profile, name):
+    """Mean shift plus spread change, each beyond two standard errors"""
+    s, p = session.stats[name], profile.stats[name]
+    # Consecutive samples (points on one pointer path) are correlated, so
+    # the standard error uses a capped effective sample count
+    n = min(s.n, MAX_EFFECTIVE_SAMPLES)
+    shift = abs(_shift(session, profile, name)) - 2 / math.sqrt(n)
+    # Spread collapsing (e.g. scripted constant-speed pointer) also counts
+    spread = abs(math.log(max(s.std, 1e-6) / max(p.std, 1e-6))) - 2 / math.sqrt(2 * n)
+    return max(0.0, shift) + max(0.0, spread)
+
+
+def _stats_score(session, profile, names):
+    names = [n for n in names if _shift(session, profile, n) is not None]
+    if not names:
+        return None
+    return _distance_score(max(_stats_distance(session, profile, n) for n in names))
+
+
+def _status(score, normal, elevated):
+    if score is None:
+        return "⚪ Insufficient data"
+    if score < ELEVATED_FACTOR_SCORE:
+        return f"🟢 {normal}"
+    if score < HIGH_FACTOR_SCORE:
+        return f"🟡 {elevated}"
+    return f"🔴 {elevated}"
+
+
+def _pace_description(session, profile, name, faster, slower):
+    shift = _shift(session, profile, name)
+    if shift is None:
+        return "Not enough events yet"
+    # Stats hold log-durations, so the mean difference is a duration ratio
+    change = math.exp(session.stats[name].mean - profile.stats[name].mean) - 1
+    if abs(change) < 0.05:
+        return "Consistent with historical pattern"
+    return f"{abs(change) * 100:.0f}% {slower if change > 0 else faster} than usual"
+
+
+def score_session(session, profile):
+    """Per-factor risk rows (factor, score, status, description) for a session against a profile"""
+    typing = _histogram_score(session, profile, ("key_dwell", "key_flight"))
+    mouse = _stats_score(session, profile, ("velocity", "curvature"))
+    navigation = _stats_score(session, profile, ("page_interval",))
+    clicks = _stats_score(session, profile, ("click_delay",))
+    dwell = _histogram_score(session, profile, ("page_dwell",))
+    form = _stats_score(session, profile, ("field_duration",))
+    return [
+        {"factor": "Typing Rhythm", "score": typing or 0, "status": _status(typing, "Normal", "Unusual rhythm"),
+         "description": "Key dwell and flight times vs profile"},
+        {"factor": "Mouse Movement", "score": mouse or 0, "status": _status(mouse, "Natural", "Atypical motion"),
+         "description": "Pointer velocity and curvature vs profile"},
+        {"factor": "Navigation Speed", "score": navigation or 0,
+         "status": _status(navigation, "Normal", "Unusual pace"),
+         "description": _pace_description(session, profile, "page_interval", "faster", "slower")},
+        {"factor": "Click Patterns", "score": clicks or 0, "status": _status(clicks, "Normal", "Unusual timing"),
+         "description": "Hesitation between pointer stop and click"},
+        {"factor": "Page Dwell Time", "score": dwell or 0, "status": _status(dwell, "Expected", "Unusual reading"),
+         "description": "Time-on-page distribution vs profile"},
+        {"factor": "Form Completion", "score": form or 0, "status": _status(form, "Normal", "Unusual pace"),
+         "description": _pace_description(session, profile, "field_duration", "faster", "slower")}
+    ]
+
+
+class ProfileStore:
+    """Per-customer behavior profiles as small JSON rows in SQLite"""
+
+    def __init__(self, path=":memory:"):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS profiles (customer_id TEXT PRIMARY KEY, features TEXT NOT NULL)")
+
+    def get(self, customer_id):
+        row = self.db.execute("SELECT features FROM profiles WHERE customer_id = ?", (customer_id,)).fetchone()
+        return BehaviorFeatures.from_dict(json.loads(row[0])) if row else None
+
+    def put(self, customer_id, features):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO profiles (customer_id, features) VALUES (?, ?)",
+                            (customer_id, json.dumps(features.to_dict())))
+
+    def close(self):
+        self.db.close()
+
+
+class BehavioralEngine:
+    """Live sessions scored against stored customer profiles"""
+
+    def __init__(self, store=None, profile_decay=PROFILE_DECAY):
+        self.store = store or ProfileStore()
+        self.profile_decay = profile_decay
+        self.sessions = {}
+        self._profiles = {}
+
+    def start_session(self, session_id, customer_id):
+        self.sessions[session_id] = (customer_id, BehaviorFeatures())
+        # Load the profile once per session so scoring never touches the store
+        self._profiles[session_id] = self.store.get(customer_id)
+
+    def observe(self, session_id, event):
+        self.sessions[session_id][1].observe(event)
+
+    def observe_many(self, session_id, events):
+        observe = self.sessions[session_id][1].observe
+        for event in events:
+            observe(event)
+
+    def assess(self, session_id):
+        """assess_risk_factors() result for the session so far"""
+        profile = self._profiles.get(session_id)
+        if profile is None:
+            return None
+        return assess_risk_factors(score_session(self.sessions[session_id][1], profile))
+
+    def end_session(self, session_id, enroll=True):
+        """Drop a session's state, folding it into the customer's profile if enroll is set"""
+        customer_id, features = self.sessions.pop(session_id)
+        profile = self._profiles.pop(session_id)
+        if enroll:
+            if profile is None:
+                profile = BehaviorFeatures()
+            profile.merge(features, self.profile_decay)
+            self.store.put(customer_id, profile)
+        return customer_id
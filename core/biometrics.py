@@ -0,0 +1,38 @@
+# Risk score thresholds shared by the fraud charts (0-100 scale)
+MEDIUM_RISK_THRESHOLD = 30
+HIGH_RISK_THRESHOLD = 70
+
+# Authentication decision thresholds on overall confidence (%)
+AUTH_SUCCESS_CONFIDENCE = 95
+AUTH_STEP_UP_CONFIDENCE = 80
+
+
+def behavioral_risk_level(total_risk):
+    """Map a summed behavioral risk score to (label, color)"""
+    if total_risk < 50:
+        return "🟢 LOW RISK", "#28a745"
+    elif total_risk < 100:
+        return "🟡 MEDIUM RISK", "#ffc107"
+    return "🔴 HIGH RISK", "#dc3545"
+
+
+def assess_risk_factors(factors):
+    """Sum behavioral risk factor scores and classify the overall risk"""
+    total_risk = sum(factor["score"] for factor in factors)
+    level, color = behavioral_risk_level(total_risk)
+    return {
+        "factors": factors,
+        "total_risk": total_risk,
+        "max_risk": 100 * len(factors),
+        "risk_level": level,
+        "risk_color": color
+    }
+
+
+def authentication_decision(overall_confidence):
+    """Return 'success', 'step_up' or 'failed' for an overall confidence (%)"""
+    if overall_confidence >= AUTH_SUCCESS_CONFIDENCE:
+        return "success"
+    elif overall_confidence >= AUTH_STEP_UP_CONFIDENCE:
+        return "step_up"
+    return "failed"
@@ -0,0 +1,189 @@
+"""Live state for every call being coached.
+
+Each call is a slotted LiveCall held in a dict keyed by call id, so
+lookups are O(1) and thousands of calls cost little more than their
+transcript tails, which are bounded ring buffers. Hang-up removes the call
+and folds it into per-agent totals.
+
+Writers serialise on one lock. Readers never take it: aggregates are kept
+as immutable tuples that writers replace with a single assignment, so the
+dashboard always sees a consistent snapshot and never blocks a writer.
+"""
+import threading
+import time
+from collections import deque
+
+from .coaching import CoachingSession, compile_rules
+
+TRANSCRIPT_TAIL = 20
+IDLE_SECONDS = 900
+
+# Customer mood from the running sentiment average
+MOODS = ("Frustrated", "Neutral", "Satisfied")
+FRUSTRATED_BELOW = -0.3
+SATISFIED_ABOVE = 0.3
+
+# Index of each field in the published totals tuple
+_ACTIVE, _COMPLETED, _HANDLE_SECONDS, _SUGGESTIONS = range(4)
+_MOOD_OFFSET = 4
+
+
+def mood_of(sentiment_average):
+    if sentiment_average is None:
+        return "Neutral"
+    if sentiment_average < FRUSTRATED_BELOW:
+        return "Frustrated"
+    if sentiment_average > SATISFIED_ABOVE:
+        return "Satisfied"
+    return "Neutral"
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+class LiveCall:
+    """State of one call in progress"""
+
+    __slots__ = ("call_id", "agent", "customer", "issue_type", "priority", "started", "last_activity",
+                 "transcript", "mood", "talk_seconds", "coaching", "suggestions")
+
+    def __init__(self, call_id, agent, customer, issue_type, priority, started, rules, tail_size):
+        self.call_id = call_id
+        self.agent = agent
+        self.customer = customer
+        self.issue_type = issue_type
+        self.priority = priority
+        self.started = started
+        self.last_activity = started
+        self.transcript = deque(maxlen=tail_size)
+        self.mood = "Neutral"
+        self.talk_seconds = {"Agent": 0.0, "Customer": 0.0}
+        self.coaching = CoachingSession(rules)
+        self.suggestions = 0
+
+    def info(self, now):
+        """Call details in the layout of the coaching page's call panel"""
+        return {
+            "Agent": self.agent,
+            "Customer": self.customer,
+            "Call Duration": _format_duration(now - self.started),
+            "Issue Type": self.issue_type,
+            "Priority": self.priority,
+            "Customer Mood": self.mood
+        }
+
+
+class CallStateManager:
+    """Live calls by id plus lock-free aggregate snapshots for dashboards"""
+
+    def __init__(self, rules=None, tail_size=TRANSCRIPT_TAIL, seconds_per_word=0.4, clock=time.time):
+        self.rules = compile_rules(rules)
+        self.tail_size = tail_size
+        self.seconds_per_word = seconds_per_word
+        self.clock = clock
+        self.calls = {}
+        self._lock = threading.Lock()
+        self._totals = (0, 0, 0.0, 0) + (0,) * len(MOODS)
+        self._agents = {}
+
+    def __len__(self):
+        return len(self.calls)
+
+    def get(self, call_id):
+        return self.calls.get(call_id)
+
+    def _adjust(self, active=0, completed=0, handle_seconds=0.0, suggestions=0, mood_from=None, mood_to=None):
+        totals = list(self._totals)
+        totals[_ACTIVE] += active
+        totals[_COMPLETED] += completed
+        totals[_HANDLE_SECONDS] += handle_seconds
+        totals[_SUGGESTIONS] += suggestions
+        if mood_from:
+            totals[_MOOD_OFFSET + MOODS.index(mood_from)] -= 1
+        if mood_to:
+            totals[_MOOD_OFFSET + MOODS.index(mood_to)] += 1
+        self._totals = tuple(totals)
+
+    def _adjust_agent(self, agent, active=0, completed=0, handle_seconds=0.0, suggestions=0):
+        current = self._agents.get(agent, (0, 0, 0.0, 0))
+        self._agents[agent] = (current[0] + active, current[1] + completed, current[2] + handle_seconds,
+                               current[3] + suggestions)
+
+    def start(self, call_id, agent, customer, issue_type="General", priority="Normal", at=None):
+        at = self.clock() if at is None else at
+        with self._lock:
+            if call_id in self.calls:
+                raise ValueError(f"call {call_id!r} is already active")
+            call = LiveCall(call_id, agent, customer, issue_type, priority, at, self.rules, self.tail_size)
+            self.calls[call_id] = call
+            self._adjust(active=1, mood_to=call.mood)
+            self._adjust_agent(agent, active=1)
+        return call
+
+    def add_utterance(self, call_id, utterance):
+        """Record an utterance ({speaker, text, mood?, t?, duration?}); returns the coaching rules it fired"""
+        call = self.calls.get(call_id)
+        if call is None:
+            raise KeyError(call_id)
+        at = utterance.get("t", self.clock())
+        duration = utterance.get("duration", len(utterance["text"].split()) * self.seconds_per_word)
+        with self._lock:
+            fired = call.coaching.observe(dict(utterance, t=at, duration=duration))
+            call.transcript.append((at, utterance["speaker"], utterance["text"]))
+            call.talk_seconds[utterance["speaker"]] = call.talk_seconds.get(utterance["speaker"], 0.0) + duration
+            call.last_activity = at + duration
+            mood = mood_of(call.coaching.sentiment_average)
+            added = sum(len(rule["suggestions"]) for rule in fired)
+            call.suggestions += added
+            self._adjust(suggestions=added, mood_from=call.mood if mood != call.mood else None,
+                         mood_to=mood if mood != call.mood else None)
+            if added:
+                self._adjust_agent(call.agent, suggestions=added)
+            call.mood = mood
+        return fired
+
+    def hang_up(self, call_id, at=None):
+        """Evict a call and fold it into its agent's totals; returns its final info or None"""
+        at = self.clock() if at is None else at
+        with self._lock:
+            call = self.calls.pop(call_id, None)
+            if call is None:
+                return None
+            handle_seconds = max(0.0, at - call.started)
+            self._adjust_agent(call.agent, active=-1, completed=1, handle_seconds=handle_seconds)
+            self._adjust(active=-1, completed=1, handle_seconds=handle_seconds, suggestions=-call.suggestions,
+                         mood_from=call.mood)
+        return call.info(at)
+
+    def evict_idle(self, idle_seconds=IDLE_SECONDS):
+        """Hang up calls with no utterance for idle_seconds, as of their last activity"""
+        now = self.clock()
+        stale = [(call_id, call.last_activity) for call_id, call in list(self.calls.items())
+                 if call.last_activity < now - idle_seconds]
+        for call_id, last_activity in stale:
+            self.hang_up(call_id, at=last_activity)
+        return len(stale)
+
+    def snapshot(self):
+        """Aggregate live state; reads published tuples only and never takes the writer lock"""
+        totals = self._totals
+        completed = totals[_COMPLETED]
+        return {
+            "active_calls": totals[_ACTIVE],
+            "completed_calls": completed,
+            "average_handle_seconds": totals[_HANDLE_SECONDS] / completed if completed else None,
+            "active_call_suggestions": totals[_SUGGESTIONS],
+            "moods": dict(zip(MOODS, totals[_MOOD_OFFSET:]))
+        }
+
+    def agent_stats(self, agent):
+        """Dashboard figures for one agent, read from its published totals"""
+        active, completed, seconds, suggestions = self._agents.get(agent, (0, 0, 0.0, 0))
+        return {
+            "Calls Handled": completed,
+            "Avg Handle Time": _format_duration(seconds / completed) if completed else "-",
+            "Active Calls": active,
+            "Suggestions per Call": round(suggestions / max(1, active + completed), 1)
+        }
@@ -0,0 +1,227 @@
+"""Event-driven live coaching rules.
+
+Rules are plain dicts, so they can live in config:
+
+    {"id": "duplicate_charge", "category": "Immediate Actions", "priority": 90,
+     "when": {"speaker": "Customer", "keywords": ["charged twice"]},
+     "suggestions": ["🔍 Check duplicate charges in billing system"],
+     "hint": "Acknowledge the specific billing error ..."}
+
+Supported conditions, all of which must hold: speaker, keywords (any),
+mood (any), sentiment_below, sentiment_drop (fall below the running
+customer average), sentiment_rise, silence_over (seconds since the
+previous utterance) and talk_ratio_over (agent share of recent words).
+
+compile_rules() merges every keyword of every rule into one regex, so an
+utterance is scanned once however many rules there are. The remaining
+conditions read O(1) session state (sentiment average, talk counters,
+timestamps), and each rule has a cooldown so hints don't repeat.
+"""
+import re
+import time
+from collections import deque
+
+from .sentiment import score_text
+
+CATEGORIES = ("Immediate Actions", "Communication Style", "Mood Management")
+
+# Exponential average of customer sentiment used for drop/rise detection
+SENTIMENT_SMOOTHING = 0.4
+
+# Talk ratio window in words, decayed per utterance
+TALK_DECAY = 0.8
+
+DEFAULT_COOLDOWN_SECONDS = 60
+SUGGESTIONS_PER_CATEGORY = 3
+
+DEFAULT_RULES = [
+    {"id": "duplicate_charge", "category": "Immediate Actions", "priority": 90,
+     "when": {"speaker": "Customer", "keywords": ["charged twice", "double charge", "duplicate charge",
+                                                   "billed twice", "same service"]},
+     "suggestions": ["🔍 Check duplicate charges in billing system", "📧 Prepare refund authorization"],
+     "hint": "Acknowledge the specific billing error and provide timeline for resolution"},
+    {"id": "escalation_request", "category": "Immediate Actions", "priority": 95,
+     "when": {"speaker": "Customer", "keywords": ["supervisor", "manager", "cancel", "complaint", "lawyer"]},
+     "suggestions": ["📞 Escalation path ready if needed"],
+     "hint": "Offer a concrete fix before transferring; customer is asking to escalate"},
+    {"id": "very_negative", "category": "Communication Style", "priority": 80,
+     "when": {"speaker": "Customer", "sentiment_below": -0.5},
+     "suggestions": ["🎯 Use direct, solution-focused language"],
+     "hint": "Customer is very upset: acknowledge the problem and state your next step"},
+    {"id": "asks_when", "category": "Communication Style", "priority": 60,
+     "when": {"speaker": "Customer", "keywords": ["how long", "when will", "how soon", "still waiting"]},
+     "suggestions": ["⏰ Provide specific timeline (2-3 minutes)"],
+     "hint": "Give a specific timeline"},
+    {"id": "wants_compensation", "category": "Communication Style", "priority": 50,
+     "when": {"speaker": "Customer", "keywords": ["refund", "credit", "compensation", "money back"]},
+     "suggestions": ["💝 Offer gesture of goodwill (service credit)"],
+     "hint": "A goodwill credit is within your authority here"},
+    {"id": "long_silence", "category": "Communication Style", "priority": 70,
+     "when": {"speaker": "Agent", "silence_over": 10},
+     "suggestions": ["🔇 Narrate what you are doing during long pauses"],
+     "hint": "Long silence: tell the customer what you're checking"},
+    {"id": "agent_dominating", "category": "Communication Style", "priority": 40,
+     "when": {"speaker": "Agent", "talk_ratio_over": 0.7},
+     "suggestions": ["👂 Let the customer talk: ask an open question"],
+     "hint": "You're doing most of the talking; ask an open question"},
+    {"id": "mood_drop", "category": "Mood Management", "priority": 85,
+     "when": {"speaker": "Customer", "sentiment_drop": 0.4},
+     "suggestions": ["⚠️ Customer frustration rising"],
+     "hint": "Mood just dropped: pause and acknowledge before continuing"},
+    {"id": "mood_recovering", "category": "Mood Management", "priority": 30,
+     "when": {"speaker": "Customer", "sentiment_rise": 0.3},
+     "suggestions": ["😌 Customer frustration decreasing"],
+     "hint": None},
+    {"id": "agent_empathy", "category": "Mood Management", "priority": 20,
+     "when": {"speaker": "Agent", "keywords": ["understand", "sorry", "apologize", "i hear you"]},
+     "suggestions": ["🎯 Continue empathetic approach"],
+     "hint": None}
+]
+
+
+class CompiledRules:
+    """Rules with every keyword merged into a single alternation regex"""
+
+    def __init__(self, rules):
+        for rule in rules:
+            if rule["category"] not in CATEGORIES:
+                raise ValueError(f"rule {rule['id']!r}: unknown category {rule['category']!r}")
+        self.rules = sorted(rules, key=lambda r: -r.get("priority", 0))
+        self.keyword_rules = {}
+        for index, rule in enumerate(self.rules):
+            for keyword in rule["when"].get("keywords", ()):
+                self.keyword_rules.setdefault(keyword.lower(), set()).add(index)
+        keywords = sorted(self.keyword_rules, key=len, reverse=True)
+        self.pattern = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b") if keywords else None
+
+    def keyword_hits(self, text):
+        """Indexes of rules whose keywords occur in text"""
+        hits = set()
+        if self.pattern:
+            for match in self.pattern.finditer(text.lower()):
+                hits |= self.keyword_rules[match.group(0)]
+        return hits
+
+
+def compile_rules(rules=None):
+    return CompiledRules(DEFAULT_RULES if rules is None else rules)
+
+
+class CoachingSession:
+    """Per-call coaching state fed one utterance at a time"""
+
+    def __init__(self, rules=None, cooldown=DEFAULT_COOLDOWN_SECONDS, clock=time.time):
+        self.rules = rules if isinstance(rules, CompiledRules) else compile_rules(rules)
+        self.cooldown = cooldown
+        self.clock = clock
+        self.sentiment_average = None
+        self.last_sentiment = None
+        self.talk = {"Agent": 0.0, "Customer": 0.0}
+        self.last_time = None
+        self.fired = {}
+        self.suggestions = {category: deque(maxlen=SUGGESTIONS_PER_CATEGORY) for category in CATEGORIES}
+        self.latest_hint = None
+
+    def _conditions_hold(self, when, utterance, context):
+        if "speaker" in when and when["speaker"] != utterance["speaker"]:
+            return False
+        if "mood" in when and utterance.get("mood") not in when["mood"]:
+            return False
+        sentiment, previous_average = context["sentiment"], context["previous_average"]
+        if "sentiment_below" in when and not (sentiment is not None and sentiment < when["sentiment_below"]):
+            return False
+        if "sentiment_drop" in when and not (sentiment is not None and previous_average is not None
+                                             and previous_average - sentiment >= when["sentiment_drop"]):
+            return False
+        if "sentiment_rise" in when and not (sentiment is not None and previous_average is not None
+                                             and previous_average < 0
+                                             and sentiment - previous_average >= when["sentiment_rise"]):
+            return False
+        if "silence_over" in when and not (context["silence"] is not None and context["silence"] > when["silence_over"]):
+            return False
+        if "talk_ratio_over" in when and not context["agent_share"] > when["talk_ratio_over"]:
+            return False
+        return True
+
+    def observe(self, utterance):
+        """Evaluate rules for one utterance ({speaker, text, mood?, t?, duration?}); returns new suggestions"""
+        now = utterance.get("t", self.clock())
+        speaker = utterance["speaker"]
+        text = utterance["text"]
+
+        silence = None
+        if self.last_time is not None:
+            silence = max(0.0, now - self.last_time)
+        self.last_time = now + utterance.get("duration", 0.0)
+
+        words = len(text.split())
+        for name in self.talk:
+            self.talk[name] *= TALK_DECAY
+        self.talk[speaker] = self.talk.get(speaker, 0.0) + words
+        total = self.talk["Agent"] + self.talk["Customer"]
+        agent_share = self.talk["Agent"] / total if total else 0.0
+
+        sentiment = previous_average = None
+        if speaker == "Customer":
+            sentiment = score_text(text)[0]
+            previous_average = self.sentiment_average
+            self.sentiment_average = sentiment if previous_average is None else (
+                SENTIMENT_SMOOTHING * sentiment + (1 - SENTIMENT_SMOOTHING) * previous_average)
+            self.last_sentiment = sentiment
+
+        context = {"sentiment": sentiment, "previous_average": previous_average, "silence": silence,
+                   "agent_share": agent_share}
+        keyword_hits = self.rules.keyword_hits(text)
+        fired = []
+        for index, rule in enumerate(self.rules.rules):
+            when = rule["when"]
+            if "keywords" in when and index not in keyword_hits:
+                continue
+            last = self.fired.get(rule["id"])
+            if last is not None and now - last < rule.get("cooldown", self.cooldown):
+                continue
+            if not self._conditions_hold(when, utterance, context):
+                continue
+            self.fired[rule["id"]] = now
+            queue = self.suggestions[rule["category"]]
+            for suggestion in reversed(rule["suggestions"]):
+                if suggestion in queue:
+                    queue.remove(suggestion)
+                queue.appendleft(suggestion)
+            fired.append({"rule": rule["id"], "category": rule["category"], "suggestions": rule["suggestions"],
+                          "hint": rule.get("hint")})
+        hints = [f["hint"] for f in fired if f["hint"]]
+        if hints:
+            # Rules run in priority order, so the first hint is the most important
+            self.latest_hint = hints[0]
+        return fired
+
+    def resolution_confidence(self):
+        if self.sentiment_average is None:
+            return "Unknown"
+        if self.sentiment_average >= 0 or (self.last_sentiment or 0) > self.sentiment_average + 0.2:
+            return "High"
+        if self.sentiment_average > -0.5:
+            return "Medium"
+        return "Low"
+
+    def recommendations(self):
+        """Current suggestions grouped under CATEGORIES, newest first"""
+        grouped = {category: list(queue) for category, queue in self.suggestions.items()}
+        grouped["Mood Management"].append(f"✅ Resolution confidence: {self.resolution_confidence()}")
+        return grouped
+
+    def coach_message(self):
+        """Highest-priority hint from the latest utterance that produced one"""
+        return f"💡 Suggestion: {self.latest_hint}" if self.latest_hint else None
+
+
+def coach_conversation(utterances, rules=None, seconds_per_word=0.4):
+    """Run a whole conversation through a session, timing utterances from their word counts"""
+    session = CoachingSession(rules)
+    t = 0.0
+    for utterance in utterances:
+        duration = utterance.get("duration", len(utterance["text"].split()) * seconds_per_word)
+        session.observe(dict(utterance, t=utterance.get("t", t), duration=duration))
+        t = utterance.get("t", t) + duration
+    return session
@@ -0,0 +1,158 @@
+"""Continuous per-call risk scoring.
+
+Each audio window contributes a voiceprint match confidence, a deepfake
+score and a behavioral risk score (all 0-100). They are turned into
+log-likelihood evidence and folded into a running log-odds estimate that
+decays back towards the prior, so an update is O(1) no matter how long the
+call has been running. Confidence tracks the effective number of windows
+behind the estimate and drops again when the signals disagree.
+"""
+import math
+import time
+from collections import deque
+from datetime import datetime
+
+# Prior probability that a call is fraudulent before any audio is scored
+PRIOR_RISK = 0.2
+
+# Weight of one window's evidence per signal; consecutive windows are
+# strongly correlated, so a single window only nudges the estimate
+SIGNAL_WEIGHTS = {
+    "voice_confidence": 0.10,
+    "deepfake_score": 0.15,
+    "behavioral_risk": 0.06
+}
+
+# How much of the previous evidence survives each window (EMA factor)
+DECAY = 0.8
+
+# Signal probabilities are clipped so no single window is decisive
+MIN_PROBABILITY = 0.05
+
+# Effective windows needed for ~63% confidence
+CONFIDENCE_SCALE = 1.5
+MAX_CONFIDENCE = 99.0
+
+# Points kept per call for the timeline chart
+TIMELINE_POINTS = 200
+
+# Calls with no update for this long are dropped by evict_idle()
+IDLE_SECONDS = 600
+
+
+def _logit(probability):
+    probability = min(1 - MIN_PROBABILITY, max(MIN_PROBABILITY, probability))
+    return math.log(probability / (1 - probability))
+
+
+def window_evidence(voice_confidence=None, deepfake_score=None, behavioral_risk=None):
+    """Weighted log-likelihood ratios (fraud vs genuine) for one window; missing signals are skipped"""
+    evidence = []
+    if voice_confidence is not None:
+        evidence.append(SIGNAL_WEIGHTS["voice_confidence"] * _logit(1 - voice_confidence / 100))
+    if deepfake_score is not None:
+        evidence.append(SIGNAL_WEIGHTS["deepfake_score"] * _logit(deepfake_score / 100))
+    if behavioral_risk is not None:
+        evidence.append(SIGNAL_WEIGHTS["behavioral_risk"] * _logit(behavioral_risk / 100))
+    return evidence
+
+
+class CallScore:
+    """Running risk estimate for one call"""
+
+    __slots__ = ("call_id", "log_odds", "weight", "disagreement", "windows", "updated", "timeline")
+
+    def __init__(self, call_id, timeline_points=TIMELINE_POINTS):
+        self.call_id = call_id
+        self.log_odds = _logit(PRIOR_RISK)
+        self.weight = 0.0
+        self.disagreement = 0.0
+        self.windows = 0
+        self.updated = None
+        self.timeline = deque(maxlen=timeline_points)
+
+    @property
+    def risk(self):
+        return 100 / (1 + math.exp(-self.log_odds))
+
+    @property
+    def confidence(self):
+        certainty = 1 - math.exp(-self.weight / CONFIDENCE_SCALE)
+        return min(MAX_CONFIDENCE, 100 * certainty / (1 + self.disagreement))
+
+    def update(self, evidence, at):
+        prior = _logit(PRIOR_RISK)
+        self.log_odds = prior + DECAY * (self.log_odds - prior) + sum(evidence)
+        self.weight = DECAY * self.weight + (1 if evidence else 0)
+        # Signals pointing in opposite directions (e.g. a matching voiceprint
+        # with a high deepfake score) lower confidence rather than the risk
+        conflict = min(sum(e for e in evidence if e > 0), -sum(e for e in evidence if e < 0))
+        self.disagreement = DECAY * self.disagreement + conflict
+        self.windows += 1
+        self.updated = at
+        self.timeline.append((at, round(self.risk, 1), round(self.confidence, 1)))
+
+    def snapshot(self):
+        return {
+            "call_id": self.call_id,
+            "risk_score": round(self.risk, 1),
+            "confidence": round(self.confidence, 1),
+            "windows": self.windows
+        }
+
+
+class ContinuousScorer:
+    """Risk estimates for many concurrent calls, updated one window at a time"""
+
+    def __init__(self, timeline_points=TIMELINE_POINTS, clock=time.time):
+        self.timeline_points = timeline_points
+        self.clock = clock
+        self.calls = {}
+
+    def __len__(self):
+        return len(self.calls)
+
+    def update(self, call_id, voice_confidence=None, deepfake_score=None, behavioral_risk=None, at=None):
+        """Fold one audio window into a call's estimate and return its snapshot"""
+        call = self.calls.get(call_id)
+        if call is None:
+            call = self.calls[call_id] = CallScore(call_id, self.timeline_points)
+        call.update(window_evidence(voice_confidence, deepfake_score, behavioral_risk),
+                    self.clock() if at is None else at)
+        return call.snapshot()
+
+    def score(self, call_id):
+        call = self.calls.get(call_id)
+        return None if call is None else call.snapshot()
+
+    def timeline(self, call_id, time_format="%H:%M:%S"):
+        """Rows of Time/Risk_Score/Confidence for the continuous scoring chart"""
+        call = self.calls.get(call_id)
+        if call is None:
+            return []
+        return [
+            {"Time": datetime.fromtimestamp(at).strftime(time_format), "Risk_Score": risk, "Confidence": conf}
+            for at, risk, conf in call.timeline
+        ]
+
+    def end(self, call_id):
+        """Stop tracking a call, returning its final snapshot"""
+        call = self.calls.pop(call_id, None)
+        return None if call is None else call.snapshot()
+
+    def evict_idle(self, idle_seconds=IDLE_SECONDS):
+        """Drop calls whose last window is older than idle_seconds"""
+        cutoff = self.clock() - idle_seconds
+        stale = [call_id for call_id, call in self.calls.items() if call.updated is not None and call.updated < cutoff]
+        for call_id in stale:
+            del self.calls[call_id]
+        return len(stale)
+
+
+def score_windows(windows, interval_seconds=3, start=None, call_id="call"):
+    """Score a sequence of window dicts and return the chart timeline"""
+    start = time.time() if start is None else start
+    scorer = ContinuousScorer()
+    for i, window in enumerate(windows):
+        scorer.update(call_id, at=start + i * interval_seconds, **window)
+    return scorer.timeline(call_id)
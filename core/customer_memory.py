@@ -0,0 +1,249 @@
+"""Contextual customer memory: facts from every interaction folded into one compact record per customer.
+
+Each customer is one row of a WITHOUT ROWID SQLite table keyed by
+customer id, so assembling a profile is a single primary-key B-tree read
+whatever the number of customers. The row holds a binary record: running
+totals (interactions, escalations, resolutions, per-channel counts), an
+exponentially weighted sentiment, the latest name, tier and communication
+style, and the last few interactions with their summaries. Rows carry a
+version that increases on every write, so writers can detect a
+concurrent update.
+"""
+import sqlite3
+import struct
+import threading
+
+CHANNELS = ("Voice", "Chat", "Email", "SMS", "Social")
+ACCOUNT_TIERS = ("", "Basic", "Standard", "Premium")
+
+# Weight of the newest interaction in the running sentiment
+SENTIMENT_SMOOTHING = 0.3
+# Interactions kept verbatim per customer
+RECENT_LIMIT = 5
+MAX_TEXT_BYTES = 240
+
+# Record layout; bump RECORD_FORMAT when it changes
+RECORD_FORMAT = 1
+_HEADER = struct.Struct(f"<BIIIfdB{len(CHANNELS)}I")
+_RECENT = struct.Struct("<dBbB")
+_TEXT = struct.Struct("<H")
+ESCALATED, RESOLVED = 1, 2
+
+# Sentiment thresholds (-1..1) for the emotional state shown on the profile
+EMOTIONAL_STATES = ((-0.5, "Frustrated"), (-0.1, "Slightly frustrated"), (0.1, "Neutral"), (0.5, "Satisfied"),
+                    (1.01, "Delighted"))
+
+
+def _pack_text(text):
+    data = (text or "").encode()[:MAX_TEXT_BYTES].decode(errors="ignore").encode()
+    return _TEXT.pack(len(data)) + data
+
+
+def _unpack_text(blob, offset):
+    (length,) = _TEXT.unpack_from(blob, offset)
+    offset += _TEXT.size
+    return blob[offset:offset + length].decode(), offset + length
+
+
+def _empty():
+    return {"interactions": 0, "escalations": 0, "resolved": 0, "sentiment": 0.0, "last_contact": 0.0,
+            "tier": "", "channels": [0] * len(CHANNELS), "name": "", "style": "", "recent": []}
+
+
+def encode_record(memory):
+    """Binary record for a memory dict"""
+    parts = [_HEADER.pack(RECORD_FORMAT, memory["interactions"], memory["escalations"], memory["resolved"],
+                          memory["sentiment"], memory["last_contact"], ACCOUNT_TIERS.index(memory["tier"]),
+                          *memory["channels"]),
+             _pack_text(memory["name"]), _pack_text(memory["style"]), bytes([len(memory["recent"])])]
+    for item in memory["recent"]:
+        flags = ESCALATED * bool(item["escalated"]) | RESOLVED * bool(item["resolved"])
+        parts.append(_RECENT.pack(item["at"], CHANNELS.index(item["channel"]),
+                                  round(max(-1.0, min(1.0, item["sentiment"])) * 100), flags))
+        parts.append(_pack_text(item["issue"]))
+        parts.append(_pack_text(item["summary"]))
+    return b"".join(parts)
+
+
+def decode_record(blob):
+    """Memory dict from a binary record"""
+    header = _HEADER.unpack_from(blob)
+    if header[0] != RECORD_FORMAT:
+        raise ValueError(f"unsupported customer record format {header[0]}")
+    memory = {"interactions": header[1], "escalations": header[2], "resolved": header[3], "sentiment": header[4],
+              "last_contact": header[5], "tier": ACCOUNT_TIERS[header[6]], "channels": list(header[7:])}
+    offset = _HEADER.size
+    memory["name"], offset = _unpack_text(blob, offset)
+    memory["style"], offset = _unpack_text(blob, offset)
+    count, offset, recent = blob[offset], offset + 1, []
+    for _ in range(count):
+        at, channel, sentiment, flags = _RECENT.unpack_from(blob, offset)
+        offset += _RECENT.size
+        issue, offset = _unpack_text(blob, offset)
+        summary, offset = _unpack_text(blob, offset)
+        recent.append({"at": at, "channel": CHANNELS[channel], "sentiment": sentiment / 100,
+                       "escalated": bool(flags & ESCALATED), "resolved": bool(flags & RESOLVED),
+                       "issue": issue, "summary": summary})
+    memory["recent"] = recent
+    return memory
+
+
+def merge_interaction(memory, interaction):
+    """Fold one interaction dict into a memory dict in place.
+
+    interaction keys: at (epoch), channel, sentiment (-1..1), summary, issue,
+    escalated, resolved, and optionally name, tier and style.
+    """
+    channel = interaction.get("channel", "Voice")
+    if channel not in CHANNELS:
+        raise ValueError(f"unknown channel {channel!r}; expected one of {CHANNELS}")
+    sentiment = float(interaction.get("sentiment", 0.0))
+    memory["sentiment"] = sentiment if not memory["interactions"] else \
+        (1 - SENTIMENT_SMOOTHING) * memory["sentiment"] + SENTIMENT_SMOOTHING * sentiment
+    memory["interactions"] += 1
+    memory["escalations"] += bool(interaction.get("escalated"))
+    memory["resolved"] += bool(interaction.get("resolved"))
+    memory["channels"][CHANNELS.index(channel)] += 1
+    memory["last_contact"] = max(memory["last_contact"], float(interaction.get("at", 0.0)))
+    for field in ("name", "tier", "style"):
+        if interaction.get(field):
+            memory[field] = interaction[field]
+    memory["recent"] = (memory["recent"] + [{
+        "at": float(interaction.get("at", 0.0)), "channel": channel, "sentiment": sentiment,
+        "escalated": bool(interaction.get("escalated")), "resolved": bool(interaction.get("resolved")),
+        "issue": interaction.get("issue", ""), "summary": interaction.get("summary", "")
+    }])[-RECENT_LIMIT:]
+    return memory
+
+
+class VersionConflict(Exception):
+    """A customer record changed since the version the writer read"""
+
+
+class CustomerMemoryStore:
+    """Customer memory records in SQLite, one primary-key row per customer"""
+
+    def __init__(self, path=":memory:"):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS customer_memory (customer_id TEXT PRIMARY KEY, "
+                            "version INTEGER NOT NULL, record BLOB NOT NULL) WITHOUT ROWID")
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM customer_memory").fetchone()[0]
+
+    def get(self, customer_id):
+        """(version, memory dict) for a customer, or (0, None) if unknown"""
+        row = self.db.execute("SELECT version, record FROM customer_memory WHERE customer_id = ?",
+                              (customer_id,)).fetchone()
+        return (row[0], decode_record(row[1])) if row else (0, None)
+
+    def _write(self, customer_id, version, memory):
+        """Store version + 1 only if the row is still at `version`; False if another writer got there first"""
+        if version == 0:
+            cursor = self.db.execute("INSERT OR IGNORE INTO customer_memory (customer_id, version, record) "
+                                     "VALUES (?, 1, ?)", (customer_id, encode_record(memory)))
+        else:
+            cursor = self.db.execute("UPDATE customer_memory SET version = ?, record = ? "
+                                     "WHERE customer_id = ? AND version = ?",
+                                     (version + 1, encode_record(memory), customer_id, version))
+        return cursor.rowcount == 1
+
+    def remember(self, customer_id, interaction, expected_version=None):
+        """Fold an interaction into a customer's record; returns the new version.
+
+        The write only lands if the record is unchanged since it was read,
+        which also holds across processes sharing the database. With
+        expected_version set, raises VersionConflict if the stored record
+        has moved on from that version; without it, a lost race is retried
+        on the fresh record.
+        """
+        with self.lock:
+            while True:
+                with self.db:
+                    version, memory = self.get(customer_id)
+                    if expected_version is not None and version != expected_version:
+                        raise VersionConflict(f"{customer_id}: expected version {expected_version}, found {version}")
+                    if self._write(customer_id, version, merge_interaction(memory or _empty(), interaction)):
+                        return version + 1
+                if expected_version is not None:
+                    raise VersionConflict(f"{customer_id}: changed by another writer after version {version}")
+
+    def remember_many(self, interactions):
+        """Fold (customer_id, interaction) pairs in one transaction, reading each customer once.
+
+        If another writer changes one of the records meanwhile, the whole
+        batch is rolled back and folded again on fresh records.
+        """
+        interactions = list(interactions)
+        with self.lock:
+            while True:
+                pending = {}
+                try:
+                    with self.db:
+                        for customer_id, interaction in interactions:
+                            if customer_id not in pending:
+                                version, memory = self.get(customer_id)
+                                pending[customer_id] = [version, memory or _empty()]
+                            merge_interaction(pending[customer_id][1], interaction)
+                        for customer_id, (version, memory) in pending.items():
+                            if not self._write(customer_id, version, memory):
+                                raise VersionConflict(customer_id)
+                    return len(pending)
+                except VersionConflict:
+                    continue
+
+    def profile(self, customer_id):
+        """Profile fields shown on the orchestration tab, or None for an unknown customer"""
+        _, memory = self.get(customer_id)
+        return customer_profile(memory) if memory else None
+
+    def close(self):
+        self.db.close()
+
+
+def emotional_state(sentiment):
+    for bound, label in EMOTIONAL_STATES:
+        if sentiment <= bound:
+            return label
+    return EMOTIONAL_STATES[-1][1]
+
+
+def customer_profile(memory):
+    """Display profile from a memory dict: name, style, previous issues, channel, emotional state, tier"""
+    issues = [f"{item['issue']} ({'escalated' if item['escalated'] else 'resolved' if item['resolved'] else 'open'})"
+              for item in reversed(memory["recent"]) if item["issue"]]
+    preferred = max(range(len(CHANNELS)), key=lambda i: memory["channels"][i])
+    return {
+        "Name": memory["name"] or "Unknown",
+        "Communication Style": memory["style"] or "Not yet known",
+        "Previous Issues": ", ".join(issues) or "None",
+        "Preferred Channel": CHANNELS[preferred],
+        "Emotional State": emotional_state(memory["sentiment"]),
+        "Account Tier": memory["tier"] or "Standard"
+    }
+
+
+def adaptation_strategy(memory):
+    """How an agent should approach the customer, from their memory"""
+    escalated = any(item["escalated"] for item in memory["recent"])
+    unhappy = memory["sentiment"] < -0.1
+    style = memory["style"].lower()
+    if "direct" in style:
+        tone = "Direct and solution-focused"
+    elif unhappy:
+        tone = "Warm and reassuring"
+    else:
+        tone = "Friendly and conversational"
+    reasons = [r for r, present in (("Premium tier", memory["tier"] == "Premium"),
+                                    ("previous escalation", escalated), ("negative sentiment", unhappy)) if present]
+    return {
+        "Tone": tone,
+        "Channel": f"Initiate via {customer_profile(memory)['Preferred Channel'].lower()} as preferred",
+        "Priority": f"High ({' + '.join(reasons)})" if reasons else "Normal",
+        "Approach": "Acknowledge past issues, proactive resolution" if escalated or unhappy
+        else "Resolve quickly and confirm next steps"
+    }
@@ -0,0 +1,220 @@
+"""Streaming synthetic-speech (deepfake) detector.
+
+Audio is framed with a hop and every frame goes through one real FFT. All
+four artefact features come from that one spectrum:
+
+- spectral flatness (vocoded audio lacks the broadband breath noise of a live voice)
+- high-band energy ratio above 4 kHz (neural vocoders band-limit)
+- phase discontinuity, the wrapped deviation from the expected per-hop
+  phase advance, weighted by power
+- pitch jitter, from the autocorrelation (inverse FFT of the power
+  spectrum) with parabolic peak interpolation
+
+StreamingDetector keeps running sums only, so feeding a chunk costs the
+FFTs of its new frames and a verdict is available as soon as
+MIN_VERDICT_SECONDS of speech has been seen. The default model is a
+logistic regression with hand-set weights; fit_model() trains one from
+labelled feature rows.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SAMPLE_RATE = 16000
+FRAME_SIZE = 512
+HOP_SIZE = 256
+HIGH_BAND_HZ = 4000
+PITCH_RANGE_HZ = (60, 400)
+VOICED_CORRELATION = 0.4
+SILENCE_RMS = 1e-3
+
+# Speech needed before a verdict is reported
+MIN_VERDICT_SECONDS = 2.0
+
+# Synthetic score (0-100) at or above which a caller fails liveness
+SYNTHETIC_THRESHOLD = 50
+
+FEATURES = ("spectral_flatness", "high_band_ratio", "phase_discontinuity", "pitch_jitter")
+
+_window = np.hanning(FRAME_SIZE).astype(np.float32)
+
+
+def frame_audio(samples, frame_size=FRAME_SIZE, hop_size=HOP_SIZE):
+    """Overlapping frames as a (frames, frame_size) view without copying"""
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < frame_size:
+        return np.empty((0, frame_size), dtype=np.float32)
+    return sliding_window_view(samples, frame_size)[::hop_size]
+
+
+def frame_features(frames, sample_rate=SAMPLE_RATE, previous_phase=None):
+    """Per-frame features from one FFT per frame.
+
+    Returns a dict of arrays (flatness, high_ratio, phase_dev, period, voiced,
+    active) plus the last frame's phase for the next call.
+    """
+    spectrum = np.fft.rfft(frames * _window, axis=1)
+    power = (spectrum.real ** 2 + spectrum.imag ** 2) + 1e-10
+    phase = np.angle(spectrum)
+    active = np.sqrt(np.mean(frames ** 2, axis=1)) > SILENCE_RMS
+
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    high_bin = int(HIGH_BAND_HZ * FRAME_SIZE / sample_rate)
+    high_ratio = power[:, high_bin:].sum(axis=1) / power.sum(axis=1)
+
+    # Deviation from the phase advance a stationary sinusoid would show
+    expected = 2 * np.pi * HOP_SIZE * np.arange(power.shape[1]) / FRAME_SIZE
+    if previous_phase is None:
+        previous = np.vstack([phase[:1], phase[:-1]])
+    else:
+        previous = np.vstack([previous_phase[None, :], phase[:-1]])
+    deviation = np.angle(np.exp(1j * (phase - previous - expected)))
+    phase_dev = np.sum(np.abs(deviation) * power, axis=1) / np.sum(power, axis=1)
+    if previous_phase is None and len(phase_dev):
+        phase_dev[0] = np.nan
+
+    # Autocorrelation is the inverse FFT of the power spectrum
+    acf = np.fft.irfft(power, axis=1)
+    acf = acf / acf[:, :1]
+    low, high = int(sample_rate / PITCH_RANGE_HZ[1]), int(sample_rate / PITCH_RANGE_HZ[0])
+    lags = acf[:, low:high + 1]
+    peak = np.argmax(lags, axis=1)
+    rows = np.arange(len(lags))
+    inner = np.clip(peak, 1, lags.shape[1] - 2)
+    y0, y1, y2 = lags[rows, inner - 1], lags[rows, inner], lags[rows, inner + 1]
+    denominator = y0 - 2 * y1 + y2
+    offset = np.where(np.abs(denominator) > 1e-12, 0.5 * (y0 - y2) / np.where(denominator == 0, 1, denominator), 0.0)
+    period = low + inner + np.clip(offset, -0.5, 0.5)
+    voiced = active & (lags[rows, peak] > VOICED_CORRELATION)
+
+    return {
+        "flatness": flatness, "high_ratio": high_ratio, "phase_dev": phase_dev,
+        "period": period, "voiced": voiced, "active": active
+    }, (phase[-1] if len(phase) else previous_phase)
+
+
+class DeepfakeModel:
+    """Logistic regression over standardised window features"""
+
+    def __init__(self, mean, scale, coef, intercept):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+
+    def probability(self, features):
+        """Probability of synthetic speech for one or more feature rows (FEATURES order)"""
+        x = (np.atleast_2d(features) - self.mean) / self.scale
+        return 1 / (1 + np.exp(-(x @ self.coef + self.intercept)))
+
+
+# Hand-set defaults: synthetic speech tends to have steadier pitch, less
+# energy above 4 kHz, cleaner (less flat) spectra and phase jumps at
+# vocoder frame joins
+DEFAULT_MODEL = DeepfakeModel(
+    mean=[0.02, 0.008, 1.3, 0.0035],
+    scale=[0.015, 0.006, 0.15, 0.002],
+    coef=[-1.0, -1.0, 0.5, -1.5],
+    intercept=0.0
+)
+
+
+def fit_model(features, labels, iterations=500, learning_rate=0.5, l2=1e-3):
+    """Fit a DeepfakeModel on feature rows (FEATURES order) and 0/1 labels with gradient descent"""
+    features = np.asarray(features, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.float64)
+    mean, scale = features.mean(axis=0), features.std(axis=0) + 1e-9
+    x = (features - mean) / scale
+    coef, intercept = np.zeros(x.shape[1]), 0.0
+    for _ in range(iterations):
+        error = 1 / (1 + np.exp(-(x @ coef + intercept))) - labels
+        coef -= learning_rate * (x.T @ error / len(x) + l2 * coef)
+        intercept -= learning_rate * error.mean()
+    return DeepfakeModel(mean, scale, coef, intercept)
+
+
+class StreamingDetector:
+    """Incremental detector for one call's audio stream"""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, model=None, min_seconds=MIN_VERDICT_SECONDS):
+        self.sample_rate = sample_rate
+        self.model = model or DEFAULT_MODEL
+        self.min_frames = int(min_seconds * sample_rate / HOP_SIZE)
+        self._pending = np.empty(0, dtype=np.float32)
+        self._phase = None
+        self._last_period = None
+        self.frames = 0
+        self.active_frames = 0
+        self._sums = {"flatness": 0.0, "high_ratio": 0.0, "phase_dev": 0.0}
+        self._phase_frames = 0
+        self._jitter_sum = 0.0
+        self._jitter_count = 0
+
+    @property
+    def seconds(self):
+        return self.frames * HOP_SIZE / self.sample_rate
+
+    def feed(self, samples):
+        """Add a chunk of float samples in [-1, 1]; returns the verdict so far"""
+        buffer = np.concatenate([self._pending, np.asarray(samples, dtype=np.float32)])
+        frames = frame_audio(buffer)
+        if len(frames):
+            self._pending = buffer[len(frames) * HOP_SIZE:]
+            self._accumulate(frames)
+        else:
+            self._pending = buffer
+        return self.verdict()
+
+    def _accumulate(self, frames):
+        values, self._phase = frame_features(frames, self.sample_rate, self._phase)
+        active = values["active"]
+        self.frames += len(frames)
+        self.active_frames += int(active.sum())
+        for key in ("flatness", "high_ratio"):
+            self._sums[key] += float(values[key][active].sum())
+        phase_dev = values["phase_dev"][active]
+        phase_dev = phase_dev[~np.isnan(phase_dev)]
+        self._sums["phase_dev"] += float(phase_dev.sum())
+        self._phase_frames += len(phase_dev)
+
+        # Jitter compares consecutive voiced frames, including across chunks
+        periods = np.where(values["voiced"], values["period"], np.nan)
+        if self._last_period is not None:
+            periods = np.concatenate([[self._last_period], periods])
+        pairs = ~np.isnan(periods[1:]) & ~np.isnan(periods[:-1])
+        ratios = np.abs(np.diff(periods))[pairs] / ((periods[1:] + periods[:-1])[pairs] / 2)
+        self._jitter_sum += float(ratios.sum())
+        self._jitter_count += len(ratios)
+        self._last_period = periods[-1] if len(periods) else None
+
+    def features(self):
+        """Mean window features in FEATURES order"""
+        active = max(self.active_frames, 1)
+        return [
+            self._sums["flatness"] / active,
+            self._sums["high_ratio"] / active,
+            self._sums["phase_dev"] / max(self._phase_frames, 1),
+            self._jitter_sum / max(self._jitter_count, 1)
+        ]
+
+    def verdict(self):
+        """Synthetic-speech score (0-100) once enough speech has been seen"""
+        ready = self.active_frames >= self.min_frames
+        result = {"ready": ready, "seconds": round(self.seconds, 2)}
+        if ready:
+            score = float(self.model.probability(self.features())[0]) * 100
+            result.update({
+                "synthetic_score": round(score, 1),
+                "live": score < SYNTHETIC_THRESHOLD,
+                "features": dict(zip(FEATURES, (round(v, 5) for v in self.features())))
+            })
+        return result
+
+
+def detect(samples, sample_rate=SAMPLE_RATE, model=None, chunk_seconds=1.0):
+    """Run the streaming detector over a whole recording in chunk_seconds pieces"""
+    detector = StreamingDetector(sample_rate, model)
+    chunk = int(chunk_seconds * sample_rate)
+    samples = np.asarray(samples, dtype=np.float32)
+    for start in range(0, len(samples), chunk):
+        detector.feed(samples[start:start + chunk])
+    return detector.verdict()
@@ -0,0 +1,341 @@
+"""Demo fixtures for dashboard charts that have no live data source yet.
+
+Everything here is random or hard-coded sample data. Nothing in this module
+is an analysis engine; pages use it only to fill charts until the real
+scoring, forecasting and fraud engines provide the numbers.
+"""
+import math
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Rostered agents per slot for Dynamic Staffing Recommendations
+DEMO_STAFFING_SLOTS = {
+    'Time Slot': ['8:00-10:00', '10:00-12:00', '12:00-14:00', '14:00-16:00', '16:00-18:00'],
+    'Current Staff': [10, 16, 14, 15, 8]
+}
+
+
+# Public holidays used by the demo call history and forecast
+DEMO_HOLIDAYS = [date(2025, 12, 25), date(2026, 1, 1), date(2026, 5, 25), date(2026, 7, 4), date(2026, 9, 7),
+                 date(2026, 11, 26), date(2026, 12, 25), date(2027, 1, 1)]
+
+
+def demo_interval_volumes(weeks=8, queues=1, end=None, holidays=(), interval_minutes=60, rng=None):
+    """Random call volumes with daily and weekly seasonality, as (volumes, start) for the forecaster.
+
+    volumes has shape (queues, intervals) and ends at the last whole hour before end.
+    """
+    rng = rng or np.random.default_rng()
+    end = (end or datetime.now()).replace(minute=0, second=0, microsecond=0)
+    per_day = 1440 // interval_minutes
+    count = weeks * 7 * per_day
+    start = end - timedelta(minutes=interval_minutes * count)
+    hours = (np.arange(count) * interval_minutes / 60 + start.hour) % 24
+    days = np.array([(start + timedelta(minutes=interval_minutes * i)).date() for i in range(0, count, per_day)])
+    weekday = np.repeat([d.weekday() for d in days], per_day)[:count]
+    daily = np.exp(-((hours - 11) / 3.5) ** 2) + 0.6 * np.exp(-((hours - 15) / 2.5) ** 2) + 0.05
+    weekly = np.where(weekday >= 5, 0.45, 1.0)
+    holiday = np.repeat(np.isin(days, list(holidays)), per_day)[:count]
+    growth = 1 + 0.01 * np.arange(count) / (7 * per_day)
+    base = rng.uniform(80, 160, size=(queues, 1)) * interval_minutes / 60
+    expected = base * daily * weekly * np.where(holiday, 0.5, 1.0) * growth
+    return rng.poisson(expected).astype(np.float64), start
+
+
+def demo_scoring_windows(points=10, rng=None):
+    """Random per-window biometric signals for a genuine caller, fed to the continuous scorer"""
+    rng = rng or random
+    return [
+        {
+            'voice_confidence': min(99.5, 88 + i * 1.0 + rng.uniform(-2, 2)),
+            'deepfake_score': max(0.5, 6 + rng.uniform(-3, 3)),
+            'behavioral_risk': max(1, 15 + rng.uniform(-5, 5))
+        }
+        for i in range(points)
+    ]
+
+
+DEMO_THREATS = [
+    ("Voice cloning attempt", "blocked"),
+    ("Behavioral anomaly", "flagged"),
+    ("Device spoofing", "blocked"),
+    ("Geographic inconsistency", "step_up"),
+    ("Synthetic voice detected", "blocked")
+]
+
+
+def demo_fraud_events(hours=8, end=None, rng=None):
+    """Random call outcomes over the last few hours as (timestamps, outcomes, threats, confidences)"""
+    rng = rng or random
+    end = (end or datetime.now()).timestamp()
+    start = end - hours * 3600
+    timestamps, outcomes, threats, confidences = [], [], [], []
+    for _ in range(int(hours * 6 * 65)):
+        timestamps.append(rng.uniform(start, end))
+        outcomes.append("legitimate")
+        threats.append(None)
+        confidences.append(None)
+    for _ in range(int(hours * 6 * 2.5)):
+        threat, outcome = rng.choice(DEMO_THREATS)
+        timestamps.append(rng.uniform(start, end))
+        outcomes.append(outcome)
+        threats.append(threat)
+        confidences.append(rng.uniform(75, 99.5))
+    order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+    return ([timestamps[i] for i in order], [outcomes[i] for i in order],
+            [threats[i] for i in order], [confidences[i] for i in order])
+
+
+def demo_call_audio(seconds=4, synthetic=False, sample_rate=16000, seed=None):
+    """Harmonic voice-like test signal for the deepfake detector.
+
+    The live version has cycle-to-cycle pitch jitter and breath noise; the
+    synthetic one has a perfectly steady pitch and is band-limited to 4 kHz.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    jitter, noise = (0.0, 0.0005) if synthetic else (0.01, 0.01)
+    vibrato = 1 + 0.03 * np.sin(2 * np.pi * 0.5 * np.arange(n) / sample_rate)
+    cycles = np.repeat(rng.normal(0, jitter, n // 80 + 1), 80)[:n]
+    phase = 2 * np.pi * np.cumsum(120 * vibrato * (1 + cycles)) / sample_rate
+    audio = 0.1 * sum(np.sin(k * phase) / k for k in range(1, 40)) + rng.normal(0, noise, n)
+    if synthetic:
+        spectrum = np.fft.rfft(audio)
+        spectrum[np.fft.rfftfreq(n, 1 / sample_rate) > 3800] = 0
+        audio = np.fft.irfft(spectrum, n)
+    return audio.astype(np.float32)
+
+
+def demo_behavior_events(pages=12, pace=1.0, scripted=False, seed=None):
+    """Synthetic key/pointer/page event stream for one digital-channel session.
+
+    pace scales every human timing (below 1 is faster); scripted replaces the
+    human jitter with constant timings and straight pointer paths.
+    """
+    rng = random.Random(seed)
+
+    def jitter(mean, spread):
+        return mean if scripted else max(0.005, rng.gauss(mean, spread))
+
+    events, t = [], 0.0
+    x, y = 400.0, 300.0
+    for page in range(pages):
+        events.append({"type": "page", "t": t, "page": page})
+        # Pointer travels to a form field along a (possibly curved) path
+        target_x, target_y = rng.uniform(100, 900), rng.uniform(100, 600)
+        bend = 0 if scripted else rng.uniform(-80, 80)
+        steps = 12
+        for step in range(1, steps + 1):
+            f = step / steps
+            t += jitter(0.016, 0.004) * pace
+            events.append({"type": "move", "t": t, "x": x + (target_x - x) * f + bend * math.sin(math.pi * f),
+                           "y": y + (target_y - y) * f})
+        x, y = target_x, target_y
+        t += jitter(0.25, 0.08) * pace
+        events.append({"type": "click", "t": t, "x": x, "y": y})
+        events.append({"type": "field_focus", "t": t})
+        for key in "account" if page % 2 else "transfer":
+            t += jitter(0.14, 0.05) * pace
+            events.append({"type": "key_down", "t": t, "key": key})
+            t += jitter(0.09, 0.02) * pace
+            events.append({"type": "key_up", "t": t, "key": key})
+        events.append({"type": "field_blur", "t": t})
+        t += jitter(6.0, 2.0) * pace
+    return events
+
+
+def demo_voiceprint_pair(dim=192, similarity=0.9, seed=None):
+    """An enrolled voiceprint and a caller embedding with roughly the given cosine similarity"""
+    rng = np.random.default_rng(seed)
+    enrolled = rng.normal(size=dim)
+    enrolled /= np.linalg.norm(enrolled)
+    noise = rng.normal(size=dim)
+    noise -= noise @ enrolled * enrolled
+    noise /= np.linalg.norm(noise)
+    caller = similarity * enrolled + np.sqrt(1 - similarity ** 2) * noise
+    return enrolled.astype(np.float32), caller.astype(np.float32)
+
+
+# Reputation feed and known device for the live authentication demo
+DEMO_CALLER_IP = "73.44.12.9"
+DEMO_DEVICE = {"user_agent": "Mobile Safari 17.4", "screen": "390x844", "timezone": "America/Chicago"}
+DEMO_REPUTATION_LINES = [
+    "73.44.0.0/16,geo,Chicago, IL",
+    "98.0.0.0/8,geo,New York, NY",
+    "185.220.100.0/22,tor",
+    "104.16.0.0/12,hosting",
+    "45.12.0.0/16,vpn",
+    "203.0.113.66,bad",
+    "198.51.100.23,bad"
+]
+
+
+# Live call shown on the AI Trainer tab
+DEMO_LIVE_CALL = {"call_id": "demo-live", "agent": "Jessica Martinez", "customer": "David Thompson",
+                  "issue_type": "Billing Dispute", "priority": "High", "elapsed_seconds": 227}
+DEMO_CONVERSATION = [
+    {"speaker": "Customer", "text": "I've been charged twice for the same service this month!", "mood": "angry"},
+    {"speaker": "Agent", "text": "I understand your frustration, Mr. Thompson. Let me look into your account right away.", "mood": "empathetic"},
+    {"speaker": "Customer", "text": "Okay, thank you. How long will the refund take?", "mood": "calm"}
+]
+
+
+def demo_completed_calls(agent, count=23, mean_seconds=252, end=None, rng=None):
+    """Random earlier calls for an agent today, one every 15 minutes, as (call_id, start, end) epoch tuples"""
+    rng = rng or random
+    now = (end or datetime.now()).timestamp()
+    calls = []
+    for i in range(count):
+        finished = now - (count - i) * 900
+        calls.append((f"demo-{agent}-{i}", finished - max(60.0, rng.gauss(mean_seconds, 60)), finished))
+    return calls
+
+
+# Call reasons for the topic trend stream: topic, calls last week and this week, mean sentiment (1-10)
+# last week and this week, and phrases. Calls added this week all use the first phrase.
+DEMO_TOPIC_STREAM = [
+    ("Billing Issues", 1080, 1247, 6.3, 6.2, ["unexpected fee increase", "charged twice on my bill",
+                                              "refund the duplicate charge", "my payment was taken twice"]),
+    ("Technical Support", 970, 892, 7.8, 7.8, ["internet keeps dropping", "router not working after update",
+                                               "app crashes when I log in", "no signal on the modem"]),
+    ("Product Returns", 515, 634, 7.4, 8.1, ["need a return label for my order", "return the damaged item",
+                                             "wrong item in my delivery", "exchange for a different size"]),
+    ("Account Changes", 440, 445, 7.9, 7.9, ["update my address", "change the email on my account",
+                                             "upgrade my plan", "reset my password"]),
+    ("Service Inquiries", 296, 332, 8.5, 8.5, ["is there a student discount", "what are your opening hours",
+                                               "how much does the premium plan cost", "when does the promotion end"])
+]
+
+
+def demo_topic_calls(end=None, rng=None):
+    """Two weeks of finished-call transcripts as (timestamp, text, sentiment), oldest first"""
+    rng = rng or random
+    end = (end or datetime.now()).timestamp()
+    week = 7 * 86400
+    calls = []
+    for topic, last_week, this_week, last_sentiment, sentiment, phrases in DEMO_TOPIC_STREAM:
+        for week_start, count, mean in ((end - 2 * week, last_week, last_sentiment), (end - week, this_week, sentiment)):
+            for i in range(count):
+                phrase = phrases[0] if i >= last_week else rng.choice(phrases)
+                score = min(10.0, max(1.0, rng.gauss(mean, 1.0)))
+                calls.append((week_start + rng.random() * week, f"Hi, {phrase}. Can you help me with that?", score))
+    calls.sort()
+    return calls
+
+
+# Customer messages, requested actions and amounts replayed through deployed agent workflows
+DEMO_WORKFLOW_MESSAGES = [
+    ("Can you update the email address on my account? Thanks!", "Account Updates", None),
+    ("My internet keeps dropping every evening, can you help?", "Technical Support", None),
+    ("I was charged a late fee by mistake, could I get a refund?", "Refunds < $100", 35.0),
+    ("The app crashes when I log in, nothing is working.", "Technical Support", None),
+    ("I've been trying to cancel for weeks and keep getting transferred. This is unacceptable!", "Refunds < $100", 147.0),
+    ("Your service was down all weekend, I'd like a credit for it.", "Service Credits", 20.0),
+    ("I want to speak to a manager, this is ridiculous and I'm furious.", "Transfers", None),
+    ("Great, thank you for the help earlier, can you upgrade my plan?", "Account Updates", None)
+]
+
+
+def demo_workflow_interactions(count=1247, rng=None):
+    """Random interactions for the workflow runtime, with a stand-in account on each"""
+    rng = rng or random
+    interactions = []
+    for i in range(count):
+        text, action, amount = rng.choice(DEMO_WORKFLOW_MESSAGES)
+        interactions.append({"customer_id": f"CUST-{rng.randint(1000, 9999)}", "text": text, "action": action,
+                             "amount": amount, "account": {"recent_contacts": min(6, int(rng.expovariate(0.8)))}})
+    return interactions
+
+
+# Share of the day's interactions per skill, customer tier and priority for the orchestration replay
+DEMO_SKILL_MIX = {"billing": 0.3, "technical": 0.25, "account": 0.15, "complaint": 0.06, "retention": 0.04,
+                  "returns": 0.12, "claims": 0.08}
+DEMO_TIER_MIX = {"Premium": 0.15, "Standard": 0.6, "Basic": 0.25}
+DEMO_PRIORITY_MIX = {1: 0.1, 2: 0.3, 3: 0.6}
+
+
+def demo_orchestration_traffic(interactions=20000, rng=None):
+    """A day of arrivals as (seconds since midnight, interaction), peaking early afternoon"""
+    rng = rng or random
+    traffic = []
+    for i in range(interactions):
+        at = min(86399.0, max(0.0, rng.gauss(13.5 * 3600, 3.5 * 3600)))
+        traffic.append((at, {
+            "id": i,
+            "skill": rng.choices(list(DEMO_SKILL_MIX), weights=DEMO_SKILL_MIX.values())[0],
+            "tier": rng.choices(list(DEMO_TIER_MIX), weights=DEMO_TIER_MIX.values())[0],
+            "priority": rng.choices(list(DEMO_PRIORITY_MIX), weights=DEMO_PRIORITY_MIX.values())[0],
+            "risk": round(rng.betavariate(2, 6), 2)
+        }))
+    traffic.sort(key=lambda arrival: arrival[0])
+    return traffic
+
+
+# Earlier interactions folded into the customer memory shown on the orchestration tab
+DEMO_MEMORY_CUSTOMER = "CUST-20417"
+DEMO_CUSTOMER_HISTORY = [
+    {"at": 1767600000, "channel": "Chat", "sentiment": 0.2, "issue": "Billing inquiry", "resolved": True,
+     "summary": "Asked why the January invoice was higher; explained the prorated upgrade.",
+     "name": "Sarah Johnson", "tier": "Premium", "style": "Direct, Professional"},
+    {"at": 1770100000, "channel": "Chat", "sentiment": 0.1, "issue": "Plan upgrade", "resolved": True,
+     "summary": "Moved to the Premium plan with annual billing."},
+    {"at": 1772800000, "channel": "Voice", "sentiment": -0.6, "issue": "Technical support", "escalated": True,
+     "summary": "Service outage for two days; transferred to tier-2 network support."},
+    {"at": 1773000000, "channel": "Chat", "sentiment": -0.2, "issue": "Outage follow-up", "resolved": True,
+     "summary": "Confirmed the fix and applied a service credit."}
+]
+
+
+# What the default builder workflow resolves and the mean sentiment it sees on a day of
+# demo_workflow_interactions(); seeded history ramps up to these so today's live row fits
+DEMO_KPI_RESOLVED_SHARE = 0.48
+DEMO_KPI_SENTIMENT = -0.1
+
+
+def demo_kpi_history(days=365, end=None, rng=None):
+    """Daily workflow outcome counters for the days before `end`, improving as the workflows mature.
+
+    Returns (dates, columns) for KPIStore.add_many().
+    """
+    rng = rng or random
+    end = end or date.today()
+    dates, columns = [], {"interactions": [], "resolved": [], "escalated": [], "failed": [], "sentiment_sum": []}
+    for i in range(days):
+        progress = i / max(days - 1, 1)
+        interactions = max(0, int(rng.gauss(1247, 100)))
+        share = rng.gauss(DEMO_KPI_RESOLVED_SHARE - 0.12 * (1 - progress), 0.012)
+        resolved = int(interactions * min(0.95, max(0.0, share)))
+        failed = int(interactions * 0.002)
+        dates.append(end - timedelta(days=days - i))
+        columns["interactions"].append(interactions)
+        columns["resolved"].append(resolved)
+        columns["escalated"].append(interactions - resolved - failed)
+        columns["failed"].append(failed)
+        columns["sentiment_sum"].append(interactions * rng.gauss(DEMO_KPI_SENTIMENT - 0.1 * (1 - progress), 0.01))
+    return dates, columns
+
+
+DEMO_JOURNEY_CUSTOMER = "CUST-30912"
+DEMO_JOURNEY_CASE = "SF-2024-789456"
+
+# Jennifer Walsh's morning across channels: (hh:mm, channel, action, status, stage)
+DEMO_JOURNEY_EVENTS = [
+    ("09:15", "Voice", "Called about product issue", "Resolved", "Support"),
+    ("09:32", "Chat", "Asked about upgrade options", "In Progress", "Sales"),
+    ("09:45", "Email", "Requested billing clarification", "Pending", "Billing"),
+    ("09:52", "Voice", "Follow-up call for complete solution", "Active", "Billing")
+]
+
+
+def demo_journey_events(day=None):
+    """DEMO_JOURNEY_EVENTS as JourneyLog.append_many() events on `day`, filed under DEMO_JOURNEY_CASE"""
+    day = day or date.today()
+    events = []
+    for clock, channel, action, status, stage in DEMO_JOURNEY_EVENTS:
+        hour, minute = map(int, clock.split(":"))
+        at = datetime(day.year, day.month, day.day, hour, minute).timestamp()
+        events.append({"customer_id": DEMO_JOURNEY_CUSTOMER, "at": at, "channel": channel, "action": action,
+                       "status": status, "stage": stage, "case_id": DEMO_JOURNEY_CASE})
+    return events
@@ -0,0 +1,119 @@
+import re
+
+from .sentiment import parse_conversation
+
+# "🟦 **Speaker 1 (Agent)** [00:00 - 00:15]" headers produced by the diarized transcript view
+LABELED_HEADER = re.compile(r'\*\*Speaker (\d+) \(([^)]+)\)\*\*\s*\[(\d+):(\d+)\s*-\s*(\d+):(\d+)\]')
+SPEAKER_ICONS = ["🟦", "🟩", "🟨", "🟥", "🟪"]
+
+
+def segments_from_transcript(transcript, words_per_second=2.5, pause_seconds=0.0):
+    """Turn a transcript into timed speaker segments.
+
+    Labeled transcripts keep their timestamps; plain 'Speaker: text' transcripts
+    are timed from word counts at the given speaking rate.
+    """
+    segments = []
+    headers = list(LABELED_HEADER.finditer(transcript))
+    if headers:
+        for i, header in enumerate(headers):
+            body_end = headers[i + 1].start() if i + 1 < len(headers) else len(transcript)
+            text = transcript[header.end():body_end].strip()
+            for icon in SPEAKER_ICONS:
+                text = text.replace(icon, "").strip()
+            start = int(header.group(3)) * 60 + int(header.group(4))
+            end = int(header.group(5)) * 60 + int(header.group(6))
+            segments.append({"speaker": header.group(2), "start": start, "end": end, "text": text})
+        return segments
+
+    cursor = 0.0
+    for utterance in parse_conversation(transcript):
+        duration = max(1.0, len(utterance["text"].split()) / words_per_second)
+        segments.append({
+            "speaker": utterance["speaker"],
+            "start": round(cursor, 1),
+            "end": round(cursor + duration, 1),
+            "text": utterance["text"]
+        })
+        cursor += duration + pause_seconds
+    return segments
+
+
+def merge_adjacent(segments, max_gap=0.5):
+    """Merge consecutive segments from the same speaker separated by short gaps"""
+    merged = []
+    for segment in segments:
+        if merged and merged[-1]["speaker"] == segment["speaker"] and segment["start"] - merged[-1]["end"] <= max_gap:
+            merged[-1] = dict(merged[-1], end=segment["end"], text=merged[-1]["text"] + " " + segment["text"])
+        else:
+            merged.append(dict(segment))
+    return merged
+
+
+def speaker_statistics(segments):
+    """Talk time, share and turn counts per speaker"""
+    stats = {}
+    total = 0.0
+    for segment in segments:
+        duration = segment["end"] - segment["start"]
+        row = stats.setdefault(segment["speaker"], {"speaker": segment["speaker"], "talk_time": 0.0, "turns": 0})
+        row["talk_time"] += duration
+        row["turns"] += 1
+        total += duration
+    for row in stats.values():
+        row["talk_time"] = round(row["talk_time"], 1)
+        row["share"] = round(row["talk_time"] / total, 3) if total else 0.0
+    changes = sum(1 for a, b in zip(segments, segments[1:]) if a["speaker"] != b["speaker"])
+    return {"speakers": list(stats.values()), "total_time": round(total, 1), "speaker_changes": changes}
+
+
+def timeline_rows(segments):
+    """Rows for the speaker timeline chart"""
+    return {
+        'Speaker': [s["speaker"] for s in segments],
+        'Start_Time': [s["start"] for s in segments],
+        'End_Time': [s["end"] for s in segments],
+        'Duration': [round(s["end"] - s["start"], 1) for s in segments]
+    }
+
+
+def format_timestamp(seconds):
+    """Format seconds as mm:ss"""
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+
+def render_labeled_transcript(segments):
+    """Render segments in the '🟦 **Speaker N (Label)** [mm:ss - mm:ss]' format"""
+    speaker_ids = {}
+    blocks = []
+    for segment in segments:
+        number = speaker_ids.setdefault(segment["speaker"], len(speaker_ids) + 1)
+        icon = SPEAKER_ICONS[(number - 1) % len(SPEAKER_ICONS)]
+        blocks.append(
+            f"{icon} **Speaker {number} ({segment['speaker']})** "
+            f"[{format_timestamp(segment['start'])} - {format_timestamp(segment['end'])}]\n{segment['text']}"
+        )
+    return "\n\n".join(blocks)
+
+
+def diarize_transcript(transcript, min_speakers=1, max_speakers=10, words_per_second=2.5):
+    """Diarize a transcript in the documented API response shape"""
+    segments = merge_adjacent(segments_from_transcript(transcript, words_per_second))
+    speaker_ids = {}
+    for segment in segments:
+        if segment["speaker"] not in speaker_ids and len(speaker_ids) < max_speakers:
+            speaker_ids[segment["speaker"]] = f"spk_{len(speaker_ids) + 1:03d}"
+    stats = speaker_statistics(segments)
+    return {
+        "audio_duration": segments[-1]["end"] if segments else 0.0,
+        "speakers": [
+            {"id": speaker_ids[row["speaker"]], "label": row["speaker"], "total_duration": row["talk_time"]}
+            for row in stats["speakers"] if row["speaker"] in speaker_ids
+        ],
+        "timeline": [
+            {"speaker": speaker_ids[s["speaker"]], "start": s["start"], "end": s["end"], "text": s["text"]}
+            for s in segments if s["speaker"] in speaker_ids
+        ],
+        "speaker_changes": stats["speaker_changes"],
+        "min_speakers_met": len(speaker_ids) >= min_speakers
+    }
@@ -0,0 +1,191 @@
+"""Voice enrollment with incremental, quality-weighted profile updates.
+
+A customer's voiceprint is the normalised weighted mean of every call
+embedding enrolled so far. Only the current mean and its accumulated
+weight are kept (weights.f32 next to the VoiceprintStore matrix), so a new
+call updates the profile in O(dim) without touching historical audio.
+The weight is capped, which turns the mean into an exponential moving
+average once a profile is mature and lets it follow a changing voice.
+
+Every batch is first written to a journal and fsynced, then applied to
+the memory-mapped matrix. A crash mid-batch is repaired on the next open
+by replaying the journal; the records hold absolute values, so replay is
+idempotent. enroll_stream() feeds an arbitrarily long iterable through
+fixed-size batches for nightly jobs.
+"""
+import os
+import struct
+
+import numpy as np
+
+from .voiceprint_index import ID_BYTES, normalize
+
+# Enrollment quality: full weight at this much clean speech
+FULL_QUALITY_SECONDS = 20.0
+MIN_QUALITY = 0.1
+
+# Accumulated weight is capped so mature profiles keep adapting
+MAX_PROFILE_WEIGHT = 20.0
+
+BATCH_SIZE = 4096
+
+JOURNAL_NAME = "enroll.journal"
+_JOURNAL_MAGIC = b"VPJ1"
+
+
+def quality_weight(speech_seconds, synthetic_score=0.0, snr_db=None):
+    """Weight (0-1) for one call: more clean, live speech counts for more"""
+    weight = min(1.0, speech_seconds / FULL_QUALITY_SECONDS)
+    weight *= max(0.0, 1 - synthetic_score / 100)
+    if snr_db is not None:
+        weight *= min(1.0, max(0.0, (snr_db - 5) / 20))
+    return round(weight, 4)
+
+
+class VoiceEnroller:
+    """Incremental enrollment into a VoiceprintStore"""
+
+    def __init__(self, store, max_weight=MAX_PROFILE_WEIGHT, min_quality=MIN_QUALITY):
+        self.store = store
+        self.max_weight = max_weight
+        self.min_quality = min_quality
+        self._weights_path = os.path.join(store.directory, "weights.f32")
+        self._journal_path = os.path.join(store.directory, JOURNAL_NAME)
+        self._open_weights()
+        self.replayed = self._replay()
+
+    def _open_weights(self):
+        size = self.store.capacity * 4
+        with open(self._weights_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self.weights = np.memmap(self._weights_path, dtype=np.float32, mode="r+", shape=(self.store.capacity,))
+
+    def _ensure_capacity(self):
+        if len(self.weights) < self.store.capacity:
+            self.weights.flush()
+            del self.weights
+            self._open_weights()
+
+    def weight(self, customer_id):
+        row = self.store.row_of(customer_id)
+        return 0.0 if row is None else float(self.weights[row])
+
+    def enroll(self, customer_id, embedding, quality=1.0):
+        """Fold one call's embedding into a customer's voiceprint; returns the new weight or None if rejected"""
+        return self.enroll_batch([customer_id], [embedding], [quality])[0]
+
+    def enroll_batch(self, customer_ids, embeddings, qualities=None):
+        """Apply one batch atomically; returns the new weight per input (None where rejected)"""
+        embeddings = normalize(embeddings)
+        qualities = np.ones(len(customer_ids)) if qualities is None else np.asarray(qualities, dtype=np.float64)
+        accepted = qualities >= self.min_quality
+        results = [None] * len(customer_ids)
+        if not accepted.any():
+            return results
+
+        # Combine repeated customers within the batch before touching the store
+        ids = [c for c, ok in zip(customer_ids, accepted) if ok]
+        unique_ids, inverse = np.unique(np.array(ids, dtype=object).astype(str), return_inverse=True)
+        weighted = embeddings[accepted] * qualities[accepted, None]
+        if len(unique_ids) == len(ids):
+            # Common nightly case: one call per customer, a plain scatter
+            sums = np.empty((len(unique_ids), self.store.dim), dtype=np.float64)
+            batch_weight = np.empty(len(unique_ids), dtype=np.float64)
+            sums[inverse] = weighted
+            batch_weight[inverse] = qualities[accepted]
+        else:
+            sums = np.zeros((len(unique_ids), self.store.dim), dtype=np.float64)
+            batch_weight = np.zeros(len(unique_ids), dtype=np.float64)
+            np.add.at(sums, inverse, weighted)
+            np.add.at(batch_weight, inverse, qualities[accepted])
+
+        keys = [self.store._key(c) for c in unique_ids]
+        rows = self.store._rows_of_keys(keys)
+        existing = rows >= 0
+        old_weight = np.zeros(len(unique_ids), dtype=np.float64)
+        if existing.any():
+            self._ensure_capacity()
+            old_weight[existing] = self.weights[rows[existing]]
+            sums[existing] += self.store.embeddings[rows[existing]] * old_weight[existing, None]
+        rows[~existing] = self.store.count + np.arange(int((~existing).sum()))
+
+        vectors = normalize(sums)
+        new_weight = np.minimum(old_weight + batch_weight, self.max_weight).astype(np.float32)
+        self._write_journal(rows, keys, new_weight, vectors)
+        self._apply(rows, keys, new_weight, vectors)
+        os.remove(self._journal_path)
+
+        weight_of = dict(zip(unique_ids.tolist(), new_weight.tolist()))
+        for i, (customer_id, ok) in enumerate(zip(customer_ids, accepted)):
+            if ok:
+                results[i] = round(weight_of[str(customer_id)], 4)
+        return results
+
+    def _write_journal(self, rows, keys, weights, vectors):
+        count = len(rows)
+        tmp = self._journal_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_JOURNAL_MAGIC + struct.pack("<II", count, self.store.dim))
+            f.write(np.asarray(rows, dtype="<i8").tobytes())
+            f.write(np.array(keys, dtype=f"S{ID_BYTES}").tobytes())
+            f.write(np.asarray(weights, dtype="<f4").tobytes())
+            f.write(np.asarray(vectors, dtype="<f4").tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        # A journal only exists once it is complete
+        os.replace(tmp, self._journal_path)
+
+    def _apply(self, rows, keys, weights, vectors):
+        self.store.write_rows(rows, keys, vectors)
+        self._ensure_capacity()
+        self.weights[rows] = weights
+        self.weights.flush()
+        self.store.flush()
+
+    def _replay(self):
+        """Re-apply a journal left by an interrupted batch; returns the number of rows replayed"""
+        if not os.path.exists(self._journal_path):
+            return 0
+        with open(self._journal_path, "rb") as f:
+            data = f.read()
+        if data[:4] != _JOURNAL_MAGIC:
+            raise ValueError(f"unrecognised enrollment journal: {self._journal_path}")
+        count, dim = struct.unpack("<II", data[4:12])
+        offset = 12
+        rows = np.frombuffer(data, dtype="<i8", count=count, offset=offset)
+        offset += 8 * count
+        keys = np.frombuffer(data, dtype=f"S{ID_BYTES}", count=count, offset=offset).tolist()
+        offset += ID_BYTES * count
+        weights = np.frombuffer(data, dtype="<f4", count=count, offset=offset)
+        offset += 4 * count
+        vectors = np.frombuffer(data, dtype="<f4", count=count * dim, offset=offset).reshape(count, dim)
+        self._apply(rows, keys, weights, vectors)
+        os.remove(self._journal_path)
+        return count
+
+
+def enroll_stream(enroller, records, batch_size=BATCH_SIZE):
+    """Enroll (customer_id, embedding, quality) records from any iterable in fixed-size batches.
+
+    Returns {"records", "enrolled", "rejected", "batches"}.
+    """
+    stats = {"records": 0, "enrolled": 0, "rejected": 0, "batches": 0}
+    batch = []
+
+    def flush():
+        ids, embeddings, qualities = zip(*batch)
+        results = enroller.enroll_batch(list(ids), np.asarray(embeddings, dtype=np.float32), list(qualities))
+        stats["enrolled"] += sum(r is not None for r in results)
+        stats["rejected"] += sum(r is None for r in results)
+        stats["batches"] += 1
+        batch.clear()
+
+    for record in records:
+        batch.append(record)
+        stats["records"] += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return stats
@@ -0,0 +1,165 @@
+from datetime import timedelta
+
+import numpy as np
+
+# Forecast horizons offered on the Predictive Forecasting Engine
+FORECAST_PERIODS = ["Next 24 Hours", "Next Week", "Next Month", "Next Quarter"]
+
+# Baseline workforce used by the What-If analysis
+BASE_AGENTS = 45
+
+
+def staffing_recommendations(slots):
+    """Add hiring recommendations to a staffing table"""
+    table = dict(slots)
+    table['Recommendation'] = [
+        f"Hire {required - current}" if required > current else "Optimal"
+        for required, current in zip(table['Required Agents'], table['Current Staff'])
+    ]
+    return table
+
+
+def whatif_agents(volume_change, skill_efficiency, base_agents=BASE_AGENTS):
+    """Agents required after a volume change (%) at a given skill efficiency (%)"""
+    return int(base_agents * (1 + volume_change / 100) * (100 / skill_efficiency))
+
+
+# Seasonal volume forecasting
+#
+# Volumes are modelled per queue as
+#   expected = profile[week slot] * exp(growth * weeks from mid-history) * holiday factor
+# where the week slot is the interval's position in the week (hour-of-day x
+# day-of-week at hourly intervals). Every queue is fitted at once on a
+# (queues, intervals) array with grouped sums, so refitting hundreds of
+# queues is a handful of vectorised passes. Prediction intervals use a
+# Poisson variance plus a fitted overdispersion term.
+
+# Forecast resolution per period: (number of buckets, intervals summed per bucket in hours)
+FORECAST_HORIZONS = {
+    "Next 24 Hours": (24, 1),
+    "Next Week": (7, 24),
+    "Next Month": (30, 24),
+    "Next Quarter": (13, 168)
+}
+
+# Variables the forecaster can use; the rest of the page's list has no data feed yet
+MODELLED_VARIABLES = ("Historical Volume", "Holidays")
+
+# Weekly growth is clamped to this fraction so short histories don't extrapolate wildly
+MAX_WEEKLY_GROWTH = 0.05
+
+# Two-sided 90% prediction intervals
+INTERVAL_Z = 1.645
+
+
+def _week_slots(start, count, interval_minutes):
+    """Position of each interval within the week, Monday 00:00 = 0"""
+    first = (start.weekday() * 1440 + start.hour * 60 + start.minute) // interval_minutes
+    return (first + np.arange(count)) % (7 * 1440 // interval_minutes)
+
+
+def _holiday_mask(start, count, interval_minutes, holidays):
+    if not holidays:
+        return np.zeros(count, dtype=bool)
+    per_day = 1440 // interval_minutes
+    offset = (start.hour * 60 + start.minute) // interval_minutes
+    days = (offset + np.arange(count)) // per_day
+    holiday_days = [(h - start.date()).days for h in holidays]
+    return np.isin(days, holiday_days)
+
+
+class SeasonalForecaster:
+    """Hour-of-week seasonal model with trend and holiday effects, fitted across many queues at once"""
+
+    def __init__(self, interval_minutes=60, trend=True):
+        if 1440 % interval_minutes:
+            raise ValueError("interval_minutes must divide a day")
+        self.interval_minutes = interval_minutes
+        self.slots_per_week = 7 * 1440 // interval_minutes
+        self.trend = trend
+        self.start = None
+
+    def fit(self, volumes, start, holidays=()):
+        """Fit to volumes of shape (queues, intervals), or (intervals,) for one queue, starting at start"""
+        volumes = np.asarray(volumes, dtype=np.float64)
+        volumes = np.atleast_2d(volumes)
+        queues, count = volumes.shape
+        if count < self.slots_per_week:
+            raise ValueError(f"need at least one week of history ({self.slots_per_week} intervals)")
+        self.start, self.count = start, count
+
+        slots = _week_slots(start, count, self.interval_minutes)
+        holiday = _holiday_mask(start, count, self.interval_minutes, holidays)
+        regular = ~holiday
+
+        # Trend from log mean volume per whole week, by least squares across all queues at once
+        weeks = count // self.slots_per_week
+        self.growth = np.zeros(queues)
+        position = (np.arange(count) - (count - 1) / 2) / self.slots_per_week
+        if self.trend and weeks >= 3:
+            weekly = volumes[:, :weeks * self.slots_per_week].reshape(queues, weeks, -1).mean(axis=2)
+            x = np.arange(weeks) - (weeks - 1) / 2
+            self.growth = np.log(weekly + 1) @ x / (x @ x)
+            self.growth = np.clip(self.growth, -MAX_WEEKLY_GROWTH, MAX_WEEKLY_GROWTH)
+        detrended = volumes * np.exp(-np.outer(self.growth, position))
+
+        # Seasonal profile: mean detrended volume per week slot over regular days
+        order = np.argsort(slots, kind="stable")
+        boundaries = np.flatnonzero(np.diff(slots[order], prepend=-1))
+        weighted = np.add.reduceat(detrended[:, order] * regular[order], boundaries, axis=1)
+        seen = np.add.reduceat(regular[order].astype(np.float64), boundaries)
+        profile = np.zeros((queues, self.slots_per_week))
+        profile[:, slots[order][boundaries]] = weighted / np.maximum(seen, 1)
+        self.profile = profile
+
+        # Holiday factor: observed over expected volume on holiday intervals
+        expected = profile[:, slots] * np.exp(np.outer(self.growth, position))
+        self.holiday_factor = np.ones(queues)
+        if holiday.any():
+            self.holiday_factor = (volumes[:, holiday].sum(axis=1) + 1) / (expected[:, holiday].sum(axis=1) + 1)
+        expected[:, holiday] *= self.holiday_factor[:, None]
+
+        # Overdispersion: variance = mean + phi * mean^2
+        excess = ((volumes - expected) ** 2 - expected).sum(axis=1)
+        self.dispersion = np.maximum(0.0, excess / np.maximum((expected ** 2).sum(axis=1), 1e-9))
+        return self
+
+    def predict(self, steps, holidays=(), z=INTERVAL_Z):
+        """Mean and prediction interval for the next steps intervals after the history.
+
+        Returns {"start", "mean", "lower", "upper", "variance"} with arrays of shape (queues, steps).
+        """
+        if self.start is None:
+            raise ValueError("forecaster has not been fitted")
+        first = self.start + timedelta(minutes=self.interval_minutes * self.count)
+        slots = _week_slots(first, steps, self.interval_minutes)
+        holiday = _holiday_mask(first, steps, self.interval_minutes, holidays)
+        position = (self.count + np.arange(steps) - (self.count - 1) / 2) / self.slots_per_week
+        mean = self.profile[:, slots] * np.exp(np.outer(self.growth, position))
+        mean[:, holiday] *= self.holiday_factor[:, None]
+        variance = mean + self.dispersion[:, None] * mean ** 2
+        spread = z * np.sqrt(variance)
+        return {"start": first, "mean": mean, "lower": np.maximum(0.0, mean - spread), "upper": mean + spread,
+                "variance": variance}
+
+
+def forecast_for_period(forecaster, period, holidays=(), queue=0, z=INTERVAL_Z):
+    """Chart rows for one of FORECAST_HORIZONS: Time/Predicted_Volume/Lower/Upper/Confidence lists"""
+    buckets, hours = FORECAST_HORIZONS[period]
+    per_bucket = hours * 60 // forecaster.interval_minutes
+    result = forecaster.predict(buckets * per_bucket, holidays, z)
+    mean = result["mean"][queue].reshape(buckets, per_bucket)
+    # Poisson noise adds up independently; the overdispersion term is treated as shared within a bucket
+    dispersion = forecaster.dispersion[queue]
+    bucket_mean = mean.sum(axis=1)
+    bucket_variance = bucket_mean + dispersion * bucket_mean ** 2
+    spread = z * np.sqrt(bucket_variance)
+    times = [result["start"] + timedelta(hours=hours * i) for i in range(buckets)]
+    return {
+        "Time": times,
+        "Predicted_Volume": np.round(bucket_mean, 1).tolist(),
+        "Lower": np.round(np.maximum(0.0, bucket_mean - spread), 1).tolist(),
+        "Upper": np.round(bucket_mean + spread, 1).tolist(),
+        # 1 - relative interval half-width: how tight the forecast is
+        "Confidence": np.round(np.clip(1 - spread / np.maximum(bucket_mean, 1e-9), 0, 1), 3).tolist()
+    }
@@ -0,0 +1,203 @@
+"""Append-only columnar store for fraud and authentication events.
+
+Events land in fixed-size numpy column segments (timestamp, outcome code,
+threat label code, confidence). Every write also bumps per-bucket counters
+for each rollup resolution (10 minutes, hourly, daily), so dashboard
+queries read one counter row per bucket instead of scanning events. Threat
+events are also pushed onto a bounded feed, so the live threat feed is a
+tail read.
+"""
+import os
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+# Outcome codes; everything except "legitimate" is a fraud attempt
+OUTCOMES = ("legitimate", "blocked", "flagged", "step_up")
+OUTCOME_ACTIONS = {"blocked": "Blocked", "flagged": "Flagged", "step_up": "Additional verification"}
+
+# Counter columns kept per rollup bucket
+SERIES = ("Fraud_Attempts", "Blocked", "Flagged", "Step_Up", "Legitimate_Calls")
+
+ROLLUP_SECONDS = (600, 3600, 86400)
+SEGMENT_SIZE = 65536
+FEED_SIZE = 100
+
+_outcome_codes = {name: code for code, name in enumerate(OUTCOMES)}
+
+# Which SERIES columns each outcome increments
+_SERIES_BY_OUTCOME = np.array([
+    [0, 0, 0, 0, 1],
+    [1, 1, 0, 0, 0],
+    [1, 0, 1, 0, 0],
+    [1, 0, 0, 1, 0]
+], dtype=np.int64)
+
+
+class _Segment:
+    """Fixed-capacity column arrays for a run of events"""
+
+    def __init__(self, size):
+        self.timestamps = np.empty(size, dtype=np.float64)
+        self.outcomes = np.empty(size, dtype=np.uint8)
+        self.threats = np.empty(size, dtype=np.uint16)
+        self.confidences = np.empty(size, dtype=np.float32)
+        self.count = 0
+
+    @property
+    def free(self):
+        return len(self.timestamps) - self.count
+
+    def columns(self):
+        n = self.count
+        return self.timestamps[:n], self.outcomes[:n], self.threats[:n], self.confidences[:n]
+
+
+class FraudEventStore:
+    """Fraud/authentication events with rollups maintained on write"""
+
+    def __init__(self, segment_size=SEGMENT_SIZE, feed_size=FEED_SIZE, resolutions=ROLLUP_SECONDS):
+        self.segment_size = segment_size
+        self.resolutions = tuple(resolutions)
+        self.segments = [_Segment(segment_size)]
+        self.rollups = {resolution: {} for resolution in self.resolutions}
+        self.feed = deque(maxlen=feed_size)
+        self.threat_labels = [""]
+        self._threat_codes = {"": 0}
+
+    def __len__(self):
+        return sum(segment.count for segment in self.segments)
+
+    def _threat_code(self, threat):
+        threat = threat or ""
+        code = self._threat_codes.get(threat)
+        if code is None:
+            code = self._threat_codes[threat] = len(self.threat_labels)
+            self.threat_labels.append(threat)
+        return code
+
+    def record(self, timestamp, outcome, threat=None, confidence=None):
+        """Append one event and update rollups and the threat feed"""
+        self.record_many([timestamp], [outcome], [threat], [confidence])
+
+    def record_many(self, timestamps, outcomes, threats=None, confidences=None):
+        """Append a batch of events with vectorised rollup updates"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        count = len(timestamps)
+        if not count:
+            return
+        try:
+            codes = np.array([_outcome_codes[o] for o in outcomes], dtype=np.uint8)
+        except KeyError as exc:
+            raise ValueError(f"unknown outcome {exc.args[0]!r}; expected one of {OUTCOMES}")
+        threats = threats if threats is not None else [None] * count
+        threat_codes = np.array([self._threat_code(t) for t in threats], dtype=np.uint16)
+        confidences = np.asarray(
+            [np.nan if c is None else c for c in confidences] if confidences is not None else np.full(count, np.nan),
+            dtype=np.float32
+        )
+
+        start = 0
+        while start < count:
+            segment = self.segments[-1]
+            if not segment.free:
+                segment = _Segment(self.segment_size)
+                self.segments.append(segment)
+            end = min(count, start + segment.free)
+            rows = slice(segment.count, segment.count + end - start)
+            segment.timestamps[rows] = timestamps[start:end]
+            segment.outcomes[rows] = codes[start:end]
+            segment.threats[rows] = threat_codes[start:end]
+            segment.confidences[rows] = confidences[start:end]
+            segment.count += end - start
+            start = end
+
+        increments = _SERIES_BY_OUTCOME[codes]
+        for resolution, buckets in self.rollups.items():
+            keys = (timestamps // resolution).astype(np.int64)
+            unique, inverse = np.unique(keys, return_inverse=True)
+            sums = np.zeros((len(unique), len(SERIES)), dtype=np.int64)
+            np.add.at(sums, inverse, increments)
+            for key, row in zip(unique.tolist(), sums):
+                existing = buckets.get(key)
+                if existing is None:
+                    buckets[key] = row
+                else:
+                    existing += row
+
+        for i in np.flatnonzero(codes).tolist():
+            self.feed.append((float(timestamps[i]), OUTCOMES[codes[i]], self.threat_labels[threat_codes[i]],
+                              float(confidences[i])))
+
+    def rollup(self, start, end, resolution=ROLLUP_SECONDS[0]):
+        """Zero-filled per-bucket counts between two epoch timestamps, one row per bucket"""
+        if resolution not in self.rollups:
+            raise ValueError(f"no rollup kept at {resolution}s; available: {self.resolutions}")
+        buckets = self.rollups[resolution]
+        empty = np.zeros(len(SERIES), dtype=np.int64)
+        rows = []
+        for key in range(int(start // resolution), int(end // resolution) + 1):
+            counts = buckets.get(key, empty)
+            row = {"Time": datetime.fromtimestamp(key * resolution)}
+            row.update(zip(SERIES, counts.tolist()))
+            rows.append(row)
+        return rows
+
+    def totals(self, start, end, resolution=ROLLUP_SECONDS[-1]):
+        """Summed counts over whole buckets covering [start, end]"""
+        totals = dict.fromkeys(SERIES, 0)
+        for row in self.rollup(start, end, resolution):
+            for name in SERIES:
+                totals[name] += row[name]
+        return totals
+
+    def events(self, start, end):
+        """Raw events in [start, end), skipping segments outside the range"""
+        rows = []
+        for segment in self.segments:
+            timestamps, outcomes, threats, confidences = segment.columns()
+            if not len(timestamps) or timestamps.max() < start or timestamps.min() >= end:
+                continue
+            for i in np.flatnonzero((timestamps >= start) & (timestamps < end)).tolist():
+                rows.append({"timestamp": float(timestamps[i]), "outcome": OUTCOMES[outcomes[i]],
+                             "threat": self.threat_labels[threats[i]] or None,
+                             "confidence": None if np.isnan(confidences[i]) else float(confidences[i])})
+        return rows
+
+    def tail(self, count=5, time_format="%H:%M"):
+        """Newest threat events for the live feed"""
+        rows = []
+        for timestamp, outcome, threat, confidence in list(self.feed)[::-1][:count]:
+            rows.append({
+                "time": datetime.fromtimestamp(timestamp).strftime(time_format),
+                "threat": threat or "Unlabelled threat",
+                "action": OUTCOME_ACTIONS[outcome],
+                "confidence": "" if np.isnan(confidence) else f"{confidence:.1f}%"
+            })
+        return rows
+
+    def save(self, directory):
+        """Write every segment's columns to one .npz per segment"""
+        os.makedirs(directory, exist_ok=True)
+        for index, segment in enumerate(self.segments):
+            timestamps, outcomes, threats, confidences = segment.columns()
+            path = os.path.join(directory, f"segment-{index:06d}.npz")
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, timestamps=timestamps, outcomes=outcomes, threats=threats, confidences=confidences,
+                     labels=np.array(self.threat_labels, dtype=str))
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, directory, **kwargs):
+        """Rebuild a store, including rollups and feed, from saved segments"""
+        store = cls(**kwargs)
+        for name in sorted(f for f in os.listdir(directory) if f.startswith("segment-") and f.endswith(".npz")):
+            with np.load(os.path.join(directory, name)) as data:
+                labels = data["labels"].tolist()
+                store.record_many(
+                    data["timestamps"], [OUTCOMES[c] for c in data["outcomes"].tolist()],
+                    [labels[c] or None for c in data["threats"].tolist()],
+                    [None if np.isnan(c) else c for c in data["confidences"].tolist()]
+                )
+        return store
@@ -0,0 +1,115 @@
+"""Guardrails for autonomous agent actions, compiled to a decision table.
+
+The builder settings (autonomy level, escalation threshold, allowed
+actions, compliance monitoring) are compiled once into a table holding a
+verdict for every combination of action and three yes/no facts about the
+proposal: over the action's amount limit, flagged by compliance checks,
+at or above the escalation threshold. A check packs those bits into an
+index and reads the verdict, so it costs one dict lookup and a tuple index
+on the critical path. Every decision is appended to an audit log.
+"""
+import time
+from collections import Counter, deque
+from itertools import islice
+
+AUTONOMY_LEVELS = ("Supervised", "Semi-autonomous", "Fully Autonomous")
+ALLOWED_ACTIONS = ("Account Updates", "Refunds < $100", "Service Credits", "Technical Support", "Transfers")
+
+ALLOW, REVIEW, DENY = "allow", "review", "deny"
+
+# Amount limits written into action names on the builder
+ACTION_LIMITS = {"Refunds < $100": 100}
+# Actions that move money; semi-autonomous agents need a human to approve them
+SENSITIVE_ACTIONS = {"Refunds < $100", "Service Credits"}
+
+# Proposal facts packed into the low bits of the table index
+OVER_LIMIT, FLAGGED, RISKY = 4, 2, 1
+FACT_BITS = 3
+
+AUDIT_SIZE = 100000
+
+
+def _verdict(action, allowed, autonomy_level, compliance_monitoring, over_limit, flagged, risky):
+    if action is None:
+        return DENY, "unknown_action"
+    if action not in allowed:
+        return DENY, "not_allowed"
+    if over_limit:
+        return DENY, "over_limit"
+    if flagged and compliance_monitoring:
+        return DENY, "compliance"
+    if autonomy_level == "Supervised":
+        return REVIEW, "supervised"
+    if risky:
+        return REVIEW, "escalation_threshold"
+    if autonomy_level == "Semi-autonomous" and action in SENSITIVE_ACTIONS:
+        return REVIEW, "sensitive_action"
+    return ALLOW, "allowed"
+
+
+class Guardrails:
+    """Check proposed agent actions against compiled builder settings, auditing every decision.
+
+    sink is an optional callable receiving each audit record as it is made,
+    e.g. to forward records to durable storage.
+    """
+
+    def __init__(self, autonomy_level="Semi-autonomous", escalation_threshold=0.7, allowed_actions=(),
+                 compliance_monitoring=True, actions=ALLOWED_ACTIONS, audit_size=AUDIT_SIZE, sink=None):
+        if autonomy_level not in AUTONOMY_LEVELS:
+            raise ValueError(f"unknown autonomy level: {autonomy_level}")
+        unknown = set(allowed_actions) - set(actions)
+        if unknown:
+            raise ValueError(f"unknown actions: {sorted(unknown)}")
+        self.autonomy_level = autonomy_level
+        self.escalation_threshold = escalation_threshold
+        self.allowed_actions = frozenset(allowed_actions)
+        self.compliance_monitoring = compliance_monitoring
+        # The last code stands for every action the table does not know
+        self.codes = {action: code for code, action in enumerate(actions)}
+        self.unknown_code = len(actions)
+        self.limits = tuple(ACTION_LIMITS.get(a, float("inf")) for a in actions) + (float("inf"),)
+        self.table = tuple(
+            _verdict(action, self.allowed_actions, autonomy_level, compliance_monitoring,
+                     bool(facts & OVER_LIMIT), bool(facts & FLAGGED), bool(facts & RISKY))
+            for action in tuple(actions) + (None,) for facts in range(1 << FACT_BITS)
+        )
+        self.audit = deque(maxlen=audit_size)
+        self.sink = sink
+
+    def check(self, action, risk=0.0, amount=None, flagged=False, actor=None):
+        """(verdict, reason) for a proposed action; verdict is ALLOW, REVIEW or DENY"""
+        code = self.codes.get(action, self.unknown_code)
+        index = code << FACT_BITS
+        if amount is not None and amount >= self.limits[code]:
+            index |= OVER_LIMIT
+        if flagged:
+            index |= FLAGGED
+        if risk >= self.escalation_threshold:
+            index |= RISKY
+        decision = self.table[index]
+        record = (time.time(), actor, action, amount, risk, decision[0], decision[1])
+        self.audit.append(record)
+        if self.sink is not None:
+            self.sink(record)
+        return decision
+
+    def summary(self):
+        """Audited decisions per verdict"""
+        counts = Counter(record[5] for record in self.audit)
+        return {verdict: counts.get(verdict, 0) for verdict in (ALLOW, REVIEW, DENY)}
+
+    def audit_rows(self, limit=10):
+        """Most recent audit records as table rows, newest first"""
+        rows = []
+        for at, actor, action, amount, risk, verdict, reason in islice(reversed(self.audit), limit):
+            rows.append({
+                "Time": time.strftime("%H:%M:%S", time.localtime(at)),
+                "Workflow": actor or "",
+                "Action": action,
+                "Amount": "" if amount is None else f"${amount:,.2f}",
+                "Risk": f"{risk:.2f}",
+                "Decision": verdict.title(),
+                "Reason": reason.replace("_", " ")
+            })
+        return rows
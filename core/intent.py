@@ -0,0 +1,195 @@
+"""On-box intent and sentiment analysis of a customer message for the Real-time Assistance tab.
+
+A message becomes two feature sets: hashed unigram and bigram indexes
+(shared tokenisation with the topic classifier) and a short dense vector
+of cues (negative and positive sentiment, exclamations, repeat contact,
+how long the problem has lasted, escalation words). Intents are
+one-vs-rest logistic regressions over both, trained once on the seed
+examples below; a message can carry several intents. Frustration,
+satisfaction and escalation risk are a fixed linear layer over the dense
+cues. Everything is a gather and a small matrix product, well under a
+millisecond per message.
+"""
+import re
+import zlib
+
+import numpy as np
+
+from .sentiment import ESCALATION_KEYWORDS, score_text
+from .topics import ngrams, tokens
+
+INTENTS = ("cancel", "refund", "transfer_complaint")
+INTENT_LABELS = {"cancel": "Cancellation", "refund": "Refund", "transfer_complaint": "Transfer complaint"}
+# Probability at which an intent counts as present
+INTENT_THRESHOLD = 0.5
+
+# Hashed n-gram space for the intent model
+INTENT_FEATURE_BITS = 12
+
+REPEAT_CONTACT = re.compile(r"\bagain\b|\bkeep \w+ing\b|every time|\b(\d+|several|multiple|many|few) times\b|"
+                            r"called (you )?(before|already)|\bstill\b", re.I)
+LONG_RUNNING = re.compile(r"for (weeks|months|days|ages)|\b(\d+|few|several|two|three) (weeks|months)\b", re.I)
+
+DENSE_FEATURES = ("negative", "positive", "exclamations", "repeat_contact", "long_running", "escalation_words")
+
+# Linear layer over DENSE_FEATURES: frustration (0-10), satisfaction (0-10), escalation logit
+SCORE_WEIGHTS = np.array([
+    [5.0, -3.0, 1.0, 2.0, 1.5, 1.5],
+    [-4.0, 4.0, -0.5, -1.0, -1.0, -1.0],
+    [3.0, -2.0, 0.5, 1.5, 1.0, 2.0]
+])
+SCORE_BIAS = np.array([2.0, 6.0, -2.5])
+
+# Escalation risk levels by probability
+RISK_LEVELS = ((0.85, "Critical"), (0.6, "High"), (0.3, "Medium"), (0.0, "Low"))
+
+# Seed messages and the intents they carry
+INTENT_EXAMPLES = [
+    ("I want to cancel my subscription", {"cancel"}),
+    ("please close my account and stop billing me", {"cancel"}),
+    ("how do I cancel my plan", {"cancel"}),
+    ("I'd like to end my contract today", {"cancel"}),
+    ("terminate my service effective immediately", {"cancel"}),
+    ("I've been trying to cancel for a month and it's still active", {"cancel"}),
+    ("why is it so hard to cancel my subscription", {"cancel"}),
+    ("I want my money back for last month", {"refund"}),
+    ("can I get a refund for the duplicate charge", {"refund"}),
+    ("please reimburse me for the overcharge", {"refund"}),
+    ("I need a refund for the past 3 months", {"refund"}),
+    ("credit my account for the outage", {"refund"}),
+    ("I keep getting transferred around and nobody helps", {"transfer_complaint"}),
+    ("you put me on hold and passed me to another department again", {"transfer_complaint"}),
+    ("every time I call I get bounced between agents", {"transfer_complaint"}),
+    ("I've been transferred five times already", {"transfer_complaint"}),
+    ("stop transferring me to different teams", {"transfer_complaint"}),
+    ("why do you keep passing me to different departments", {"transfer_complaint"}),
+    ("each agent sends me to someone else", {"transfer_complaint"}),
+    ("I want to cancel and get a refund for this month", {"cancel", "refund"}),
+    ("cancel my account, I was transferred three times and nobody could do it", {"cancel", "transfer_complaint"}),
+    ("I keep getting transferred and I just want my refund", {"refund", "transfer_complaint"}),
+    ("trying to cancel for weeks, keep getting transferred, and I want a refund", {"cancel", "refund",
+                                                                                   "transfer_complaint"}),
+    ("how do I update my address", set()),
+    ("my internet is slow in the evenings", set()),
+    ("what are your opening hours", set()),
+    ("thanks, that fixed it", set()),
+    ("can you upgrade my plan to premium", set()),
+    ("the app crashes when I log in", set())
+]
+
+# Suggested actions and response sentences per intent, in the order they are addressed
+INTENT_ACTIONS = {
+    "transfer_complaint": ("🔄 **Process:** Own the case end to end, no further transfers",
+                           "I'm sorry you've been passed around; I'll stay with you and handle this myself."),
+    "refund": ("💸 **Offer:** Refund the disputed charges",
+               "I'm processing your refund now, and you'll see the confirmation by email."),
+    "cancel": ("📞 **Process:** One-click cancellation, retention offer first",
+               "I can complete your cancellation right away, or first share an offer if you'd like to stay.")
+}
+
+
+def _hashed(text):
+    mask = (1 << INTENT_FEATURE_BITS) - 1
+    return np.fromiter((zlib.crc32(g.encode()) & mask for g in ngrams(tokens(text))), dtype=np.int64)
+
+
+def dense_features(text):
+    """DENSE_FEATURES vector for a message"""
+    score, _ = score_text(text)
+    lowered = text.lower()
+    return np.array([
+        max(0.0, -score),
+        max(0.0, score),
+        min(text.count("!"), 3) / 3,
+        1.0 if REPEAT_CONTACT.search(text) else 0.0,
+        1.0 if LONG_RUNNING.search(text) else 0.0,
+        min(sum(word in lowered for word in ESCALATION_KEYWORDS), 3) / 3
+    ])
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class IntentModel:
+    """One-vs-rest logistic regression over hashed n-grams plus the dense cues"""
+
+    def __init__(self, intents=INTENTS):
+        self.intents = tuple(intents)
+        self.hashed_weights = np.zeros((1 << INTENT_FEATURE_BITS, len(self.intents)))
+        self.dense_weights = np.zeros((len(DENSE_FEATURES), len(self.intents)))
+        self.bias = np.zeros(len(self.intents))
+
+    def fit(self, examples, iterations=400, learning_rate=0.5, l2=1e-3):
+        """Batch gradient descent on (text, set of intents) examples"""
+        hashed = np.zeros((len(examples), 1 << INTENT_FEATURE_BITS))
+        for row, (text, _) in enumerate(examples):
+            np.add.at(hashed[row], _hashed(text), 1.0)
+        features = np.hstack([hashed, np.array([dense_features(text) for text, _ in examples])])
+        targets = np.array([[intent in labels for intent in self.intents] for _, labels in examples], dtype=float)
+        weights, bias = np.zeros((features.shape[1], len(self.intents))), np.zeros(len(self.intents))
+        for _ in range(iterations):
+            error = _sigmoid(features @ weights + bias) - targets
+            weights -= learning_rate * (features.T @ error / len(examples) + l2 * weights)
+            bias -= learning_rate * error.mean(axis=0)
+        self.hashed_weights, self.dense_weights = weights[:-len(DENSE_FEATURES)], weights[-len(DENSE_FEATURES):]
+        self.bias = bias
+        return self
+
+    def probabilities(self, text, dense=None):
+        """Intent -> probability for a message"""
+        dense = dense_features(text) if dense is None else dense
+        logits = self.hashed_weights[_hashed(text)].sum(axis=0) + dense @ self.dense_weights + self.bias
+        return dict(zip(self.intents, _sigmoid(logits).tolist()))
+
+
+_default_model = None
+
+
+def default_model():
+    """IntentModel trained on INTENT_EXAMPLES, built once"""
+    global _default_model
+    if _default_model is None:
+        _default_model = IntentModel().fit(INTENT_EXAMPLES)
+    return _default_model
+
+
+def risk_level(risk):
+    return next(label for bound, label in RISK_LEVELS if risk >= bound)
+
+
+def suggested_response(intents, frustration):
+    """Response assembled from the templates of the detected intents"""
+    opening = ("I sincerely apologize for the frustrating experience." if frustration >= 6
+               else "Thanks for reaching out, I'm happy to help.")
+    body = [INTENT_ACTIONS[intent][1] for intent in INTENT_ACTIONS if intent in intents]
+    if not body:
+        body = ["Let me look into this for you right away."]
+    return " ".join([opening] + body + ["Is there anything else I can resolve for you today?"])
+
+
+def analyze_message(text, model=None):
+    """Frustration, satisfaction and escalation risk, intents, actions and a suggested response for a message"""
+    dense = dense_features(text)
+    frustration, satisfaction, escalation = SCORE_WEIGHTS @ dense + SCORE_BIAS
+    frustration = float(np.clip(frustration, 0, 10))
+    satisfaction = float(np.clip(satisfaction, 0, 10))
+    risk = float(_sigmoid(escalation))
+    probabilities = (model or default_model()).probabilities(text, dense)
+    intents = [intent for intent in INTENT_ACTIONS if probabilities[intent] >= INTENT_THRESHOLD]
+    actions = []
+    if frustration >= 6:
+        actions.append("🎯 **Immediate:** Acknowledge frustration")
+    actions += [INTENT_ACTIONS[intent][0] for intent in intents]
+    if risk >= 0.6:
+        actions.append("📞 **Follow-up:** Senior specialist call-back within 24 hours")
+    return {
+        "frustration": round(frustration, 1),
+        "satisfaction": round(satisfaction, 1),
+        "escalation_risk": round(risk, 2),
+        "risk_level": risk_level(risk),
+        "intent_probabilities": probabilities,
+        "intents": intents,
+        "actions": actions or ["✅ **Proceed:** Answer directly, no special handling needed"],
+        "response": suggested_response(intents, frustration)
+    }
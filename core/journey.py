@@ -0,0 +1,120 @@
+"""Cross-channel customer journey: an append-only, time-ordered event log per customer.
+
+Events live in a WITHOUT ROWID SQLite table clustered on (customer id,
+time, sequence), so a customer's timeline is one contiguous range scan of
+the primary-key B-tree. A secondary index on (case id, time, sequence)
+gives the same for everything filed under a case, across customers and
+channels. Events are never updated: a status change is a new event.
+Batched appends run as one transaction, which keeps ingestion from every
+channel in the tens of thousands of events per second.
+"""
+import itertools
+import sqlite3
+import threading
+import time
+
+CHANNELS = ("Voice", "Chat", "Email", "WhatsApp", "Video", "Social")
+CHANNEL_ICONS = {"Voice": "📞", "Chat": "💬", "Email": "📧", "WhatsApp": "🟢", "Video": "🎥", "Social": "🌐"}
+STATUSES = ("Active", "In Progress", "Pending", "Resolved")
+
+_channel_codes = {name: code for code, name in enumerate(CHANNELS)}
+_status_codes = {name: code for code, name in enumerate(STATUSES)}
+
+_COLUMNS = "customer_id, at, seq, channel, status, action, stage, case_id"
+
+
+def _row(event, seq):
+    channel, status = event["channel"], event.get("status", "Active")
+    if channel not in _channel_codes:
+        raise ValueError(f"unknown channel: {channel}")
+    if status not in _status_codes:
+        raise ValueError(f"unknown status: {status}")
+    return (event["customer_id"], float(event.get("at", time.time())), seq, _channel_codes[channel],
+            _status_codes[status], event.get("action", ""), event.get("stage", ""), event.get("case_id"))
+
+
+def _event(row):
+    customer_id, at, _, channel, status, action, stage, case_id = row
+    return {"customer_id": customer_id, "at": at, "channel": CHANNELS[channel], "status": STATUSES[status],
+            "action": action, "stage": stage, "case_id": case_id}
+
+
+class JourneyLog:
+    """Customer journey events in SQLite, clustered by customer and time, indexed by case"""
+
+    def __init__(self, path=":memory:"):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS journey_events (customer_id TEXT NOT NULL, "
+                            "at REAL NOT NULL, seq INTEGER NOT NULL, channel INTEGER NOT NULL, "
+                            "status INTEGER NOT NULL, action TEXT NOT NULL, stage TEXT NOT NULL, case_id TEXT, "
+                            "PRIMARY KEY (customer_id, at, seq)) WITHOUT ROWID")
+            self.db.execute("CREATE INDEX IF NOT EXISTS journey_events_case ON journey_events (case_id, at, seq) "
+                            "WHERE case_id IS NOT NULL")
+        last = self.db.execute("SELECT MAX(seq) FROM journey_events").fetchone()[0]
+        # Breaks ties between events with the same timestamp, in append order
+        self._seq = itertools.count((last or 0) + 1)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM journey_events").fetchone()[0]
+
+    def append(self, customer_id, channel, action="", at=None, status="Active", stage="", case_id=None):
+        """Record one event; `at` defaults to now"""
+        self.append_many([{"customer_id": customer_id, "channel": channel, "action": action,
+                           "at": time.time() if at is None else at, "status": status, "stage": stage,
+                           "case_id": case_id}])
+
+    def append_many(self, events):
+        """Record event dicts (customer_id, channel, at, action, status, stage, case_id) in one transaction"""
+        with self.lock, self.db:
+            rows = [_row(event, next(self._seq)) for event in events]
+            self.db.executemany(f"INSERT INTO journey_events ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def timeline(self, customer_id, since=None, until=None, limit=None):
+        """A customer's events in time order, optionally within [since, until] and capped to the latest `limit`"""
+        bounds = (customer_id, float("-inf") if since is None else since, float("inf") if until is None else until)
+        if limit is None:
+            rows = self.db.execute(f"SELECT {_COLUMNS} FROM journey_events WHERE customer_id = ? AND at BETWEEN ? "
+                                   "AND ? ORDER BY at, seq", bounds).fetchall()
+        else:
+            rows = self.db.execute(f"SELECT {_COLUMNS} FROM journey_events WHERE customer_id = ? AND at BETWEEN ? "
+                                   "AND ? ORDER BY at DESC, seq DESC LIMIT ?", bounds + (limit,)).fetchall()[::-1]
+        return [_event(row) for row in rows]
+
+    def case_timeline(self, case_id):
+        """Every event filed under a case, in time order"""
+        rows = self.db.execute(f"SELECT {_COLUMNS} FROM journey_events WHERE case_id = ? ORDER BY at, seq",
+                               (case_id,)).fetchall()
+        return [_event(row) for row in rows]
+
+    def close(self):
+        self.db.close()
+
+
+def _in_order(values):
+    seen = []
+    for value in values:
+        if value and value not in seen:
+            seen.append(value)
+    return seen
+
+
+def journey_summary(events, name=None):
+    """Unified-desktop summary of a timeline: stages and channels in order, channel switches, open items.
+
+    An item is a case, or an action for events without a case; it is open
+    unless its latest event is "Resolved".
+    """
+    channels = [event["channel"] for event in events]
+    latest = {event["case_id"] or event["action"]: event["status"] for event in events}
+    return {
+        "Customer": name or (events[0]["customer_id"] if events else "Unknown"),
+        "Journey Stage": " → ".join(_in_order(event["stage"] for event in events)) or "New",
+        "Channels Used": _in_order(channels),
+        "Channel Switches": sum(a != b for a, b in zip(channels, channels[1:])),
+        "Open Items": sum(status != "Resolved" for status in latest.values())
+    }
@@ -0,0 +1,168 @@
+"""Daily agentic-AI KPIs from workflow outcomes, stored as memory-mapped columns.
+
+Each day is one row of raw outcome counters (interactions, resolved,
+escalated, failed, summed sentiment), kept in one flat binary file per
+column and sorted by day. A date-range read binary-searches the day
+column and slices the same rows from the other columns, so only the pages
+holding those days are touched: showing 90 days costs the same with one
+year of history or twenty. The dashboard KPIs are derived from the
+counters at read time, so a day can be topped up as outcomes arrive.
+"""
+import os
+from datetime import date
+
+import numpy as np
+
+from .workflows import FAILED, RESOLVED, RUNNING, WAITING
+
+DEFAULT_KPI_DIRECTORY = "kpi_store"
+
+# Raw daily counters, stored one file per column
+COUNTERS = ("interactions", "resolved", "escalated", "failed", "sentiment_sum")
+_DTYPES = {"day": np.int32, "interactions": np.int64, "resolved": np.int64, "escalated": np.int64,
+           "failed": np.int64, "sentiment_sum": np.float64}
+
+KPIS = ("Autonomous_Resolution", "Productivity_Gain", "Customer_Satisfaction", "Cost_Reduction")
+# Cost of an AI-resolved interaction relative to a human-handled one
+AI_COST_RATIO = 0.1
+# Cap on the automated share used for productivity, so the gain stays finite
+MAX_AUTOMATED_SHARE = 0.95
+
+
+def _day_number(day):
+    return int(np.datetime64(day, "D").astype(np.int64))
+
+
+def outcome_counts(runtime, name=None):
+    """Daily counters from a WorkflowRuntime's instance records"""
+    names = [name] if name is not None else list(runtime.instances)
+    records = [runtime.records(n) for n in names]
+    status = np.concatenate([r["status"] for r in records]) if records else np.zeros(0, np.uint8)
+    sentiment = np.concatenate([r["sentiment"] for r in records]) if records else np.zeros(0, np.float32)
+    finished = status != RUNNING
+    return {
+        "interactions": int(finished.sum()),
+        "resolved": int((status == RESOLVED).sum()),
+        "escalated": int((status == WAITING).sum()),
+        "failed": int((status == FAILED).sum()),
+        "sentiment_sum": float(sentiment[finished].sum())
+    }
+
+
+def derive_kpis(columns):
+    """Dashboard KPI columns from raw counter columns"""
+    interactions = np.maximum(columns["interactions"], 1)
+    share = columns["resolved"] / interactions
+    capped = np.minimum(share, MAX_AUTOMATED_SHARE)
+    return {
+        "Autonomous_Resolution": share * 100,
+        "Productivity_Gain": (1 / (1 - capped) - 1) * 100,
+        "Customer_Satisfaction": np.clip(5.5 + 4.5 * columns["sentiment_sum"] / interactions, 1, 10),
+        "Cost_Reduction": share * (1 - AI_COST_RATIO) * 100
+    }
+
+
+class KPIStore:
+    """Day-sorted counter columns in a directory, read by date range through memory maps"""
+
+    def __init__(self, directory=DEFAULT_KPI_DIRECTORY):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        for column in _DTYPES:
+            open(self._path(column), "ab").close()
+
+    def _path(self, column):
+        return os.path.join(self.directory, f"{column}.bin")
+
+    def _column(self, column, mode="r"):
+        size = os.path.getsize(self._path(column)) // np.dtype(_DTYPES[column]).itemsize
+        if not size:
+            return np.zeros(0, dtype=_DTYPES[column])
+        return np.memmap(self._path(column), dtype=_DTYPES[column], mode=mode, shape=(size,))
+
+    def __len__(self):
+        return len(self._column("day"))
+
+    def days(self):
+        """(first, last) stored day as dates, or None when empty"""
+        days = self._column("day")
+        if not len(days):
+            return None
+        return tuple(np.datetime64(int(d), "D").astype(date) for d in (days[0], days[-1]))
+
+    def add(self, day, **counters):
+        """Add to a day's counters, creating the day if needed"""
+        self._write(day, counters, accumulate=True)
+
+    def put(self, day, **counters):
+        """Replace a day's counters, e.g. with a fresh snapshot of today's outcomes"""
+        self._write(day, counters, accumulate=False)
+
+    def add_many(self, days, **columns):
+        """Append whole columns for days after the last stored day, in ascending order"""
+        numbers = np.array([_day_number(d) for d in days], dtype=np.int32)
+        stored = self._column("day")
+        if len(numbers) and (np.any(np.diff(numbers) <= 0) or (len(stored) and numbers[0] <= stored[-1])):
+            raise ValueError("add_many needs ascending days after the last stored day")
+        self._append(numbers, {c: np.asarray(columns.get(c, np.zeros(len(numbers))), dtype=_DTYPES[c])
+                               for c in COUNTERS})
+
+    def _write(self, day, counters, accumulate):
+        unknown = set(counters) - set(COUNTERS)
+        if unknown:
+            raise ValueError(f"unknown counters: {sorted(unknown)}")
+        number = _day_number(day)
+        days = self._column("day")
+        row = int(np.searchsorted(days, number))
+        if row < len(days) and days[row] == number:
+            for column, value in counters.items():
+                stored = self._column(column, mode="r+")
+                stored[row] = stored[row] + value if accumulate else value
+                stored.flush()
+        elif row == len(days):
+            self._append(np.array([number], dtype=np.int32),
+                         {c: np.array([counters.get(c, 0)], dtype=_DTYPES[c]) for c in COUNTERS})
+        else:
+            self._insert(row, number, counters)
+
+    def _append(self, numbers, columns):
+        # Counters first, day last: rows past the end of the day column are leftovers of an
+        # interrupted append, so they are cut off before writing
+        size = len(self._column("day"))
+        for column, values in columns.items():
+            os.truncate(self._path(column), size * np.dtype(_DTYPES[column]).itemsize)
+            with open(self._path(column), "ab") as f:
+                f.write(values.tobytes())
+        with open(self._path("day"), "ab") as f:
+            f.write(numbers.tobytes())
+
+    def _insert(self, row, number, counters):
+        """Backfill a day before the last stored one by rewriting every column"""
+        # Same order as _append: every rewritten column is on disk before any file is
+        # swapped in, and the day column is swapped last
+        size = len(self._column("day"))
+        columns = COUNTERS + ("day",)
+        for column in columns:
+            values = np.array(self._column(column)[:size])
+            value = number if column == "day" else counters.get(column, 0)
+            np.insert(values, row, value).astype(_DTYPES[column]).tofile(self._path(column) + ".tmp")
+        for column in columns:
+            os.replace(self._path(column) + ".tmp", self._path(column))
+
+    def read(self, start, end):
+        """Counters and KPIs for stored days in [start, end], with a "Date" column"""
+        days = self._column("day")
+        lo = int(np.searchsorted(days, _day_number(start), side="left"))
+        hi = int(np.searchsorted(days, _day_number(end), side="right"))
+        columns = {c: np.array(self._column(c)[lo:hi]) for c in COUNTERS}
+        result = {"Date": np.array(days[lo:hi]).astype("datetime64[D]")}
+        result.update(columns)
+        result.update(derive_kpis(columns))
+        return result
+
+    def last(self, days=90):
+        """The most recent `days` stored days"""
+        span = self.days()
+        if span is None:
+            return self.read(date.today(), date.today())
+        return self.read(np.datetime64(span[1], "D") - (days - 1), span[1])
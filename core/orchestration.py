@@ -0,0 +1,168 @@
+"""Routing of interactions onto AI-agent, human-agent and back-office queues, with a day replay.
+
+Each route keeps one priority heap per skill, ordered by interaction
+priority, then customer tier, then arrival, so enqueue and dequeue are
+O(log n). A free agent takes the best head among the skills it serves.
+simulate_day() replays a day of arrivals through the router as a
+discrete-event simulation, optionally paced against the wall clock, and
+records queue lengths and active sessions for the dashboard.
+"""
+import heapq
+import itertools
+import random
+import time
+
+import numpy as np
+
+ROUTES = ("AI Agent", "Human Agent", "Back Office")
+# Served first to last within the same priority
+CUSTOMER_TIERS = ("Premium", "Standard", "Basic")
+
+# Where each skill goes first; AI sessions hand off to humans on the same skill
+SKILL_ROUTES = {
+    "billing": "AI Agent", "technical": "AI Agent", "account": "AI Agent",
+    "complaint": "Human Agent", "retention": "Human Agent",
+    "returns": "Back Office", "claims": "Back Office"
+}
+# Escalation risk at which an interaction for the AI agent goes straight to a human
+HUMAN_RISK = 0.7
+
+# Mean handle seconds per route and the share of AI sessions handed to a human
+HANDLE_SECONDS = {"AI Agent": 150, "Human Agent": 420, "Back Office": 600}
+HANDOFF_RATE = 0.12
+
+# Concurrent sessions per route as [(count, skills)]
+DEFAULT_POOLS = {
+    "AI Agent": [(300, {"billing", "technical", "account"})],
+    "Human Agent": [(30, {"complaint", "retention", "billing"}), (28, {"technical", "account", "billing"})],
+    "Back Office": [(85, {"returns", "claims"})]
+}
+
+# Dashboard statuses for finished interactions
+STATUSES = ("Automatic Resolution", "AI-Assisted", "Human Takeover", "Back-office")
+SNAPSHOT_SECONDS = 900
+DAY_SECONDS = 86400
+
+
+class Router:
+    """Priority queues per (route, skill)"""
+
+    def __init__(self):
+        self.queues = {}
+        self.order = itertools.count()
+        self.lengths = dict.fromkeys(ROUTES, 0)
+
+    def route(self, interaction):
+        route = SKILL_ROUTES.get(interaction["skill"], "Human Agent")
+        if route == "AI Agent" and (interaction.get("handoff") or interaction.get("risk", 0.0) >= HUMAN_RISK):
+            return "Human Agent"
+        return route
+
+    def enqueue(self, interaction, now):
+        """Queue an interaction on its route; returns the route"""
+        route = self.route(interaction)
+        tier = CUSTOMER_TIERS.index(interaction.get("tier", "Standard"))
+        entry = (interaction.get("priority", 3), tier, now, next(self.order), interaction)
+        heapq.heappush(self.queues.setdefault((route, interaction["skill"]), []), entry)
+        self.lengths[route] += 1
+        return route
+
+    def dequeue(self, route, skills):
+        """Best waiting (arrived, interaction) among skills on a route, or None"""
+        best = None
+        for skill in skills:
+            queue = self.queues.get((route, skill))
+            if queue and (best is None or queue[0][:4] < best[0][:4]):
+                best = queue
+        if best is None:
+            return None
+        _, _, arrived, _, interaction = heapq.heappop(best)
+        self.lengths[route] -= 1
+        return arrived, interaction
+
+
+def simulate_day(traffic, pools=None, handle_seconds=None, handoff_rate=HANDOFF_RATE,
+                 snapshot_seconds=SNAPSHOT_SECONDS, speedup=None, seed=None, clock=time.monotonic,
+                 sleep=time.sleep):
+    """Replay (arrival seconds, interaction) traffic through a Router and the agent pools.
+
+    With speedup set, simulated time is paced to run that many times faster
+    than the wall clock; otherwise events are processed as fast as possible.
+    Returns per-route waits, finished counts per dashboard status, and
+    snapshots of queue length, active sessions, completions and statuses.
+    """
+    pools = pools or DEFAULT_POOLS
+    handle_seconds = handle_seconds or HANDLE_SECONDS
+    rng = random.Random(seed)
+    router = Router()
+    free = {route: [count for count, _ in groups] for route, groups in pools.items()}
+    active = dict.fromkeys(ROUTES, 0)
+    completed = dict.fromkeys(ROUTES, 0)
+    waits = {route: [] for route in ROUTES}
+    status = dict.fromkeys(STATUSES, 0)
+    snapshots = []
+
+    events, order = [], itertools.count()
+    for at, interaction in traffic:
+        heapq.heappush(events, (at, next(order), "arrival", interaction))
+    for at in np.arange(0, DAY_SECONDS + 1, snapshot_seconds).tolist():
+        heapq.heappush(events, (at, next(order), "snapshot", None))
+
+    def start(now, route, group, arrived, interaction):
+        free[route][group] -= 1
+        active[route] += 1
+        waits[route].append(now - arrived)
+        done = now + rng.expovariate(1 / handle_seconds[route])
+        heapq.heappush(events, (done, next(order), "done", (route, group, interaction)))
+
+    started_wall = clock()
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if speedup:
+            lag = started_wall + now / speedup - clock()
+            if lag > 0:
+                sleep(lag)
+        if kind == "arrival":
+            route = router.enqueue(payload, now)
+            for group, (_, skills) in enumerate(pools[route]):
+                if free[route][group] and payload["skill"] in skills:
+                    arrived, interaction = router.dequeue(route, skills)
+                    start(now, route, group, arrived, interaction)
+                    break
+        elif kind == "done":
+            route, group, interaction = payload
+            active[route] -= 1
+            completed[route] += 1
+            free[route][group] += 1
+            if route == "AI Agent" and rng.random() < handoff_rate:
+                heapq.heappush(events, (now, next(order), "arrival",
+                                        dict(interaction, handoff=True, priority=interaction.get("priority", 3) - 1)))
+            elif route == "AI Agent":
+                status["Automatic Resolution"] += 1
+            elif route == "Back Office":
+                status["Back-office"] += 1
+            else:
+                status["Human Takeover" if interaction.get("handoff") else "AI-Assisted"] += 1
+            waiting = router.dequeue(route, pools[route][group][1])
+            if waiting is not None:
+                start(now, route, group, *waiting)
+        else:
+            snapshots.append({"time": now, "queue": dict(router.lengths), "active": dict(active),
+                              "completed": dict(completed), "status": dict(status)})
+
+    summary = {}
+    for route in ROUTES:
+        wait = np.asarray(waits[route])
+        summary[route] = {
+            "handled": int(wait.size),
+            "mean_wait": float(wait.mean()) if wait.size else 0.0,
+            "p90_wait": float(np.percentile(wait, 90)) if wait.size else 0.0,
+            "max_queue": max((s["queue"][route] for s in snapshots), default=0)
+        }
+    return {"routes": summary, "status": status, "snapshots": snapshots, "wall_seconds": clock() - started_wall}
+
+
+def state_at(result, seconds):
+    """The last snapshot taken at or before a time of day"""
+    times = [s["time"] for s in result["snapshots"]]
+    return result["snapshots"][max(0, np.searchsorted(times, seconds, side="right") - 1)]
@@ -0,0 +1,167 @@
+import re
+
+# PII pattern library: label -> (regex, confidence, risk level, category, tag)
+PII_PATTERNS = {
+    "Email Addresses": (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', 0.99, "High", "contact_information", "EMAIL_ADDRESS"),
+    "SSN": (r'\b\d{3}-\d{2}-\d{4}\b', 0.99, "Critical", "government_id", "SSN"),
+    "Credit Cards": (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b|(?<=ending in )\d{4}\b', 0.95, "High", "financial_information", "CREDIT_CARD"),
+    "Phone Numbers": (r'\(?\b\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', 0.97, "Medium", "contact_information", "PHONE_NUMBER"),
+    "Account Numbers": (r'\b(?:AC|ACC)-[\d-]+\d\b', 0.93, "High", "financial_information", "ACCOUNT_NUMBER"),
+    "Employee IDs": (r'\bEMP-\d+\b', 0.96, "Medium", "personal_identifier", "EMPLOYEE_ID"),
+    "Ticket Numbers": (r'\bTK-\d+\b', 0.91, "Low", "online_identifier", "TICKET_NUMBER"),
+    "Dates": (r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+              r' \d{1,2}, \d{4}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b', 0.94, "High", "personal_identifier", "DATE"),
+    "Addresses": (r'\b\d{1,5} [A-Z][a-z]+(?: [A-Z][a-z]+)* (?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b'
+                  r'(?:, [A-Z][a-z]+)?(?:, [A-Z]{2} \d{5})?', 0.92, "Medium", "location_data", "ADDRESS"),
+    "Currency": (r'\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?', 0.88, "Low", "financial_information", "CURRENCY"),
+    "IP Addresses": (r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', 0.87, "Medium", "online_identifier", "IP_ADDRESS"),
+}
+
+# Cues that introduce a person's name in conversation
+NAME_CUES = re.compile(
+    r"(?:(?i:my name is|this is)|I'm|I am|(?:Mr|Mrs|Ms|Dr)\.?|wife,|husband,|speaking with)\s+"
+    r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)"
+)
+NAME_STOPWORDS = {"Sarah", "Agent", "Customer", "Thank", "Sure", "Perfect", "Hi", "Yes", "No"}
+
+# Threshold adjustments for the detection modes offered in the UI
+DETECTION_MODES = {"High Precision": 0.05, "Balanced": 0.0, "High Recall": -0.1}
+
+COMPILED_PATTERNS = {label: re.compile(spec[0]) for label, spec in PII_PATTERNS.items()}
+
+
+def detect_names(text):
+    """Find person names introduced by conversational cues"""
+    entities = []
+    for match in NAME_CUES.finditer(text):
+        name = match.group(1)
+        first = name.split()[0]
+        if first in NAME_STOPWORDS and " " not in name:
+            continue
+        entities.append({
+            "type": "Names",
+            "value": name,
+            "start_pos": match.start(1),
+            "end_pos": match.end(1),
+            "confidence": 0.98 if " " in name else 0.9,
+            "risk_level": "High",
+            "category": "personal_identifier",
+            "tag": "PERSON_NAME"
+        })
+    return entities
+
+
+def detect_pii(text, pii_types=None, confidence_threshold=0.0, detection_mode="Balanced"):
+    """Detect PII entities in text, returning non-overlapping matches ordered by position"""
+    threshold = confidence_threshold + DETECTION_MODES.get(detection_mode, 0.0)
+    candidates = []
+
+    if pii_types is None or "Names" in pii_types:
+        candidates.extend(detect_names(text))
+
+    for label, pattern in COMPILED_PATTERNS.items():
+        if pii_types is not None and label not in pii_types:
+            continue
+        _, confidence, risk_level, category, tag = PII_PATTERNS[label]
+        for match in pattern.finditer(text):
+            candidates.append({
+                "type": label,
+                "value": match.group(0),
+                "start_pos": match.start(),
+                "end_pos": match.end(),
+                "confidence": confidence,
+                "risk_level": risk_level,
+                "category": category,
+                "tag": tag
+            })
+
+    # Resolve overlaps: earliest start wins, longer and more confident matches break ties
+    candidates.sort(key=lambda e: (e["start_pos"], -(e["end_pos"] - e["start_pos"]), -e["confidence"]))
+    entities = []
+    last_end = -1
+    for entity in candidates:
+        if entity["confidence"] < threshold or entity["start_pos"] < last_end:
+            continue
+        entities.append(entity)
+        last_end = entity["end_pos"]
+    return entities
+
+
+def mask_value(entity, masking_method):
+    """Mask a single entity value with the chosen method"""
+    value = entity["value"]
+    if masking_method == "Replacement Tags":
+        return f"[{entity['tag']}]"
+    if masking_method == "Full Redaction":
+        return "[REDACTED]"
+    if masking_method == "Asterisks":
+        return re.sub(r'[A-Za-z0-9]', '*', value)
+    # Partial masking keeps the trailing characters and any separators
+    if entity["tag"] == "EMAIL_ADDRESS":
+        local, _, domain = value.partition("@")
+        return f"{local[:1]}***@{domain}"
+    if entity["tag"] == "PERSON_NAME":
+        parts = value.split()
+        return " ".join(parts[:-1] + [parts[-1][:1] + "***"]) if len(parts) > 1 else value[:1] + "***"
+    keep = 4
+    alnum_seen = 0
+    masked = []
+    for char in reversed(value):
+        if char.isalnum():
+            alnum_seen += 1
+            masked.append(char if alnum_seen <= keep else "*")
+        else:
+            masked.append(char)
+    return "".join(reversed(masked))
+
+
+def mask_text(text, entities, masking_method="Replacement Tags"):
+    """Replace detected entities in text using the chosen masking method"""
+    pieces = []
+    cursor = 0
+    for entity in entities:
+        pieces.append(text[cursor:entity["start_pos"]])
+        pieces.append(mask_value(entity, masking_method))
+        cursor = entity["end_pos"]
+    pieces.append(text[cursor:])
+    return "".join(pieces)
+
+
+def summarize_detections(entities):
+    """Aggregate entities per PII type for the detection results table"""
+    summary = {}
+    for entity in entities:
+        row = summary.setdefault(entity["type"], {
+            "PII Type": entity["type"],
+            "Count": 0,
+            "Confidence": 0.0,
+            "Status": "Masked",
+            "Risk Level": entity["risk_level"]
+        })
+        row["Count"] += 1
+        row["Confidence"] = max(row["Confidence"], entity["confidence"])
+    return list(summary.values())
+
+
+def analyze_text(text, pii_types=None, masking_method="Replacement Tags", confidence_threshold=0.0,
+                 detection_mode="Balanced"):
+    """Run detection and masking, returning a result in the documented API response shape"""
+    entities = detect_pii(text, pii_types, confidence_threshold, detection_mode)
+    by_risk = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+    by_category = {}
+    for entity in entities:
+        by_risk[entity["risk_level"].lower()] += 1
+        by_category[entity["category"]] = by_category.get(entity["category"], 0) + 1
+
+    return {
+        "detected_pii": [
+            {key: entity[key] for key in ("type", "value", "start_pos", "end_pos", "confidence", "risk_level", "category")}
+            for entity in entities
+        ],
+        "protected_text": mask_text(text, entities, masking_method),
+        "statistics": {
+            "total_entities": len(entities),
+            "by_risk_level": by_risk,
+            "by_category": by_category
+        }
+    }
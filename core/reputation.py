@@ -0,0 +1,265 @@
+"""Device fingerprint and IP reputation lookups for the authentication checks.
+
+- DeviceRegistry keeps one 64-bit hash per (customer, device fingerprint)
+  pair in a set, so a known-device check is a single hash probe.
+- BloomFilter holds large single-address lists (bad IPs, VPN exits) in a
+  fixed word array; lookups can return rare false positives, never false
+  negatives.
+- PrefixTable answers longest-prefix CIDR matches. Nested prefixes are
+  flattened at build time into sorted disjoint ranges (the leaves of the
+  radix tree), so a lookup is one bisect over plain ints.
+
+ReputationCache loads all of this from a text file and swaps in freshly
+built tables on reload, so lookups never see a half-built structure.
+"""
+import asyncio
+import hashlib
+import ipaddress
+import logging
+import os
+import random
+import socket
+from array import array
+from bisect import bisect_right
+
+log = logging.getLogger(__name__)
+
+# About 1% false positives at 12 bits per listed address
+BLOOM_BITS_PER_VALUE = 12
+PATTERN_BITS = 3
+DEFAULT_RELOAD_SECONDS = 300
+
+# Reputation categories, most severe first
+CATEGORIES = ("bad", "tor", "vpn", "hosting")
+
+_MASK64 = (1 << 64) - 1
+_HASH_A = 0x9E3779B97F4A7C15
+
+
+def _bit_patterns(count=4096, bits=PATTERN_BITS, seed=0x5EED):
+    rng = random.Random(seed)
+    return [sum(1 << bit for bit in rng.sample(range(64), bits)) for _ in range(count)]
+
+
+_PATTERNS = _bit_patterns()
+
+
+def ip_to_int(ip):
+    """(version, integer) for an IPv4/IPv6 address string or int"""
+    if isinstance(ip, int):
+        return (4 if ip <= 0xFFFFFFFF else 6), ip
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except OSError:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+
+
+class BloomFilter:
+    """Blocked Bloom filter over integers.
+
+    Each value maps to one 64-bit word and sets a mask of up to
+    2 * PATTERN_BITS bits within it, taken from two precomputed pattern
+    tables. A lookup is one multiply, two table reads and one word read.
+    """
+
+    def __init__(self, capacity, bits_per_value=BLOOM_BITS_PER_VALUE):
+        self.words = array("Q", bytes(8 * max(1, capacity * bits_per_value // 64)))
+        self._size = len(self.words)
+        self.count = 0
+
+    def _slot(self, value):
+        h = ((value ^ (value >> 64)) * _HASH_A) & _MASK64
+        return h % self._size, _PATTERNS[(h >> 40) & 0xFFF] | _PATTERNS[(h >> 52) & 0xFFF]
+
+    def add(self, value):
+        word, mask = self._slot(value)
+        self.words[word] |= mask
+        self.count += 1
+
+    def __contains__(self, value):
+        # _slot() inlined: this is the per-lookup hot path
+        h = ((value ^ (value >> 64)) * _HASH_A) & _MASK64
+        mask = _PATTERNS[(h >> 40) & 0xFFF] | _PATTERNS[(h >> 52) & 0xFFF]
+        return self.words[h % self._size] & mask == mask
+
+
+class PrefixTable:
+    """Longest-prefix match over CIDR blocks, flattened to disjoint sorted ranges"""
+
+    def __init__(self, entries=()):
+        """entries: iterable of (cidr, value)"""
+        blocks = {4: [], 6: []}
+        for cidr, value in entries:
+            network = ipaddress.ip_network(cidr, strict=False)
+            start = int(network.network_address)
+            blocks[network.version].append((start, start + network.num_addresses, value))
+        self.tables = {version: self._flatten(items) for version, items in blocks.items()}
+        self.size = sum(len(items) for items in blocks.values())
+
+    @staticmethod
+    def _flatten(blocks):
+        """Disjoint (starts, ends, values) where each range carries its most specific block"""
+        # Wider blocks first at equal starts so nested blocks sit above them on the stack
+        blocks.sort(key=lambda b: (b[0], b[0] - b[1]))
+        starts, ends, values = [], [], []
+
+        def emit(start, end, value):
+            if start >= end:
+                return
+            if starts and ends[-1] == start and values[-1] == value:
+                ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+                values.append(value)
+
+        stack, position = [], 0
+        for start, end, value in blocks:
+            while stack and stack[-1][0] <= start:
+                top_end, top_value = stack.pop()
+                emit(position, top_end, top_value)
+                position = max(position, top_end)
+            if stack:
+                emit(position, start, stack[-1][1])
+            stack.append((end, value))
+            position = start
+        while stack:
+            top_end, top_value = stack.pop()
+            emit(position, top_end, top_value)
+            position = max(position, top_end)
+        return starts, ends, values
+
+    def lookup(self, ip):
+        """Value of the most specific block containing ip, or None"""
+        return self.find(*ip_to_int(ip))
+
+    def find(self, version, value):
+        starts, ends, values = self.tables[version]
+        i = bisect_right(starts, value) - 1
+        if i >= 0 and value < ends[i]:
+            return values[i]
+        return None
+
+
+def _pair_hash(customer_id, fingerprint):
+    # Built-in hashing is salted per process, which is fine: the registry is
+    # rebuilt from its source file on every start and never persisted
+    return hash((customer_id, fingerprint))
+
+
+def device_fingerprint(attributes):
+    """Stable fingerprint for a dict of device attributes (user agent, screen, timezone, ...)"""
+    canonical = "\x1f".join(f"{key}={attributes[key]}" for key in sorted(attributes))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class DeviceRegistry:
+    """Known devices per customer as a set of 64-bit pair hashes"""
+
+    def __init__(self, pairs=()):
+        self._known = {_pair_hash(customer_id, fingerprint) for customer_id, fingerprint in pairs}
+
+    def __len__(self):
+        return len(self._known)
+
+    def add(self, customer_id, fingerprint):
+        self._known.add(_pair_hash(customer_id, fingerprint))
+
+    def remove(self, customer_id, fingerprint):
+        self._known.discard(_pair_hash(customer_id, fingerprint))
+
+    def known(self, customer_id, fingerprint):
+        return _pair_hash(customer_id, fingerprint) in self._known
+
+    @classmethod
+    def load(cls, path):
+        """Registry from 'customer_id,fingerprint' lines"""
+        with open(path) as f:
+            return cls(tuple(line.strip().split(",", 1)) for line in f
+                       if line.strip() and not line.startswith("#"))
+
+
+def parse_reputation_lines(lines):
+    """Split 'address-or-cidr,category[,location]' lines into single addresses and CIDR blocks.
+
+    Returns ({category: [int addresses]}, [(cidr, (category, location))]).
+    """
+    addresses, blocks = {}, []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [part.strip() for part in line.split(",", 2)]
+        target, category = parts[0], parts[1] if len(parts) > 1 else "bad"
+        location = parts[2] if len(parts) > 2 else None
+        if category not in CATEGORIES and category != "geo":
+            raise ValueError(f"unknown reputation category {category!r} in line {line!r}")
+        if "/" in target or category == "geo":
+            blocks.append((target, (category, location)))
+        else:
+            addresses.setdefault(category, []).append(ip_to_int(target)[1])
+    return addresses, blocks
+
+
+class ReputationCache:
+    """IP reputation and location lookups, rebuilt from a file on reload"""
+
+    def __init__(self, lines=(), path=None, bits_per_value=BLOOM_BITS_PER_VALUE):
+        self.path = path
+        self.bits_per_value = bits_per_value
+        self._mtime = None
+        if path:
+            self.reload(force=True)
+        else:
+            self._build(lines)
+
+    def _build(self, lines):
+        addresses, blocks = parse_reputation_lines(lines)
+        filters = {}
+        for category, values in addresses.items():
+            bloom = BloomFilter(len(values), self.bits_per_value)
+            for value in values:
+                bloom.add(value)
+            filters[category] = bloom
+        reputation = PrefixTable((cidr, value[0]) for cidr, value in blocks if value[0] != "geo")
+        locations = PrefixTable((cidr, value[1]) for cidr, value in blocks if value[0] == "geo")
+        # One attribute swap publishes the new tables to concurrent readers
+        self._tables = (filters, reputation, locations)
+
+    def reload(self, force=False):
+        """Rebuild from the file if it changed since the last load; returns True when reloaded"""
+        mtime = os.stat(self.path).st_mtime_ns
+        if not force and mtime == self._mtime:
+            return False
+        with open(self.path) as f:
+            self._build(f.readlines())
+        self._mtime = mtime
+        return True
+
+    async def auto_reload(self, interval=DEFAULT_RELOAD_SECONDS):
+        """Reload periodically from the event loop; run as a background task.
+
+        A missing or malformed file is logged and skipped: lookups keep using
+        the current tables and the next interval tries again.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception:
+                log.exception("reputation reload from %s failed; keeping current tables", self.path)
+
+    def categories(self, ip):
+        """Reputation categories matching ip, most severe first"""
+        filters, reputation, _ = self._tables
+        version, value = ip_to_int(ip)
+        found = [category for category, bloom in filters.items() if value in bloom]
+        block = reputation.find(version, value)
+        if block and block not in found:
+            found.append(block)
+        if len(found) > 1:
+            found.sort(key=CATEGORIES.index)
+        return found
+
+    def location(self, ip):
+        return self._tables[2].lookup(ip)
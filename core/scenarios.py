@@ -0,0 +1,125 @@
+"""Workforce scenario planning over a grid of what-if combinations.
+
+A scenario is one combination of volume change, skill efficiency,
+shrinkage, handle time and service-level target applied to a forecast
+day. The whole grid is evaluated in one batch against the Erlang C
+staffing model. Shrinkage only converts agents on the phones into
+rostered headcount, and efficiency only rescales handle time, so the
+Erlang solve runs once per distinct (volume change, effective handle
+time, target) triple and results are scattered back to every scenario.
+"""
+import numpy as np
+
+from .staffing import SHIFT_HOURS, TARGET_SECONDS, required_agents
+
+SCENARIO_AXES = ("volume_change", "skill_efficiency", "shrinkage", "aht", "target_level")
+
+# Default sweep: volume change (%), skill efficiency (%), shrinkage, AHT (s), service-level target
+DEFAULT_GRID = {
+    "volume_change": np.arange(-50, 101, 10),
+    "skill_efficiency": np.arange(80, 151, 10),
+    "shrinkage": np.array([0.2, 0.25, 0.3, 0.35, 0.4]),
+    "aht": np.arange(180, 481, 60),
+    "target_level": np.array([0.7, 0.8, 0.9, 0.95])
+}
+
+# Fully loaded cost of one rostered agent for a week of shifts
+WEEKLY_COST_PER_AGENT = 1500
+
+
+def scenario_grid(**axes):
+    """Every combination of the given axes (defaults from DEFAULT_GRID) as flat, aligned arrays"""
+    values = [np.atleast_1d(np.asarray(axes.get(name, DEFAULT_GRID[name]), dtype=np.float64))
+              for name in SCENARIO_AXES]
+    unknown = set(axes) - set(SCENARIO_AXES)
+    if unknown:
+        raise ValueError(f"unknown scenario axes: {sorted(unknown)}")
+    mesh = np.meshgrid(*values, indexing="ij")
+    return {name: grid.ravel() for name, grid in zip(SCENARIO_AXES, mesh)}
+
+
+def evaluate_scenarios(day_volume, grid, interval_seconds=3600, target_seconds=TARGET_SECONDS,
+                       shift_hours=SHIFT_HOURS, weekly_cost_per_agent=WEEKLY_COST_PER_AGENT):
+    """Headcount, weekly cost, service level, ASA and occupancy for every scenario in grid.
+
+    day_volume holds forecast calls per interval for one day. Returns the
+    grid's axes plus result arrays, all aligned by scenario.
+    """
+    day_volume = np.asarray(day_volume, dtype=np.float64)
+    effective_aht = grid["aht"] * 100 / grid["skill_efficiency"]
+    keys = np.stack([grid["volume_change"], effective_aht, grid["target_level"]], axis=1)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    volume = day_volume[None, :] * (1 + unique[:, 0:1] / 100)
+    solved = required_agents(volume, unique[:, 1:2], interval_seconds, target_level=unique[:, 2:3],
+                             target_seconds=target_seconds)
+    calls = volume.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        level = np.where(calls > 0, (solved["service_level"] * volume).sum(axis=1) / calls, 1.0)
+        asa = np.where(calls > 0, (solved["asa"] * volume).sum(axis=1) / calls, 0.0)
+        occupancy = solved["load"].sum(axis=1) / np.maximum(solved["agents"].sum(axis=1), 1)
+    agent_hours = solved["agents"].sum(axis=1) * interval_seconds / 3600
+
+    headcount = np.ceil(agent_hours[inverse] / (1 - grid["shrinkage"]) / shift_hours).astype(np.int64)
+    result = dict(grid)
+    result.update({
+        "agents": headcount,
+        "cost": headcount * weekly_cost_per_agent,
+        "service_level": level[inverse],
+        "asa": asa[inverse],
+        "occupancy": occupancy[inverse]
+    })
+    return result
+
+
+def pareto_frontier(cost, level, candidates=None):
+    """Indexes of scenarios that no other candidate beats on both lower cost and higher service level.
+
+    candidates is an optional boolean mask, e.g. the scenarios sharing a
+    volume forecast, since volume is a condition rather than a choice.
+    Returned cheapest first.
+    """
+    cost, level = np.asarray(cost), np.asarray(level)
+    indexes = np.flatnonzero(candidates) if candidates is not None else np.arange(len(cost))
+    order = indexes[np.lexsort((-level[indexes], cost[indexes]))]
+    frontier, best = [], -np.inf
+    for i in order.tolist():
+        if level[i] > best:
+            frontier.append(i)
+            best = level[i]
+    return np.array(frontier, dtype=np.int64)
+
+
+def matching(result, **values):
+    """Boolean mask of scenarios whose axes equal the given values"""
+    mask = np.ones(len(result["agents"]), dtype=bool)
+    for name, value in values.items():
+        mask &= np.isclose(result[name], value)
+    return mask
+
+
+def select(result, **values):
+    """Index of the scenario closest to the given axis values"""
+    distance = np.zeros(len(result["agents"]))
+    for name, value in values.items():
+        span = np.ptp(result[name]) or 1.0
+        distance += ((result[name] - value) / span) ** 2
+    return int(distance.argmin())
+
+
+def scenario_rows(result, indexes):
+    """Table rows for the given scenarios"""
+    rows = []
+    for i in np.asarray(indexes).tolist():
+        rows.append({
+            "Volume Change": f"{result['volume_change'][i]:+.0f}%",
+            "Skill Efficiency": f"{result['skill_efficiency'][i]:.0f}%",
+            "Shrinkage": f"{result['shrinkage'][i]:.0%}",
+            "AHT": f"{result['aht'][i]:.0f}s",
+            "Target": f"{result['target_level'][i]:.0%}",
+            "Agents Required": int(result["agents"][i]),
+            "Cost": f"${result['cost'][i]:,.0f}/week",
+            "Service Level": f"{result['service_level'][i]:.0%}"
+        })
+    return rows
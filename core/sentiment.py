@@ -0,0 +1,179 @@
+import re
+
+# Lexicon weights on a -1..1 scale; phrases are matched before single words
+SENTIMENT_LEXICON = {
+    "completely unacceptable": -0.9, "unacceptable": -0.8, "frustrated": -0.7, "frustrating": -0.7,
+    "frustration": -0.5, "angry": -0.8, "furious": -0.9, "useless": -0.8, "terrible": -0.8, "awful": -0.8,
+    "worried": -0.4, "problem": -0.3, "issue": -0.2, "trouble": -0.4, "can't": -0.3, "cannot": -0.3,
+    "not working": -0.5, "nothing is working": -0.7, "charged twice": -0.6, "refund": -0.2, "cancel": -0.3,
+    "disappointed": -0.6, "hope you can actually": -0.4, "incorrect": -0.3, "locked": -0.2,
+    "thank you": 0.5, "thanks": 0.5, "appreciate": 0.7, "great": 0.6, "perfect": 0.7, "excellent": 0.8,
+    "wonderful": 0.8, "helpful": 0.7, "glad": 0.6, "happy": 0.7, "resolved": 0.5, "worked": 0.5,
+    "makes sense": 0.4, "finally": 0.2, "patient": 0.5, "sorry": 0.2, "understand": 0.3, "welcome": 0.5,
+    "help": 0.2, "turned my day around": 0.9, "absolutely": 0.3, "love": 0.8, "pleased": 0.6
+}
+
+# Emotion keyword sets used for the emotion breakdown
+EMOTION_KEYWORDS = {
+    "Frustration": ["frustrat", "unacceptable", "nothing is working", "for weeks", "keep getting"],
+    "Anger": ["angry", "furious", "useless", "ridiculous", "charged twice"],
+    "Gratitude": ["thank", "appreciate", "grateful"],
+    "Joy": ["great", "wonderful", "happy", "glad", "perfect", "turned my day around"],
+    "Relief": ["finally", "makes sense", "worked", "able to log in"],
+    "Empathy": ["sorry", "understand", "apologize", "understandable"],
+    "Worry": ["worried", "concerned", "security"]
+}
+
+ESCALATION_KEYWORDS = ["supervisor", "manager", "cancel", "lawyer", "complaint", "unacceptable", "useless", "refund"]
+
+SPEAKER_LINE = re.compile(r'^\s*([A-Za-z][A-Za-z ]{0,30}?)\s*:\s*(.+)$')
+TOKEN = re.compile(r"[a-z']+")
+NEGATIONS = {"not", "never", "no", "don't", "isn't", "wasn't", "didn't"}
+
+SINGLE_WORDS = {k: v for k, v in SENTIMENT_LEXICON.items() if " " not in k}
+PHRASES = sorted((k for k in SENTIMENT_LEXICON if " " in k), key=len, reverse=True)
+
+
+def parse_conversation(text):
+    """Split a 'Speaker: text' transcript into utterance dicts"""
+    utterances = []
+    for line in text.strip().splitlines():
+        match = SPEAKER_LINE.match(line)
+        if match:
+            utterances.append({"speaker": match.group(1).strip(), "text": match.group(2).strip()})
+        elif line.strip() and utterances:
+            utterances[-1]["text"] += " " + line.strip()
+    if not utterances and text.strip():
+        utterances.append({"speaker": "Unknown", "text": text.strip()})
+    return utterances
+
+
+def score_text(text):
+    """Score text on a -1..1 scale, returning (score, confidence)"""
+    lowered = text.lower()
+    hits = []
+    for phrase in PHRASES:
+        if phrase in lowered:
+            hits.append(SENTIMENT_LEXICON[phrase])
+            lowered = lowered.replace(phrase, " ")
+
+    tokens = TOKEN.findall(lowered)
+    for i, token in enumerate(tokens):
+        weight = SINGLE_WORDS.get(token)
+        if weight is None:
+            continue
+        if i > 0 and tokens[i - 1] in NEGATIONS:
+            weight = -weight * 0.7
+        hits.append(weight)
+
+    if not hits:
+        return 0.0, 0.6
+    # Exclamation marks intensify whatever polarity dominates
+    score = sum(hits) / (len(hits) ** 0.5 + 0.5)
+    score *= 1 + 0.1 * min(text.count("!"), 3)
+    score = max(-1.0, min(1.0, score))
+    confidence = min(0.99, 0.7 + 0.05 * len(hits) + 0.2 * abs(score))
+    return round(score, 2), round(confidence, 2)
+
+
+def label_score(score):
+    """Map a -1..1 score onto the labels used in the dashboards"""
+    if score <= -0.5:
+        return "Very Negative"
+    if score < -0.1:
+        return "Negative"
+    if score <= 0.1:
+        return "Neutral"
+    if score < 0.5:
+        return "Positive"
+    return "Very Positive"
+
+
+def detect_emotions(text):
+    """Return emotion -> strength for emotions present in text"""
+    lowered = text.lower()
+    emotions = {}
+    for emotion, keywords in EMOTION_KEYWORDS.items():
+        count = sum(lowered.count(keyword) for keyword in keywords)
+        if count:
+            emotions[emotion] = round(min(1.0, 0.4 + 0.2 * count), 2)
+    return emotions
+
+
+def escalation_risk(score, text):
+    """Estimate escalation risk from sentiment and trigger keywords"""
+    lowered = text.lower()
+    triggers = []
+    if score < -0.3:
+        triggers.append("negative_sentiment")
+    if any(word in lowered for word in ("frustrat", "angry", "furious")):
+        triggers.append("frustration_keywords")
+    if any(word in lowered for word in ESCALATION_KEYWORDS):
+        triggers.append("escalation_keywords")
+
+    risk = max(0.0, -score) * 0.6 + 0.15 * len(triggers)
+    risk = round(min(1.0, risk), 2)
+    level = "high" if risk >= 0.7 else "medium" if risk >= 0.4 else "low"
+    return {"level": level, "score": risk, "triggers": triggers}
+
+
+def analyze_text(text):
+    """Analyze a single text in the documented API response shape"""
+    score, confidence = score_text(text)
+    emotions = detect_emotions(text)
+    ranked = sorted(emotions, key=emotions.get, reverse=True)
+    return {
+        "sentiment": {"label": label_score(score).lower().replace(" ", "_"), "score": score, "confidence": confidence},
+        "emotions": {"primary": ranked[0].lower() if ranked else "neutral",
+                     "secondary": [e.lower() for e in ranked[1:3]],
+                     "scores": {e.lower(): s for e, s in emotions.items()}},
+        "escalation_risk": escalation_risk(score, text)
+    }
+
+
+def analyze_conversation(text_or_utterances, seconds_per_word=0.4):
+    """Score every utterance and derive the conversation-level metrics shown on the dashboard"""
+    if isinstance(text_or_utterances, str):
+        utterances = parse_conversation(text_or_utterances)
+    else:
+        utterances = list(text_or_utterances)
+
+    results = []
+    elapsed = 0.0
+    for utterance in utterances:
+        score, confidence = score_text(utterance["text"])
+        emotions = detect_emotions(utterance["text"])
+        results.append({
+            "Speaker": utterance["speaker"],
+            "Utterance": utterance["text"],
+            "Sentiment": label_score(score),
+            "Score": score,
+            "Confidence": confidence,
+            "Emotions": ", ".join(emotions) if emotions else "Neutral",
+            "Time": round(elapsed, 1)
+        })
+        elapsed += len(utterance["text"].split()) * seconds_per_word
+
+    customer_rows = [r for r in results if r["Speaker"].lower() != "agent"]
+    customer = [r["Score"] for r in customer_rows]
+    agent = [r["Score"] for r in results if r["Speaker"].lower() == "agent"]
+    initial = customer[0] if customer else 0.0
+    final = customer[-1] if customer else 0.0
+    emotion_totals = {}
+    for utterance in utterances:
+        for emotion, strength in detect_emotions(utterance["text"]).items():
+            emotion_totals[emotion] = round(emotion_totals.get(emotion, 0.0) + strength, 2)
+
+    return {
+        "utterances": results,
+        "duration": round(elapsed, 1),
+        "initial_sentiment": initial,
+        "final_sentiment": final,
+        "trajectory": "improving" if final > initial + 0.1 else "declining" if final < initial - 0.1 else "stable",
+        # 0-10 satisfaction scale used across the pages
+        "overall_satisfaction": round((final + 1) * 5, 1),
+        "agent_performance": round((sum(agent) / len(agent) + 1) * 5, 1) if agent else 0.0,
+        # Escalation risk reflects where the customer ended up, not where they started
+        "escalation_risk": escalation_risk(final, customer_rows[-1]["Utterance"] if customer_rows else ""),
+        "emotion_distribution": emotion_totals
+    }
@@ -0,0 +1,620 @@
+"""Local asyncio HTTP + WebSocket service for the documented /v1 API.
+
+Run with: python -m core.server --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+import struct
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from . import diarization, pii, sentiment, summarization
+from .voiceprint_index import IVFIndex, VoiceprintStore
+from .webhooks import Endpoint, WebhookDispatcher
+
+# Service limits
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_BODY_BYTES = 2 * 1024 * 1024
+MAX_PENDING_REQUESTS = 256
+MAX_BATCH_DOCUMENTS = 1000
+BATCH_MAX_SIZE = 32
+BATCH_WINDOW_SECONDS = 0.002
+STREAM_WINDOW = 32
+WS_CLOSE_TOO_BIG = 1009
+MAX_JOBS = 10000
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large", 415: "Unsupported Media Type",
+                500: "Internal Server Error", 503: "Service Unavailable"}
+
+# API option values -> engine labels
+PII_TYPE_ALIASES = {
+    "names": "Names", "emails": "Email Addresses", "phones": "Phone Numbers", "ssn": "SSN",
+    "credit_cards": "Credit Cards", "account_numbers": "Account Numbers", "employee_ids": "Employee IDs",
+    "ticket_numbers": "Ticket Numbers", "dates": "Dates", "addresses": "Addresses", "currency": "Currency",
+    "ip_addresses": "IP Addresses"
+}
+MASKING_METHODS = {"replacement_tags": "Replacement Tags", "full_redaction": "Full Redaction",
+                   "asterisks": "Asterisks", "partial": "Partial"}
+SUMMARY_LENGTHS = {"brief": "Brief", "standard": "Standard", "detailed": "Detailed"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Engine handlers (run inside the worker pool, so they must stay module-level)
+def _text(payload, key="text"):
+    value = payload.get(key) if isinstance(payload, dict) else None
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"'{key}' must be a non-empty string")
+    return value
+
+
+def handle_pii(payload):
+    """PII detection for one document"""
+    options = payload.get("options") or {}
+    pii_types = payload.get("pii_types")
+    labels = None if pii_types is None else [PII_TYPE_ALIASES.get(t, t) for t in pii_types]
+    masking = payload.get("masking_method") or options.get("masking_method", "replacement_tags")
+    return pii.analyze_text(_text(payload), labels, MASKING_METHODS.get(masking, masking),
+                            float(options.get("confidence_threshold", 0.0)))
+
+
+def handle_pii_stream(payload):
+    """PII detection for one stream message"""
+    result = handle_pii(payload)
+    return {"pii_count": len(result["detected_pii"]), **result}
+
+
+def handle_sentiment(payload):
+    """Sentiment for one text"""
+    return sentiment.analyze_text(_text(payload))
+
+
+def handle_conversation(payload):
+    """Sentiment flow for a conversation given as messages or a 'Speaker: text' transcript"""
+    messages = payload.get("conversation") or payload.get("messages")
+    if isinstance(messages, str):
+        return sentiment.analyze_conversation(messages)
+    if not isinstance(messages, list) or not messages:
+        raise ValueError("'conversation' must be a non-empty list of {speaker, text} messages")
+    return sentiment.analyze_conversation(
+        [{"speaker": str(m.get("speaker", "customer")).capitalize(), "text": _text(m)} for m in messages]
+    )
+
+
+def handle_summarization(payload):
+    """Structured summary for one transcript"""
+    options = payload.get("options") or {}
+    summary = summarization.summarize_transcript(
+        _text(payload, "transcript"),
+        SUMMARY_LENGTHS.get(str(options.get("length", "standard")).lower(), "Standard"),
+        bool(options.get("include_sentiment", True)),
+        bool(options.get("include_actions", True))
+    )
+    flow = summary["sentiment"]
+    return {
+        "summary": summary["issue_summary"],
+        "action_items": summary["action_items"],
+        "sentiment_analysis": flow and {
+            "initial": sentiment.label_score(flow["initial_sentiment"]).lower(),
+            "final": sentiment.label_score(flow["final_sentiment"]).lower(),
+            "overall_score": round(flow["overall_satisfaction"] / 10, 2)
+        },
+        "details": summary,
+        "markdown": summarization.render_markdown(summary) if options.get("format") == "markdown" else None
+    }
+
+
+def handle_diarization(payload):
+    """Diarization for one transcript"""
+    return diarization.diarize_transcript(_text(payload, "transcript"),
+                                          int(payload.get("min_speakers", 1)),
+                                          int(payload.get("max_speakers", 10)))
+
+
+HANDLERS = {
+    "pii": handle_pii,
+    "pii_stream": handle_pii_stream,
+    "sentiment": handle_sentiment,
+    "conversation": handle_conversation,
+    "summarization": handle_summarization,
+    "diarization": handle_diarization
+}
+
+
+def _warm_worker():
+    return os.getpid()
+
+
+def worker_context():
+    """Start method for the worker pool; forked workers would inherit the listening and client sockets"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def run_batch(handler_name, payloads):
+    """Run one handler over a batch of payloads, returning (status, body) per payload"""
+    handler = HANDLERS[handler_name]
+    results = []
+    for payload in payloads:
+        try:
+            results.append((200, handler(payload)))
+        except (ValueError, TypeError, KeyError, AttributeError) as exc:
+            results.append((400, {"error": str(exc)}))
+    return results
+
+
+class MicroBatcher:
+    """Coalesce single requests for one handler into worker-pool batches.
+
+    A batch is dispatched once a worker slot is free, so batches grow while
+    the pool is saturated and stay at one item when it is idle.
+    """
+
+    def __init__(self, handler_name, pool, worker_slots, max_size=BATCH_MAX_SIZE, window=BATCH_WINDOW_SECONDS):
+        self.handler_name = handler_name
+        self.pool = pool
+        self.worker_slots = worker_slots
+        self.max_size = max_size
+        self.window = window
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.ensure_future(self._collect())
+
+    async def submit(self, payload):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((payload, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            await self.worker_slots.acquire()
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_size:
+                if self.queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(remaining)
+                    if self.queue.empty():
+                        break
+                batch.append(self.queue.get_nowait())
+            asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.pool, run_batch, self.handler_name, [p for p, _ in batch])
+        except Exception as exc:
+            results = [(500, {"error": f"worker failure: {exc}"})] * len(batch)
+        finally:
+            self.worker_slots.release()
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# WebSocket framing (RFC 6455, server side)
+def encode_frame(opcode, payload):
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+    return header + payload
+
+
+def unmask(data, mask):
+    if not data:
+        return data
+    length = len(data)
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(length, "big")
+
+
+async def read_message(reader, writer):
+    """Read one complete text/binary message, answering pings; None on close"""
+    fragments = []
+    while True:
+        head = await reader.readexactly(2)
+        fin, opcode = head[0] & 0x80, head[0] & 0x0F
+        length = head[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "frame too large")
+        mask = await reader.readexactly(4) if head[1] & 0x80 else None
+        data = await reader.readexactly(length)
+        if mask:
+            data = unmask(data, mask)
+
+        if opcode == 0x8:
+            writer.write(encode_frame(0x8, data[:2]))
+            return None
+        if opcode == 0x9:
+            writer.write(encode_frame(0xA, data))
+            continue
+        if opcode == 0xA:
+            continue
+        fragments.append(data)
+        if fin:
+            return b"".join(fragments)
+
+
+class Service:
+    """Routes /v1 requests onto per-handler batchers backed by a bounded process pool"""
+
+    def __init__(self, workers=None, api_key=None, max_pending=MAX_PENDING_REQUESTS, dispatcher=None,
+                 stream_window=STREAM_WINDOW, voiceprints=None, voiceprint_index=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.voiceprints = voiceprints
+        self.voiceprint_index = voiceprint_index
+        self.stream_window = stream_window
+        self.api_key = api_key
+        self.dispatcher = dispatcher
+        self.pool = None
+        self.batchers = {}
+        self.admission = None
+        self.max_pending = max_pending
+        self.jobs = OrderedDict()
+        self.routes = {
+            ("POST", "/v1/pii-detection"): lambda body: self._single("pii", "pii", body),
+            ("POST", "/v1/pii-detection/batch"): lambda body: self._batch("pii", "pii", body, "documents"),
+            ("POST", "/v1/sentiment-analysis"): lambda body: self._single("sent", "sentiment", body),
+            ("POST", "/v1/sentiment-analysis/conversation"): lambda body: self._single("sent", "conversation", body),
+            ("POST", "/v1/sentiment-analysis/batch"): lambda body: self._batch("sent", "conversation", body,
+                                                                              "conversations"),
+            ("POST", "/v1/call-summarization"): lambda body: self._single("sum", "summarization", body),
+            ("POST", "/v1/call-summarization/batch"): lambda body: self._batch("sum", "summarization", body,
+                                                                              "transcripts"),
+            ("POST", "/v1/speaker-diarization"): self._diarization_job,
+            ("POST", "/v1/biometrics/verify"): self._verify_voiceprint,
+            ("POST", "/v1/biometrics/identify"): self._identify_voiceprint,
+            ("GET", "/v1/health"): self._health
+        }
+        self.streams = {
+            "/v1/pii-detection/stream": "pii_stream",
+            "/v1/sentiment-analysis/stream": "sentiment"
+        }
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=worker_context())
+        # Start every worker now rather than lazily on the first request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_worker) for _ in range(self.workers)))
+        worker_slots = asyncio.Semaphore(self.workers)
+        self.admission = asyncio.Semaphore(self.max_pending)
+        for name in HANDLERS:
+            self.batchers[name] = MicroBatcher(name, self.pool, worker_slots)
+            self.batchers[name].start()
+        if self.dispatcher:
+            self.dispatcher.start()
+        return await asyncio.start_server(self.handle_connection, host, port, limit=64 * 1024)
+
+    async def close(self):
+        if self.dispatcher:
+            await self.dispatcher.close()
+        for batcher in self.batchers.values():
+            batcher.task.cancel()
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # Jobs (only asynchronous routes keep results; synchronous responses are never stored)
+    def _new_job(self, prefix):
+        job_id = f"{prefix}_{uuid.uuid4().hex[:12]}"
+        self.jobs[job_id] = {"job_id": job_id, "status": "processing", "created_at": time.time(), "result": None}
+        while len(self.jobs) > MAX_JOBS:
+            self.jobs.popitem(last=False)
+        return self.jobs[job_id]
+
+    def _finish_job(self, job, status, result, started):
+        job["status"] = "completed" if status == 200 else "failed"
+        job["processing_time"] = round(time.perf_counter() - started, 4)
+        job["result"] = result
+        if self.dispatcher and status == 200:
+            self._publish_events(job["job_id"], result)
+
+    def _response(self, prefix, status, result, started):
+        job_id = f"{prefix}_{uuid.uuid4().hex[:12]}"
+        if self.dispatcher and status == 200:
+            self._publish_events(job_id, result)
+        return {"job_id": job_id, "status": "completed" if status == 200 else "failed",
+                "processing_time": round(time.perf_counter() - started, 4), **result}
+
+    def _publish_events(self, job_id, result):
+        """Raise the webhook events documented on the PII and sentiment pages"""
+        if "results" in result:
+            self.dispatcher.publish("batch_complete", {"job_id": job_id, "documents": len(result["results"])})
+            return
+        detected = result.get("detected_pii")
+        if detected:
+            self.dispatcher.publish("pii_detected", {"job_id": job_id, "pii_count": len(detected)})
+            critical = [e["type"] for e in detected if e["risk_level"] == "Critical"]
+            if critical:
+                self.dispatcher.publish("high_risk_pii", {"job_id": job_id, "types": critical})
+        risk = result.get("escalation_risk")
+        if risk and risk.get("level") == "high":
+            self.dispatcher.publish("escalation_detected", {"job_id": job_id, **risk})
+
+    # Route handlers
+    async def _single(self, prefix, handler_name, body):
+        started = time.perf_counter()
+        status, result = await self.batchers[handler_name].submit(body)
+        return status, self._response(prefix, status, result, started)
+
+    async def _batch(self, prefix, handler_name, body, key):
+        items = body.get(key)
+        if not isinstance(items, list) or not items:
+            raise HTTPError(400, f"'{key}' must be a non-empty list")
+        if len(items) > MAX_BATCH_DOCUMENTS:
+            raise HTTPError(413, f"at most {MAX_BATCH_DOCUMENTS} {key} per batch")
+        shared = {k: v for k, v in body.items() if k != key}
+        payloads = [{**shared, **item} if isinstance(item, dict) else item for item in items]
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(self.batchers[handler_name].submit(p) for p in payloads))
+        results = [{"id": item.get("id") if isinstance(item, dict) else None, "status": status, **result}
+                   for item, (status, result) in zip(items, outcomes)]
+        return 200, self._response(prefix, 200, {"results": results}, started)
+
+    async def _diarization_job(self, body):
+        if "transcript" not in body:
+            raise HTTPError(415, "audio diarization requires the embedding service; send a 'transcript'")
+        job = self._new_job("diar")
+        started = time.perf_counter()
+
+        async def run():
+            status, result = await self.batchers["diarization"].submit(body)
+            self._finish_job(job, status, result, started)
+
+        asyncio.ensure_future(run())
+        return 202, {"job_id": job["job_id"], "status": job["status"], "estimated_time": 1}
+
+    def _embedding(self, body):
+        if self.voiceprints is None:
+            raise HTTPError(503, "no voiceprint store configured")
+        embedding = body.get("embedding")
+        if not isinstance(embedding, list) or len(embedding) != self.voiceprints.dim:
+            raise HTTPError(400, f"'embedding' must be a list of {self.voiceprints.dim} numbers")
+        try:
+            return [float(x) for x in embedding]
+        except (TypeError, ValueError):
+            raise HTTPError(400, "'embedding' must contain only numbers")
+
+    async def _verify_voiceprint(self, body):
+        embedding = self._embedding(body)
+        if not body.get("customer_id"):
+            raise HTTPError(400, "'customer_id' is required")
+        # numpy releases the GIL for the dot product; the memmap read may touch disk
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, self.voiceprints.verify, str(body["customer_id"]), embedding)
+        return 200, result
+
+    @staticmethod
+    def _positive_int(body, key, default):
+        value = body.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise HTTPError(400, f"'{key}' must be a positive integer")
+        return value
+
+    async def _identify_voiceprint(self, body):
+        embedding = self._embedding(body)
+        k, nprobe = self._positive_int(body, "k", 5), self._positive_int(body, "nprobe", 16)
+        if self.voiceprint_index is None:
+            raise HTTPError(503, "no voiceprint index built")
+        candidates = await asyncio.get_running_loop().run_in_executor(
+            None, self.voiceprint_index.identify, embedding, k, nprobe)
+        return 200, {"candidates": candidates}
+
+    async def _job(self, path):
+        parts = path.split("/")
+        job = self.jobs.get(parts[3]) if len(parts) > 3 else None
+        if job is None:
+            raise HTTPError(404, "job not found")
+        summary = {k: job[k] for k in ("job_id", "status") if k in job}
+        if len(parts) == 4:
+            return 200, {**summary, "processing_time": job.get("processing_time")}
+        if len(parts) == 5 and parts[4] == "results":
+            if job["status"] == "processing":
+                return 202, summary
+            return 200, {**summary, **job["result"]}
+        raise HTTPError(404, "unknown route")
+
+    async def _health(self, body):
+        return 200, {"status": "ok", "workers": self.workers, "jobs": len(self.jobs)}
+
+    # Connection handling
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if path in self.streams and headers.get("upgrade", "").lower() == "websocket":
+                    await self._stream(reader, writer, headers, self.streams[path])
+                    break
+                status, payload = await self._respond(method, path, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except HTTPError as exc:
+            self._write_response(writer, exc.status, {"error": str(exc)}, False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0].rstrip("/") or "/", headers, body
+
+    def _authorized(self, headers):
+        return self.api_key is None or headers.get("authorization") == f"Bearer {self.api_key}"
+
+    async def _respond(self, method, path, headers, body):
+        if not self._authorized(headers):
+            return 401, {"error": "invalid API key"}
+        # Shed load instead of queueing without bound
+        if self.admission.locked():
+            return 503, {"error": "server busy, retry later"}
+        async with self.admission:
+            try:
+                if path.startswith("/v1/jobs/") and method == "GET":
+                    return await self._job(path)
+                route = self.routes.get((method, path))
+                if route is None:
+                    if any(p == path for _, p in self.routes):
+                        raise HTTPError(405, "method not allowed")
+                    raise HTTPError(404, "unknown route")
+                if method == "POST":
+                    if "multipart/form-data" in headers.get("content-type", ""):
+                        raise HTTPError(415, "audio upload requires the embedding service; send JSON")
+                    try:
+                        payload = json.loads(body or b"{}")
+                    except ValueError:
+                        raise HTTPError(400, "request body must be JSON")
+                    if not isinstance(payload, dict):
+                        raise HTTPError(400, "request body must be a JSON object")
+                    return await route(payload)
+                return await route(None)
+            except HTTPError as exc:
+                return exc.status, {"error": str(exc)}
+
+    def _write_response(self, writer, status, payload, keep_alive=True):
+        body = json.dumps(payload, default=str).encode()
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode() + b"\r\n" + body)
+
+    async def _stream(self, reader, writer, headers, handler_name):
+        """Serve a WebSocket stream; at most stream_window messages are in flight per socket"""
+        if not self._authorized(headers):
+            self._write_response(writer, 401, {"error": "invalid API key"}, False)
+            return
+        accept = base64.b64encode(hashlib.sha1((headers.get("sec-websocket-key", "") + WS_GUID).encode()).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        await writer.drain()
+
+        # A full window stops the reader, which stops reading the socket and pushes back on the client
+        pending = asyncio.Queue(maxsize=self.stream_window)
+        batcher = self.batchers[handler_name]
+
+        async def send_results():
+            while True:
+                item = await pending.get()
+                if item is None:
+                    return
+                message_id, future = item
+                status, result = await future
+                reply = {"id": message_id, **result} if message_id is not None else result
+                writer.write(encode_frame(0x1, json.dumps(reply, default=str).encode()))
+                await writer.drain()
+
+        sender = asyncio.ensure_future(send_results())
+        try:
+            while not sender.done():
+                message = await read_message(reader, writer)
+                if message is None:
+                    break
+                try:
+                    payload = json.loads(message)
+                except ValueError:
+                    payload = {"text": message.decode("utf-8", "replace")}
+                if not isinstance(payload, dict):
+                    payload = {"text": str(payload)}
+                await pending.put((payload.get("id"), asyncio.ensure_future(batcher.submit(payload))))
+            await pending.put(None)
+            await sender
+        except HTTPError:
+            # Oversized frame: close the socket with 1009 rather than writing an HTTP response onto it
+            writer.write(encode_frame(0x8, struct.pack("!H", WS_CLOSE_TOO_BIG) + b"message too big"))
+            await writer.drain()
+        finally:
+            sender.cancel()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, api_key=None, webhook_config=None,
+                voiceprint_dir=None):
+    dispatcher = None
+    voiceprints = voiceprint_index = None
+    if voiceprint_dir:
+        voiceprints = VoiceprintStore(voiceprint_dir)
+        if os.path.exists(os.path.join(voiceprint_dir, "ivf.npz")):
+            voiceprint_index = IVFIndex.load(voiceprints)
+            voiceprint_index.refresh()
+    if webhook_config:
+        with open(webhook_config) as f:
+            configs = json.load(f)
+        configs = configs if isinstance(configs, list) else [configs]
+        dispatcher = WebhookDispatcher([Endpoint.from_config(c) for c in configs])
+    service = Service(workers, api_key, dispatcher=dispatcher, voiceprints=voiceprints,
+                      voiceprint_index=voiceprint_index)
+    server = await service.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contact Center AI /v1 API service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--api-key", default=os.environ.get("CCAI_API_KEY"),
+                        help="require 'Authorization: Bearer <key>' (default: $CCAI_API_KEY, open if unset)")
+    parser.add_argument("--webhook-config", help="JSON webhook config (one object or a list) to deliver events to")
+    parser.add_argument("--voiceprint-dir", help="enrolled voiceprint store for /v1/biometrics (ivf.npz enables identify)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.api_key, args.webhook_config,
+                          args.voiceprint_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Staffing from forecast volume: batch Erlang C plus a discrete-event simulator.
+
+required_agents() solves every interval and queue in one call. Erlang C
+is computed through the Erlang B recursion
+    B(0) = 1,  B(n) = A * B(n-1) / (n + A * B(n-1))
+which never forms A^n or n! and so stays finite for any load. Every
+element of the batch steps through n together, and each keeps the first n
+that meets its service-level and occupancy targets.
+
+Erlang C assumes callers never hang up and every agent takes every call.
+simulate() drops both assumptions: callers abandon after an exponential
+patience and agent groups can serve any subset of skills.
+"""
+import heapq
+import random
+
+import numpy as np
+
+# Service-level target: share of calls answered within TARGET_SECONDS
+TARGET_SERVICE_LEVEL = 0.8
+TARGET_SECONDS = 20
+MAX_OCCUPANCY = 0.85
+
+DEFAULT_AHT_SECONDS = 300
+DEFAULT_INTERVAL_SECONDS = 3600
+
+# Share of paid time agents are unavailable (breaks, training, absence)
+SHRINKAGE = 0.3
+SHIFT_HOURS = 8
+
+
+def _service_level(agents, load, wait_probability, aht, target_seconds):
+    with np.errstate(over="ignore", invalid="ignore"):
+        level = 1 - wait_probability * np.exp(-(agents - load) * target_seconds / aht)
+    return np.where(agents > load, level, 0.0)
+
+
+def erlang_c(agents, load):
+    """Probability that a call waits, for arrays of agents and offered load (Erlangs)"""
+    agents, load = np.broadcast_arrays(np.asarray(agents, dtype=np.int64), np.asarray(load, dtype=np.float64))
+    blocking = np.ones(load.shape)
+    result = np.ones(load.shape)
+    for n in range(1, int(agents.max(initial=0)) + 1):
+        blocking = load * blocking / (n + load * blocking)
+        at_n = agents == n
+        result[at_n] = n * blocking[at_n] / (n - load[at_n] * (1 - blocking[at_n]))
+    # Fewer agents than the load: every call waits
+    return np.where(agents > load, result, 1.0)
+
+
+def required_agents(volume, aht=DEFAULT_AHT_SECONDS, interval_seconds=DEFAULT_INTERVAL_SECONDS,
+                    target_level=TARGET_SERVICE_LEVEL, target_seconds=TARGET_SECONDS, max_occupancy=MAX_OCCUPANCY):
+    """Fewest agents per element meeting the targets, for any array shape of volumes.
+
+    volume and aht broadcast together (e.g. queues x intervals). Returns a
+    dict of arrays: agents, service_level, asa (seconds), occupancy and
+    load (Erlangs).
+    """
+    volume, aht = np.broadcast_arrays(np.asarray(volume, dtype=np.float64), np.asarray(aht, dtype=np.float64))
+    load = volume * aht / interval_seconds
+    agents = np.zeros(load.shape, dtype=np.int64)
+    level = np.where(load > 0, 0.0, 1.0)
+    wait = np.zeros(load.shape)
+    solved = load <= 0
+
+    blocking = np.ones(load.shape)
+    # Occupancy alone needs load / max_occupancy agents; the service level rarely needs more than a few dozen extra
+    limit = int(np.ceil(load.max(initial=0) / max_occupancy + 10 * np.sqrt(load.max(initial=0)) + 10))
+    for n in range(1, limit + 1):
+        blocking = load * blocking / (n + load * blocking)
+        candidate = ~solved & (n > load)
+        if not candidate.any():
+            if solved.all():
+                break
+            continue
+        c = n * blocking / (n - load * (1 - blocking))
+        sl = _service_level(n, load, c, aht, target_seconds)
+        ok = candidate & (sl >= target_level) & (load <= n * max_occupancy)
+        agents[ok], level[ok], wait[ok] = n, sl[ok], c[ok]
+        solved |= ok
+        if solved.all():
+            break
+    if not solved.all():
+        raise ValueError("service-level target unreachable within the agent search range")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        asa = np.where(agents > load, wait * aht / (agents - load), 0.0)
+        occupancy = np.where(agents > 0, load / agents, 0.0)
+    return {"agents": agents, "service_level": level, "asa": asa, "occupancy": occupancy, "load": load}
+
+
+def scheduled_agents(required, shrinkage=SHRINKAGE):
+    """Agents to roster so that required ones are on the phones after shrinkage"""
+    return np.ceil(np.asarray(required) / (1 - shrinkage)).astype(np.int64)
+
+
+def daily_headcount(required, interval_hours=1, shift_hours=SHIFT_HOURS, shrinkage=SHRINKAGE):
+    """Rostered agents for a day: agent-hours needed, grossed up for shrinkage, in whole shifts"""
+    agent_hours = np.asarray(required).sum(axis=-1) * interval_hours / (1 - shrinkage)
+    return np.ceil(agent_hours / shift_hours).astype(np.int64)
+
+
+def simulate(arrival_rates, aht, groups, patience=None, duration=DEFAULT_INTERVAL_SECONDS,
+             target_seconds=TARGET_SECONDS, seed=None):
+    """Discrete-event simulation of a multi-skill queue with abandonment.
+
+    arrival_rates: {skill: calls per hour}; aht: seconds or {skill: seconds};
+    groups: [(agent count, skills)]; patience: mean seconds before a waiting
+    caller hangs up (None never abandons). Agents pick the longest-waiting
+    call among their skills. Returns {skill: {offered, answered, abandoned,
+    service_level, asa}} plus an "occupancy" entry per group.
+    """
+    rng = random.Random(seed)
+    aht_of = aht if isinstance(aht, dict) else dict.fromkeys(arrival_rates, aht)
+    skills = list(arrival_rates)
+
+    # Events are (time, order, kind, payload); order keeps ties deterministic
+    events, order = [], 0
+    for skill, rate in arrival_rates.items():
+        if rate > 0:
+            heapq.heappush(events, (rng.expovariate(rate / 3600), order, "arrival", skill))
+            order += 1
+
+    free = [[(0.0, i) for i in range(count)] for i, (count, _) in enumerate(groups)]
+    busy_time = [0.0] * len(groups)
+    waiting = {skill: [] for skill in skills}
+    stats = {skill: {"offered": 0, "answered": 0, "abandoned": 0, "in_target": 0, "wait": 0.0} for skill in skills}
+    call_id = 0
+
+    def start(now, group, skill, arrived):
+        handle = rng.expovariate(1 / aht_of[skill])
+        busy_time[group] += min(handle, max(0.0, duration - now))
+        waited = now - arrived
+        s = stats[skill]
+        s["answered"] += 1
+        s["wait"] += waited
+        s["in_target"] += waited <= target_seconds
+        return now + handle
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if kind == "arrival":
+            skill = payload
+            if now < duration:
+                stats[skill]["offered"] += 1
+                heapq.heappush(events, (now + rng.expovariate(arrival_rates[skill] / 3600), order, "arrival", skill))
+                order += 1
+                group = next((g for g, (_, served) in enumerate(groups) if skill in served and free[g]), None)
+                if group is not None:
+                    free[group].sort()
+                    _, agent = free[group].pop(0)
+                    heapq.heappush(events, (start(now, group, skill, now), order, "done", (group, agent)))
+                    order += 1
+                else:
+                    call_id += 1
+                    waiting[skill].append((now, call_id))
+                    if patience:
+                        heapq.heappush(events, (now + rng.expovariate(1 / patience), order, "abandon", (skill, call_id)))
+                        order += 1
+        elif kind == "abandon":
+            skill, cid = payload
+            queue = waiting[skill]
+            for i, (_, queued) in enumerate(queue):
+                if queued == cid:
+                    del queue[i]
+                    stats[skill]["abandoned"] += 1
+                    break
+        else:
+            group, agent = payload
+            served = [s for s in groups[group][1] if waiting.get(s)]
+            if served:
+                skill = min(served, key=lambda s: waiting[s][0][0])
+                arrived, _ = waiting[skill].pop(0)
+                heapq.heappush(events, (start(now, group, skill, arrived), order, "done", (group, agent)))
+                order += 1
+            else:
+                free[group].append((now, agent))
+
+    result = {}
+    for skill, s in stats.items():
+        offered = s["offered"]
+        result[skill] = {
+            "offered": offered,
+            "answered": s["answered"],
+            "abandoned": s["abandoned"],
+            "service_level": s["in_target"] / offered if offered else 1.0,
+            "asa": s["wait"] / s["answered"] if s["answered"] else 0.0
+        }
+    result["occupancy"] = [busy / (count * duration) if count else 0.0
+                           for busy, (count, _) in zip(busy_time, groups)]
+    return result
+
+
+def _slot_hours(label):
+    """Hours of day covered by a '8:00-10:00' slot label"""
+    start, end = (int(part.split(":")[0]) for part in label.split("-"))
+    return list(range(start, end if end > start else end + 24))
+
+
+def staffing_table(slots, volume_by_hour, aht=DEFAULT_AHT_SECONDS, **targets):
+    """Required Agents per time slot from hourly forecast volumes.
+
+    slots holds 'Time Slot' labels and 'Current Staff'; volume_by_hour maps
+    hour of day to forecast calls. Every hour of every slot is solved in
+    one batch; a slot needs the agents of its busiest hour and reports
+    the service level of its worst hour.
+    """
+    hours = [_slot_hours(label) for label in slots['Time Slot']]
+    flat = [hour % 24 for slot in hours for hour in slot]
+    solved = required_agents([volume_by_hour.get(hour, 0.0) for hour in flat], aht, 3600, **targets)
+    volumes, agents, levels = [], [], []
+    position = 0
+    for slot in hours:
+        span = slice(position, position + len(slot))
+        volumes.append(int(round(sum(volume_by_hour.get(h % 24, 0.0) for h in slot))))
+        agents.append(int(solved["agents"][span].max()))
+        levels.append(f"{solved['service_level'][span].min():.0%}")
+        position += len(slot)
+    table = {'Time Slot': list(slots['Time Slot']), 'Predicted Volume': volumes, 'Required Agents': agents}
+    table.update((key, value) for key, value in slots.items() if key != 'Time Slot')
+    table['Service Level'] = levels
+    return table
@@ -0,0 +1,175 @@
+import re
+from datetime import datetime
+
+from .pii import detect_pii
+from .sentiment import parse_conversation, analyze_conversation
+
+# Topic keyword map used for key topics and call type
+TOPIC_KEYWORDS = {
+    "Account access issues": ["access", "log in", "login", "dashboard", "locked"],
+    "Password reset problems": ["password", "reset"],
+    "Email delivery issues": ["email", "spam", "not receiving"],
+    "Security verification": ["verify", "verification", "security"],
+    "Billing inquiries": ["bill", "charge", "charged", "refund", "invoice", "payment"],
+    "Technical support": ["error", "not working", "crash", "bug", "technical"],
+    "Product returns": ["return", "replacement", "warranty"],
+    "Cancellation": ["cancel", "subscription"]
+}
+
+CALL_TYPES = {
+    "Technical Support": ["Account access issues", "Password reset problems", "Technical support"],
+    "Billing Inquiry": ["Billing inquiries"],
+    "Product Return": ["Product returns"],
+    "Retention": ["Cancellation"]
+}
+
+# Agent phrasing that signals a completed action
+ACTION_PATTERN = re.compile(
+    r"\b(?:I've|I have|I'm going to|I will|I'll|Let me)\s+([^.!?]*?\b(?:unlock|unlocked|sent|send|updated|update|"
+    r"reset|refund|processed|process|escalat|schedul|credit|cancel)[^.!?]*)[.!?]",
+    re.IGNORECASE
+)
+ISSUE_PATTERN = re.compile(
+    r"[^.!?]*\b(?:can't|cannot|haven't been able|unable|trouble|issue|problem|not working|not receiving|"
+    r"charged|incorrect)\b[^.!?]*[.!?]",
+    re.IGNORECASE
+)
+CAUSE_PATTERN = re.compile(r"[^.!?]*\b(?:because|due to|was locked|were being blocked|locked after)\b[^.!?]*[.!?]",
+                           re.IGNORECASE)
+AGENT_NAME = re.compile(r"\bthis is ([A-Z][a-z]+)")
+
+SUMMARY_LENGTHS = {"Brief": 1, "Standard": 3, "Detailed": 6}
+
+
+def extract_key_topics(text):
+    """Return topics whose keywords appear in the text, most mentioned first"""
+    lowered = text.lower()
+    counts = {topic: sum(lowered.count(k) for k in keywords) for topic, keywords in TOPIC_KEYWORDS.items()}
+    return [topic for topic, count in sorted(counts.items(), key=lambda kv: -kv[1]) if count]
+
+
+def classify_call_type(topics):
+    """Pick the call type whose topics rank highest"""
+    for topic in topics:
+        for call_type, call_topics in CALL_TYPES.items():
+            if topic in call_topics:
+                return call_type
+    return "General Inquiry"
+
+
+def extract_customer_info(utterances):
+    """Collect customer identifiers mentioned during the call"""
+    customer_text = " ".join(u["text"] for u in utterances if u["speaker"].lower() != "agent")
+    agent_text = " ".join(u["text"] for u in utterances if u["speaker"].lower() == "agent")
+    info = {"Customer": None, "Account": None, "Contact": [], "Agent": None}
+    for entity in detect_pii(customer_text + " " + agent_text):
+        if entity["type"] == "Names" and info["Customer"] is None and " " in entity["value"]:
+            info["Customer"] = entity["value"]
+        elif entity["type"] == "Account Numbers" and info["Account"] is None:
+            info["Account"] = entity["value"]
+        elif entity["type"] in ("Email Addresses", "Phone Numbers") and entity["value"] not in info["Contact"]:
+            info["Contact"].append(entity["value"])
+    agent_match = AGENT_NAME.search(agent_text)
+    if agent_match:
+        info["Agent"] = agent_match.group(1)
+    return info
+
+
+def _sentences(pattern, text, limit):
+    found = []
+    for match in pattern.finditer(text):
+        sentence = match.group(0).strip()
+        if sentence not in found:
+            found.append(sentence)
+        if len(found) >= limit:
+            break
+    return found
+
+
+def summarize_transcript(transcript, summary_length="Standard", include_sentiment=True, include_actions=True,
+                         seconds_per_word=0.4):
+    """Build a structured call summary from a 'Speaker: text' transcript"""
+    utterances = parse_conversation(transcript)
+    limit = SUMMARY_LENGTHS.get(summary_length, 3)
+    customer_text = " ".join(u["text"] for u in utterances if u["speaker"].lower() != "agent")
+    agent_text = " ".join(u["text"] for u in utterances if u["speaker"].lower() == "agent")
+
+    topics = extract_key_topics(transcript)
+    issues = _sentences(ISSUE_PATTERN, customer_text, limit)
+    causes = _sentences(CAUSE_PATTERN, agent_text, limit)
+    actions = []
+    if include_actions:
+        for match in ACTION_PATTERN.finditer(agent_text):
+            action = match.group(1).strip()
+            action = action[:1].upper() + action[1:]
+            if action not in actions:
+                actions.append(action)
+
+    sentiment = analyze_conversation(utterances, seconds_per_word) if include_sentiment else None
+    duration_seconds = sum(len(u["text"].split()) for u in utterances) * seconds_per_word
+    resolved = bool(actions) and (sentiment is None or sentiment["final_sentiment"] >= 0)
+
+    return {
+        "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M'),
+        "customer_info": extract_customer_info(utterances),
+        "call_type": classify_call_type(topics),
+        "duration_seconds": round(duration_seconds),
+        "issue_summary": " ".join(issues) if issues else (utterances[0]["text"] if utterances else ""),
+        "root_causes": causes,
+        "resolution": actions[:limit + 1],
+        "action_items": actions,
+        "key_topics": topics[:max(limit, 3)],
+        "sentiment": sentiment,
+        "first_call_resolution": resolved,
+        "escalation_required": bool(sentiment and sentiment["escalation_risk"]["level"] == "high"),
+        "word_count": sum(len(u["text"].split()) for u in utterances)
+    }
+
+
+def render_markdown(summary):
+    """Format a summary dict as the markdown report shown on the page"""
+    info = summary["customer_info"]
+    lines = [
+        "**Call Summary Report**",
+        f"*Generated on {summary['generated_at']}*",
+        "", "---", "",
+        "**📋 Basic Information**",
+        f"- **Customer:** {info['Customer'] or 'Unknown'}",
+        f"- **Account:** {info['Account'] or 'Not provided'}",
+        f"- **Contact:** {', '.join(info['Contact']) or 'Not provided'}",
+        f"- **Agent:** {info['Agent'] or 'Unknown'}",
+        f"- **Call Duration:** ~{max(1, round(summary['duration_seconds'] / 60))} minutes",
+        f"- **Call Type:** {summary['call_type']}",
+        "", "---", "",
+        "**🎯 Issue Summary**",
+        summary["issue_summary"],
+    ]
+    if summary["root_causes"]:
+        lines += ["", "**🔧 Root Cause**"] + [f"{i}. {c}" for i, c in enumerate(summary["root_causes"], 1)]
+    if summary["resolution"]:
+        lines += ["", "**✅ Resolution**"] + [f"{i}. {r}" for i, r in enumerate(summary["resolution"], 1)]
+
+    sentiment = summary["sentiment"]
+    if sentiment:
+        lines += [
+            "", "---", "",
+            "**😊 Sentiment Analysis**",
+            f"- **Initial Sentiment:** {round((sentiment['initial_sentiment'] + 1) * 5)}/10",
+            f"- **Final Sentiment:** {round((sentiment['final_sentiment'] + 1) * 5)}/10",
+            f"- **Sentiment Trajectory:** {sentiment['trajectory'].capitalize()}",
+            f"- **Agent Performance:** {sentiment['agent_performance']}/10",
+        ]
+    if summary["action_items"]:
+        lines += ["", "---", "", "**📋 Action Items**"] + [f"- ✅ {a}" for a in summary["action_items"]]
+    if summary["key_topics"]:
+        lines += ["", "---", "", "**🏷️ Key Topics**"] + [f"- {t}" for t in summary["key_topics"]]
+
+    lines += [
+        "", "---", "",
+        "**📊 Call Metrics**",
+        f"- **First Call Resolution:** {'✅ Yes' if summary['first_call_resolution'] else '❌ No'}",
+        f"- **Escalation Required:** {'⚠️ Yes' if summary['escalation_required'] else '❌ No'}",
+    ]
+    if sentiment:
+        lines.append(f"- **Customer Satisfaction:** {sentiment['overall_satisfaction']}/10")
+    return "\n".join(lines)
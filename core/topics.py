@@ -0,0 +1,337 @@
+"""Streaming topic trends over finished calls.
+
+Each call transcript is classified by a multinomial naive Bayes model over
+hashed unigram and bigram features, so the vocabulary never has to be
+stored. Counts are kept per window resolution (hour, day, week) in a ring
+of count-min sketches, one per time bucket. The ring holds two windows:
+the current one and the one before it, so trend deltas are a pair of
+estimates. Topic volume, summed sentiment and per-topic phrase counts
+share the sketches.
+
+Memory is fixed by the sketch and ring sizes, whatever the stream length
+or vocabulary. A rise is only reported when it is significant under a
+Poisson comparison of the two windows.
+"""
+import hashlib
+import math
+import re
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from .sentiment import score_text
+
+TOPICS = ("Billing Issues", "Technical Support", "Product Returns", "Account Changes", "Service Inquiries")
+
+# Hashed feature space for the classifier
+FEATURE_BITS = 16
+
+# Count-min sketch shape: about 1/width overcount with probability 1 - e^-depth
+SKETCH_DEPTH = 4
+SKETCH_WIDTH = 1024
+
+# Window name -> (bucket seconds, buckets per window)
+WINDOWS = {"hour": (300, 12), "day": (3600, 24), "week": (86400, 7)}
+
+# Trend thresholds: Poisson z-score for an alert, relative change for "Stable"
+ALERT_Z = 3.0
+STABLE_CHANGE = 0.05
+MIN_CALLS = 20
+SENTIMENT_SHIFT = 0.5
+TRACKED_PHRASES = 24
+
+TOKEN = re.compile(r"[a-z']+")
+STOPWORDS = frozenset(
+    "a an and are as at be been but by can could did do does for from had has have i i'm i've if in is it it's "
+    "its just me my of on or our so than that the their them then there this to too up us was we were what when "
+    "which will with would you your yes no not hi hello please thanks thank okay ok".split()
+)
+
+# Seed transcripts per topic for the default classifier
+SEED_EXAMPLES = {
+    "Billing Issues": [
+        "I was charged twice for the same service this month", "my bill is higher than usual",
+        "there is a duplicate charge on my invoice", "I want a refund for the late fee",
+        "why did my payment fail and my card get charged", "the billing statement shows the wrong amount",
+        "you overcharged me on my last bill", "dispute a charge on my account statement"
+    ],
+    "Technical Support": [
+        "the internet keeps dropping every evening", "my router is not working after the update",
+        "the app crashes when I log in", "I cannot connect to wifi", "error message when streaming video",
+        "the device will not turn on", "slow connection speed all week", "reset the modem but still no signal"
+    ],
+    "Product Returns": [
+        "I want to return the item I bought", "the package arrived damaged and I need a replacement",
+        "how do I send back the wrong size", "return label for my order", "the product is defective",
+        "exchange this for a different model", "refund for the returned order has not arrived",
+        "I received the wrong item in my delivery"
+    ],
+    "Account Changes": [
+        "I need to update my address", "change the email on my account", "add my wife as an authorized user",
+        "upgrade my plan to the premium tier", "downgrade my subscription", "reset my password and username",
+        "close my account", "transfer the account to my name"
+    ],
+    "Service Inquiries": [
+        "what are your opening hours", "do you offer service in my area", "how much does the premium plan cost",
+        "what channels are included in the package", "is there a student discount", "tell me about your new offers",
+        "when does the promotion end", "what is the difference between the plans"
+    ]
+}
+
+
+def tokens(text):
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def ngrams(words):
+    """Unigrams and bigrams of already filtered tokens"""
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _feature_indexes(text):
+    mask = (1 << FEATURE_BITS) - 1
+    return np.fromiter((zlib.crc32(g.encode()) & mask for g in ngrams(tokens(text))), dtype=np.int64)
+
+
+class TopicClassifier:
+    """Multinomial naive Bayes over hashed n-gram counts"""
+
+    def __init__(self, topics=TOPICS):
+        self.topics = tuple(topics)
+        self.log_prior = np.full(len(self.topics), -math.log(len(self.topics)))
+        self.log_likelihood = np.zeros((len(self.topics), 1 << FEATURE_BITS))
+
+    def fit(self, texts, labels, alpha=0.5):
+        counts = np.zeros((len(self.topics), 1 << FEATURE_BITS))
+        docs = np.zeros(len(self.topics))
+        for text, label in zip(texts, labels):
+            row = self.topics.index(label)
+            np.add.at(counts[row], _feature_indexes(text), 1)
+            docs[row] += 1
+        self.log_prior = np.log((docs + 1) / (docs.sum() + len(self.topics)))
+        smoothed = counts + alpha
+        self.log_likelihood = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        return self
+
+    def probabilities(self, text):
+        scores = self.log_prior + self.log_likelihood[:, _feature_indexes(text)].sum(axis=1)
+        scores = np.exp(scores - scores.max())
+        return scores / scores.sum()
+
+    def classify(self, text):
+        """(topic, probability) for a transcript"""
+        probabilities = self.probabilities(text)
+        best = int(probabilities.argmax())
+        return self.topics[best], float(probabilities[best])
+
+
+_default_classifier = None
+
+
+def default_classifier():
+    """Classifier trained on SEED_EXAMPLES, built once"""
+    global _default_classifier
+    if _default_classifier is None:
+        texts = [text for examples in SEED_EXAMPLES.values() for text in examples]
+        labels = [topic for topic, examples in SEED_EXAMPLES.items() for _ in examples]
+        _default_classifier = TopicClassifier(tuple(SEED_EXAMPLES)).fit(texts, labels)
+    return _default_classifier
+
+
+@lru_cache(maxsize=1 << 16)
+def sketch_columns(key, depth=SKETCH_DEPTH, width=SKETCH_WIDTH):
+    """Column per sketch row for a key, by double hashing one 64-bit digest"""
+    digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+    first, step = digest & 0xFFFFFFFF, (digest >> 32) | 1
+    return (first + step * np.arange(depth)) % width
+
+
+class SlidingSketch:
+    """Two windows of count-min sketches in a ring of time buckets.
+
+    Each bucket has a count sketch and a value-sum sketch; a bucket is
+    cleared when the ring wraps onto it. Late events for a bucket that has
+    already been overwritten by a newer one are dropped.
+    """
+
+    def __init__(self, bucket_seconds, buckets, depth=SKETCH_DEPTH, width=SKETCH_WIDTH):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self.width = width
+        self.counts = np.zeros((2 * buckets, depth, width), dtype=np.float32)
+        self.sums = np.zeros((2 * buckets, depth, width), dtype=np.float32)
+        self.bucket_ids = np.full(2 * buckets, -1, dtype=np.int64)
+        self._rows = np.arange(depth)
+        self._offsets = self._rows * width
+
+    def _slot(self, bucket):
+        slot = bucket % len(self.bucket_ids)
+        if self.bucket_ids[slot] > bucket:
+            return None
+        if self.bucket_ids[slot] != bucket:
+            self.counts[slot] = 0
+            self.sums[slot] = 0
+            self.bucket_ids[slot] = bucket
+        return slot
+
+    def add(self, columns, t):
+        """Count one event for every key in columns, an array of shape (keys, depth)"""
+        slot = self._slot(int(t // self.bucket_seconds))
+        if slot is None:
+            return
+        cells = (columns + self._offsets).ravel()
+        self.counts[slot].reshape(-1)[:] += np.bincount(cells, minlength=self.counts[slot].size)
+
+    def add_value(self, columns, t, value):
+        """Add value to one key's sum; a key's cells are distinct so plain indexing is safe"""
+        slot = self._slot(int(t // self.bucket_seconds))
+        if slot is not None:
+            self.sums[slot][self._rows, columns] += value
+
+    def _live(self, t, previous):
+        # The window is the half-open interval [t - window, t)
+        newest = math.ceil(t / self.bucket_seconds) - 1 - (self.buckets if previous else 0)
+        return (self.bucket_ids > newest - self.buckets) & (self.bucket_ids <= newest)
+
+    def estimate_many(self, columns, t, previous=False):
+        """Counts over the current (or previous) window ending at t for keys of shape (keys, depth)"""
+        live = self._live(t, previous)
+        if not live.any() or not len(columns):
+            return np.zeros(len(columns))
+        return self.counts[:, self._rows, columns][live].sum(axis=0).min(axis=-1)
+
+    def estimate(self, columns, t, previous=False):
+        """(count, value sum) for one key over the current or previous window ending at t"""
+        live = self._live(t, previous)
+        if not live.any():
+            return 0.0, 0.0
+        counts = self.counts[:, self._rows, columns][live].sum(axis=0)
+        sums = self.sums[:, self._rows, columns][live].sum(axis=0)
+        best = counts.argmin()
+        return float(counts[best]), float(sums[best])
+
+
+def trend_label(current, previous):
+    """'↗️ +15%', '↘️ -8%' or '→ Stable'"""
+    if previous <= 0:
+        return "🆕 New" if current else "→ Stable"
+    change = (current - previous) / previous
+    if abs(change) < STABLE_CHANGE:
+        return "→ Stable"
+    return f"{'↗️' if change > 0 else '↘️'} {change:+.0%}"
+
+
+def rise_z(current, previous):
+    """Poisson z-score of a change between two equal-length windows"""
+    return (current - previous) / math.sqrt(current + previous) if current + previous else 0.0
+
+
+class TopicTrends:
+    """Classifies finished calls and keeps windowed topic, sentiment and phrase counts"""
+
+    def __init__(self, classifier=None, windows=WINDOWS, clock=time.time):
+        self.classifier = classifier or default_classifier()
+        self.clock = clock
+        self.windows = {name: SlidingSketch(seconds, buckets) for name, (seconds, buckets) in windows.items()}
+        self.calls = 0
+        # Candidate rising phrases per topic, bounded; their counts live in the sketches
+        self.phrases = {topic: {} for topic in self.classifier.topics}
+        self._topic_columns = {topic: sketch_columns(topic) for topic in self.classifier.topics}
+        self._longest = max(self.windows.values(), key=lambda sketch: sketch.bucket_seconds * sketch.buckets)
+
+    def observe(self, text, t=None, sentiment=None):
+        """Classify one finished call and count it; sentiment is on the 1-10 scale (scored from text if omitted)"""
+        t = self.clock() if t is None else t
+        topic, _ = self.classifier.classify(text)
+        if sentiment is None:
+            sentiment = (score_text(text)[0] + 1) * 4.5 + 1
+        words = tokens(text)
+        phrases = sorted({f"{a} {b}" for a, b in zip(words, words[1:])})
+        topic_columns = self._topic_columns[topic]
+        columns = np.array([topic_columns] + [sketch_columns(f"{topic}\x1f{p}") for p in phrases])
+        for sketch in self.windows.values():
+            sketch.add(columns, t)
+            sketch.add_value(topic_columns, t, sentiment)
+        self._track_phrases(topic, phrases, columns[1:], t)
+        self.calls += 1
+        return topic
+
+    def _track_phrases(self, topic, phrases, columns, t):
+        """Keep the TRACKED_PHRASES most frequent phrases per topic as trend candidates"""
+        if not phrases:
+            return
+        tracked = self.phrases[topic]
+        counts = self._longest.estimate_many(columns, t)
+        for phrase, cols, count in zip(phrases, columns, counts.tolist()):
+            if phrase in tracked or len(tracked) < TRACKED_PHRASES:
+                tracked[phrase] = (count, cols)
+                continue
+            weakest = min(tracked, key=lambda p: tracked[p][0])
+            if count > tracked[weakest][0]:
+                del tracked[weakest]
+                tracked[phrase] = (count, cols)
+
+    def topic_stats(self, window="week", now=None):
+        """Per-topic current/previous volume and mean sentiment for one window"""
+        now = self.clock() if now is None else now
+        sketch = self.windows[window]
+        stats = []
+        for topic in self.classifier.topics:
+            columns = self._topic_columns[topic]
+            current, current_sum = sketch.estimate(columns, now)
+            previous, previous_sum = sketch.estimate(columns, now, previous=True)
+            stats.append({
+                "topic": topic, "current": current, "previous": previous,
+                "sentiment": current_sum / current if current else None,
+                "previous_sentiment": previous_sum / previous if previous else None
+            })
+        return stats
+
+    def summary(self, window="week", now=None):
+        """Topic/Volume/Trend/Sentiment columns, busiest topic first, for the trending table"""
+        stats = sorted(self.topic_stats(window, now), key=lambda s: -s["current"])
+        return {
+            'Topic': [s["topic"] for s in stats],
+            'Volume': [int(s["current"]) for s in stats],
+            'Trend': [trend_label(s["current"], s["previous"]) for s in stats],
+            'Sentiment': [round(s["sentiment"], 1) if s["sentiment"] is not None else None for s in stats]
+        }
+
+    def rising_phrases(self, topic, window="week", now=None, limit=3):
+        """Tracked phrases for a topic ordered by their rise between windows"""
+        now = self.clock() if now is None else now
+        sketch = self.windows[window]
+        rises = []
+        for phrase, (_, columns) in self.phrases[topic].items():
+            current = sketch.estimate(columns, now)[0]
+            previous = sketch.estimate(columns, now, previous=True)[0]
+            if current > previous:
+                rises.append((rise_z(current, previous), phrase))
+        return [phrase for _, phrase in sorted(rises, reverse=True)[:limit]]
+
+    def insights(self, window="week", now=None):
+        """Proactive insight strings from significant volume and sentiment changes"""
+        insights = []
+        for s in sorted(self.topic_stats(window, now), key=lambda s: -abs(rise_z(s["current"], s["previous"]))):
+            current, previous, topic = s["current"], s["previous"], s["topic"]
+            if current + previous < MIN_CALLS:
+                continue
+            z = rise_z(current, previous)
+            if z >= ALERT_Z:
+                phrases = self.rising_phrases(topic, window, now)
+                driver = f" - driven by \"{phrases[0]}\"" if phrases else ""
+                trend = f"trending up {(current - previous) / previous:.0%}" if previous else f"new this {window}"
+                insights.append(f"🚨 **Alert:** {topic} {trend}{driver}")
+            elif z <= -ALERT_Z:
+                insights.append(f"📈 **Opportunity:** {topic} volume down {(previous - current) / previous:.0%} - current fixes are working")
+            if s["sentiment"] is not None and s["previous_sentiment"] is not None and min(current, previous) >= MIN_CALLS:
+                shift = s["sentiment"] - s["previous_sentiment"]
+                if shift >= SENTIMENT_SHIFT:
+                    insights.append(f"✅ **Positive:** {topic} sentiment improving ({s['previous_sentiment']:.1f} → "
+                                    f"{s['sentiment']:.1f})")
+                elif shift <= -SENTIMENT_SHIFT:
+                    insights.append(f"⚠️ **Watch:** {topic} sentiment falling ({s['previous_sentiment']:.1f} → "
+                                    f"{s['sentiment']:.1f})")
+        return insights
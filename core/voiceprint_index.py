@@ -0,0 +1,310 @@
+"""Enrolled voiceprint store with exact 1:1 verification and IVF 1:N identification.
+
+Embeddings are L2-normalised float32 rows in one contiguous memory-mapped
+matrix, so cosine similarity is a dot product and a lookup only pages in
+the rows it touches. Customer ids live in a parallel fixed-width memmap;
+a sorted permutation gives O(log n) id -> row lookups without a 10M-entry
+Python dict.
+
+Identification uses an inverted-file (IVF) index: spherical k-means
+centroids partition the rows, each inverted list is a contiguous slice of
+one row-number array (CSR layout), and a query scores only the rows of its
+nprobe closest lists. Rows added after the index was built are scanned
+exactly until refresh() folds them in.
+"""
+import json
+import os
+
+import numpy as np
+
+# Store layout
+DEFAULT_DIM = 192
+ID_BYTES = 32
+INITIAL_CAPACITY = 1024
+RECENT_ID_LIMIT = 10000
+
+# Verification and search defaults
+VERIFY_THRESHOLD = 0.75
+DEFAULT_NLIST = 1024
+DEFAULT_NPROBE = 16
+TRAIN_SAMPLE = 100000
+KMEANS_ITERATIONS = 10
+ASSIGN_CHUNK_ROWS = 65536
+
+
+def normalize(vectors):
+    """L2-normalise vectors along the last axis as float32"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def similarity_to_confidence(score, threshold=VERIFY_THRESHOLD):
+    """Map a cosine score onto a 0-100 confidence that crosses 50 at the decision threshold"""
+    return round(float(100 / (1 + np.exp(-(score - threshold) * 20))), 1)
+
+
+class VoiceprintStore:
+    """Memory-mapped float32 matrix of enrolled voiceprints keyed by customer id"""
+
+    def __init__(self, directory, dim=DEFAULT_DIM):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        meta_path = self._path("meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.dim, self.count, self.capacity = meta["dim"], meta["count"], meta["capacity"]
+        else:
+            self.dim, self.count, self.capacity = dim, 0, INITIAL_CAPACITY
+            self._resize_files(self.capacity)
+        self._open()
+        self._sorted_rows = None
+        self._sorted_ids = None
+        self._recent = {}
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _resize_files(self, capacity):
+        for name, row_bytes in (("embeddings.f32", self.dim * 4), ("ids.bin", ID_BYTES)):
+            with open(self._path(name), "ab") as f:
+                f.truncate(capacity * row_bytes)
+
+    def _open(self):
+        self.embeddings = np.memmap(self._path("embeddings.f32"), dtype=np.float32, mode="r+",
+                                    shape=(self.capacity, self.dim))
+        self.ids = np.memmap(self._path("ids.bin"), dtype=f"S{ID_BYTES}", mode="r+", shape=(self.capacity,))
+
+    def _grow(self, needed):
+        self.flush()
+        self.capacity = max(needed, self.capacity * 2)
+        del self.embeddings, self.ids
+        self._resize_files(self.capacity)
+        self._open()
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def _key(customer_id):
+        key = str(customer_id).encode()
+        if len(key) > ID_BYTES:
+            raise ValueError(f"customer id longer than {ID_BYTES} bytes: {customer_id!r}")
+        return key
+
+    def _sort_ids(self):
+        self._sorted_rows = np.argsort(self.ids[:self.count], kind="stable")
+        self._sorted_ids = self.ids[:self.count][self._sorted_rows]
+        self._recent = {}
+
+    def row_of(self, customer_id):
+        """Row number for a customer id, or None if not enrolled"""
+        key = self._key(customer_id)
+        if key in self._recent:
+            return self._recent[key]
+        if self._sorted_ids is None:
+            self._sort_ids()
+        i = int(np.searchsorted(self._sorted_ids, key))
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == key:
+            return int(self._sorted_rows[i])
+        return None
+
+    def add(self, customer_id, embedding):
+        """Insert or replace one customer's voiceprint, returning its row"""
+        row = self.row_of(customer_id)
+        if row is None:
+            row = self._append([self._key(customer_id)], normalize(embedding)[None, :])[0]
+        else:
+            self.embeddings[row] = normalize(embedding)
+        return row
+
+    def add_many(self, customer_ids, embeddings, check_existing=True):
+        """Bulk insert customers that are not yet enrolled, returning their rows.
+
+        Bulk loads of known-new ids can pass check_existing=False to skip the
+        duplicate check and defer re-sorting the id index to the next lookup.
+        """
+        keys = [self._key(c) for c in customer_ids]
+        if check_existing and (len(set(keys)) != len(keys) or self._enrolled(keys).any()):
+            raise ValueError("add_many only accepts new, unique customer ids; use add() to replace")
+        return self._append(keys, normalize(embeddings))
+
+    def _enrolled(self, keys):
+        """Vectorised membership test for a list of encoded ids"""
+        return self._rows_of_keys(keys) >= 0
+
+    def _rows_of_keys(self, keys):
+        if self._sorted_ids is None:
+            self._sort_ids()
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        if len(self._sorted_ids):
+            wanted = np.array(keys, dtype=f"S{ID_BYTES}")
+            pos = np.minimum(np.searchsorted(self._sorted_ids, wanted), len(self._sorted_ids) - 1)
+            found = self._sorted_ids[pos] == wanted
+            rows[found] = self._sorted_rows[pos[found]]
+        if self._recent:
+            for i, key in enumerate(keys):
+                row = self._recent.get(key)
+                if row is not None:
+                    rows[i] = row
+        return rows
+
+    def rows_of(self, customer_ids):
+        """Row numbers for many customer ids at once, -1 where not enrolled"""
+        return self._rows_of_keys([self._key(c) for c in customer_ids])
+
+    def _append(self, keys, vectors):
+        start = self.count
+        rows = list(range(start, start + len(keys)))
+        self.write_rows(rows, keys, vectors)
+        return rows
+
+    def write_rows(self, rows, keys, vectors):
+        """Write normalised vectors at explicit rows, extending the store for rows past the end.
+
+        Rows past the current end must be contiguous from count; used by
+        _append() and by journal replay, which needs to re-apply exact rows.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        end = max(self.count, int(rows.max()) + 1)
+        if end > self.capacity:
+            self._grow(end)
+        self.embeddings[rows] = vectors
+        new = rows >= self.count
+        new_keys = [key for key, is_new in zip(keys, new.tolist()) if is_new]
+        self.ids[rows[new]] = new_keys
+        self.count = end
+        if len(new_keys) > RECENT_ID_LIMIT or len(self._recent) + len(new_keys) > RECENT_ID_LIMIT:
+            self._sorted_ids = None
+        else:
+            self._recent.update(zip(new_keys, rows[new].tolist()))
+
+    def set_row(self, row, embedding):
+        """Overwrite the voiceprint stored at a row"""
+        self.embeddings[row] = normalize(embedding)
+
+    def get(self, customer_id):
+        row = self.row_of(customer_id)
+        return None if row is None else np.array(self.embeddings[row])
+
+    def verify(self, customer_id, embedding, threshold=VERIFY_THRESHOLD):
+        """Exact 1:1 verification of a caller embedding against a claimed identity"""
+        row = self.row_of(customer_id)
+        if row is None:
+            return {"customer_id": customer_id, "enrolled": False, "match": False, "score": 0.0, "confidence": 0.0}
+        score = float(self.embeddings[row] @ normalize(embedding))
+        return {"customer_id": customer_id, "enrolled": True, "match": score >= threshold,
+                "score": round(score, 4), "confidence": similarity_to_confidence(score, threshold)}
+
+    def customer_ids(self, rows):
+        return [self.ids[r].decode() for r in rows]
+
+    def flush(self):
+        """Persist rows and metadata; metadata is replaced atomically"""
+        self.embeddings.flush()
+        self.ids.flush()
+        tmp = self._path("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"dim": self.dim, "count": self.count, "capacity": self.capacity}, f)
+        os.replace(tmp, self._path("meta.json"))
+
+
+def _assign(vectors, centroids):
+    """Index of the closest centroid for each row, computed in chunks"""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        chunk = np.asarray(vectors[start:start + ASSIGN_CHUNK_ROWS])
+        labels[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(vectors, nlist, iterations=KMEANS_ITERATIONS, seed=0):
+    """Unit-norm centroids for normalised vectors"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index over a VoiceprintStore for approximate 1:N identification"""
+
+    def __init__(self, store, centroids, labels):
+        self.store = store
+        self.centroids = centroids
+        self.labels = labels
+        self._build_lists()
+
+    @classmethod
+    def train(cls, store, nlist=DEFAULT_NLIST, sample=TRAIN_SAMPLE, iterations=KMEANS_ITERATIONS, seed=0):
+        """Train centroids on a sample of the store and index every enrolled row"""
+        count = len(store)
+        nlist = max(1, min(nlist, count))
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(count, min(sample, count), replace=False))
+        centroids = spherical_kmeans(np.asarray(store.embeddings[rows]), nlist, iterations, seed)
+        return cls(store, centroids, _assign(store.embeddings[:count], centroids))
+
+    @property
+    def indexed(self):
+        return len(self.labels)
+
+    def _build_lists(self):
+        self.list_rows = np.argsort(self.labels, kind="stable").astype(np.int64)
+        counts = np.bincount(self.labels, minlength=len(self.centroids))
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def refresh(self):
+        """Assign rows enrolled since the last build to their lists"""
+        if self.indexed < len(self.store):
+            tail = _assign(self.store.embeddings[self.indexed:len(self.store)], self.centroids)
+            self.labels = np.concatenate([self.labels, tail])
+            self._build_lists()
+
+    def search(self, queries, k=5, nprobe=DEFAULT_NPROBE):
+        """Top-k (rows, scores) per query, scoring only rows in the nprobe closest lists"""
+        queries = normalize(np.atleast_2d(queries))
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        tail = np.arange(self.indexed, len(self.store))
+        results = []
+        for query, lists in zip(queries, probes):
+            candidates = np.concatenate(
+                [self.list_rows[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists] + [tail]
+            )
+            # Sorted row order keeps memmap reads sequential
+            candidates.sort()
+            scores = np.asarray(self.store.embeddings[candidates]) @ query
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            results.append((candidates[top], scores[top]))
+        return results
+
+    def identify(self, embedding, k=5, nprobe=DEFAULT_NPROBE, threshold=VERIFY_THRESHOLD):
+        """Best matching enrolled customers for a caller embedding"""
+        rows, scores = self.search(embedding, k, nprobe)[0]
+        return [
+            {"customer_id": customer_id, "score": round(float(score), 4),
+             "confidence": similarity_to_confidence(score, threshold), "match": bool(score >= threshold)}
+            for customer_id, score in zip(self.store.customer_ids(rows), scores)
+        ]
+
+    def save(self, path=None):
+        path = path or os.path.join(self.store.directory, "ivf.npz")
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, centroids=self.centroids, labels=self.labels)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, store, path=None):
+        data = np.load(path or os.path.join(store.directory, "ivf.npz"))
+        return cls(store, data["centroids"], data["labels"])
@@ -0,0 +1,507 @@
+"""Webhook delivery: persistent outbound queue, HMAC signing, pooled connections and batched retries.
+
+Events are written to a SQLite outbox first, so nothing is lost if the
+process stops. One worker per endpoint waits a short window to coalesce
+bursts, then claims up to MAX_BATCH_EVENTS due events and POSTs them as a
+single signed request over a pooled keep-alive connection. Events that
+share a coalesce key replace each other while still pending, so a storm
+of escalations for one call becomes a single delivery.
+
+Run `python -m core.webhooks --demo` to deliver a burst to the local receiver.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import sqlite3
+import ssl
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Delivery defaults
+DEFAULT_QUEUE_PATH = "webhooks.db"
+MAX_BATCH_EVENTS = 100
+BATCH_WINDOW_SECONDS = 0.25
+MAX_ATTEMPTS = 8
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 300.0
+POOL_SIZE = 4
+REQUEST_TIMEOUT_SECONDS = 10.0
+SIGNATURE_HEADER = "X-CCAI-Signature"
+SIGNATURE_TOLERANCE_SECONDS = 300
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Events advertised on the PII and sentiment pages
+WEBHOOK_EVENTS = [
+    "pii_detected", "high_risk_pii", "batch_complete", "compliance_alert",
+    "sentiment_analyzed", "escalation_detected", "satisfaction_low", "emotion_change", "conversation_complete"
+]
+
+
+def sign_payload(secret, body, timestamp=None):
+    """Signature header value 't=<unix>,v1=<hex hmac-sha256 of "<t>.<body>">'"""
+    timestamp = int(time.time() if timestamp is None else timestamp)
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(secret, body, header, tolerance=SIGNATURE_TOLERANCE_SECONDS, now=None):
+    """Check a signature header against the raw request body"""
+    try:
+        fields = dict(part.split("=", 1) for part in header.split(","))
+        timestamp = int(fields["t"])
+    except (ValueError, KeyError, AttributeError):
+        return False
+    if abs((time.time() if now is None else now) - timestamp) > tolerance:
+        return False
+    expected = sign_payload(secret, body, timestamp).split("v1=", 1)[1]
+    return hmac.compare_digest(expected, fields.get("v1", ""))
+
+
+def backoff_delay(attempts, rng=None, base=BASE_BACKOFF_SECONDS, cap=MAX_BACKOFF_SECONDS):
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    rng = rng or random
+    return min(cap, base * 2 ** max(0, attempts - 1)) * rng.uniform(0.5, 1.0)
+
+
+class Endpoint:
+    """A webhook subscription, built from the page config shape via from_config"""
+
+    def __init__(self, url, secret=None, events=None, name=None):
+        self.url = url
+        self.secret = secret
+        self.events = set(events) if events else None
+        self.name = name or url
+
+    @classmethod
+    def from_config(cls, config):
+        auth = config.get("authentication") or {}
+        return cls(config["webhook_url"], auth.get("token") or config.get("secret"), config.get("events"),
+                   config.get("name"))
+
+    def accepts(self, event):
+        return self.events is None or event in self.events
+
+
+class DeliveryQueue:
+    """SQLite outbox; rows move pending -> inflight -> deleted (or dead after MAX_ATTEMPTS)"""
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH, max_attempts=MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                endpoint TEXT NOT NULL,
+                event TEXT NOT NULL,
+                coalesce_key TEXT,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (endpoint, status, next_attempt_at);
+            CREATE UNIQUE INDEX IF NOT EXISTS deliveries_coalesce ON deliveries (endpoint, coalesce_key)
+                WHERE status = 'pending' AND coalesce_key IS NOT NULL;
+        """)
+
+    def recover(self):
+        """Return rows left inflight by a previous process to the pending state"""
+        with self.db:
+            self.db.execute("UPDATE OR IGNORE deliveries SET status = 'pending' WHERE status = 'inflight'")
+            # Whatever is still inflight was superseded by a newer pending event with the same key
+            self.db.execute("DELETE FROM deliveries WHERE status = 'inflight'")
+
+    def enqueue(self, endpoint, event, payload, coalesce_key=None, now=None):
+        now = time.time() if now is None else now
+        with self.db:
+            self.db.execute(
+                "INSERT INTO deliveries (endpoint, event, coalesce_key, payload, created_at, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (endpoint, coalesce_key) WHERE status = 'pending' AND coalesce_key IS NOT NULL "
+                "DO UPDATE SET event = excluded.event, payload = excluded.payload, created_at = excluded.created_at",
+                (endpoint, event, coalesce_key, json.dumps(payload, default=str), now, now)
+            )
+
+    def enqueue_many(self, rows):
+        """Insert (endpoint, event, payload, coalesce_key, created_at) rows in one transaction"""
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO deliveries (endpoint, event, coalesce_key, payload, created_at, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (endpoint, coalesce_key) WHERE status = 'pending' AND coalesce_key IS NOT NULL "
+                "DO UPDATE SET event = excluded.event, payload = excluded.payload, created_at = excluded.created_at",
+                [(endpoint, event, key, json.dumps(payload, default=str), now, now)
+                 for endpoint, event, payload, key, now in rows]
+            )
+
+    def claim(self, endpoint, limit=MAX_BATCH_EVENTS, now=None):
+        """Mark up to `limit` due events inflight and return them oldest first"""
+        now = time.time() if now is None else now
+        with self.db:
+            rows = self.db.execute(
+                "SELECT id, event, payload, created_at, attempts FROM deliveries "
+                "WHERE endpoint = ? AND status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (endpoint, now, limit)
+            ).fetchall()
+            self.db.executemany("UPDATE deliveries SET status = 'inflight' WHERE id = ?", [(r[0],) for r in rows])
+        return [{"id": r[0], "event": r[1], "data": json.loads(r[2]), "created_at": r[3], "attempts": r[4]}
+                for r in rows]
+
+    def complete(self, ids):
+        with self.db:
+            self.db.executemany("DELETE FROM deliveries WHERE id = ?", [(i,) for i in ids])
+
+    def retry(self, rows, delay, error, now=None):
+        """Reschedule failed rows, or mark them dead once they run out of attempts"""
+        now = time.time() if now is None else now
+        with self.db:
+            for row in rows:
+                attempts = row["attempts"] + 1
+                status = "dead" if attempts >= self.max_attempts else "pending"
+                self.db.execute(
+                    "UPDATE OR IGNORE deliveries SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? "
+                    "WHERE id = ?", (status, attempts, now + delay, error, row["id"])
+                )
+            self.db.executemany("DELETE FROM deliveries WHERE id = ? AND status = 'inflight'",
+                                [(row["id"],) for row in rows])
+
+    def fail(self, rows, error):
+        with self.db:
+            self.db.executemany("UPDATE deliveries SET status = 'dead', last_error = ? WHERE id = ?",
+                                [(error, row["id"]) for row in rows])
+
+    def next_due(self, endpoint):
+        row = self.db.execute("SELECT MIN(next_attempt_at) FROM deliveries WHERE endpoint = ? AND status = 'pending'",
+                              (endpoint,)).fetchone()
+        return row[0]
+
+    def counts(self):
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM deliveries GROUP BY status").fetchall())
+
+    def close(self):
+        self.db.close()
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one origin"""
+
+    def __init__(self, url, size=POOL_SIZE, timeout=REQUEST_TIMEOUT_SECONDS):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.opened = 0
+
+    async def _connect(self):
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def post(self, body, headers):
+        """POST body to the endpoint path and return (status, response headers)"""
+        async with self.slots:
+            reader, writer = await asyncio.wait_for(self._connect(), self.timeout)
+            try:
+                head = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+                writer.write(f"POST {self.path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+                             f"{head}\r\n".encode() + body)
+                await writer.drain()
+                status, response_headers = await asyncio.wait_for(self._read_response(reader), self.timeout)
+            except BaseException:
+                writer.close()
+                raise
+            if response_headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self.idle.append((reader, writer))
+            return status, response_headers
+
+    async def _read_response(self, reader):
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers
+
+    async def close(self):
+        idle, self.idle = self.idle, []
+        for _, writer in idle:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for _, writer in idle), return_exceptions=True)
+
+
+class WebhookDispatcher:
+    """Fan events out to endpoints with coalesced, signed, retried batch deliveries.
+
+    publish() only appends to an in-memory buffer; a writer task flushes the
+    buffer to the outbox in one transaction. All SQLite work runs on a single
+    dedicated thread so the event loop never blocks on disk I/O.
+    """
+
+    def __init__(self, endpoints, queue_path=DEFAULT_QUEUE_PATH, batch_window=BATCH_WINDOW_SECONDS,
+                 max_batch=MAX_BATCH_EVENTS, max_attempts=MAX_ATTEMPTS, pool_size=POOL_SIZE,
+                 base_backoff=BASE_BACKOFF_SECONDS, rng=None):
+        self.endpoints = {e.name: e for e in endpoints}
+        self.db_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webhook-outbox")
+        self.queue = self.db_thread.submit(DeliveryQueue, queue_path, max_attempts).result()
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.pool_size = pool_size
+        self.base_backoff = base_backoff
+        self.rng = rng or random.Random()
+        self.buffer = []
+        self.flush_requested = None
+        self.pools = {}
+        self.wakeups = {}
+        self.tasks = []
+        self.stats = {"requests": 0, "delivered": 0, "retried": 0, "dead": 0}
+
+    async def _db(self, method, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.db_thread, method, *args)
+
+    def start(self):
+        self.flush_requested = asyncio.Event()
+        if self.buffer:
+            self.flush_requested.set()
+        for name, endpoint in self.endpoints.items():
+            self.pools[name] = ConnectionPool(endpoint.url, self.pool_size)
+            self.wakeups[name] = asyncio.Event()
+        self.tasks.append(asyncio.ensure_future(self._run()))
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self._flush()
+        for pool in self.pools.values():
+            await pool.close()
+        await self._db(self.queue.close)
+        self.db_thread.shutdown()
+
+    def publish(self, event, payload, coalesce_key=None):
+        """Buffer an event for every subscribed endpoint; later events with the same key replace pending ones"""
+        now = time.time()
+        for name, endpoint in self.endpoints.items():
+            if endpoint.accepts(event):
+                self.buffer.append((name, event, payload, coalesce_key, now))
+        if self.buffer and self.flush_requested is not None:
+            self.flush_requested.set()
+
+    async def _flush(self):
+        rows, self.buffer = self.buffer, []
+        if rows:
+            await self._db(self.queue.enqueue_many, rows)
+            for name in {row[0] for row in rows}:
+                if name in self.wakeups:
+                    self.wakeups[name].set()
+
+    async def drain(self, timeout=30.0):
+        """Wait until no events are buffered, pending or inflight"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            counts = await self._db(self.queue.counts)
+            if not self.buffer and not counts.get("pending") and not counts.get("inflight"):
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    async def _run(self):
+        await self._db(self.queue.recover)
+        for name, endpoint in self.endpoints.items():
+            self.wakeups[name].set()
+            self.tasks.append(asyncio.ensure_future(self._worker(endpoint)))
+        while True:
+            await self.flush_requested.wait()
+            self.flush_requested.clear()
+            await self._flush()
+
+    async def _worker(self, endpoint):
+        wakeup = self.wakeups[endpoint.name]
+        inflight = asyncio.Semaphore(self.pool_size)
+        while True:
+            due = await self._db(self.queue.next_due, endpoint.name)
+            if due is None:
+                await wakeup.wait()
+            elif due > time.time():
+                try:
+                    await asyncio.wait_for(wakeup.wait(), due - time.time())
+                except asyncio.TimeoutError:
+                    pass
+            wakeup.clear()
+            # Let a burst accumulate so it goes out as one request
+            await asyncio.sleep(self.batch_window)
+            while True:
+                await inflight.acquire()
+                rows = await self._db(self.queue.claim, endpoint.name, self.max_batch)
+                if not rows:
+                    inflight.release()
+                    break
+                asyncio.ensure_future(self._deliver(endpoint, rows, inflight))
+
+    async def _deliver(self, endpoint, rows, inflight):
+        body = json.dumps({
+            "delivery_id": uuid.uuid4().hex,
+            "sent_at": time.time(),
+            "events": [{"id": r["id"], "event": r["event"], "created_at": r["created_at"], "data": r["data"]}
+                       for r in rows]
+        }, default=str).encode()
+        headers = {"Content-Type": "application/json", "User-Agent": "ccai-webhooks/1"}
+        if endpoint.secret:
+            headers[SIGNATURE_HEADER] = sign_payload(endpoint.secret, body)
+        try:
+            self.stats["requests"] += 1
+            status, response_headers = await self.pools[endpoint.name].post(body, headers)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as exc:
+            status, response_headers, error = None, {}, f"{type(exc).__name__}: {exc}"
+        else:
+            error = f"HTTP {status}"
+        finally:
+            inflight.release()
+
+        if status is not None and 200 <= status < 300:
+            await self._db(self.queue.complete, [r["id"] for r in rows])
+            self.stats["delivered"] += len(rows)
+            return
+        if status is None or status in RETRYABLE_STATUSES:
+            delay = backoff_delay(min(r["attempts"] for r in rows) + 1, self.rng, self.base_backoff)
+            retry_after = response_headers.get("retry-after", "")
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await self._db(self.queue.retry, rows, delay, error)
+            self.stats["retried"] += len(rows)
+        else:
+            await self._db(self.queue.fail, rows, error)
+            self.stats["dead"] += len(rows)
+        self.wakeups[endpoint.name].set()
+
+
+class LocalReceiver:
+    """Local HTTP stand-in for a webhook receiver; records deliveries and can fail on demand"""
+
+    def __init__(self, secret=None, fail_first=0, fail_status=503, retry_after=None):
+        self.secret = secret
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.request_times = []
+        self.connections = 0
+        self.deliveries = []
+        self.rejected = 0
+        self.handlers = set()
+        self.server = None
+        self.url = None
+
+    async def start(self, host="127.0.0.1", port=0, path="/webhook"):
+        self.server = await asyncio.start_server(self._handle, host, port)
+        self.url = f"http://{host}:{self.server.sockets[0].getsockname()[1]}{path}"
+        return self.url
+
+    @property
+    def events(self):
+        return [event for delivery in self.deliveries for event in delivery["events"]]
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.handlers.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                self.request_times.append(time.monotonic())
+                extra = ""
+                if self.requests <= self.fail_first:
+                    status = self.fail_status
+                    if self.retry_after is not None:
+                        extra = f"Retry-After: {self.retry_after}\r\n"
+                elif self.secret and not verify_signature(self.secret, body, headers.get(SIGNATURE_HEADER.lower())):
+                    status = 401
+                    self.rejected += 1
+                else:
+                    status = 200
+                    self.deliveries.append(json.loads(body))
+                writer.write(f"HTTP/1.1 {status} OK\r\nContent-Length: 0\r\n{extra}\r\n".encode())
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.handlers.discard(asyncio.current_task())
+            writer.close()
+
+    async def close(self):
+        self.server.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+
+async def demo(calls=50, events_per_call=20, queue_path=":memory:"):
+    """Deliver an escalation storm to a receiver that fails its first two requests"""
+    receiver = LocalReceiver(secret="demo-secret", fail_first=2)
+    url = await receiver.start()
+    dispatcher = WebhookDispatcher([Endpoint(url, "demo-secret", ["escalation_detected", "batch_complete"])],
+                                   queue_path, rng=random.Random(7))
+    dispatcher.start()
+    for i in range(events_per_call):
+        for call in range(calls):
+            dispatcher.publish("escalation_detected", {"call_id": f"call_{call}", "risk": 0.7 + i / 100},
+                               coalesce_key=f"call_{call}")
+    dispatcher.publish("batch_complete", {"job_id": "pii_demo", "documents": 100})
+    await dispatcher.drain()
+    print(f"published {calls * events_per_call + 1} events -> delivered {len(receiver.events)} "
+          f"in {len(receiver.deliveries)} requests over {receiver.connections} connection(s); "
+          f"{receiver.requests - len(receiver.deliveries)} failed attempts retried")
+    await dispatcher.close()
+    await receiver.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Webhook dispatcher")
+    parser.add_argument("--demo", action="store_true", help="deliver a burst to the local receiver")
+    args = parser.parse_args(argv)
+    if args.demo:
+        asyncio.run(demo())
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Agent workflows: natural-language definitions compiled to step state machines and run on asyncio.
+
+A workflow definition from the AI Workflow Builder (instructions, autonomy
+level, escalation threshold, allowed actions) compiles to a fixed sequence
+of steps with two transitions each: on to the next step, or over to the
+escalate step. Each running interaction is one coroutine, so thousands of
+instances share one event loop while they wait on lookups. Instance state
+is a 10-byte record in a NumPy structured array, so a runtime's state can
+be snapshotted to bytes and resumed after a restart.
+"""
+import asyncio
+import re
+
+import numpy as np
+
+from .guardrails import ALLOW, Guardrails
+from .sentiment import escalation_risk, score_text
+
+# Steps a workflow can use, and the instruction phrases that ask for them
+WORKFLOW_STEPS = ("analyze_sentiment", "lookup_account", "resolve", "escalate")
+STEP_PATTERNS = {
+    "analyze_sentiment": re.compile(r"sentiment|frustrat|emotion|mood|tone", re.I),
+    "lookup_account": re.compile(r"account|history|order|previous contact", re.I),
+    "resolve": re.compile(r"resolv|refund|fix|credit", re.I),
+    "escalate": re.compile(r"escalat|transfer|specialist|supervisor|hand ?off", re.I)
+}
+
+# Instance statuses; waiting means escalated and parked for a human
+RUNNING, WAITING, RESOLVED, FAILED = range(4)
+STATUS_NAMES = ("running", "waiting", "resolved", "failed")
+
+# Compact per-instance record: current step, status, sentiment and escalation risk
+INSTANCE_DTYPE = np.dtype([("step", "u1"), ("status", "u1"), ("sentiment", "<f4"), ("risk", "<f4")])
+
+MAX_CONCURRENCY = 2000
+
+
+class Workflow:
+    """A compiled workflow: ordered steps, each moving on to the next or over to escalate.
+
+    The resolve step only acts when the workflow's guardrails allow it.
+    """
+
+    def __init__(self, name, steps, autonomy_level="Semi-autonomous", escalation_threshold=0.7,
+                 allowed_actions=(), compliance_monitoring=True):
+        unknown = set(steps) - set(WORKFLOW_STEPS)
+        if unknown:
+            raise ValueError(f"unknown workflow steps: {sorted(unknown)}")
+        # Escalation is always reachable, and always last
+        self.steps = tuple(s for s in steps if s != "escalate") + ("escalate",)
+        self.escalate_step = len(self.steps) - 1
+        self.name = name
+        self.escalation_threshold = escalation_threshold
+        self.guardrails = Guardrails(autonomy_level, escalation_threshold, allowed_actions, compliance_monitoring)
+
+    def describe(self):
+        """The step sequence as shown on the builder, e.g. 'Analyze Sentiment → Resolve → Escalate'"""
+        return " → ".join(step.replace("_", " ").title() for step in self.steps)
+
+
+def compile_workflow(name, instructions, autonomy_level="Semi-autonomous", escalation_threshold=0.7,
+                     allowed_actions=(), compliance_monitoring=True):
+    """Compile builder settings into a Workflow, ordering steps as the instructions mention them"""
+    found = {}
+    for step, pattern in STEP_PATTERNS.items():
+        match = pattern.search(instructions)
+        if match:
+            found[step] = match.start()
+    steps = sorted(found, key=found.get) or list(WORKFLOW_STEPS)
+    return Workflow(name, steps, autonomy_level, escalation_threshold, allowed_actions, compliance_monitoring)
+
+
+class WorkflowRuntime:
+    """Run interactions through deployed workflows on the event loop.
+
+    accounts is an optional coroutine function customer_id -> account dict
+    (or None) used by the lookup step; without one the step reads the
+    interaction's own "account" field.
+    """
+
+    def __init__(self, accounts=None, max_concurrency=MAX_CONCURRENCY):
+        self.accounts = accounts
+        self.max_concurrency = max_concurrency
+        self.workflows = {}
+        self.instances = {}
+        self.errors = []
+
+    def deploy(self, workflow):
+        self.workflows[workflow.name] = workflow
+        self.instances.setdefault(workflow.name, [])
+        return workflow
+
+    def records(self, name):
+        """Every instance record of a workflow, in start order"""
+        return np.concatenate(self.instances[name]) if self.instances[name] else np.zeros(0, INSTANCE_DTYPE)
+
+    async def run(self, name, interactions):
+        """Start one instance per interaction dict and wait for all to finish or park; returns their indexes"""
+        # Each batch gets its own block of records, so concurrent runs never reallocate each other's
+        offset = sum(len(block) for block in self.instances[name])
+        block = np.zeros(len(interactions), dtype=INSTANCE_DTYPE)
+        self.instances[name].append(block)
+        await self._execute_all(name, ((block, i, offset + i, interaction) for i, interaction in enumerate(interactions)))
+        return range(offset, offset + len(interactions))
+
+    async def resume(self, name, interactions):
+        """Continue every running instance from its recorded step; interactions are indexed like the instances"""
+        jobs, offset = [], 0
+        for block in self.instances[name]:
+            for i in np.flatnonzero(block["status"] == RUNNING).tolist():
+                jobs.append((block, i, offset + i, interactions[offset + i]))
+            offset += len(block)
+        await self._execute_all(name, jobs)
+
+    async def _execute_all(self, name, jobs):
+        workflow, slots = self.workflows[name], asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(block, local, index, interaction):
+            async with slots:
+                await self._execute(workflow, block[local:local + 1], index, interaction)
+
+        await asyncio.gather(*(bounded(*job) for job in jobs))
+
+    async def _execute(self, workflow, record, index, interaction):
+        try:
+            while record["status"][0] == RUNNING:
+                step = int(record["step"][0])
+                proceed = await getattr(self, "_" + workflow.steps[step])(workflow, record, interaction)
+                if step == workflow.escalate_step:
+                    record["status"] = WAITING
+                elif not proceed:
+                    record["step"] = workflow.escalate_step
+                elif step + 1 == workflow.escalate_step:
+                    record["status"] = RESOLVED
+                else:
+                    record["step"] = step + 1
+        except Exception as exc:
+            record["status"] = FAILED
+            self.errors.append((workflow.name, index, f"{type(exc).__name__}: {exc}"))
+
+    async def _analyze_sentiment(self, workflow, record, interaction):
+        text = interaction.get("text", "")
+        score, _ = score_text(text)
+        risk = escalation_risk(score, text)["score"]
+        record["sentiment"], record["risk"] = score, risk
+        return risk < workflow.escalation_threshold
+
+    async def _lookup_account(self, workflow, record, interaction):
+        if self.accounts is None:
+            account = interaction.get("account")
+        else:
+            account = await self.accounts(interaction.get("customer_id"))
+        # Repeat contacts raise the risk of an automated answer
+        if account and account.get("recent_contacts", 0) >= 3:
+            record["risk"] = min(1.0, float(record["risk"][0]) + 0.1 * account["recent_contacts"])
+        return account is not None and float(record["risk"][0]) < workflow.escalation_threshold
+
+    async def _resolve(self, workflow, record, interaction):
+        verdict, _ = workflow.guardrails.check(interaction.get("action"), float(record["risk"][0]),
+                                               interaction.get("amount"), interaction.get("flagged", False),
+                                               workflow.name)
+        return verdict == ALLOW
+
+    async def _escalate(self, workflow, record, interaction):
+        return False
+
+    def counts(self, name=None):
+        """Instances per status for one workflow, or across all deployed workflows"""
+        names = [name] if name is not None else list(self.instances)
+        tally = np.zeros(len(STATUS_NAMES), dtype=np.int64)
+        for n in names:
+            tally += np.bincount(self.records(n)["status"], minlength=len(STATUS_NAMES))
+        return dict(zip(STATUS_NAMES, tally.tolist()))
+
+    def status(self, name, index):
+        return STATUS_NAMES[self.records(name)["status"][index]]
+
+    def snapshot(self, name):
+        """Every instance record of a workflow as bytes"""
+        return self.records(name).tobytes()
+
+    def restore(self, name, data):
+        """Reload instance records saved by snapshot(); the workflow must be deployed again first"""
+        self.instances[name] = [np.frombuffer(data, dtype=INSTANCE_DTYPE).copy()]
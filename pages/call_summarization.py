@@ -3,10 +3,9 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import time
-from datetime import datetime, timedelta
 import json
 from .common_header import show_header
+from core.summarization import summarize_transcript, render_markdown
 
 def show_call_summarization():
     show_header()
@@ -101,27 +100,9 @@ Agent: Thank you so much, Mr. Smith. You have a great day as well, and please do
             # Generate summary button
             if st.button("🚀 Generate Summary", type="primary"):
                 if user_transcript.strip():
-                    with st.spinner("Analyzing conversation... This may take a moment."):
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        # Simulate processing steps
-                        steps = [
-                            "Parsing conversation structure...",
-                            "Identifying key topics...",
-                            "Extracting customer information...",
-                            "Analyzing sentiment...",
-                            "Identifying action items...",
-                            "Generating summary..."
-                        ]
-                        
-                        for i, step in enumerate(steps):
-                            status_text.text(step)
-                            progress_bar.progress((i + 1) / len(steps))
-                            time.sleep(0.5)
-                        
-                        status_text.text("✅ Summary generated!")
-                        st.success("Call summary generated successfully!")
+                    with st.spinner("Analyzing conversation..."):
+                        summary = summarize_transcript(user_transcript, summary_length, include_sentiment, include_actions)
+                    st.success(f"Call summary generated successfully! {len(summary['action_items'])} action items found.")
                 else:
                     st.error("Please provide a transcript to summarize.")
         
@@ -130,77 +111,8 @@ Agent: Thank you so much, Mr. Smith. You have a great day as well, and please do
             
             # Sample generated summary
             if 'user_transcript' in locals() and user_transcript.strip():
-                summary_content = f"""
-**Call Summary Report**
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}*
-
----
-
-**📋 Basic Information**
-- **Customer:** John Smith
-- **Account:** AC-12345-6789  
-- **Contact:** john.smith@email.com, (555) 123-4567
-- **Agent:** Sarah
-- **Call Duration:** ~5 minutes
-- **Call Type:** Technical Support
-
----
-
-**🎯 Issue Summary**
-Customer unable to access account dashboard for 3 days due to login failures. Password reset emails not being received.
-
-**🔧 Root Cause**
-1. Account automatically locked after multiple failed login attempts
-2. Email provider blocking password reset emails
-
-**✅ Resolution**
-1. Account unlocked by agent
-2. Temporary password sent via SMS
-3. Email delivery settings updated
-4. Customer successfully logged in
-
----
-
-**😊 Sentiment Analysis**
-- **Initial Sentiment:** Frustrated (2/10)
-- **Final Sentiment:** Very Satisfied (9/10)
-- **Sentiment Trajectory:** ↗️ Improving throughout call
-- **Agent Performance:** Excellent (Patient, helpful, professional)
-
----
-
-**📋 Action Items**
-- ✅ Account unlocked and access restored
-- ✅ Temporary password sent via SMS  
-- ✅ Email delivery settings updated
-- 📧 Follow-up email with security tips (automated)
-
----
-
-**🏷️ Key Topics**
-- Account access issues
-- Password reset problems
-- Email delivery issues
-- Security verification
-- Customer authentication
-
----
-
-**📊 Call Metrics**
-- **Resolution Time:** 5 minutes
-- **First Call Resolution:** ✅ Yes
-- **Customer Satisfaction:** 9/10
-- **Issue Complexity:** Medium
-- **Escalation Required:** ❌ No
-
----
-
-**💡 Insights & Recommendations**
-1. **Process Improvement:** Consider implementing SMS as primary password reset method
-2. **Proactive Monitoring:** Set up alerts for email delivery failures
-3. **Customer Education:** Provide guidance on email security settings
-4. **Agent Recognition:** Sarah demonstrated excellent customer service skills
-                """
+                summary = summarize_transcript(user_transcript, summary_length, include_sentiment, include_actions)
+                summary_content = render_markdown(summary)
                 
                 st.markdown(summary_content)
                 
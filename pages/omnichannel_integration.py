@@ -6,6 +6,8 @@ import plotly.graph_objects as go
 import time
 from datetime import datetime, timedelta
 import random
+from core.demo_data import DEMO_JOURNEY_CASE, DEMO_JOURNEY_CUSTOMER, demo_journey_events
+from core.journey import CHANNEL_ICONS, JourneyLog, journey_summary
 from .common_header import show_header
 
 def show_omnichannel_integration():
@@ -49,13 +51,10 @@ def show_omnichannel_integration():
             # Current customer interaction simulation
             st.markdown("**🔴 Active Customer Interaction**")
             
-            customer_journey = {
-                "Customer": "Jennifer Walsh",
-                "Journey Stage": "Support → Sales → Billing",
-                "Channels Used": ["Phone", "Chat", "Email"],
-                "Context Preserved": "100%",
-                "Agent Handoffs": "0 (seamless transitions)"
-            }
+            journey = JourneyLog()
+            journey.append_many(demo_journey_events())
+            journey_timeline = journey.timeline(DEMO_JOURNEY_CUSTOMER)
+            customer_journey = journey_summary(journey_timeline, name="Jennifer Walsh")
             
             # Display customer journey
             for key, value in customer_journey.items():
@@ -67,20 +66,13 @@ def show_omnichannel_integration():
             # Channel timeline
             st.markdown("### 📅 Customer Journey Timeline")
             
-            journey_timeline = [
-                {"time": "09:15", "channel": "📞 Phone", "action": "Called about product issue", "status": "Resolved"},
-                {"time": "09:32", "channel": "💬 Chat", "action": "Asked about upgrade options", "status": "In Progress"},
-                {"time": "09:45", "channel": "📧 Email", "action": "Requested billing clarification", "status": "Pending"},
-                {"time": "09:52", "channel": "📞 Phone", "action": "Follow-up call for complete solution", "status": "Active"}
-            ]
-            
             for event in journey_timeline:
                 status_color = {"Resolved": "success", "In Progress": "info", "Pending": "warning", "Active": "error"}
                 
                 st.markdown(f"""
                 <div style="background: #f8f9fa; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; 
                             border-left: 4px solid {'#28a745' if event['status'] == 'Resolved' else '#17a2b8' if event['status'] == 'In Progress' else '#ffc107' if event['status'] == 'Pending' else '#dc3545'};">
-                    <strong>{event['time']}</strong> - {event['channel']}<br>
+                    <strong>{datetime.fromtimestamp(event['at']):%H:%M}</strong> - {CHANNEL_ICONS[event['channel']]} {event['channel']}<br>
                     {event['action']}<br>
                     <small><strong>Status:</strong> {event['status']}</small>
                 </div>
@@ -90,7 +82,7 @@ def show_omnichannel_integration():
             st.markdown("### 📋 Unified Case Management")
             
             case_details = {
-                "Case ID": "SF-2024-789456",
+                "Case ID": DEMO_JOURNEY_CASE,
                 "Product": "Enterprise Software Suite",
                 "Issue Type": "Technical + Billing + Upgrade",
                 "Priority": "High",
@@ -3,11 +3,11 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import time
 import re
 from datetime import datetime, timedelta
 import json
 from .common_header import show_header
+from core.pii import detect_pii, mask_text, summarize_detections, PII_PATTERNS
 
 def show_pii_detection():
     show_header()
@@ -126,89 +126,19 @@ Agent: Absolutely. I'll send that to john.smith@company.com right away. Your tic
             # Process button
             if st.button("🔍 Detect & Mask PII", type="primary"):
                 if original_text.strip():
-                    with st.spinner("Analyzing text for PII... This may take a moment."):
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        # Simulate processing steps
-                        steps = [
-                            "Tokenizing text...",
-                            "Running NER models...",
-                            "Pattern matching...",
-                            "Confidence scoring...",
-                            "Applying masking...",
-                            "Generating report..."
-                        ]
-                        
-                        for i, step in enumerate(steps):
-                            status_text.text(step)
-                            progress_bar.progress((i + 1) / len(steps))
-                            time.sleep(0.3)
-                        
-                        status_text.text("✅ PII detection complete!")
-                        st.success("PII detected and masked successfully!")
+                    with st.spinner("Analyzing text for PII..."):
+                        entities = detect_pii(original_text, pii_types, confidence_threshold, detection_mode)
+                    st.success(f"PII detected and masked successfully! {len(entities)} entities found.")
                 else:
                     st.error("Please provide text to analyze.")
         
         with col2:
             st.markdown("### 🛡️ Protected Text")
             
-            # Sample protected text based on masking method
+            # Protected text from the detection engine
             if 'original_text' in locals() and original_text.strip():
-                if masking_method == "Replacement Tags":
-                    protected_text = """
-Customer: Hi, my name is [PERSON_NAME] and I need help with my account. My email is [EMAIL_ADDRESS] and my phone number is [PHONE_NUMBER]. 
-
-Agent: Thank you [PERSON_NAME]. I'll need to verify your identity. Can you provide your social security number?
-
-Customer: Sure, it's [SSN]. Also, my date of birth is [DATE], and I live at [ADDRESS].
-
-Agent: Perfect. I can see your account now. Your credit card ending in [CREDIT_CARD] was charged [CURRENCY] yesterday. The billing address on file is [ADDRESS].
-
-Customer: That's correct. Can you also update my emergency contact? It should be my wife, [PERSON_NAME], at [PHONE_NUMBER].
-
-Agent: I've updated that information. Your account balance shows [CURRENCY]. Is there anything else I can help you with today?
-
-Customer: Actually, can you send the receipt to my work email? It's [EMAIL_ADDRESS]. My employee ID is [EMPLOYEE_ID].
-
-Agent: Absolutely. I'll send that to [EMAIL_ADDRESS] right away. Your ticket number for this interaction is [TICKET_NUMBER]. Have a great day!
-                    """
-                elif masking_method == "Asterisks":
-                    protected_text = """
-Customer: Hi, my name is John ***** and I need help with my account. My email is ****@******.com and my phone number is (***) ***-**67. 
-
-Agent: Thank you Mr. *****. I'll need to verify your identity. Can you provide your social security number?
-
-Customer: Sure, it's ***-**-*789. Also, my date of birth is ***** **, **85, and I live at *** Main Street, *******, ** *****.
-
-Agent: Perfect. I can see your account now. Your credit card ending in *567 was charged $***.** yesterday. The billing address on file is *** Main Street, *******, ** *****.
-
-Customer: That's correct. Can you also update my emergency contact? It should be my wife, ***** *****, at (***) ***-**43.
-
-Agent: I've updated that information. Your account balance shows $*,***.56. Is there anything else I can help you with today?
-
-Customer: Actually, can you send the receipt to my work email? It's ****@*******.com. My employee ID is ***-******.
-
-Agent: Absolutely. I'll send that to ****@*******.com right away. Your ticket number for this interaction is **-******. Have a great day!
-                    """
-                else:  # Partial Masking
-                    protected_text = """
-Customer: Hi, my name is John S*** and I need help with my account. My email is j***@email.com and my phone number is (555) ***-4567. 
-
-Agent: Thank you Mr. S***. I'll need to verify your identity. Can you provide your social security number?
-
-Customer: Sure, it's ***-45-6789. Also, my date of birth is March **, 1985, and I live at *** Main Street, Anytown, CA 90210.
-
-Agent: Perfect. I can see your account now. Your credit card ending in 4567 was charged $***.99 yesterday. The billing address on file is *** Main Street, Anytown, CA 90210.
-
-Customer: That's correct. Can you also update my emergency contact? It should be my wife, Sarah S***, at (555) ***-6543.
-
-Agent: I've updated that information. Your account balance shows $1,***.56. Is there anything else I can help you with today?
-
-Customer: Actually, can you send the receipt to my work email? It's j***@company.com. My employee ID is EMP-***123.
-
-Agent: Absolutely. I'll send that to j***@company.com right away. Your ticket number for this interaction is TK-***789. Have a great day!
-                    """
+                entities = detect_pii(original_text, pii_types, confidence_threshold, detection_mode)
+                protected_text = mask_text(original_text, entities, masking_method)
                 
                 st.text_area("Anonymized text:", protected_text, height=350)
                 
@@ -244,18 +174,9 @@ Agent: Absolutely. I'll send that to j***@company.com right away. Your ticket nu
         if 'original_text' in locals() and original_text.strip():
             st.markdown("### 🔍 Detection Results")
             
-            pii_data = {
-                'PII Type': ['Person Name', 'Email Address', 'Phone Number', 'SSN', 'Credit Card', 
-                           'Address', 'Date of Birth', 'Account Balance', 'Employee ID', 'Ticket Number'],
-                'Count': [3, 2, 2, 1, 1, 2, 1, 2, 1, 1],
-                'Confidence': [0.98, 0.99, 0.97, 0.99, 0.95, 0.92, 0.94, 0.88, 0.96, 0.91],
-                'Status': ['Masked', 'Masked', 'Masked', 'Masked', 'Masked', 
-                          'Masked', 'Masked', 'Masked', 'Masked', 'Masked'],
-                'Risk Level': ['High', 'High', 'Medium', 'Critical', 'High',
-                             'Medium', 'High', 'Low', 'Medium', 'Low']
-            }
+            pii_data = summarize_detections(entities)
             
-            pii_df = pd.DataFrame(pii_data)
+            pii_df = pd.DataFrame(pii_data, columns=['PII Type', 'Count', 'Confidence', 'Status', 'Risk Level'])
             
             # Color code by risk level
             def color_risk(val):
@@ -277,11 +198,11 @@ Agent: Absolutely. I'll send that to j***@company.com right away. Your ticket nu
             col_sum1, col_sum2, col_sum3, col_sum4 = st.columns(4)
             
             with col_sum1:
-                st.metric("Total PII Detected", len(pii_df), "entities")
+                st.metric("Total PII Detected", int(pii_df['Count'].sum()), "entities")
             with col_sum2:
-                st.metric("Critical Risk Items", len(pii_df[pii_df['Risk Level'] == 'Critical']), "🔴")
+                st.metric("Critical Risk Items", int(pii_df[pii_df['Risk Level'] == 'Critical']['Count'].sum()), "🔴")
             with col_sum3:
-                st.metric("Avg Confidence", f"{pii_df['Confidence'].mean():.2%}", "score")
+                st.metric("Avg Confidence", f"{pii_df['Confidence'].mean():.2%}" if len(pii_df) else "n/a", "score")
             with col_sum4:
                 st.metric("Protection Rate", "100%", "✅ Complete")
     
@@ -497,16 +418,10 @@ Agent: Absolutely. I'll send that to j***@company.com right away. Your ticket nu
         st.markdown("### 📚 Pattern Library")
         
         pattern_library = pd.DataFrame({
-            'Pattern Name': ['US Phone Number', 'Email Address', 'SSN', 'Credit Card', 'IP Address'],
-            'Regex Pattern': [
-                r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-                r'\b\d{3}-\d{2}-\d{4}\b',
-                r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
-                r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'
-            ],
-            'Confidence': [0.95, 0.98, 0.99, 0.92, 0.87],
-            'Status': ['Active', 'Active', 'Active', 'Active', 'Active']
+            'Pattern Name': list(PII_PATTERNS),
+            'Regex Pattern': [spec[0] for spec in PII_PATTERNS.values()],
+            'Confidence': [spec[1] for spec in PII_PATTERNS.values()],
+            'Status': ['Active'] * len(PII_PATTERNS)
         })
         
         st.dataframe(pattern_library, use_container_width=True)
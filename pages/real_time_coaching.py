@@ -5,8 +5,17 @@ import plotly.express as px
 import plotly.graph_objects as go
 import time
 from datetime import datetime, timedelta
-import random
 from .common_header import show_header
+from core.demo_data import (demo_interval_volumes, demo_completed_calls, demo_topic_calls, DEMO_CONVERSATION,
+                            DEMO_HOLIDAYS, DEMO_LIVE_CALL, DEMO_STAFFING_SLOTS)
+from core.forecasting import (staffing_recommendations, forecast_for_period, SeasonalForecaster, FORECAST_PERIODS,
+                              MODELLED_VARIABLES)
+from core.topics import TopicTrends
+from core.staffing import staffing_table, DEFAULT_AHT_SECONDS, SHRINKAGE, TARGET_SERVICE_LEVEL
+from core.scenarios import (evaluate_scenarios, matching, pareto_frontier, scenario_grid, scenario_rows, select,
+                            DEFAULT_GRID)
+from core.call_state import CallStateManager
+from core.roi import coaching_roi, simulate_coaching_roi, PRODUCTIVITY_GAIN, SATISFACTION_IMPROVEMENT, RESOLUTION_IMPROVEMENT
 
 def show_real_time_coaching():
     show_header()
@@ -49,14 +58,21 @@ def show_real_time_coaching():
             # Current call simulation
             st.markdown("**🔴 Live Call in Progress**")
             
-            call_info = {
-                "Agent": "Jessica Martinez",
-                "Customer": "David Thompson",
-                "Call Duration": "3:47",
-                "Issue Type": "Billing Dispute",
-                "Priority": "High",
-                "Customer Mood": "Frustrated"
-            }
+            # Live call state: earlier calls are replayed so the dashboard has today's totals
+            live = DEMO_LIVE_CALL
+            now = time.time()
+            calls = CallStateManager()
+            for call_id, started, ended in demo_completed_calls(live["agent"]):
+                calls.start(call_id, live["agent"], "Earlier caller", at=started)
+                calls.hang_up(call_id, at=ended)
+            calls.start(live["call_id"], live["agent"], live["customer"], live["issue_type"], live["priority"],
+                        at=now - live["elapsed_seconds"])
+            
+            # Utterances go through the call's coaching engine as they arrive
+            conversation = DEMO_CONVERSATION
+            fired_by_message = [calls.add_utterance(live["call_id"], msg) for msg in conversation]
+            call = calls.get(live["call_id"])
+            call_info = call.info(now)
             
             # Display call info
             col_info1, col_info2 = st.columns(2)
@@ -76,40 +92,20 @@ def show_real_time_coaching():
             # Real-time conversation
             st.markdown("### 💬 Live Conversation")
             
-            conversation = [
-                {"speaker": "Customer", "text": "I've been charged twice for the same service this month!", "mood": "angry"},
-                {"speaker": "Agent", "text": "I understand your frustration, Mr. Thompson. Let me look into your account right away.", "mood": "empathetic"},
-                {"speaker": "AI Coach", "text": "💡 Suggestion: Acknowledge the specific billing error and provide timeline for resolution", "mood": "coaching"}
-            ]
-            
-            for msg in conversation:
-                if msg["speaker"] == "AI Coach":
-                    st.info(f"**{msg['speaker']}:** {msg['text']}")
-                elif msg["mood"] == "angry":
+            # Coaching hints appear inline after the utterance that triggered them
+            for msg, fired in zip(conversation, fired_by_message):
+                if msg["mood"] == "angry":
                     st.error(f"**{msg['speaker']}:** {msg['text']}")
                 else:
                     st.success(f"**{msg['speaker']}:** {msg['text']}")
+                hint = next((rule["hint"] for rule in fired if rule["hint"]), None)
+                if hint:
+                    st.info(f"**AI Coach:** 💡 Suggestion: {hint}")
             
             # AI recommendations
             st.markdown("### 🤖 Real-Time AI Recommendations")
             
-            recommendations = {
-                "Immediate Actions": [
-                    "🔍 Check duplicate charges in billing system",
-                    "📧 Prepare refund authorization",
-                    "📞 Escalation path ready if needed"
-                ],
-                "Communication Style": [
-                    "🎯 Use direct, solution-focused language",
-                    "⏰ Provide specific timeline (2-3 minutes)",
-                    "💝 Offer gesture of goodwill (service credit)"
-                ],
-                "Mood Management": [
-                    "😌 Customer frustration decreasing",
-                    "🎯 Continue empathetic approach",
-                    "✅ Resolution confidence: High"
-                ]
-            }
+            recommendations = call.coaching.recommendations()
             
             for category, items in recommendations.items():
                 st.markdown(f"**{category}:**")
@@ -122,8 +118,7 @@ def show_real_time_coaching():
             # Performance metrics
             performance_metrics = {
                 "Today's Stats": {
-                    "Calls Handled": 23,
-                    "Avg Handle Time": "4:12",
+                    **calls.agent_stats(live["agent"]),
                     "Customer Satisfaction": 9.2,
                     "First Call Resolution": "96%"
                 },
@@ -194,7 +189,7 @@ def show_real_time_coaching():
             # Forecasting parameters
             forecast_period = st.selectbox(
                 "Forecast Period",
-                ["Next 24 Hours", "Next Week", "Next Month", "Next Quarter"]
+                FORECAST_PERIODS
             )
             
             variables_to_consider = st.multiselect(
@@ -204,57 +199,57 @@ def show_real_time_coaching():
                 default=["Historical Volume", "Weather Patterns", "Holidays"]
             )
             
-            # Generate predictive data
-            if forecast_period == "Next 24 Hours":
-                hours = list(range(24))
-                predicted_volume = [random.randint(50, 200) for _ in hours]
-                confidence = [random.uniform(0.85, 0.98) for _ in hours]
-                
-                forecast_df = pd.DataFrame({
-                    'Hour': hours,
-                    'Predicted_Volume': predicted_volume,
-                    'Confidence': confidence
-                })
-                
-                # Volume prediction chart
-                fig_forecast = px.line(
-                    forecast_df, 
-                    x='Hour', 
-                    y='Predicted_Volume',
-                    title='24-Hour Call Volume Forecast'
-                )
-                
-                # Add confidence interval
-                upper_bound = [vol * (1 + (1 - conf) * 0.5) for vol, conf in zip(predicted_volume, confidence)]
-                lower_bound = [vol * (1 - (1 - conf) * 0.5) for vol, conf in zip(predicted_volume, confidence)]
-                
-                fig_forecast.add_trace(go.Scatter(
-                    x=hours, y=upper_bound,
-                    fill=None, mode='lines',
-                    line_color='rgba(0,100,80,0)',
-                    showlegend=False
-                ))
-                
-                fig_forecast.add_trace(go.Scatter(
-                    x=hours, y=lower_bound,
-                    fill='tonexty', mode='lines',
-                    line_color='rgba(0,100,80,0)',
-                    name='Confidence Interval',
-                    fillcolor='rgba(0,100,80,0.2)'
-                ))
-                
-                st.plotly_chart(fig_forecast, use_container_width=True)
+            # Fit the seasonal model to the call history and forecast the selected period
+            holidays = DEMO_HOLIDAYS if "Holidays" in variables_to_consider else ()
+            volumes, history_start = demo_interval_volumes(holidays=DEMO_HOLIDAYS, rng=np.random.default_rng(7))
+            forecaster = SeasonalForecaster(trend="Historical Volume" in variables_to_consider)
+            forecaster.fit(volumes, history_start, holidays)
+            forecast = forecast_for_period(forecaster, forecast_period, holidays)
+            
+            unmodelled = [v for v in variables_to_consider if v not in MODELLED_VARIABLES]
+            if unmodelled:
+                st.caption(f"No data feed yet for: {', '.join(unmodelled)}")
+            
+            forecast_df = pd.DataFrame({
+                'Time': forecast['Time'],
+                'Predicted_Volume': forecast['Predicted_Volume'],
+                'Confidence': forecast['Confidence']
+            })
+            
+            # Volume prediction chart
+            fig_forecast = px.line(
+                forecast_df, 
+                x='Time', 
+                y='Predicted_Volume',
+                title=f'{forecast_period} Call Volume Forecast'
+            )
+            
+            # Add 90% prediction interval
+            fig_forecast.add_trace(go.Scatter(
+                x=forecast['Time'], y=forecast['Upper'],
+                fill=None, mode='lines',
+                line_color='rgba(0,100,80,0)',
+                showlegend=False
+            ))
+            
+            fig_forecast.add_trace(go.Scatter(
+                x=forecast['Time'], y=forecast['Lower'],
+                fill='tonexty', mode='lines',
+                line_color='rgba(0,100,80,0)',
+                name='Confidence Interval',
+                fillcolor='rgba(0,100,80,0.2)'
+            ))
+            
+            st.plotly_chart(fig_forecast, use_container_width=True)
             
             # Staffing recommendations
             st.markdown("### 👥 Dynamic Staffing Recommendations")
             
-            staffing_data = {
-                'Time Slot': ['8:00-10:00', '10:00-12:00', '12:00-14:00', '14:00-16:00', '16:00-18:00'],
-                'Predicted Volume': [150, 220, 180, 280, 160],
-                'Required Agents': [8, 12, 9, 15, 9],
-                'Current Staff': [6, 10, 8, 12, 8],
-                'Recommendation': ['Hire 2', 'Hire 2', 'Hire 1', 'Hire 3', 'Hire 1']
-            }
+            # Erlang C over the next 24 hourly forecasts, solved in one batch
+            next_day = forecaster.predict(24)
+            day_volume = next_day["mean"][0]
+            volume_by_hour = {(next_day["start"] + timedelta(hours=i)).hour: v for i, v in enumerate(day_volume)}
+            staffing_data = staffing_recommendations(staffing_table(DEMO_STAFFING_SLOTS, volume_by_hour))
             
             staffing_df = pd.DataFrame(staffing_data)
             st.dataframe(staffing_df, use_container_width=True)
@@ -464,13 +459,13 @@ def show_real_time_coaching():
         with col1:
             st.markdown("### 📊 Calabrio Trending Topics AI")
             
-            # Topic analysis
-            topic_data = {
-                'Topic': ['Billing Issues', 'Technical Support', 'Product Returns', 'Account Changes', 'Service Inquiries'],
-                'Volume': [1247, 892, 634, 445, 332],
-                'Trend': ['↗️ +15%', '↘️ -8%', '↗️ +23%', '→ Stable', '↗️ +12%'],
-                'Sentiment': [6.2, 7.8, 8.1, 7.9, 8.5]
-            }
+            # Topic analysis over the finished-call stream; the demo stream ends on a day
+            # boundary so the weekly sketch windows line up with its two weeks
+            stream_end = datetime.fromtimestamp(time.time() // 86400 * 86400)
+            topic_trends = TopicTrends()
+            for finished_at, transcript, call_sentiment in demo_topic_calls(stream_end):
+                topic_trends.observe(transcript, finished_at, call_sentiment)
+            topic_data = topic_trends.summary("week", stream_end.timestamp())
             
             # Volume by topic
             fig_topics = px.bar(
@@ -491,12 +486,7 @@ def show_real_time_coaching():
             # Proactive insights
             st.markdown("### 🔮 Proactive Insights")
             
-            insights = [
-                "🚨 **Alert:** Billing issues trending up 15% - investigate recent policy changes",
-                "✅ **Positive:** Product returns sentiment improving - new process working",
-                "📈 **Opportunity:** Technical support volume decreasing - knowledge base effective",
-                "🎯 **Action:** Service inquiries growing - consider FAQ expansion"
-            ]
+            insights = topic_trends.insights("week", stream_end.timestamp()) or ["→ No significant topic changes this week"]
             
             for insight in insights:
                 st.info(insight)
@@ -507,50 +497,53 @@ def show_real_time_coaching():
             # Workforce scenarios
             st.markdown("**Scenario Planning Dashboard:**")
             
-            scenario_type = st.selectbox(
-                "Workforce Scenario",
-                ["Current State", "15% Volume Increase", "Peak Season", "New Skill Addition"]
+            # Sweep the full what-if grid against the forecast day in one batch
+            scenarios = evaluate_scenarios(day_volume, scenario_grid())
+            
+            col_p1, col_p2 = st.columns(2)
+            with col_p1:
+                scenario_volume = st.select_slider("Volume Change (%)", DEFAULT_GRID["volume_change"].tolist(), 0,
+                                                   key="scenario_volume")
+                scenario_aht = st.select_slider("Average Handle Time (s)", DEFAULT_GRID["aht"].tolist(), 300)
+                scenario_efficiency = st.select_slider("Skill Efficiency (%)", DEFAULT_GRID["skill_efficiency"].tolist(),
+                                                       100, key="scenario_efficiency")
+            with col_p2:
+                scenario_shrinkage = st.select_slider("Shrinkage", DEFAULT_GRID["shrinkage"].tolist(), 0.3,
+                                                      format_func=lambda v: f"{v:.0%}")
+                scenario_target = st.select_slider("Service Level Target", DEFAULT_GRID["target_level"].tolist(), 0.8,
+                                                   format_func=lambda v: f"{v:.0%}")
+            
+            chosen = select(scenarios, volume_change=scenario_volume, aht=scenario_aht,
+                            skill_efficiency=scenario_efficiency, shrinkage=scenario_shrinkage,
+                            target_level=scenario_target)
+            scenario = scenario_rows(scenarios, [chosen])[0]
+            
+            col_s1, col_s2 = st.columns(2)
+            
+            with col_s1:
+                st.metric("Required Agents", scenario["Agents Required"])
+                st.metric("Weekly Cost", scenario["Cost"])
+            
+            with col_s2:
+                st.metric("Productivity", scenario["Skill Efficiency"])
+                st.metric("Service Level", scenario["Service Level"])
+            
+            # Cost/service trade-off for the chosen volume and handle time: volume and AHT are
+            # conditions, the rest are choices
+            conditions = matching(scenarios, volume_change=scenario_volume, aht=scenario_aht)
+            frontier = pareto_frontier(scenarios["cost"], scenarios["service_level"], conditions)
+            
+            fig_pareto = px.scatter(
+                x=scenarios["cost"][conditions], y=scenarios["service_level"][conditions] * 100,
+                labels={"x": "Weekly Cost ($)", "y": "Service Level (%)"},
+                title="Scenario Trade-offs (Pareto frontier highlighted)", opacity=0.35
             )
-            
-            workforce_scenarios = {
-                "Current State": {
-                    "Agents Required": 45,
-                    "Productivity": "100%",
-                    "Cost": "$67,500/week",
-                    "Service Level": "92%"
-                },
-                "15% Volume Increase": {
-                    "Agents Required": 52,
-                    "Productivity": "105%",
-                    "Cost": "$78,000/week",
-                    "Service Level": "91%"
-                },
-                "Peak Season": {
-                    "Agents Required": 68,
-                    "Productivity": "98%",
-                    "Cost": "$102,000/week",
-                    "Service Level": "89%"
-                },
-                "New Skill Addition": {
-                    "Agents Required": 48,
-                    "Productivity": "110%",
-                    "Cost": "$72,000/week",
-                    "Service Level": "94%"
-                }
-            }
-            
-            if scenario_type in workforce_scenarios:
-                scenario = workforce_scenarios[scenario_type]
-                
-                col_s1, col_s2 = st.columns(2)
-                
-                with col_s1:
-                    st.metric("Required Agents", scenario["Agents Required"])
-                    st.metric("Weekly Cost", scenario["Cost"])
-                
-                with col_s2:
-                    st.metric("Productivity", scenario["Productivity"])
-                    st.metric("Service Level", scenario["Service Level"])
+            fig_pareto.add_trace(go.Scatter(
+                x=scenarios["cost"][frontier], y=scenarios["service_level"][frontier] * 100,
+                mode="lines+markers", name="Pareto frontier"
+            ))
+            st.plotly_chart(fig_pareto, use_container_width=True)
+            st.dataframe(pd.DataFrame(scenario_rows(scenarios, frontier)), use_container_width=True)
             
             # Productivity improvements
             st.markdown("### 🚀 Productivity Improvements")
@@ -577,8 +570,15 @@ def show_real_time_coaching():
             volume_change = st.slider("Volume Change (%)", -50, 100, 0)
             skill_efficiency = st.slider("Skill Efficiency (%)", 80, 150, 100)
             
-            base_agents = 45
-            adjusted_agents = int(base_agents * (1 + volume_change/100) * (100/skill_efficiency))
+            # Baseline and adjusted scenarios re-solve the whole forecast day
+            whatif = evaluate_scenarios(day_volume, {
+                "volume_change": np.array([0.0, volume_change]),
+                "skill_efficiency": np.array([100.0, skill_efficiency]),
+                "shrinkage": np.full(2, SHRINKAGE),
+                "aht": np.full(2, float(DEFAULT_AHT_SECONDS)),
+                "target_level": np.full(2, TARGET_SERVICE_LEVEL)
+            })
+            base_agents, adjusted_agents = (int(a) for a in whatif["agents"])
             
             st.write(f"**Recommended Agents:** {adjusted_agents}")
             st.write(f"**Change from Baseline:** {adjusted_agents - base_agents:+d} agents")
@@ -607,18 +607,14 @@ def show_real_time_coaching():
             current_resolution = st.slider("Current First Call Resolution (%)", 50, 95, 75)
             
             # Calculate improvements
-            productivity_gain = 0.4  # 40% productivity gain
-            satisfaction_improvement = 1.8  # +1.8 points average
-            resolution_improvement = 0.15  # +15% FCR
-            
-            # Cost calculations
-            current_cost = current_agents * avg_salary
-            new_agents_needed = int(current_agents / (1 + productivity_gain))
-            cost_savings = (current_agents - new_agents_needed) * avg_salary
-            
-            # Quality improvements
-            new_satisfaction = min(10.0, current_satisfaction + satisfaction_improvement)
-            new_resolution = min(95.0, current_resolution + (resolution_improvement * 100))
+            roi = coaching_roi(current_agents, avg_salary, current_satisfaction, current_resolution)
+            productivity_gain = PRODUCTIVITY_GAIN
+            satisfaction_improvement = SATISFACTION_IMPROVEMENT
+            resolution_improvement = RESOLUTION_IMPROVEMENT
+            new_agents_needed = roi["new_agents_needed"]
+            cost_savings = roi["cost_savings"]
+            new_satisfaction = roi["new_satisfaction"]
+            new_resolution = roi["new_resolution"]
             
             # Display results
             st.markdown("### 📊 Projected Results")
@@ -634,15 +630,32 @@ def show_real_time_coaching():
                 st.metric("Productivity Gain", f"{productivity_gain*100:.0f}%", "Per agent efficiency")
             
             # ROI timeline
-            implementation_cost = 500000  # Estimated implementation cost
-            monthly_savings = cost_savings / 12
-            payback_months = implementation_cost / monthly_savings if monthly_savings > 0 else float('inf')
+            implementation_cost = roi["implementation_cost"]
+            monthly_savings = roi["monthly_savings"]
+            payback_months = roi["payback_months"]
             
             st.markdown(f"**ROI Metrics:**")
             st.write(f"- Implementation Cost: ${implementation_cost:,.0f}")
             st.write(f"- Monthly Savings: ${monthly_savings:,.0f}")
             st.write(f"- Payback Period: {payback_months:.1f} months")
-            st.write(f"- 3-Year ROI: {((cost_savings * 3 - implementation_cost) / implementation_cost * 100):.0f}%")
+            st.write(f"- 3-Year ROI: {roi['roi_3_year']:.0f}%")
+            
+            # Monte-Carlo ranges around the plan
+            simulated = simulate_coaching_roi(current_agents, avg_salary)
+            payback, roi_3_year = simulated["payback_months"], simulated["roi_3_year"]
+            st.markdown("**Uncertainty (100k simulated outcomes):**")
+            st.write(f"- Payback Period: {payback['p50']:.1f} months (90% range {payback['p5']:.1f}–{payback['p95']:.1f})")
+            st.write(f"- 3-Year ROI: {roi_3_year['p50']:.0f}% (90% range {roi_3_year['p5']:.0f}%–{roi_3_year['p95']:.0f}%)")
+            st.write(f"- Chance of paying back within 3 years: {simulated['pays_back']:.0%}")
+            
+            counts, edges = roi_3_year["histogram"]
+            fig_roi = px.bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=counts,
+                title="3-Year ROI Distribution",
+                labels={'x': '3-Year ROI (%)', 'y': 'Simulated Outcomes'}
+            )
+            st.plotly_chart(fig_roi, use_container_width=True)
         
         with col2:
             st.markdown("### 📈 Market Benchmarks")
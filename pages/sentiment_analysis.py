@@ -3,10 +3,10 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import time
 from datetime import datetime, timedelta
 import json
 from .common_header import show_header
+from core.sentiment import analyze_conversation
 
 def show_sentiment_analysis():
     show_header()
@@ -140,27 +140,9 @@ Customer: You too, Sarah. Thanks again!
             # Analyze button
             if st.button("📊 Analyze Sentiment", type="primary"):
                 if conversation_text.strip():
-                    with st.spinner("Analyzing sentiment... This may take a moment."):
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        # Simulate processing steps
-                        steps = [
-                            "Tokenizing conversation...",
-                            "Identifying speakers...",
-                            "Running sentiment models...",
-                            "Detecting emotions...",
-                            "Calculating scores...",
-                            "Generating insights..."
-                        ]
-                        
-                        for i, step in enumerate(steps):
-                            status_text.text(step)
-                            progress_bar.progress((i + 1) / len(steps))
-                            time.sleep(0.4)
-                        
-                        status_text.text("✅ Sentiment analysis complete!")
-                        st.success("Sentiment analysis completed successfully!")
+                    with st.spinner("Analyzing sentiment..."):
+                        analysis = analyze_conversation(conversation_text)
+                    st.success(f"Sentiment analysis completed! {len(analysis['utterances'])} utterances scored.")
                 else:
                     st.error("Please provide a conversation to analyze.")
         
@@ -168,25 +150,17 @@ Customer: You too, Sarah. Thanks again!
             st.markdown("### 📈 Sentiment Timeline")
             
             if 'conversation_text' in locals() and conversation_text.strip():
-                # Generate sample timeline data based on the conversation
-                time_points = list(range(0, 300, 15))  # 5-minute call, 15-second intervals
-                
-                # Simulate sentiment progression that matches the conversation flow
-                agent_sentiment = [0.8, 0.8, 0.9, 0.85, 0.9, 0.85, 0.9, 0.9, 0.85, 0.9, 0.9, 0.85, 0.9, 0.9, 0.8, 0.85, 0.9, 0.9, 0.85, 0.9]
-                customer_sentiment = [-0.4, -0.6, -0.5, -0.3, -0.2, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.8, 0.9, 0.9, 0.9, 0.8, 0.9, 0.9]
-                
-                sentiment_df = pd.DataFrame({
-                    'Time (seconds)': time_points,
-                    'Agent Sentiment': agent_sentiment,
-                    'Customer Sentiment': customer_sentiment
-                })
+                analysis = analyze_conversation(conversation_text)
+                utterances = analysis['utterances']
+                agent_rows = [u for u in utterances if u['Speaker'].lower() == 'agent']
+                customer_rows = [u for u in utterances if u['Speaker'].lower() != 'agent']
                 
                 # Create sentiment timeline
                 fig = go.Figure()
                 
                 fig.add_trace(go.Scatter(
-                    x=sentiment_df['Time (seconds)'],
-                    y=sentiment_df['Agent Sentiment'],
+                    x=[u['Time'] for u in agent_rows],
+                    y=[u['Score'] for u in agent_rows],
                     mode='lines+markers',
                     name='Agent',
                     line=dict(color='#667eea', width=3),
@@ -194,8 +168,8 @@ Customer: You too, Sarah. Thanks again!
                 ))
                 
                 fig.add_trace(go.Scatter(
-                    x=sentiment_df['Time (seconds)'],
-                    y=sentiment_df['Customer Sentiment'],
+                    x=[u['Time'] for u in customer_rows],
+                    y=[u['Score'] for u in customer_rows],
                     mode='lines+markers', 
                     name='Customer',
                     line=dict(color='#28a745', width=3),
@@ -221,13 +195,19 @@ Customer: You too, Sarah. Thanks again!
                 # Key moments annotation
                 st.markdown("### 🎯 Key Sentiment Moments")
                 
-                moments = [
-                    {"time": "0:00-0:45", "event": "Customer Initial Frustration", "sentiment": "Very Negative (-0.6)", "color": "🔴"},
-                    {"time": "0:45-1:30", "event": "Agent Empathy & Acknowledgment", "sentiment": "Improving (-0.3)", "color": "🟡"},
-                    {"time": "1:30-2:30", "event": "Problem Identification", "sentiment": "Neutral to Positive (+0.3)", "color": "🟢"},
-                    {"time": "2:30-4:00", "event": "Solution Implementation", "sentiment": "Positive (+0.7)", "color": "🟢"},
-                    {"time": "4:00-5:00", "event": "Customer Satisfaction", "sentiment": "Very Positive (+0.9)", "color": "🟢"}
-                ]
+                # Key moments are the customer's turning points: start, low, high and end
+                moments = []
+                if customer_rows:
+                    lowest = min(customer_rows, key=lambda u: u['Score'])
+                    highest = max(customer_rows, key=lambda u: u['Score'])
+                    for label, row in [("Opening", customer_rows[0]), ("Lowest Point", lowest),
+                                       ("Highest Point", highest), ("Closing", customer_rows[-1])]:
+                        moments.append({
+                            "time": f"{int(row['Time'] // 60)}:{int(row['Time'] % 60):02d}",
+                            "event": f"{label}: {row['Utterance'][:60]}...",
+                            "sentiment": f"{row['Sentiment']} ({row['Score']:+.1f})",
+                            "color": "🔴" if row['Score'] < -0.1 else "🟡" if row['Score'] <= 0.1 else "🟢"
+                        })
                 
                 for moment in moments:
                     st.markdown(f"""
@@ -261,23 +241,10 @@ Customer: You too, Sarah. Thanks again!
                 # Utterance-level analysis
                 st.markdown("#### 💬 Utterance-level Sentiment")
                 
-                utterance_data = {
-                    'Speaker': ['Agent', 'Customer', 'Agent', 'Customer', 'Agent', 'Customer', 'Agent', 'Customer'],
-                    'Utterance': [
-                        'Thank you for calling TechSupport Plus...',
-                        'Hi Sarah, I\'m really frustrated right now...',
-                        'I\'m so sorry to hear about this frustration...',
-                        'Well, I hope you can actually help...',
-                        'I sincerely apologize for your previous experience...',
-                        'Finally! Someone who seems to know...',
-                        'I can see that your account was locked...',
-                        'Perfect! I just got the text and I\'m able to log in...'
-                    ],
-                    'Sentiment': ['Positive', 'Very Negative', 'Empathetic', 'Negative', 'Apologetic', 'Hopeful', 'Informative', 'Very Positive'],
-                    'Score': [0.8, -0.6, 0.9, -0.3, 0.85, 0.4, 0.7, 0.9],
-                    'Confidence': [0.92, 0.95, 0.88, 0.91, 0.89, 0.86, 0.93, 0.96],
-                    'Emotions': ['Professional', 'Frustrated, Angry', 'Empathetic, Caring', 'Skeptical', 'Apologetic', 'Relieved', 'Helpful', 'Grateful, Happy']
-                }
+                utterance_data = [
+                    {key: u[key] for key in ('Speaker', 'Utterance', 'Sentiment', 'Score', 'Confidence', 'Emotions')}
+                    for u in utterances
+                ]
                 
                 utterance_df = pd.DataFrame(utterance_data)
                 st.dataframe(utterance_df, use_container_width=True)
@@ -285,15 +252,16 @@ Customer: You too, Sarah. Thanks again!
             with col_res2:
                 st.markdown("#### 📊 Summary Metrics")
                 
-                st.metric("Overall Satisfaction", "8.7/10", "+6.3 improvement")
-                st.metric("Agent Performance", "9.2/10", "Excellent")
-                st.metric("Resolution Success", "✅ Yes", "First call")
-                st.metric("Escalation Risk", "0%", "No risk detected")
+                improvement = (analysis['final_sentiment'] - analysis['initial_sentiment']) * 5
+                risk = analysis['escalation_risk']
+                st.metric("Overall Satisfaction", f"{analysis['overall_satisfaction']}/10", f"{improvement:+.1f} improvement")
+                st.metric("Agent Performance", f"{analysis['agent_performance']}/10", analysis['trajectory'].capitalize())
+                st.metric("Escalation Risk", f"{risk['score']:.0%}", risk['level'].capitalize())
                 
                 # Emotion distribution
                 emotion_data = pd.DataFrame({
-                    'Emotion': ['Happy', 'Grateful', 'Frustrated', 'Relieved', 'Professional'],
-                    'Percentage': [35, 25, 15, 15, 10]
+                    'Emotion': list(analysis['emotion_distribution']),
+                    'Percentage': list(analysis['emotion_distribution'].values())
                 })
                 
                 fig_emotion = px.pie(emotion_data, values='Percentage', names='Emotion',
@@ -307,14 +275,14 @@ Customer: You too, Sarah. Thanks again!
             insights_col1, insights_col2 = st.columns(2)
             
             with insights_col1:
-                st.markdown("""
-                **🎯 Key Insights:**
-                - Customer started highly frustrated (-0.6) but ended very satisfied (+0.9)
-                - Agent demonstrated excellent empathy and problem-solving skills
-                - Sentiment trajectory shows consistent improvement throughout call
-                - No escalation triggers detected
-                - Resolution achieved within acceptable timeframe
-                """)
+                insights = [
+                    f"Customer started at {analysis['initial_sentiment']:+.1f} and ended at {analysis['final_sentiment']:+.1f}",
+                    f"Sentiment trajectory is {analysis['trajectory']}",
+                    f"Escalation risk is {analysis['escalation_risk']['level']}"
+                    + (f" ({', '.join(analysis['escalation_risk']['triggers'])})" if analysis['escalation_risk']['triggers'] else ""),
+                    f"Call length approximately {analysis['duration'] / 60:.1f} minutes"
+                ]
+                st.markdown("**🎯 Key Insights:**\n" + "\n".join(f"- {insight}" for insight in insights))
             
             with insights_col2:
                 st.markdown("""
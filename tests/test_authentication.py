@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+from core.authentication import (authenticate, behavioral_check, confidence_bounds, fit_calibration, fuse,
+                                 fused_log_odds, run_authentication, voice_check)
+from core.behavioral import BehavioralEngine
+from core.demo_data import demo_behavior_events, demo_call_audio
+
+
+def fixed(confidence, delay=0.0, details=None):
+    async def check():
+        await asyncio.sleep(delay)
+        return confidence, details or {}
+    return check
+
+
+def test_checks_run_concurrently():
+    checks = {name: fixed(97, delay=0.2) for name in ("Voice Biometrics", "Behavioral Analysis", "Device Fingerprinting")}
+    started = time.perf_counter()
+    result = run_authentication(checks, early_exit=False)
+    assert time.perf_counter() - started < 0.35
+    assert result["decision"] == "success" and result["overall_confidence"] >= 95
+
+
+def test_more_agreeing_factors_raise_confidence():
+    one = fuse({"Voice Biometrics": 95})
+    two = fuse({"Voice Biometrics": 95, "Behavioral Analysis": 95})
+    assert one < two
+    assert fuse({}) == 50.0
+
+
+def test_single_factor_keeps_its_own_confidence():
+    assert fuse({"Geographic Verification": 95}) == 95.0
+    assert fuse({"Voice Biometrics": 94.7}) == 94.7
+    run = lambda factor, confidence: run_authentication({factor: fixed(confidence)})["decision"]
+    assert run("Geographic Verification", 95) == "success"
+    assert run("Device Fingerprinting", 96) == "success"
+    assert run("Voice Biometrics", 94.7) == "step_up"
+    assert run("Behavioral Analysis", 80) == "step_up"
+    assert run("Voice Biometrics", 79) == "failed"
+
+
+def test_timeout_and_errors_contribute_no_evidence():
+    async def broken():
+        raise RuntimeError("lookup failed")
+
+    result = run_authentication({
+        "Voice Biometrics": fixed(97),
+        "Device Fingerprinting": fixed(99, delay=1),
+        "Geographic Verification": broken
+    }, timeouts={"Device Fingerprinting": 0.05}, early_exit=False)
+    factors = result["factors"]
+    assert factors["Device Fingerprinting"]["status"] == "timeout"
+    assert factors["Geographic Verification"]["status"] == "error"
+    assert "lookup failed" in factors["Geographic Verification"]["details"]["Status"]
+    assert result["overall_confidence"] == fuse({"Voice Biometrics": 97}, factors=factors)
+    assert result["overall_confidence"] < fuse({"Voice Biometrics": 97})
+    assert result["decision"] == "step_up"
+
+
+def test_early_exit_cancels_checks_that_cannot_change_the_decision():
+    result = run_authentication({
+        "Voice Biometrics": fixed(99),
+        "Behavioral Analysis": fixed(98),
+        "Device Fingerprinting": fixed(99, delay=0.01),
+        "Geographic Verification": fixed(10, delay=5)
+    })
+    assert result["early_exit"] and result["elapsed"] < 1
+    assert result["factors"]["Geographic Verification"]["status"] == "skipped"
+    assert result["decision"] == "success"
+    low, high = confidence_bounds({"Voice Biometrics": 99}, ["Behavioral Analysis"])
+    assert low < fuse({"Voice Biometrics": 99, "Behavioral Analysis": 50}) < high
+
+
+def test_fit_calibration_separates_outcomes():
+    log_odds = [-3, -2, -1.5, 1, 2.5, 4]
+    scale, bias = fit_calibration(log_odds, [0, 0, 0, 1, 1, 1])
+    assert scale > 0
+    assert fuse({"Voice Biometrics": 99}, calibration=(scale, bias)) > 50
+    assert fused_log_odds({"Voice Biometrics": 50}) == 0
+
+
+def test_engine_adapters_feed_the_pipeline():
+    engine = BehavioralEngine()
+    for seed in range(5):
+        engine.start_session(seed, "C")
+        engine.observe_many(seed, demo_behavior_events(seed=seed))
+        engine.end_session(seed)
+    engine.start_session("live", "C")
+    engine.observe_many("live", demo_behavior_events(seed=42))
+    verification = {"match": True, "confidence": 96.0}
+
+    result = run_authentication({
+        "Voice Biometrics": voice_check(demo_call_audio(seed=1), lambda: verification),
+        "Behavioral Analysis": behavioral_check(engine, "live")
+    }, early_exit=False)
+    voice = result["factors"]["Voice Biometrics"]
+    assert voice["status"] == "ok" and voice["confidence"] <= 96.0
+    assert voice["details"]["Voiceprint Match"].startswith("✅")
+    assert result["factors"]["Behavioral Analysis"]["confidence"] > 80
+
+    short = asyncio.run(authenticate({"Voice Biometrics": voice_check(demo_call_audio(seconds=0.5))}))
+    assert short["factors"]["Voice Biometrics"]["status"] == "error"
@@ -0,0 +1,89 @@
+import math
+
+from core.behavioral import (BehaviorFeatures, BehavioralEngine, LogHistogram, ProfileStore, RunningStats,
+                             score_session)
+from core.demo_data import demo_behavior_events
+
+
+def enrolled_engine(store=None, sessions=5):
+    engine = BehavioralEngine(store)
+    for seed in range(sessions):
+        engine.start_session(seed, "CUST-1")
+        engine.observe_many(seed, demo_behavior_events(seed=seed))
+        engine.end_session(seed)
+    return engine
+
+
+def live_assessment(engine, **kwargs):
+    engine.start_session("live", "CUST-1")
+    engine.observe_many("live", demo_behavior_events(**kwargs))
+    return engine.assess("live")
+
+
+def test_running_stats_merge_matches_single_pass():
+    values = [0.5, 1.5, 2.0, 4.0, 7.5, 3.25]
+    single, left, right = RunningStats(), RunningStats(), RunningStats()
+    for v in values:
+        single.add(v)
+    for v in values[:2]:
+        left.add(v)
+    for v in values[2:]:
+        right.add(v)
+    left.merge(right)
+    assert math.isclose(left.mean, single.mean) and math.isclose(left.std, single.std)
+
+
+def test_histogram_bins_and_distance():
+    a, b = LogHistogram(), LogHistogram()
+    for seconds in (0.001, 0.1, 0.1, 1000):
+        a.add(seconds)
+    assert a.counts[0] == 1 and a.counts[-1] == 1 and a.total == 4
+    b.merge(a)
+    assert a.hellinger(b) == 0
+    c = LogHistogram()
+    c.add(5)
+    assert a.hellinger(c) == 1
+
+
+def test_session_features_are_fixed_size():
+    features = BehaviorFeatures()
+    for event in demo_behavior_events(pages=40, seed=1):
+        features.observe(event)
+    stored = features.to_dict()
+    assert all(len(counts) == 16 for counts in stored["histograms"].values())
+    assert all(len(values) == 3 for values in stored["stats"].values())
+    restored = BehaviorFeatures.from_dict(stored)
+    assert score_session(restored, features)[0]["score"] == 0
+
+
+def test_genuine_session_scores_low_and_scripted_session_high():
+    engine = enrolled_engine()
+    genuine = live_assessment(engine, seed=42)
+    engine.end_session("live", enroll=False)
+    scripted = live_assessment(engine, seed=43, scripted=True, pace=0.5)
+    assert genuine["risk_level"].endswith("LOW RISK")
+    assert scripted["risk_level"].endswith("HIGH RISK")
+    assert [f["factor"] for f in scripted["factors"]][:2] == ["Typing Rhythm", "Mouse Movement"]
+    navigation = scripted["factors"][2]
+    assert navigation["status"].startswith("🔴") and "faster than usual" in navigation["description"]
+
+
+def test_unknown_customer_has_no_assessment_and_sparse_factors_are_flagged():
+    engine = BehavioralEngine()
+    engine.start_session("s", "NEW")
+    engine.observe("s", {"type": "page", "t": 0})
+    assert engine.assess("s") is None
+    factors = score_session(BehaviorFeatures(), BehaviorFeatures())
+    assert all(f["score"] == 0 and f["status"].startswith("⚪") for f in factors)
+
+
+def test_profiles_persist_without_raw_events(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    enrolled_engine(ProfileStore(path)).store.close()
+    store = ProfileStore(path)
+    profile = store.get("CUST-1")
+    assert profile.histograms["key_dwell"].total > 0 and store.get("CUST-2") is None
+    engine = BehavioralEngine(store)
+    assert live_assessment(engine, seed=42)["total_risk"] < 50
+    engine.end_session("live")
+    assert engine.sessions == {} and store.get("CUST-1").stats["velocity"].n > profile.stats["velocity"].n
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from core.call_state import CallStateManager, LiveCall, mood_of
+from core.demo_data import DEMO_CONVERSATION, demo_completed_calls
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_call_lifecycle_and_dashboard_totals():
+    clock = FakeClock()
+    calls = CallStateManager(clock=clock)
+    calls.start("c1", "Jessica", "David", "Billing Dispute", "High", at=clock.now - 227)
+    fired = [calls.add_utterance("c1", msg) for msg in DEMO_CONVERSATION]
+    assert any(rule["rule"] == "duplicate_charge" for rule in fired[0])
+
+    info = calls.get("c1").info(clock.now)
+    assert info["Call Duration"] == "3:47"
+    assert info["Issue Type"] == "Billing Dispute"
+    assert info["Customer Mood"] in ("Frustrated", "Neutral", "Satisfied")
+
+    snapshot = calls.snapshot()
+    assert snapshot["active_calls"] == 1
+    assert snapshot["active_call_suggestions"] == calls.get("c1").suggestions > 0
+    assert sum(snapshot["moods"].values()) == 1
+
+    calls.hang_up("c1", at=clock.now + 13)
+    assert calls.get("c1") is None
+    snapshot = calls.snapshot()
+    assert snapshot["active_calls"] == 0 and snapshot["completed_calls"] == 1
+    assert snapshot["average_handle_seconds"] == 240
+    assert snapshot["active_call_suggestions"] == 0 and sum(snapshot["moods"].values()) == 0
+    assert calls.agent_stats("Jessica")["Avg Handle Time"] == "4:00"
+    assert calls.hang_up("c1") is None
+
+
+def test_transcript_tail_is_bounded_and_mood_tracks_sentiment():
+    calls = CallStateManager(tail_size=5, clock=FakeClock())
+    calls.start("c1", "A", "B")
+    with pytest.raises(ValueError):
+        calls.start("c1", "A", "B")
+    for i in range(12):
+        calls.add_utterance("c1", {"speaker": "Customer", "text": f"this is terrible and useless {i}", "t": i})
+    call = calls.get("c1")
+    assert len(call.transcript) == 5 and call.transcript[0][2].endswith("7")
+    assert call.mood == "Frustrated"
+    assert calls.snapshot()["moods"]["Frustrated"] == 1
+    assert mood_of(None) == "Neutral" and mood_of(0.8) == "Satisfied"
+    with pytest.raises(KeyError):
+        calls.add_utterance("missing", {"speaker": "Agent", "text": "hi"})
+
+
+def test_live_calls_are_slotted():
+    assert not hasattr(LiveCall("c", "a", "b", "i", "p", 0, None, 5), "__dict__")
+
+
+def test_evict_idle_hangs_up_silent_calls():
+    clock = FakeClock()
+    calls = CallStateManager(clock=clock)
+    calls.start("quiet", "A", "B", at=clock.now - 2000)
+    calls.start("busy", "A", "C", at=clock.now - 2000)
+    calls.add_utterance("quiet", {"speaker": "Agent", "text": "one moment", "t": clock.now - 1500, "duration": 5})
+    calls.add_utterance("busy", {"speaker": "Agent", "text": "still here", "t": clock.now - 10})
+    assert calls.evict_idle(900) == 1
+    assert calls.get("quiet") is None and calls.get("busy") is not None
+    assert calls.agent_stats("A")["Calls Handled"] == 1 and calls.agent_stats("A")["Active Calls"] == 1
+    # The idle stretch after the last utterance is not handle time
+    assert calls.snapshot()["average_handle_seconds"] == 505
+
+
+def test_thousands_of_concurrent_calls_with_lock_free_reader():
+    calls = CallStateManager(clock=FakeClock())
+    snapshots = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            snapshot = calls.snapshot()
+            snapshots.append(snapshot["active_calls"] == sum(snapshot["moods"].values()))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for i in range(3000):
+            calls.start(i, f"agent-{i % 50}", f"customer-{i}")
+        for i in range(3000):
+            calls.add_utterance(i, DEMO_CONVERSATION[i % 3])
+        for i in range(0, 3000, 2):
+            calls.hang_up(i)
+    finally:
+        stop.set()
+        thread.join()
+    assert len(calls) == 1500
+    assert calls.snapshot()["completed_calls"] == 1500
+    assert snapshots and all(snapshots)
+
+
+def test_demo_completed_calls_feed_agent_stats():
+    calls = CallStateManager()
+    for call_id, started, ended in demo_completed_calls("Jessica", count=23):
+        calls.start(call_id, "Jessica", "Earlier caller", at=started)
+        calls.hang_up(call_id, at=ended)
+    assert calls.agent_stats("Jessica")["Calls Handled"] == 23
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from core.coaching import CATEGORIES, CoachingSession, coach_conversation, compile_rules
+
+CONVERSATION = [
+    {"speaker": "Customer", "text": "I've been charged twice for the same service this month!", "mood": "angry"},
+    {"speaker": "Agent", "text": "I understand your frustration, Mr. Thompson. Let me look into your account right away."},
+    {"speaker": "Customer", "text": "Okay, thank you. How long will the refund take?"}
+]
+
+
+def fired_rules(session, utterance):
+    return [rule["rule"] for rule in session.observe(utterance)]
+
+
+def test_keyword_rules_fire_for_the_right_speaker():
+    session = CoachingSession()
+    assert "duplicate_charge" in fired_rules(session, dict(CONVERSATION[0], t=0))
+    assert fired_rules(session, {"speaker": "Agent", "text": "Were you charged twice?", "t": 1}) == []
+    assert session.coach_message().startswith("💡 Suggestion: Acknowledge the specific billing error")
+
+
+def test_recommendations_use_page_categories():
+    session = coach_conversation(CONVERSATION)
+    recommendations = session.recommendations()
+    assert tuple(recommendations) == CATEGORIES
+    assert recommendations["Immediate Actions"][:2] == ["🔍 Check duplicate charges in billing system",
+                                                        "📧 Prepare refund authorization"]
+    assert "⏰ Provide specific timeline (2-3 minutes)" in recommendations["Communication Style"]
+    assert "😌 Customer frustration decreasing" in recommendations["Mood Management"]
+    assert recommendations["Mood Management"][-1] == "✅ Resolution confidence: High"
+
+
+def test_sentiment_drop_silence_and_talk_ratio():
+    session = CoachingSession()
+    session.observe({"speaker": "Customer", "text": "Thanks, that is great, really helpful", "t": 0})
+    assert "mood_drop" in fired_rules(session, {"speaker": "Customer", "text": "This is terrible and useless", "t": 5})
+    assert "long_silence" in fired_rules(session, {"speaker": "Agent", "text": "Sorry for the wait", "t": 30})
+
+    session = CoachingSession()
+    session.observe({"speaker": "Customer", "text": "Hi", "t": 0})
+    rules = fired_rules(session, {"speaker": "Agent", "text": " ".join(["word"] * 40), "t": 1})
+    assert "agent_dominating" in rules
+
+
+def test_cooldown_suppresses_repeats():
+    session = CoachingSession(cooldown=60)
+    assert "duplicate_charge" in fired_rules(session, dict(CONVERSATION[0], t=0))
+    assert "duplicate_charge" not in fired_rules(session, dict(CONVERSATION[0], t=30))
+    assert "duplicate_charge" in fired_rules(session, dict(CONVERSATION[0], t=61))
+
+
+def test_custom_rules_and_validation():
+    rules = [{"id": "angry", "category": "Mood Management", "when": {"mood": ["angry"]},
+              "suggestions": ["🧊 Lower your pace"], "hint": "Slow down"}]
+    session = CoachingSession(rules)
+    assert fired_rules(session, dict(CONVERSATION[0], t=0)) == ["angry"]
+    assert fired_rules(session, dict(CONVERSATION[1], t=100)) == []
+    with pytest.raises(ValueError):
+        compile_rules([{"id": "x", "category": "Other", "when": {}, "suggestions": []}])
+
+
+def test_rule_evaluation_is_sub_millisecond():
+    session = CoachingSession(compile_rules())
+    count = 2000
+    started = time.perf_counter()
+    for i in range(count):
+        session.observe(dict(CONVERSATION[i % 3], t=i * 4.0))
+    assert (time.perf_counter() - started) / count < 0.001
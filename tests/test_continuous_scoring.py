@@ -0,0 +1,51 @@
+from core.continuous_scoring import PRIOR_RISK, ContinuousScorer, score_windows
+
+GENUINE = {"voice_confidence": 97, "deepfake_score": 4, "behavioral_risk": 12}
+FRAUD = {"voice_confidence": 20, "deepfake_score": 95, "behavioral_risk": 80}
+
+
+def test_genuine_windows_lower_risk_and_raise_confidence():
+    timeline = score_windows([GENUINE] * 10, start=0)
+    risks = [row["Risk_Score"] for row in timeline]
+    confidences = [row["Confidence"] for row in timeline]
+    assert len(timeline) == 10
+    assert risks[0] < PRIOR_RISK * 100
+    assert risks == sorted(risks, reverse=True) and risks[-1] < 5
+    assert confidences == sorted(confidences) and confidences[-1] > 90
+
+
+def test_fraud_windows_cross_the_high_risk_threshold():
+    assert score_windows([FRAUD] * 10, start=0)[-1]["Risk_Score"] > 70
+
+
+def test_estimate_recovers_after_signals_change():
+    scorer = ContinuousScorer()
+    for i in range(10):
+        scorer.update("c1", at=i, **FRAUD)
+    high = scorer.score("c1")["risk_score"]
+    for i in range(10, 30):
+        scorer.update("c1", at=i, **GENUINE)
+    assert scorer.score("c1")["risk_score"] < high / 4
+
+
+def test_conflicting_signals_lower_confidence():
+    conflicting = dict(GENUINE, deepfake_score=95)
+    agree = score_windows([GENUINE] * 8, start=0)[-1]["Confidence"]
+    disagree = score_windows([conflicting] * 8, start=0)[-1]["Confidence"]
+    assert disagree < agree
+
+
+def test_calls_are_independent_and_evicted_when_idle():
+    now = [100.0]
+    scorer = ContinuousScorer(timeline_points=3, clock=lambda: now[0])
+    scorer.update("a", **FRAUD)
+    for _ in range(5):
+        scorer.update("b", **GENUINE)
+    assert scorer.score("a")["risk_score"] > scorer.score("b")["risk_score"]
+    assert len(scorer.timeline("b")) == 3 and scorer.score("b")["windows"] == 5
+
+    now[0] = 1000.0
+    scorer.update("b", voice_confidence=95)
+    assert scorer.evict_idle(idle_seconds=600) == 1
+    assert scorer.score("a") is None and len(scorer) == 1
+    assert scorer.end("b")["windows"] == 6 and scorer.timeline("b") == []
@@ -0,0 +1,98 @@
+import os
+import random
+import time
+
+import pytest
+
+from core.customer_memory import (RECENT_LIMIT, CustomerMemoryStore, VersionConflict, adaptation_strategy,
+                                  decode_record, encode_record, merge_interaction, _empty)
+from core.demo_data import DEMO_CUSTOMER_HISTORY, DEMO_MEMORY_CUSTOMER
+
+
+def test_record_round_trips_compactly():
+    memory = _empty()
+    for interaction in DEMO_CUSTOMER_HISTORY:
+        merge_interaction(memory, interaction)
+    blob = encode_record(memory)
+    decoded = decode_record(blob)
+    assert decoded["recent"][2]["summary"] == DEMO_CUSTOMER_HISTORY[2]["summary"]
+    assert decoded["recent"][2]["escalated"] and decoded["recent"][2]["sentiment"] == -0.6
+    assert decoded["channels"] == memory["channels"] and decoded["name"] == "Sarah Johnson"
+    assert decoded["sentiment"] == pytest.approx(memory["sentiment"], abs=1e-6)
+    assert len(blob) < 512
+    with pytest.raises(ValueError):
+        decode_record(b"\x09" + blob[1:])
+
+
+def test_profile_accumulates_every_interaction():
+    store = CustomerMemoryStore()
+    store.remember_many((DEMO_MEMORY_CUSTOMER, interaction) for interaction in DEMO_CUSTOMER_HISTORY)
+    profile = store.profile(DEMO_MEMORY_CUSTOMER)
+    assert profile["Preferred Channel"] == "Chat"
+    assert profile["Account Tier"] == "Premium"
+    assert profile["Emotional State"] == "Slightly frustrated"
+    assert profile["Previous Issues"].startswith("Outage follow-up (resolved), Technical support (escalated)")
+    version, memory = store.get(DEMO_MEMORY_CUSTOMER)
+    assert version == 1 and memory["interactions"] == 4 and memory["escalations"] == 1
+    strategy = adaptation_strategy(memory)
+    assert strategy["Tone"] == "Direct and solution-focused"
+    assert strategy["Priority"].startswith("High (Premium tier + previous escalation")
+    assert store.profile("nobody") is None
+
+
+def test_recent_interactions_are_bounded():
+    store = CustomerMemoryStore()
+    for i in range(RECENT_LIMIT + 3):
+        store.remember("c1", {"at": i, "channel": "Email", "issue": f"issue {i}"})
+    version, memory = store.get("c1")
+    assert version == RECENT_LIMIT + 3 and memory["interactions"] == RECENT_LIMIT + 3
+    assert [item["issue"] for item in memory["recent"]] == [f"issue {i}" for i in range(3, RECENT_LIMIT + 3)]
+    with pytest.raises(ValueError):
+        store.remember("c1", {"channel": "Pigeon"})
+
+
+def test_stale_writers_are_rejected():
+    store = CustomerMemoryStore()
+    version = store.remember("c1", {"channel": "Chat"})
+    store.remember("c1", {"channel": "Voice"}, expected_version=version)
+    with pytest.raises(VersionConflict):
+        store.remember("c1", {"channel": "Voice"}, expected_version=version)
+    assert store.get("c1")[1]["interactions"] == 2
+
+
+def test_writers_in_separate_connections_cannot_both_win(tmp_path):
+    path = os.path.join(tmp_path, "memory.db")
+    first, second = CustomerMemoryStore(path), CustomerMemoryStore(path)
+    version = first.remember("c1", {"channel": "Chat"})
+    _, memory = first.get("c1")
+    assert second.remember("c1", {"channel": "Voice"}, expected_version=version) == version + 1
+    # first still holds the record it read at `version`
+    with first.db:
+        assert not first._write("c1", version, merge_interaction(memory, {"channel": "Email"}))
+    with first.db:
+        assert first._write("c2", 0, memory)
+    with second.db:
+        assert not second._write("c2", 0, memory)
+    with pytest.raises(VersionConflict):
+        first.remember("c1", {"channel": "Email"}, expected_version=version)
+    assert first.remember("c1", {"channel": "Email"}) == version + 2
+    assert second.get("c1")[1]["interactions"] == 3
+
+
+def test_profile_assembly_is_sub_millisecond(tmp_path):
+    store = CustomerMemoryStore(os.path.join(tmp_path, "memory.db"))
+    rng = random.Random(0)
+    customers = 50000
+    store.remember_many((f"CUST-{i:08d}", {"at": i, "channel": "Chat", "sentiment": rng.uniform(-1, 1),
+                                           "issue": "Billing inquiry", "resolved": True,
+                                           "summary": "Asked about a duplicate charge on the last bill."})
+                        for i in range(customers))
+    assert len(store) == customers
+    lookups = [f"CUST-{rng.randrange(customers):08d}" for _ in range(5000)]
+    started = time.perf_counter()
+    for customer_id in lookups:
+        store.profile(customer_id)
+    assert (time.perf_counter() - started) / len(lookups) < 1e-3
+    store.close()
+    reopened = CustomerMemoryStore(os.path.join(tmp_path, "memory.db"))
+    assert reopened.profile(lookups[0])["Previous Issues"] == "Billing inquiry (resolved)"
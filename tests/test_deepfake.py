@@ -0,0 +1,51 @@
+import numpy as np
+
+from core.deepfake import (FEATURES, HOP_SIZE, SAMPLE_RATE, StreamingDetector, detect, fit_model,
+                           frame_audio)
+from core.demo_data import demo_call_audio
+
+
+def test_live_and_synthetic_voices_are_separated():
+    live = detect(demo_call_audio(seed=1))
+    synthetic = detect(demo_call_audio(synthetic=True, seed=1))
+    assert live["live"] and live["synthetic_score"] < 20
+    assert not synthetic["live"] and synthetic["synthetic_score"] > 80
+    assert live["features"]["pitch_jitter"] > synthetic["features"]["pitch_jitter"]
+    assert live["features"]["high_band_ratio"] > synthetic["features"]["high_band_ratio"]
+
+
+def test_verdict_is_ready_within_five_seconds_of_streaming():
+    detector = StreamingDetector()
+    audio = demo_call_audio(seconds=5, seed=2)
+    verdicts = [detector.feed(audio[i:i + 1600]) for i in range(0, len(audio), 1600)]
+    first_ready = next(v for v in verdicts if v["ready"])
+    assert first_ready["seconds"] <= 5
+    assert not verdicts[0]["ready"]
+
+
+def test_chunking_does_not_change_features():
+    audio = demo_call_audio(seconds=3, seed=3)
+    whole = detect(audio, chunk_seconds=10)["features"]
+    chunked = detect(audio, chunk_seconds=0.037)["features"]
+    for name in FEATURES:
+        assert np.isclose(whole[name], chunked[name], rtol=1e-3, atol=1e-6)
+
+
+def test_silence_never_produces_a_verdict():
+    detector = StreamingDetector()
+    verdict = detector.feed(np.zeros(SAMPLE_RATE * 5, dtype=np.float32))
+    assert not verdict["ready"] and detector.frames == len(frame_audio(np.zeros(SAMPLE_RATE * 5)))
+    assert frame_audio(np.zeros(SAMPLE_RATE)).shape[1] == 2 * HOP_SIZE
+
+
+def test_fit_model_learns_from_labelled_windows():
+    rows, labels = [], []
+    for seed in range(6):
+        for synthetic in (False, True):
+            detector = StreamingDetector()
+            detector.feed(demo_call_audio(seconds=2.5, synthetic=synthetic, seed=seed))
+            rows.append(detector.features())
+            labels.append(int(synthetic))
+    model = fit_model(rows, labels)
+    predictions = model.probability(rows) > 0.5
+    assert (predictions == np.array(labels, dtype=bool)).all()
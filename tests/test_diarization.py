@@ -0,0 +1,34 @@
+from core.diarization import diarize_transcript, segments_from_transcript, speaker_statistics
+
+LABELED = """🟦 **Speaker 1 (Agent)** [00:00 - 00:15]
+Thank you for calling.
+
+🟩 **Speaker 2 (Customer)** [00:16 - 00:40]
+I can't log in.
+"""
+
+
+def test_labeled_transcript_keeps_timestamps():
+    segments = segments_from_transcript(LABELED)
+    assert [(s["speaker"], s["start"], s["end"]) for s in segments] == [("Agent", 0, 15), ("Customer", 16, 40)]
+    assert segments[1]["text"] == "I can't log in."
+
+
+def test_plain_transcript_is_timed_from_word_counts():
+    segments = segments_from_transcript("Agent: one two three four five\nCustomer: hi", words_per_second=2.5)
+    assert segments[0] == {"speaker": "Agent", "start": 0.0, "end": 2.0, "text": "one two three four five"}
+    # Short utterances get at least one second
+    assert (segments[1]["start"], segments[1]["end"]) == (2.0, 3.0)
+
+
+def test_speaker_statistics():
+    stats = speaker_statistics(segments_from_transcript(LABELED))
+    assert stats["total_time"] == 39
+    assert stats["speaker_changes"] == 1
+    assert {row["speaker"]: row["talk_time"] for row in stats["speakers"]} == {"Agent": 15, "Customer": 24}
+
+
+def test_diarize_merges_adjacent_turns_and_caps_speakers():
+    result = diarize_transcript("Agent: hello\nAgent: there\nCustomer: hi\nSupervisor: joining", max_speakers=2)
+    assert [s["speaker"] for s in result["timeline"]] == ["spk_001", "spk_002"]
+    assert result["timeline"][0]["text"] == "hello there"
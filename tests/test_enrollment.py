@@ -0,0 +1,64 @@
+import numpy as np
+
+from core.enrollment import VoiceEnroller, enroll_stream, quality_weight
+from core.voiceprint_index import VoiceprintStore, normalize
+
+
+def unit(seed, dim=8):
+    return normalize(np.random.default_rng(seed).standard_normal(dim))
+
+
+def test_incremental_updates_equal_the_weighted_mean(tmp_path):
+    enroller = VoiceEnroller(VoiceprintStore(str(tmp_path), dim=8))
+    calls = [(unit(1), 1.0), (unit(2), 0.5), (unit(3), 0.25)]
+    for embedding, quality in calls:
+        enroller.enroll("C1", embedding, quality)
+    expected = normalize(sum(normalize(e) * q for e, q in calls))
+    # Each step re-normalises the running mean, so compare directions
+    assert np.dot(enroller.store.get("C1"), expected) > 0.99
+    assert enroller.weight("C1") == 1.75
+
+
+def test_low_quality_calls_are_rejected_and_weight_is_capped(tmp_path):
+    enroller = VoiceEnroller(VoiceprintStore(str(tmp_path), dim=8), max_weight=2.0)
+    assert enroller.enroll("C1", unit(1), quality=0.05) is None
+    assert enroller.store.row_of("C1") is None
+    for _ in range(5):
+        enroller.enroll("C1", unit(1), quality=1.0)
+    assert enroller.weight("C1") == 2.0
+    assert quality_weight(10, synthetic_score=50) == 0.25
+    assert quality_weight(40, snr_db=5) == 0.0
+
+
+def test_batch_combines_repeated_customers(tmp_path):
+    enroller = VoiceEnroller(VoiceprintStore(str(tmp_path), dim=8))
+    results = enroller.enroll_batch(["A", "B", "A"], [unit(1), unit(2), unit(3)], [1.0, 1.0, 0.5])
+    assert results == [1.5, 1.0, 1.5]
+    assert len(enroller.store) == 2
+    assert np.dot(enroller.store.get("A"), normalize(unit(1) + 0.5 * unit(3))) > 0.999
+
+
+def test_interrupted_batch_is_replayed_on_open(tmp_path):
+    store = VoiceprintStore(str(tmp_path), dim=8)
+    enroller = VoiceEnroller(store)
+    enroller.enroll("A", unit(1))
+    # Simulate a crash after the journal was fsynced but before it was applied
+    enroller._write_journal(np.array([0, 1]), [b"A", b"B"], np.array([2.0, 1.0], dtype=np.float32),
+                            np.stack([unit(5), unit(6)]))
+    reopened = VoiceEnroller(VoiceprintStore(str(tmp_path)))
+    assert reopened.replayed == 2
+    assert len(reopened.store) == 2 and reopened.weight("A") == 2.0
+    assert np.allclose(reopened.store.get("B"), unit(6), atol=1e-6)
+    assert VoiceEnroller(VoiceprintStore(str(tmp_path))).replayed == 0
+
+
+def test_enroll_stream_batches_and_grows_the_store(tmp_path):
+    store = VoiceprintStore(str(tmp_path), dim=8)
+    enroller = VoiceEnroller(store)
+    records = ((f"C{i}", unit(i), 0.05 if i % 10 == 0 else 1.0) for i in range(3000))
+    stats = enroll_stream(enroller, records, batch_size=512)
+    assert stats == {"records": 3000, "enrolled": 2700, "rejected": 300, "batches": 6}
+    assert len(store) == 2700 and store.capacity >= 2700
+    assert store.verify("C7", unit(7))["match"]
+    reopened = VoiceEnroller(VoiceprintStore(str(tmp_path)))
+    assert reopened.weight("C2999") == 1.0
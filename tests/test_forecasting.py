@@ -0,0 +1,80 @@
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from core.demo_data import demo_interval_volumes
+from core.forecasting import FORECAST_HORIZONS, FORECAST_PERIODS, SeasonalForecaster, forecast_for_period
+
+END = datetime(2026, 10, 19, 9)
+HOLIDAYS = [date(2026, 9, 7), date(2026, 10, 20)]
+
+
+def fitted(holidays=HOLIDAYS, **kwargs):
+    volumes, start = demo_interval_volumes(end=END, holidays=holidays, rng=np.random.default_rng(1), **kwargs)
+    return SeasonalForecaster().fit(volumes, start, holidays), volumes
+
+
+def test_recovers_daily_and_weekly_seasonality():
+    forecaster, volumes = fitted()
+    result = forecaster.predict(7 * 24)
+    assert result["start"] == END
+    mean = result["mean"][0]
+    # Late morning on a weekday is the daily peak; nights and weekends are quiet
+    assert mean[2] > 5 * mean[16]
+    saturday_noon = (5 - END.weekday()) * 24 + 12 - END.hour
+    monday_noon = 12 - END.hour
+    assert mean[saturday_noon] < 0.6 * mean[monday_noon]
+    assert np.all(result["lower"] <= mean) and np.all(mean <= result["upper"])
+
+
+def test_learns_holiday_effect_and_trend():
+    forecaster, _ = fitted()
+    assert forecaster.holiday_factor[0] == pytest.approx(0.5, abs=0.1)
+    assert forecaster.growth[0] == pytest.approx(0.01, abs=0.01)
+    normal = forecaster.predict(48)["mean"][0]
+    holiday = forecaster.predict(48, holidays=HOLIDAYS)["mean"][0]
+    tomorrow = slice(24 - END.hour, 48 - END.hour)
+    assert holiday[tomorrow].sum() == pytest.approx(forecaster.holiday_factor[0] * normal[tomorrow].sum())
+
+
+def test_prediction_interval_covers_held_out_week():
+    volumes, start = demo_interval_volumes(weeks=9, end=END, rng=np.random.default_rng(3))
+    forecaster = SeasonalForecaster().fit(volumes[:, :-168], start)
+    result = forecaster.predict(168)
+    actual = volumes[0, -168:]
+    inside = (actual >= result["lower"][0]) & (actual <= result["upper"][0])
+    assert inside.mean() > 0.8
+
+
+def test_every_page_period_has_a_forecast():
+    forecaster, _ = fitted()
+    assert set(FORECAST_PERIODS) == set(FORECAST_HORIZONS)
+    for period in FORECAST_PERIODS:
+        rows = forecast_for_period(forecaster, period, HOLIDAYS)
+        buckets = FORECAST_HORIZONS[period][0]
+        assert len(rows["Time"]) == len(rows["Predicted_Volume"]) == len(rows["Upper"]) == buckets
+        assert all(lo <= mid <= hi for lo, mid, hi in zip(rows["Lower"], rows["Predicted_Volume"], rows["Upper"]))
+    week = forecast_for_period(forecaster, "Next Week")
+    day = forecast_for_period(forecaster, "Next 24 Hours")
+    assert week["Predicted_Volume"][0] == pytest.approx(sum(day["Predicted_Volume"]), rel=1e-3)
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        SeasonalForecaster(interval_minutes=7)
+    with pytest.raises(ValueError):
+        SeasonalForecaster().fit(np.ones(24), END)
+    with pytest.raises(ValueError):
+        SeasonalForecaster().predict(24)
+
+
+def test_refits_500_queues_at_15_minutes_in_seconds():
+    volumes, start = demo_interval_volumes(weeks=8, queues=500, interval_minutes=15, end=END,
+                                           rng=np.random.default_rng(2))
+    started = time.perf_counter()
+    forecaster = SeasonalForecaster(interval_minutes=15).fit(volumes, start)
+    forecaster.predict(96)
+    assert time.perf_counter() - started < 5
+    assert forecaster.profile.shape == (500, 7 * 96)
@@ -0,0 +1,68 @@
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from core.demo_data import demo_fraud_events
+from core.fraud_store import SERIES, FraudEventStore
+
+DAY = 86400
+START = 1_700_000_000 // DAY * DAY
+
+
+def test_rollups_match_a_full_scan():
+    rng = random.Random(5)
+    events = demo_fraud_events(hours=30, end=datetime.fromtimestamp(START + 30 * 3600), rng=rng)
+    store = FraudEventStore(segment_size=1000)
+    half = len(events[0]) // 2
+    store.record_many(*(column[:half] for column in events))
+    for row in zip(*(column[half:] for column in events)):
+        store.record(*row)
+    assert len(store) == len(events[0]) and len(store.segments) > 1
+
+    for resolution in (600, 3600, 86400):
+        rows = store.rollup(START, START + 30 * 3600 - 1, resolution)
+        assert sum(row["Legitimate_Calls"] for row in rows) == events[1].count("legitimate")
+        assert sum(row["Blocked"] for row in rows) == events[1].count("blocked")
+        attempts = sum(row["Fraud_Attempts"] for row in rows)
+        assert attempts == len(events[1]) - events[1].count("legitimate")
+    hour = store.rollup(START + 3600, START + 3600, 3600)
+    raw = store.events(START + 3600, START + 7200)
+    assert hour[0]["Fraud_Attempts"] == sum(e["outcome"] != "legitimate" for e in raw)
+
+
+def test_rollup_is_zero_filled_and_rejects_unknown_resolutions():
+    store = FraudEventStore()
+    store.record(START + 30, "blocked", "Device spoofing", 95.5)
+    rows = store.rollup(START, START + 1800, 600)
+    assert [row["Blocked"] for row in rows] == [1, 0, 0, 0]
+    assert set(SERIES) <= set(rows[0])
+    with pytest.raises(ValueError):
+        store.rollup(START, START + 60, 60)
+    with pytest.raises(ValueError):
+        store.record(START, "unknown")
+
+
+def test_threat_feed_tails_newest_threats_only():
+    store = FraudEventStore(feed_size=3)
+    store.record(START, "legitimate")
+    for i, threat in enumerate(["Voice cloning attempt", "Behavioral anomaly", "Device spoofing", "Synthetic voice detected"]):
+        store.record(START + 60 * (i + 1), "flagged" if i == 1 else "blocked", threat, 90 + i)
+    feed = store.tail(5)
+    assert [t["threat"] for t in feed] == ["Synthetic voice detected", "Device spoofing", "Behavioral anomaly"]
+    assert feed[0]["action"] == "Blocked" and feed[0]["confidence"] == "93.0%"
+    assert feed[2]["action"] == "Flagged"
+
+
+def test_save_and_load_rebuild_rollups(tmp_path):
+    store = FraudEventStore(segment_size=4)
+    for i in range(10):
+        store.record(START + i * 700, "step_up" if i % 3 else "legitimate", "Geographic inconsistency" if i % 3 else None)
+    store.save(str(tmp_path))
+    loaded = FraudEventStore.load(str(tmp_path), segment_size=4)
+    assert loaded.rollup(START, START + DAY - 1, DAY) == store.rollup(START, START + DAY - 1, DAY)
+    assert loaded.tail(2) == store.tail(2)
+    assert loaded.events(START, START + 1)[0]["threat"] is None
+    with np.load(str(tmp_path / "segment-000000.npz")) as data:
+        assert data["labels"].dtype.kind == "U"
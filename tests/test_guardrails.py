@@ -0,0 +1,62 @@
+import itertools
+import time
+
+import pytest
+
+from core.guardrails import ALLOW, ALLOWED_ACTIONS, AUTONOMY_LEVELS, DENY, REVIEW, Guardrails, _verdict
+
+
+def test_verdicts_follow_builder_settings():
+    rails = Guardrails("Semi-autonomous", 0.7, ["Account Updates", "Refunds < $100"])
+    assert rails.check("Account Updates", risk=0.2) == (ALLOW, "allowed")
+    assert rails.check("Account Updates", risk=0.7) == (REVIEW, "escalation_threshold")
+    assert rails.check("Refunds < $100", amount=40) == (REVIEW, "sensitive_action")
+    assert rails.check("Refunds < $100", amount=100) == (DENY, "over_limit")
+    assert rails.check("Transfers") == (DENY, "not_allowed")
+    assert rails.check("Delete Account") == (DENY, "unknown_action")
+    assert rails.check("Account Updates", flagged=True) == (DENY, "compliance")
+
+    autonomous = Guardrails("Fully Autonomous", 0.7, ["Refunds < $100"], compliance_monitoring=False)
+    assert autonomous.check("Refunds < $100", amount=40, flagged=True) == (ALLOW, "allowed")
+    assert Guardrails("Supervised", 0.7, ["Account Updates"]).check("Account Updates") == (REVIEW, "supervised")
+
+    with pytest.raises(ValueError):
+        Guardrails("Reckless")
+    with pytest.raises(ValueError):
+        Guardrails(allowed_actions=["Launch Rockets"])
+
+
+def test_table_matches_rules_for_every_combination():
+    for level, monitoring in itertools.product(AUTONOMY_LEVELS, (True, False)):
+        allowed = ALLOWED_ACTIONS[::2]
+        rails = Guardrails(level, 0.5, allowed, monitoring)
+        for action, amount, flagged, risk in itertools.product(ALLOWED_ACTIONS, (None, 50, 150), (False, True),
+                                                                (0.1, 0.9)):
+            expected = _verdict(action, frozenset(allowed), level, monitoring,
+                                action == "Refunds < $100" and amount is not None and amount >= 100,
+                                flagged, risk >= 0.5)
+            assert rails.check(action, risk, amount, flagged) == expected
+
+
+def test_every_decision_is_audited():
+    seen = []
+    rails = Guardrails(allowed_actions=["Account Updates"], sink=seen.append)
+    rails.check("Account Updates", 0.1, actor="handler")
+    rails.check("Transfers", 0.3, actor="handler")
+    assert len(rails.audit) == len(seen) == 2
+    assert seen[1][1:] == ("handler", "Transfers", None, 0.3, DENY, "not_allowed")
+    assert rails.summary() == {ALLOW: 1, REVIEW: 0, DENY: 1}
+    rows = rails.audit_rows()
+    assert rows[0]["Action"] == "Transfers" and rows[0]["Decision"] == "Deny"
+    assert rows[1]["Reason"] == "allowed"
+
+
+def test_checks_take_microseconds():
+    rails = Guardrails(allowed_actions=["Account Updates", "Refunds < $100"])
+    checks = 100000
+    started = time.perf_counter()
+    for i in range(checks):
+        rails.check("Refunds < $100", 0.3, 45.0, False, "handler")
+    per_check = (time.perf_counter() - started) / checks
+    assert per_check < 10e-6
+    assert len(rails.audit) == checks
@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+
+from core.intent import DENSE_FEATURES, INTENT_EXAMPLES, analyze_message, default_model, dense_features
+
+PAGE_MESSAGE = ("I've been trying to cancel my subscription for weeks but keep getting transferred around. "
+                "This is extremely frustrating and I want a refund for the past 3 months.")
+
+
+def test_page_message_is_a_frustrated_multi_intent_escalation():
+    analysis = analyze_message(PAGE_MESSAGE)
+    assert analysis["intents"] == ["transfer_complaint", "refund", "cancel"]
+    assert analysis["frustration"] >= 8 and analysis["satisfaction"] <= 3
+    assert analysis["risk_level"] == "Critical"
+    assert analysis["actions"][0].endswith("Acknowledge frustration")
+    assert "refund" in analysis["response"] and "cancellation" in analysis["response"]
+    assert analysis["response"].startswith("I sincerely apologize")
+
+
+def test_calm_messages_stay_low_risk():
+    for message in ("How do I update the email on my account?", "Thanks so much, that worked perfectly!"):
+        analysis = analyze_message(message)
+        assert analysis["intents"] == []
+        assert analysis["risk_level"] == "Low" and analysis["frustration"] < 3
+        assert analysis["response"].startswith("Thanks for reaching out")
+    assert analyze_message("Thanks so much, that worked perfectly!")["satisfaction"] > 7
+
+
+def test_single_intents():
+    assert analyze_message("Please cancel my plan, I am moving abroad.")["intents"] == ["cancel"]
+    assert analyze_message("I was charged twice, I want my money back!")["intents"] == ["refund"]
+    assert analyze_message("Why do you keep passing me to different departments?")["intents"] == \
+        ["transfer_complaint"]
+
+
+def test_model_fits_its_seed_examples():
+    model = default_model()
+    for text, labels in INTENT_EXAMPLES:
+        probabilities = model.probabilities(text)
+        assert {intent for intent, p in probabilities.items() if p >= 0.5} == labels
+
+
+def test_dense_cues():
+    features = dict(zip(DENSE_FEATURES, dense_features(PAGE_MESSAGE)))
+    assert features["repeat_contact"] == features["long_running"] == 1.0
+    assert features["negative"] > 0 and features["positive"] == 0
+    assert np.all(dense_features("what are your opening hours") == 0)
+
+
+def test_analysis_takes_well_under_single_digit_milliseconds():
+    analyze_message(PAGE_MESSAGE)
+    runs = 200
+    started = time.perf_counter()
+    for _ in range(runs):
+        analyze_message(PAGE_MESSAGE)
+    assert (time.perf_counter() - started) / runs < 2e-3
@@ -0,0 +1,75 @@
+import os
+import random
+import time
+from datetime import date
+
+import pytest
+
+from core.demo_data import DEMO_JOURNEY_CASE, DEMO_JOURNEY_CUSTOMER, demo_journey_events
+from core.journey import CHANNELS, JourneyLog, journey_summary
+
+
+def test_demo_journey_reads_back_in_order():
+    log = JourneyLog()
+    events = demo_journey_events(date(2026, 10, 19))
+    log.append_many(reversed(events))
+    timeline = log.timeline(DEMO_JOURNEY_CUSTOMER)
+    assert [event["action"] for event in timeline] == [event["action"] for event in events]
+    assert log.case_timeline(DEMO_JOURNEY_CASE) == timeline
+    summary = journey_summary(timeline, name="Jennifer Walsh")
+    assert summary["Journey Stage"] == "Support → Sales → Billing"
+    assert summary["Channels Used"] == ["Voice", "Chat", "Email"]
+    assert summary["Channel Switches"] == 3 and summary["Open Items"] == 1
+
+
+def test_resolved_case_is_no_longer_open():
+    log = JourneyLog()
+    log.append("c1", "Chat", "Reported a login problem", at=10, status="Active", case_id="case-1")
+    log.append("c1", "Email", "Asked for an invoice copy", at=15, status="Pending")
+    assert journey_summary(log.timeline("c1"))["Open Items"] == 2
+    log.append("c1", "Voice", "Login fixed", at=20, status="Resolved", case_id="case-1")
+    assert journey_summary(log.timeline("c1"))["Open Items"] == 1
+
+
+def test_ranges_limits_and_ties():
+    log = JourneyLog()
+    for i, channel in enumerate(CHANNELS):
+        log.append("c1", channel, f"event {i}", at=100 + i // 2, case_id="case-1" if i % 2 else None)
+    log.append("c2", "Chat", "someone else", at=101)
+    assert [e["action"] for e in log.timeline("c1", since=101, until=101)] == ["event 2", "event 3"]
+    assert [e["action"] for e in log.timeline("c1", limit=2)] == ["event 4", "event 5"]
+    assert [e["action"] for e in log.case_timeline("case-1")] == ["event 1", "event 3", "event 5"]
+    assert log.timeline("nobody") == [] and journey_summary([])["Journey Stage"] == "New"
+    with pytest.raises(ValueError):
+        log.append("c1", "Fax")
+    with pytest.raises(ValueError):
+        log.append("c1", "Chat", status="Lost")
+    assert len(log) == 7
+
+
+def test_sequence_continues_after_reopen(tmp_path):
+    path = os.path.join(tmp_path, "journey.db")
+    log = JourneyLog(path)
+    log.append("c1", "Email", "first", at=50)
+    log.close()
+    reopened = JourneyLog(path)
+    reopened.append("c1", "Video", "second", at=50)
+    assert [e["action"] for e in reopened.timeline("c1")] == ["first", "second"]
+
+
+def test_ingest_rate_and_screen_pop_latency(tmp_path):
+    log = JourneyLog(os.path.join(tmp_path, "journey.db"))
+    rng = random.Random(0)
+    customers = 20000
+    events = [{"customer_id": f"CUST-{rng.randrange(customers):06d}", "at": 1.7e9 + i, "channel": rng.choice(CHANNELS),
+               "action": "Asked about an invoice", "stage": "Billing", "case_id": f"CASE-{i // 5}"}
+              for i in range(100000)]
+    started = time.perf_counter()
+    for batch in range(0, len(events), 5000):
+        log.append_many(events[batch:batch + 5000])
+    assert len(events) / (time.perf_counter() - started) > 20000
+    lookups = [f"CUST-{rng.randrange(customers):06d}" for _ in range(1000)]
+    started = time.perf_counter()
+    for customer_id in lookups:
+        journey_summary(log.timeline(customer_id))
+    assert (time.perf_counter() - started) / len(lookups) < 10e-3
@@ -0,0 +1,114 @@
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from core.demo_data import demo_kpi_history, demo_workflow_interactions
+from core.kpi_store import KPIStore, derive_kpis, outcome_counts
+from core.workflows import WorkflowRuntime, compile_workflow
+
+END = date(2026, 10, 1)
+
+
+def filled(tmp_path, days=365):
+    store = KPIStore(str(tmp_path))
+    dates, columns = demo_kpi_history(days, END, random.Random(0))
+    store.add_many(dates, **columns)
+    return store, dates, columns
+
+
+def test_date_range_reads_only_matching_days(tmp_path):
+    store, dates, columns = filled(tmp_path)
+    result = store.read(date(2026, 9, 1), date(2026, 9, 10))
+    assert len(result["Date"]) == 10
+    assert result["Date"][0] == np.datetime64("2026-09-01") and result["Date"][-1] == np.datetime64("2026-09-10")
+    first = dates.index(date(2026, 9, 1))
+    assert result["interactions"].tolist() == columns["interactions"][first:first + 10]
+    assert len(store.read(date(2020, 1, 1), date(2020, 2, 1))["Date"]) == 0
+    last = store.last(90)
+    assert len(last["Date"]) == 90 and last["Date"][-1] == np.datetime64(END - timedelta(days=1))
+
+
+def test_kpis_follow_the_counters():
+    kpis = derive_kpis({"interactions": np.array([1000, 0]), "resolved": np.array([750, 0]),
+                        "sentiment_sum": np.array([400.0, 0.0])})
+    assert kpis["Autonomous_Resolution"].tolist() == [75.0, 0.0]
+    assert kpis["Productivity_Gain"][0] == pytest.approx(300.0)
+    assert kpis["Customer_Satisfaction"][0] == pytest.approx(7.3)
+    assert kpis["Cost_Reduction"][0] == pytest.approx(67.5)
+
+
+def test_days_can_be_topped_up_replaced_and_backfilled(tmp_path):
+    store, dates, columns = filled(tmp_path, days=30)
+    store.add(END, interactions=10, resolved=6)
+    store.add(END, interactions=10, resolved=8)
+    assert store.read(END, END)["resolved"].tolist() == [14]
+    store.put(END, interactions=5, resolved=5)
+    assert store.read(END, END)["Autonomous_Resolution"].tolist() == [100.0]
+    store.put(END - timedelta(days=90), interactions=1)
+    assert len(store) == 32 and store.days() == (END - timedelta(days=90), END)
+    with pytest.raises(ValueError):
+        store.add(END, calls=1)
+    with pytest.raises(ValueError):
+        store.add_many([END - timedelta(days=1)], interactions=[1])
+
+
+def test_reopened_store_ignores_half_written_append(tmp_path):
+    store, dates, _ = filled(tmp_path, days=10)
+    # Simulate a crash after the counters were appended but before the day was written
+    with open(store._path("interactions"), "ab") as f:
+        f.write(np.array([999], dtype=np.int64).tobytes())
+    reopened = KPIStore(str(tmp_path))
+    assert len(reopened) == 10
+    reopened.add(END, interactions=3)
+    assert reopened.read(END, END)["interactions"].tolist() == [3]
+
+
+def test_read_cost_does_not_grow_with_history(tmp_path):
+    small, _, _ = filled(tmp_path / "small", days=120)
+    large = KPIStore(str(tmp_path / "large"))
+    days = 20 * 365
+    start = END - timedelta(days=days)
+    large.add_many([start + timedelta(days=i) for i in range(days)], interactions=np.full(days, 1000),
+                   resolved=np.full(days, 700))
+
+    def timed(store):
+        started = time.perf_counter()
+        for _ in range(200):
+            store.last(90)
+        return (time.perf_counter() - started) / 200
+
+    assert timed(large) < 5e-3
+    assert timed(large) < timed(small) * 3
+
+
+def test_seeded_history_leads_into_the_live_runtime_row(tmp_path):
+    runtime = WorkflowRuntime()
+    workflow = compile_workflow("handler", "analyze sentiment, check account, resolve or escalate",
+                                allowed_actions=["Account Updates", "Technical Support"])
+    runtime.deploy(workflow)
+    asyncio.run(runtime.run("handler", demo_workflow_interactions(rng=random.Random(3))))
+    store, _, _ = filled(tmp_path, days=30)
+    history = store.last(7)
+    store.put(END, **outcome_counts(runtime))
+    today = store.read(END, END)
+    assert abs(today["Autonomous_Resolution"][0] - history["Autonomous_Resolution"].mean()) < 3
+    assert abs(today["Customer_Satisfaction"][0] - history["Customer_Satisfaction"].mean()) < 0.2
+
+
+def test_runtime_outcomes_become_todays_counters(tmp_path):
+    runtime = WorkflowRuntime()
+    workflow = compile_workflow("handler", "analyze sentiment, check account, resolve or escalate",
+                                allowed_actions=["Account Updates", "Technical Support"])
+    runtime.deploy(workflow)
+    asyncio.run(runtime.run("handler", demo_workflow_interactions(200, random.Random(0))))
+    counts = outcome_counts(runtime)
+    assert counts["interactions"] == 200
+    assert counts["resolved"] + counts["escalated"] + counts["failed"] == 200
+    store = KPIStore(str(tmp_path))
+    store.put(END, **counts)
+    row = store.read(END, END)
+    assert row["Autonomous_Resolution"][0] == pytest.approx(counts["resolved"] / 2)
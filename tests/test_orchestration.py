@@ -0,0 +1,83 @@
+import random
+import time
+
+import pytest
+
+from core.demo_data import demo_orchestration_traffic
+from core.orchestration import DEFAULT_POOLS, ROUTES, STATUSES, Router, simulate_day, state_at
+from core.staffing import erlang_c
+
+
+def test_router_places_interactions_by_skill_and_risk():
+    router = Router()
+    assert router.enqueue({"skill": "billing"}, 0) == "AI Agent"
+    assert router.enqueue({"skill": "billing", "risk": 0.9}, 0) == "Human Agent"
+    assert router.enqueue({"skill": "billing", "handoff": True}, 0) == "Human Agent"
+    assert router.enqueue({"skill": "claims", "risk": 0.9}, 0) == "Back Office"
+    assert router.enqueue({"skill": "unheard of"}, 0) == "Human Agent"
+    assert router.lengths == {"AI Agent": 1, "Human Agent": 3, "Back Office": 1}
+
+
+def test_dequeue_order_is_priority_then_tier_then_arrival():
+    router = Router()
+    router.enqueue({"id": "late", "skill": "billing", "priority": 2}, 5)
+    router.enqueue({"id": "basic", "skill": "technical", "priority": 2, "tier": "Basic"}, 1)
+    router.enqueue({"id": "early", "skill": "billing", "priority": 2}, 2)
+    router.enqueue({"id": "urgent", "skill": "technical", "priority": 1, "tier": "Basic"}, 9)
+    router.enqueue({"id": "premium", "skill": "billing", "priority": 2, "tier": "Premium"}, 8)
+    served = [router.dequeue("AI Agent", {"billing", "technical"})[1]["id"] for _ in range(5)]
+    assert served == ["urgent", "premium", "early", "late", "basic"]
+    assert router.dequeue("AI Agent", {"billing", "technical"}) is None
+    # A pool only sees its own skills
+    router.enqueue({"id": "t", "skill": "technical"}, 0)
+    assert router.dequeue("AI Agent", {"billing"}) is None
+
+
+def test_single_queue_waits_agree_with_erlang_c():
+    rng = random.Random(4)
+    traffic, at = [], 0.0
+    while True:
+        at += rng.expovariate(200 / 3600)
+        if at >= 80 * 3600:
+            break
+        traffic.append((at, {"skill": "complaint"}))
+    pools = {"AI Agent": [], "Human Agent": [(20, {"complaint"})], "Back Office": []}
+    result = simulate_day(traffic, pools, {"Human Agent": 300}, seed=5)
+    load = 200 * 300 / 3600
+    asa = erlang_c(20, load) * 300 / (20 - load)
+    assert result["routes"]["Human Agent"]["handled"] == len(traffic)
+    assert result["routes"]["Human Agent"]["mean_wait"] == pytest.approx(asa, rel=0.25)
+
+
+def test_demo_day_accounts_for_every_interaction():
+    traffic = demo_orchestration_traffic(5000, random.Random(0))
+    started = time.perf_counter()
+    result = simulate_day(traffic, seed=1)
+    assert time.perf_counter() - started < 2
+    handoffs = result["routes"]["Human Agent"]["handled"] - sum(
+        1 for _, i in traffic if i["skill"] in ("complaint", "retention")
+        or i["skill"] in ("billing", "technical", "account") and i["risk"] >= 0.7)
+    assert sum(result["status"].values()) == len(traffic)
+    assert result["status"]["Human Takeover"] == handoffs > 0
+    assert set(result["status"]) == set(STATUSES)
+    noon = state_at(result, 12 * 3600 + 100)
+    assert noon["time"] == 12 * 3600 and sum(noon["active"].values()) > 0
+    assert all(noon["active"][r] <= sum(c for c, _ in DEFAULT_POOLS[r]) for r in ROUTES)
+
+
+def test_replay_is_paced_by_speedup():
+    wall = [0.0]
+    sleeps = []
+
+    def clock():
+        return wall[0]
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        wall[0] += seconds
+
+    traffic = [(3600.0, {"skill": "billing"}), (7200.0, {"skill": "billing"})]
+    simulate_day(traffic, speedup=1000, seed=0, clock=clock, sleep=sleep)
+    # A day of simulated time takes 86.4 s of wall time at 1000x
+    assert wall[0] == pytest.approx(86.4)
+    assert len(sleeps) > 2
@@ -0,0 +1,36 @@
+from core.pii import detect_pii, mask_text, mask_value
+
+
+def test_overlapping_matches_keep_longest_earliest_entity():
+    # The card number also contains phone-number-shaped digit runs
+    entities = detect_pii("Card 4111-1111-1111-1111 on file")
+    assert [e["type"] for e in entities] == ["Credit Cards"]
+    assert entities[0]["value"] == "4111-1111-1111-1111"
+
+
+def test_entities_do_not_overlap_and_are_ordered():
+    text = "My name is John Smith, email john.smith@email.com, SSN 123-45-6789, phone (555) 123-4567."
+    entities = detect_pii(text)
+    assert [e["type"] for e in entities] == ["Names", "Email Addresses", "SSN", "Phone Numbers"]
+    for a, b in zip(entities, entities[1:]):
+        assert a["end_pos"] <= b["start_pos"]
+
+
+def test_pii_type_filter_and_threshold():
+    text = "email john@example.com from 10.0.0.1"
+    assert [e["type"] for e in detect_pii(text, ["IP Addresses"])] == ["IP Addresses"]
+    assert [e["type"] for e in detect_pii(text, confidence_threshold=0.9)] == ["Email Addresses"]
+
+
+def test_masking_methods():
+    text = "SSN 123-45-6789 and email jane@example.com"
+    entities = detect_pii(text)
+    assert mask_text(text, entities, "Replacement Tags") == "SSN [SSN] and email [EMAIL_ADDRESS]"
+    assert mask_text(text, entities, "Full Redaction") == "SSN [REDACTED] and email [REDACTED]"
+    assert mask_text(text, entities, "Asterisks") == "SSN ***-**-**** and email ****@*******.***"
+    assert mask_text(text, entities, "Partial") == "SSN ***-**-6789 and email j***@example.com"
+
+
+def test_partial_mask_of_names():
+    entity = {"value": "John Smith", "tag": "PERSON_NAME"}
+    assert mask_value(entity, "Partial") == "John S***"
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import random
+
+from core.authentication import device_check, geo_check
+from core.reputation import BloomFilter, DeviceRegistry, PrefixTable, ReputationCache, device_fingerprint
+
+FEED = [
+    "10.0.0.0/8,hosting",
+    "10.1.0.0/16,vpn",
+    "10.1.2.0/24,bad",
+    "10.1.2.128/25,tor",
+    "2001:db8::/32,vpn",
+    "73.44.0.0/16,geo,Chicago, IL",
+    "203.0.113.66,bad"
+]
+
+
+def test_prefix_table_returns_most_specific_block():
+    table = PrefixTable([("10.0.0.0/8", "a"), ("10.1.0.0/16", "b"), ("10.1.2.0/24", "c"), ("10.1.2.128/25", "d"),
+                         ("11.0.0.0/8", "e"), ("2001:db8::/32", "v6")])
+    expected = {"10.0.0.1": "a", "10.1.0.0": "b", "10.1.1.255": "b", "10.1.2.0": "c", "10.1.2.127": "c",
+                "10.1.2.128": "d", "10.1.2.255": "d", "10.1.3.0": "b", "10.2.0.0": "a", "10.255.255.255": "a",
+                "11.5.5.5": "e", "12.0.0.0": None, "9.255.255.255": None, "2001:db8::1": "v6", "2001:db9::": None}
+    assert {ip: table.lookup(ip) for ip in expected} == expected
+
+
+def test_prefix_table_agrees_with_brute_force_on_random_blocks():
+    import ipaddress
+    rng = random.Random(3)
+    entries = []
+    for i in range(300):
+        length = rng.choice([8, 12, 16, 20, 24, 28])
+        entries.append((str(ipaddress.ip_network((rng.getrandbits(32) & ~((1 << (32 - length)) - 1), length))), i))
+    table = PrefixTable(entries)
+    networks = [(ipaddress.ip_network(cidr), value) for cidr, value in entries]
+    for _ in range(500):
+        ip = ipaddress.ip_address(rng.getrandbits(32))
+        matches = [(n.prefixlen, v) for n, v in networks if ip in n]
+        best = max(matches)[0] if matches else None
+        candidates = {v for length, v in matches if length == best}
+        assert (table.lookup(str(ip)) in candidates) if matches else table.lookup(str(ip)) is None
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    rng = random.Random(1)
+    listed = {rng.getrandbits(32) for _ in range(20000)}
+    bloom = BloomFilter(len(listed))
+    for value in listed:
+        bloom.add(value)
+    assert all(value in bloom for value in listed)
+    others = [rng.getrandbits(32) for _ in range(20000)]
+    false_positives = sum(value in bloom for value in others if value not in listed)
+    assert false_positives / len(others) < 0.03
+
+
+def test_reputation_categories_and_locations():
+    cache = ReputationCache(FEED)
+    assert cache.categories("10.1.2.200") == ["tor"]
+    assert cache.categories("10.9.9.9") == ["hosting"]
+    assert cache.categories("203.0.113.66") == ["bad"]
+    assert cache.categories("2001:db8::5") == ["vpn"]
+    assert cache.categories("8.8.8.8") == []
+    assert cache.location("73.44.1.2") == "Chicago, IL" and cache.location("8.8.8.8") is None
+
+
+def test_reload_swaps_tables_only_when_file_changes(tmp_path):
+    path = tmp_path / "reputation.txt"
+    path.write_text("203.0.113.66,bad\n")
+    cache = ReputationCache(path=str(path))
+    assert cache.categories("203.0.113.66") == ["bad"]
+    assert not cache.reload()
+    path.write_text("198.51.100.0/24,vpn\n")
+    os.utime(path, ns=(1, 10 ** 18))
+    assert cache.reload()
+    assert cache.categories("203.0.113.66") == [] and cache.categories("198.51.100.9") == ["vpn"]
+
+
+def test_auto_reload_survives_bad_files(tmp_path, caplog):
+    path = tmp_path / "reputation.txt"
+    path.write_text("203.0.113.66,bad\n")
+    cache = ReputationCache(path=str(path))
+
+    async def scenario():
+        task = asyncio.ensure_future(cache.auto_reload(interval=0.01))
+        path.write_text("203.0.113.66,spam\n")
+        os.utime(path, ns=(1, 10 ** 18))
+        await asyncio.sleep(0.05)
+        path.unlink()
+        await asyncio.sleep(0.05)
+        assert not task.done() and cache.categories("203.0.113.66") == ["bad"]
+        path.write_text("198.51.100.0/24,vpn\n")
+        os.utime(path, ns=(1, 2 * 10 ** 18))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert cache.categories("198.51.100.9") == ["vpn"]
+    assert "keeping current tables" in caplog.text
+
+
+def test_device_registry_and_auth_checks():
+    fingerprint = device_fingerprint({"user_agent": "UA", "screen": "390x844"})
+    assert fingerprint == device_fingerprint({"screen": "390x844", "user_agent": "UA"})
+    registry = DeviceRegistry([("C1", fingerprint)])
+    assert registry.known("C1", fingerprint) and not registry.known("C2", fingerprint)
+    cache = ReputationCache(FEED)
+
+    confidence, details = asyncio.run(device_check(registry, cache, "C1", fingerprint, "73.44.1.2")())
+    assert confidence == 97.0 and details["IP Reputation"] == "✅ Clean IP address"
+    confidence, details = asyncio.run(device_check(registry, cache, "C2", fingerprint, "203.0.113.66")())
+    assert confidence == 3.0 and "bad" in details["IP Reputation"]
+
+    assert asyncio.run(geo_check(cache, "73.44.1.2", "Chicago, IL")())[0] == 95.0
+    confidence, details = asyncio.run(geo_check(cache, "10.1.9.9", "Chicago, IL")())
+    assert confidence == 60.0 and "vpn" in details["VPN Detection"]
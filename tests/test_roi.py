@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from core.forecasting import staffing_recommendations, whatif_agents
+from core.roi import automation_roi, coaching_roi, simulate_automation_roi, simulate_coaching_roi
+
+
+def test_coaching_roi_matches_inline_formulas():
+    current_agents, avg_salary, satisfaction, resolution = 100, 50000, 7.2, 75
+    roi = coaching_roi(current_agents, avg_salary, satisfaction, resolution)
+
+    new_agents_needed = int(current_agents / (1 + 0.4))
+    cost_savings = (current_agents - new_agents_needed) * avg_salary
+    monthly_savings = cost_savings / 12
+    assert roi["new_agents_needed"] == new_agents_needed
+    assert roi["cost_savings"] == cost_savings
+    assert roi["new_satisfaction"] == pytest.approx(min(10.0, satisfaction + 1.8))
+    assert roi["new_resolution"] == pytest.approx(min(95.0, resolution + 15))
+    assert roi["payback_months"] == pytest.approx(500000 / monthly_savings)
+    assert roi["roi_3_year"] == pytest.approx((cost_savings * 3 - 500000) / 500000 * 100)
+
+
+def test_coaching_roi_without_savings_never_pays_back():
+    assert coaching_roi(0, 50000, 7.0, 75)["payback_months"] == float('inf')
+
+
+def test_automation_roi_matches_inline_formulas():
+    calls, handle_time, cost, automation, reduction = 10000, 8, 25, 60, 30
+    roi = automation_roi(calls, handle_time, cost, automation, reduction)
+
+    current_cost = calls * (handle_time / 60) * cost
+    remaining_calls = calls - calls * (automation / 100)
+    new_cost = remaining_calls * (handle_time * (1 - reduction / 100) / 60) * cost
+    monthly_savings = current_cost - new_cost
+    assert roi["monthly_savings"] == pytest.approx(monthly_savings)
+    assert roi["annual_savings"] == pytest.approx(monthly_savings * 12)
+    assert roi["roi"] == pytest.approx(monthly_savings * 12 / 500000 * 100)
+
+
+def test_staffing_and_whatif():
+    table = staffing_recommendations({'Required Agents': [8, 9], 'Current Staff': [6, 9]})
+    assert table['Recommendation'] == ["Hire 2", "Optimal"]
+    assert whatif_agents(0, 100) == 45
+    assert whatif_agents(100, 100) == 90
+
+
+def test_coaching_simulation_spreads_around_the_plan():
+    plan = coaching_roi(50, 40000, 7.5, 75)
+    simulated = simulate_coaching_roi(50, 40000, samples=20000)
+    payback, roi = simulated["payback_months"], simulated["roi_3_year"]
+    assert payback["p5"] < plan["payback_months"] < payback["p95"]
+    assert roi["p5"] < plan["roi_3_year"] < roi["p95"]
+    assert payback["p5"] <= payback["p50"] <= payback["p95"]
+    # The gain more often falls short of plan than beats it
+    assert roi["p50"] < plan["roi_3_year"]
+    counts, edges = roi["histogram"]
+    assert counts.sum() == 20000 and len(edges) == len(counts) + 1
+
+
+def test_automation_simulation_brackets_the_plan():
+    plan = automation_roi(10000, 8, 25, 60, 30)
+    simulated = simulate_automation_roi(10000, 8, 25, 60, 30, samples=20000)
+    savings, roi = simulated["monthly_savings"], simulated["roi_3_year"]
+    assert savings["p5"] < plan["monthly_savings"] < savings["p95"]
+    assert roi["p5"] < plan["annual_savings"] * 3 / 500000 * 100 - 100 < roi["p95"]
+    assert 0 < simulated["pays_back"] < 1
+
+
+def test_simulation_without_savings_never_pays_back():
+    simulated = simulate_coaching_roi(0, 40000, samples=1000)
+    assert simulated["pays_back"] == 0
+    assert np.isinf(simulated["payback_months"]["p50"])
+
+
+def test_simulations_are_cached():
+    first = simulate_automation_roi(50000, 8.5, 25.0, 80, 50, seed=7)
+    assert simulate_automation_roi(50000, 8.5, 25.0, 80, 50, seed=7) is first
+    assert simulate_automation_roi(50000, 8.5, 25.0, 70, 50, seed=7) is not first
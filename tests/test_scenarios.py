@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+import pytest
+
+from core.scenarios import (DEFAULT_GRID, evaluate_scenarios, matching, pareto_frontier, scenario_grid,
+                            scenario_rows, select)
+from core.staffing import daily_headcount, required_agents
+
+DAY = 120 * np.exp(-((np.arange(24) - 13) / 4.0) ** 2) + 5
+
+
+def test_grid_covers_every_combination():
+    grid = scenario_grid()
+    expected = np.prod([len(values) for values in DEFAULT_GRID.values()])
+    assert all(len(values) == expected for values in grid.values())
+    assert len(scenario_grid(volume_change=[0], aht=300)["aht"]) == expected // (16 * 6)
+    with pytest.raises(ValueError):
+        scenario_grid(weather=[1])
+
+
+def test_each_scenario_matches_a_direct_staffing_solve():
+    result = evaluate_scenarios(DAY, scenario_grid(volume_change=[0, 20], skill_efficiency=[100, 125],
+                                                   shrinkage=[0.3], aht=[300], target_level=[0.8]))
+    for i in range(len(result["agents"])):
+        volume = DAY * (1 + result["volume_change"][i] / 100)
+        aht = 300 * 100 / result["skill_efficiency"][i]
+        direct = daily_headcount(required_agents(volume, aht)["agents"], shrinkage=0.3)
+        assert result["agents"][i] == direct
+    # More volume costs more; more efficient agents cost less
+    by = {(v, e): c for v, e, c in zip(result["volume_change"], result["skill_efficiency"], result["cost"])}
+    assert by[(20, 100)] > by[(0, 100)] > by[(0, 125)]
+    assert np.all(result["service_level"] >= 0.8)
+
+
+def test_pareto_frontier_is_non_dominated_and_complete():
+    result = evaluate_scenarios(DAY, scenario_grid())
+    conditions = matching(result, volume_change=0, aht=300)
+    frontier = pareto_frontier(result["cost"], result["service_level"], conditions)
+    cost, level = result["cost"], result["service_level"]
+    assert np.all(np.diff(cost[frontier]) >= 0) and np.all(np.diff(level[frontier]) > 0)
+    for i in np.flatnonzero(conditions):
+        dominated = (cost[frontier] <= cost[i]) & (level[frontier] >= level[i])
+        assert dominated.any()
+    assert set(frontier.tolist()) <= set(np.flatnonzero(conditions).tolist())
+
+
+def test_full_grid_evaluates_interactively():
+    grid = scenario_grid()
+    started = time.perf_counter()
+    evaluate_scenarios(DAY, grid)
+    assert time.perf_counter() - started < 2
+    assert len(grid["aht"]) > 10000
+
+
+def test_select_and_rows():
+    result = evaluate_scenarios(DAY, scenario_grid())
+    i = select(result, volume_change=15, skill_efficiency=100, shrinkage=0.3, aht=300, target_level=0.8)
+    row = scenario_rows(result, [i])[0]
+    assert row["Volume Change"] in ("+10%", "+20%")
+    assert row["Shrinkage"] == "30%" and row["Target"] == "80%"
+    assert row["Cost"].endswith("/week")
@@ -0,0 +1,32 @@
+from core.sentiment import analyze_conversation, escalation_risk, label_score, score_text
+
+
+def test_negation_flips_polarity():
+    positive, _ = score_text("This was helpful")
+    negated, _ = score_text("This was not helpful")
+    assert positive > 0
+    assert negated < 0
+
+
+def test_neutral_text_scores_zero():
+    assert score_text("The meeting is on Tuesday") == (0.0, 0.6)
+    assert label_score(0.0) == "Neutral"
+
+
+def test_escalation_levels():
+    assert escalation_risk(0.6, "Thanks, that worked")["level"] == "low"
+    assert escalation_risk(-0.4, "I am frustrated")["level"] == "medium"
+    high = escalation_risk(-0.9, "This is unacceptable, get me a supervisor. I'm furious")
+    assert high["level"] == "high"
+    assert set(high["triggers"]) == {"negative_sentiment", "frustration_keywords", "escalation_keywords"}
+
+
+def test_conversation_uses_final_customer_utterance_for_escalation():
+    result = analyze_conversation(
+        "Customer: I'm furious, this is unacceptable!\n"
+        "Agent: I'm sorry, let me help.\n"
+        "Customer: Thank you, that worked, I really appreciate it."
+    )
+    assert result["initial_sentiment"] < 0 < result["final_sentiment"]
+    assert result["trajectory"] == "improving"
+    assert result["escalation_risk"]["level"] == "low"
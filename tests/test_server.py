@@ -0,0 +1,259 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+
+import core.server
+from core.server import Service
+
+TRANSCRIPT = "Agent: Thank you for calling, how can I help?\nCustomer: I can't log in to my account."
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 30))
+
+
+async def start_service(**kwargs):
+    service = Service(workers=1, **kwargs)
+    server = await service.start("127.0.0.1", 0)
+    return service, server, server.sockets[0].getsockname()[1]
+
+
+async def stop_service(service, server):
+    server.close()
+    await service.close()
+
+
+async def request(port, method, path, body=None, headers=None):
+    """Send one request with Connection: close and read the response to EOF"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b""
+    head = "".join(f"{k}: {v}\r\n" for k, v in (headers or {}).items())
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n"
+                 f"Connection: close\r\n{head}\r\n".encode() + data)
+    await writer.drain()
+    raw = await asyncio.wait_for(reader.read(), 5)
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+async def ws_connect(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+    await writer.drain()
+    assert (await reader.readuntil(b"\r\n\r\n")).startswith(b"HTTP/1.1 101")
+    return reader, writer
+
+
+def ws_frame(data, opcode=0x1):
+    mask = os.urandom(4)
+    length = len(data)
+    head = bytes([0x80 | opcode])
+    head += bytes([0x80 | length]) if length < 126 else bytes([0x80 | 126]) + struct.pack("!H", length)
+    return head + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+
+async def ws_read(reader):
+    head = await reader.readexactly(2)
+    length = head[1] & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    return head[0] & 0x0F, await reader.readexactly(length)
+
+
+def test_first_response_closes_cleanly():
+    async def scenario():
+        service, server, port = await start_service()
+        try:
+            # Regression: workers forked lazily used to inherit this socket and hold it open
+            status, body = await request(port, "POST", "/v1/pii-detection", {"text": "SSN 123-45-6789"})
+            assert status == 200
+            assert body["protected_text"] == "SSN [SSN]"
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_routing_and_error_mapping():
+    async def scenario():
+        service, server, port = await start_service()
+        try:
+            status, body = await request(port, "POST", "/v1/sentiment-analysis", {"text": "I am frustrated!"})
+            assert status == 200 and body["sentiment"]["score"] < 0 and body["job_id"].startswith("sent_")
+            status, body = await request(port, "POST", "/v1/call-summarization", {"transcript": TRANSCRIPT})
+            assert status == 200 and body["details"]["call_type"] == "Technical Support"
+            assert (await request(port, "GET", "/v1/health"))[0] == 200
+
+            assert (await request(port, "POST", "/v1/pii-detection", {"text": ""}))[0] == 400
+            assert (await request(port, "POST", "/v1/pii-detection", b"{not json"))[0] == 400
+            assert (await request(port, "POST", "/v1/nope", {}))[0] == 404
+            assert (await request(port, "GET", "/v1/pii-detection"))[0] == 405
+            assert (await request(port, "POST", "/v1/speaker-diarization", b"--x",
+                                  {"Content-Type": "multipart/form-data; boundary=x"}))[0] == 415
+            assert (await request(port, "POST", "/v1/speaker-diarization", {"audio_url": "x"}))[0] == 415
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_load_shedding_returns_503():
+    async def scenario():
+        service, server, port = await start_service(max_pending=1)
+        try:
+            await service.admission.acquire()
+            status, body = await request(port, "POST", "/v1/pii-detection", {"text": "hi"})
+            assert status == 503
+            service.admission.release()
+            assert (await request(port, "POST", "/v1/pii-detection", {"text": "hi"}))[0] == 200
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_batch_passes_ids_through_and_reports_item_errors():
+    async def scenario():
+        service, server, port = await start_service()
+        try:
+            status, body = await request(port, "POST", "/v1/pii-detection/batch", {
+                "documents": [{"id": "doc1", "text": "email a@b.com"}, {"id": "doc2", "text": ""}],
+                "masking_method": "full_redaction"
+            })
+            assert status == 200
+            assert [(r["id"], r["status"]) for r in body["results"]] == [("doc1", 200), ("doc2", 400)]
+            assert body["results"][0]["protected_text"] == "email [REDACTED]"
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_sync_results_are_not_stored_as_jobs():
+    async def scenario():
+        service, server, port = await start_service()
+        try:
+            _, body = await request(port, "POST", "/v1/pii-detection", {"text": "SSN 123-45-6789"})
+            assert (await request(port, "GET", f"/v1/jobs/{body['job_id']}/results"))[0] == 404
+            assert not service.jobs
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_diarization_job_lifecycle():
+    async def scenario():
+        service, server, port = await start_service()
+        try:
+            status, body = await request(port, "POST", "/v1/speaker-diarization", {"transcript": TRANSCRIPT})
+            assert status == 202 and body["status"] == "processing"
+            job_path = f"/v1/jobs/{body['job_id']}"
+            for _ in range(100):
+                status, result = await request(port, "GET", job_path + "/results")
+                if status == 200:
+                    break
+                await asyncio.sleep(0.05)
+            assert status == 200 and result["status"] == "completed"
+            assert [s["label"] for s in result["speakers"]] == ["Agent", "Customer"]
+            assert (await request(port, "GET", job_path))[1]["status"] == "completed"
+            assert (await request(port, "GET", "/v1/jobs/diar_missing"))[0] == 404
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_websocket_round_trip_preserves_order():
+    async def scenario():
+        service, server, port = await start_service()
+        try:
+            reader, writer = await ws_connect(port, "/v1/pii-detection/stream")
+            for i in range(10):
+                writer.write(ws_frame(json.dumps({"id": i, "text": f"call 555-123-45{i:02d}"}).encode()))
+            writer.write(ws_frame(b"plain text from jane@example.com"))
+            await writer.drain()
+            replies = [json.loads((await ws_read(reader))[1]) for _ in range(11)]
+            assert [r.get("id") for r in replies] == list(range(10)) + [None]
+            assert all(r["pii_count"] == 1 for r in replies)
+            writer.write(ws_frame(struct.pack("!H", 1000), opcode=0x8))
+            assert (await ws_read(reader))[0] == 0x8
+            writer.close()
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_websocket_backpressure_bounds_inflight_messages():
+    async def scenario():
+        window = 4
+        service, server, port = await start_service(stream_window=window)
+        gate = asyncio.Event()
+        submitted = []
+        original = service.batchers["pii_stream"].submit
+
+        async def gated_submit(payload):
+            submitted.append(payload["id"])
+            await gate.wait()
+            return await original(payload)
+
+        service.batchers["pii_stream"].submit = gated_submit
+        try:
+            reader, writer = await ws_connect(port, "/v1/pii-detection/stream")
+            for i in range(window * 3):
+                writer.write(ws_frame(json.dumps({"id": i, "text": "a@b.com"}).encode()))
+            await writer.drain()
+            await asyncio.sleep(0.3)
+            # window queued, one awaited by the sender and one held by the reader; the rest stay unread on the socket
+            assert len(submitted) == window + 2
+            gate.set()
+            replies = [json.loads((await ws_read(reader))[1]) for _ in range(window * 3)]
+            assert [r["id"] for r in replies] == list(range(window * 3))
+            writer.close()
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_websocket_oversized_frame_closes_with_1009(monkeypatch):
+    monkeypatch.setattr(core.server, "MAX_BODY_BYTES", 64)
+
+    async def scenario():
+        service, server, port = await start_service()
+        try:
+            reader, writer = await ws_connect(port, "/v1/sentiment-analysis/stream")
+            writer.write(ws_frame(b"x" * 100))
+            await writer.drain()
+            opcode, payload = await ws_read(reader)
+            assert opcode == 0x8
+            assert struct.unpack("!H", payload[:2])[0] == 1009
+            writer.close()
+        finally:
+            await stop_service(service, server)
+    run(scenario())
+
+
+def test_biometrics_verify_and_identify(tmp_path):
+    from core.voiceprint_index import IVFIndex, VoiceprintStore
+
+    store = VoiceprintStore(str(tmp_path / "vp"), dim=4)
+    store.add_many(["ACC-1", "ACC-2", "ACC-3"], [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]])
+    index = IVFIndex.train(store, nlist=2)
+
+    async def scenario():
+        service, server, port = await start_service(voiceprints=store, voiceprint_index=index)
+        try:
+            status, body = await request(port, "POST", "/v1/biometrics/verify",
+                                         {"customer_id": "ACC-2", "embedding": [0, 1, 0.05, 0]})
+            assert status == 200 and body["match"] and body["confidence"] > 90
+            status, body = await request(port, "POST", "/v1/biometrics/identify",
+                                         {"embedding": [0, 0, 1, 0], "k": 1, "nprobe": 2})
+            assert status == 200 and body["candidates"][0]["customer_id"] == "ACC-3"
+            assert (await request(port, "POST", "/v1/biometrics/verify",
+                                  {"customer_id": "ACC-2", "embedding": [1, 2]}))[0] == 400
+            for bad in ({"k": "five"}, {"k": 0}, {"nprobe": -1}, {"k": 1.5}):
+                status, body = await request(port, "POST", "/v1/biometrics/identify",
+                                             {"embedding": [0, 0, 1, 0], **bad})
+                assert status == 400 and "positive integer" in body["error"]
+        finally:
+            await stop_service(service, server)
+    run(scenario())
@@ -0,0 +1,83 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from core.staffing import daily_headcount, erlang_c, required_agents, scheduled_agents, simulate, staffing_table
+
+
+def erlang_c_reference(agents, load):
+    top = load ** agents / math.factorial(agents) * agents / (agents - load)
+    return top / (sum(load ** k / math.factorial(k) for k in range(agents)) + top)
+
+
+def test_erlang_c_matches_closed_form():
+    for agents, load in [(12, 10.0), (11, 10.0), (3, 1.5), (30, 25.0)]:
+        assert erlang_c(agents, load) == pytest.approx(erlang_c_reference(agents, load))
+    assert erlang_c(5, 6.0) == 1.0
+
+
+def test_erlang_c_stays_finite_for_large_loads():
+    # The closed form overflows floats here; the recursion does not
+    probability = erlang_c(2100, 2000.0)
+    assert 0 < probability < 1
+
+
+def test_required_agents_is_the_smallest_that_meets_targets():
+    result = required_agents([100, 200, 0], aht=180, interval_seconds=1800)
+    assert result["agents"].tolist() == [14, 24, 0]
+    assert np.all(result["service_level"] >= 0.8)
+    assert np.all(result["occupancy"] <= 0.85)
+    # One agent fewer misses the service-level or occupancy target
+    fewer = result["agents"][:2] - 1
+    load = result["load"][:2]
+    level = 1 - erlang_c(fewer, load) * np.exp(-(fewer - load) * 20 / 180)
+    assert np.all((level < 0.8) | (load > fewer * 0.85))
+
+
+def test_batch_of_queues_by_intervals_solves_quickly():
+    volumes = np.random.default_rng(0).uniform(0, 400, size=(500, 96))
+    started = time.perf_counter()
+    result = required_agents(volumes, aht=300, interval_seconds=900)
+    assert time.perf_counter() - started < 2
+    assert result["agents"].shape == (500, 96)
+    assert np.all(result["service_level"][volumes > 0] >= 0.8)
+
+
+def test_shrinkage_and_headcount():
+    assert scheduled_agents([7, 10], shrinkage=0.3).tolist() == [10, 15]
+    assert daily_headcount(np.full(24, 10), shrinkage=0.25) == 40
+
+
+def test_simulation_agrees_with_erlang_c_without_abandonment():
+    agents = int(required_agents(200, 300)["agents"])
+    result = simulate({"billing": 200}, 300, [(agents, {"billing"})], duration=20 * 3600, seed=1)
+    assert result["billing"]["abandoned"] == 0
+    assert result["billing"]["service_level"] == pytest.approx(float(required_agents(200, 300)["service_level"]),
+                                                               abs=0.06)
+
+
+def test_simulation_covers_abandonment_and_multi_skill_groups():
+    rates, aht = {"billing": 120, "tech": 60}, {"billing": 240, "tech": 480}
+    shared = simulate(rates, aht, [(8, {"billing"}), (6, {"tech"}), (3, {"billing", "tech"})],
+                      patience=90, duration=10 * 3600, seed=2)
+    for skill in rates:
+        s = shared[skill]
+        assert s["answered"] + s["abandoned"] <= s["offered"]
+        assert s["abandoned"] > 0
+    assert len(shared["occupancy"]) == 3 and all(0 < o <= 1 for o in shared["occupancy"])
+    # Never-abandoning callers all get answered
+    patient = simulate(rates, aht, [(8, {"billing"}), (6, {"tech"}), (3, {"billing", "tech"})],
+                       duration=3600, seed=3)
+    assert all(patient[skill]["answered"] == patient[skill]["offered"] for skill in rates)
+
+
+def test_staffing_table_uses_busiest_hour_per_slot():
+    slots = {'Time Slot': ['8:00-10:00', '22:00-2:00'], 'Current Staff': [5, 2]}
+    volume_by_hour = {8: 40.0, 9: 120.0, 22: 10.0, 23: 5.0, 0: 0.0, 1: 0.0}
+    table = staffing_table(slots, volume_by_hour)
+    assert list(table) == ['Time Slot', 'Predicted Volume', 'Required Agents', 'Current Staff', 'Service Level']
+    assert table['Predicted Volume'] == [160, 15]
+    assert table['Required Agents'][0] == int(required_agents(120.0)["agents"])
+    assert table['Required Agents'][1] == int(required_agents(10.0)["agents"])
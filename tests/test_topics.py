@@ -0,0 +1,101 @@
+import random
+from datetime import datetime
+
+import numpy as np
+
+from core.demo_data import DEMO_TOPIC_STREAM, demo_topic_calls
+from core.topics import SlidingSketch, TopicTrends, default_classifier, sketch_columns, trend_label
+
+# A day boundary, so the weekly windows line up with the demo weeks
+END = datetime.fromtimestamp(1792800000)
+
+
+def fed_trends():
+    trends = TopicTrends()
+    for finished_at, text, sentiment in demo_topic_calls(END, random.Random(1)):
+        trends.observe(text, finished_at, sentiment)
+    return trends
+
+
+def test_classifier_separates_demo_topics():
+    classifier = default_classifier()
+    for topic, *_, phrases in DEMO_TOPIC_STREAM:
+        for phrase in phrases:
+            assert classifier.classify(f"Hi, {phrase}. Can you help me with that?")[0] == topic
+
+
+def test_weekly_summary_matches_stream():
+    summary = fed_trends().summary("week", END.timestamp())
+    expected = {topic: this_week for topic, _, this_week, *_ in DEMO_TOPIC_STREAM}
+    assert dict(zip(summary["Topic"], summary["Volume"])) == expected
+    assert summary["Volume"] == sorted(summary["Volume"], reverse=True)
+    trends = dict(zip(summary["Topic"], summary["Trend"]))
+    assert trends["Billing Issues"] == "↗️ +15%"
+    assert trends["Account Changes"] == "→ Stable"
+    assert trends["Technical Support"] == "↘️ -8%"
+    sentiment = dict(zip(summary["Topic"], summary["Sentiment"]))
+    assert abs(sentiment["Billing Issues"] - 6.2) < 0.2
+
+
+def test_insights_flag_only_significant_changes():
+    insights = fed_trends().insights("week", END.timestamp())
+    alerts = [i for i in insights if i.startswith("🚨")]
+    assert len(alerts) == 2
+    assert any("Billing Issues" in a and '"unexpected fee"' in a for a in alerts)
+    assert any("Product Returns" in a for a in alerts)
+    # A -8% dip on ~900 calls is within Poisson noise
+    assert not any("Technical Support" in i for i in insights)
+    assert any(i.startswith("✅") and "Product Returns" in i for i in insights)
+
+
+def test_sliding_sketch_expires_old_buckets_in_fixed_memory():
+    sketch = SlidingSketch(bucket_seconds=60, buckets=5)
+    size = sketch.counts.nbytes
+    key = np.array([sketch_columns("topic")])
+    for minute in range(100):
+        sketch.add(key, minute * 60 + 1)
+    assert sketch.estimate_many(key, 100 * 60)[0] == 5
+    assert sketch.estimate_many(key, 100 * 60, previous=True)[0] == 5
+    assert sketch.estimate_many(key, 200 * 60)[0] == 0
+    assert sketch.counts.nbytes == size
+
+
+def test_late_events_never_clear_a_newer_bucket():
+    sketch = SlidingSketch(bucket_seconds=60, buckets=5)
+    key = np.array([sketch_columns("topic")])
+    for minute in range(20):
+        sketch.add(key, minute * 60 + 1)
+    # Minute 10 shares a ring slot with minute 20's bucket once it arrives
+    sketch.add(key, 20 * 60 + 1)
+    sketch.add(key, 10 * 60 + 1)
+    assert sketch.estimate_many(key, 21 * 60)[0] == 5
+
+
+def test_topic_without_previous_calls_is_reported_as_new():
+    trends = TopicTrends()
+    now = END.timestamp()
+    for i in range(40):
+        trends.observe("I was charged twice on my bill", now - 3600 - i * 60, 3.0)
+    alerts = [i for i in trends.insights("week", now) if i.startswith("🚨")]
+    assert alerts and all("inf" not in a for a in alerts)
+    assert any("new this week" in a for a in alerts)
+
+
+def test_count_min_never_undercounts():
+    sketch = SlidingSketch(bucket_seconds=3600, buckets=1, width=64)
+    rng = random.Random(0)
+    truth = {}
+    for _ in range(2000):
+        key = f"k{rng.randint(0, 300)}"
+        truth[key] = truth.get(key, 0) + 1
+        sketch.add(np.array([sketch_columns(key, width=64)]), 10)
+    keys = sorted(truth)
+    estimates = sketch.estimate_many(np.array([sketch_columns(k, width=64) for k in keys]), 20)
+    assert all(estimate >= truth[k] for k, estimate in zip(keys, estimates))
+
+
+def test_trend_labels():
+    assert trend_label(115, 100) == "↗️ +15%"
+    assert trend_label(92, 100) == "↘️ -8%"
+    assert trend_label(102, 100) == "→ Stable"
+    assert trend_label(5, 0) == "🆕 New"
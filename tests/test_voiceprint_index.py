@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from core.voiceprint_index import IVFIndex, VoiceprintStore, normalize
+
+DIM = 32
+
+
+def clustered_embeddings(count, seed=0, clusters=20):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, DIM))
+    return centers[rng.integers(clusters, size=count)] + rng.normal(scale=0.5, size=(count, DIM))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = VoiceprintStore(str(tmp_path / "voiceprints"), dim=DIM)
+    store.add_many([f"ACC-{i:06d}" for i in range(3000)], clustered_embeddings(3000))
+    return store
+
+
+def test_store_grows_past_initial_capacity_and_reopens(store, tmp_path):
+    assert len(store) == 3000 and store.capacity >= 3000
+    expected = store.get("ACC-002999")
+    store.flush()
+    reopened = VoiceprintStore(str(tmp_path / "voiceprints"))
+    assert len(reopened) == 3000 and reopened.dim == DIM
+    np.testing.assert_array_equal(reopened.get("ACC-002999"), expected)
+    assert reopened.get("ACC-999999") is None
+
+
+def test_verify_accepts_owner_and_rejects_impostor(store):
+    owner = store.get("ACC-000042")
+    noisy = owner + np.random.default_rng(1).normal(scale=0.02, size=DIM)
+    assert store.verify("ACC-000042", noisy)["match"]
+    impostor = store.verify("ACC-000042", -owner)
+    assert not impostor["match"] and impostor["confidence"] < 1
+    assert store.verify("ACC-missing", owner)["enrolled"] is False
+
+
+def test_add_replaces_existing_customer(store):
+    row = store.row_of("ACC-000007")
+    vector = normalize(np.ones(DIM))
+    assert store.add("ACC-000007", np.ones(DIM)) == row
+    np.testing.assert_allclose(store.get("ACC-000007"), vector, rtol=1e-6)
+    with pytest.raises(ValueError):
+        store.add_many(["ACC-000007"], [np.ones(DIM)])
+
+
+def test_ivf_identification_recall(store):
+    index = IVFIndex.train(store, nlist=32, seed=0)
+    rng = np.random.default_rng(2)
+    targets = rng.choice(len(store), 200, replace=False)
+    queries = np.asarray(store.embeddings[targets]) + rng.normal(scale=0.02, size=(200, DIM))
+    hits = sum(rows[0] == target for (rows, _), target in zip(index.search(queries, k=1, nprobe=8), targets))
+    assert hits / len(targets) >= 0.95
+
+
+def test_rows_added_after_training_are_searched_then_folded_in(store):
+    index = IVFIndex.train(store, nlist=32)
+    store.add("ACC-new", np.arange(DIM, dtype=float))
+    assert index.identify(np.arange(DIM, dtype=float), k=1)[0]["customer_id"] == "ACC-new"
+    index.refresh()
+    assert index.indexed == len(store)
+    assert index.identify(np.arange(DIM, dtype=float), k=1, nprobe=4)[0]["customer_id"] == "ACC-new"
+
+
+def test_index_round_trips_through_disk(store):
+    index = IVFIndex.train(store, nlist=16)
+    index.save()
+    loaded = IVFIndex.load(store)
+    query = store.get("ACC-000100")
+    assert loaded.identify(query, k=1)[0]["customer_id"] == index.identify(query, k=1)[0]["customer_id"]
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import random
+
+from core.webhooks import (
+    ConnectionPool, DeliveryQueue, Endpoint, LocalReceiver, WebhookDispatcher,
+    backoff_delay, sign_payload, verify_signature
+)
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 30))
+
+
+def test_sign_and_verify():
+    body = b'{"events": []}'
+    header = sign_payload("secret", body, timestamp=1700000000)
+    assert verify_signature("secret", body, header, now=1700000010)
+    assert not verify_signature("other", body, header, now=1700000010)
+    assert not verify_signature("secret", body + b" ", header, now=1700000010)
+    # Replayed outside the tolerance window
+    assert not verify_signature("secret", body, header, now=1700000000 + 3600)
+    assert not verify_signature("secret", body, None)
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    rng = random.Random(1)
+    for attempts in range(1, 6):
+        delay = backoff_delay(attempts, rng, base=1.0, cap=10.0)
+        assert min(10.0, 2 ** (attempts - 1)) * 0.5 <= delay <= min(10.0, 2 ** (attempts - 1))
+
+
+def test_receiver_rejects_bad_signature():
+    async def scenario():
+        receiver = LocalReceiver(secret="right")
+        url = await receiver.start()
+        dispatcher = WebhookDispatcher([Endpoint(url, "wrong")], ":memory:", batch_window=0.01, max_attempts=1)
+        dispatcher.start()
+        dispatcher.publish("pii_detected", {"pii_count": 1})
+        await dispatcher.drain()
+        counts = await dispatcher._db(dispatcher.queue.counts)
+        await dispatcher.close()
+        await receiver.close()
+        return receiver, dispatcher, counts
+
+    receiver, dispatcher, counts = run(scenario())
+    assert receiver.rejected == 1 and not receiver.deliveries
+    # 401 is not retryable
+    assert counts == {"dead": 1} and dispatcher.stats["dead"] == 1
+
+
+def test_503_is_retried_after_retry_after():
+    async def scenario():
+        receiver = LocalReceiver(secret="s", fail_first=1, retry_after=1)
+        url = await receiver.start()
+        dispatcher = WebhookDispatcher([Endpoint(url, "s")], ":memory:", batch_window=0.01, base_backoff=0.01)
+        dispatcher.start()
+        dispatcher.publish("batch_complete", {"job_id": "pii_1"})
+        assert await dispatcher.drain()
+        await dispatcher.close()
+        await receiver.close()
+        return receiver, dispatcher
+
+    receiver, dispatcher = run(scenario())
+    assert receiver.requests == 2
+    assert receiver.request_times[1] - receiver.request_times[0] >= 0.95
+    assert [e["event"] for e in receiver.events] == ["batch_complete"]
+    assert dispatcher.stats == {"requests": 2, "delivered": 1, "retried": 1, "dead": 0}
+
+
+def test_burst_is_coalesced_by_key_into_one_delivery():
+    async def scenario():
+        receiver = LocalReceiver()
+        url = await receiver.start()
+        dispatcher = WebhookDispatcher([Endpoint(url, events=["escalation_detected"])], ":memory:",
+                                       batch_window=0.05)
+        dispatcher.start()
+        for i in range(10):
+            for call in range(5):
+                dispatcher.publish("escalation_detected", {"call": call, "n": i}, coalesce_key=f"call_{call}")
+        dispatcher.publish("pii_detected", {"ignored": True})
+        assert await dispatcher.drain()
+        await dispatcher.close()
+        await receiver.close()
+        return receiver
+
+    receiver = run(scenario())
+    assert len(receiver.deliveries) == 1
+    assert sorted((e["data"]["call"], e["data"]["n"]) for e in receiver.events) == [(c, 9) for c in range(5)]
+
+
+def test_publish_does_not_touch_the_database():
+    dispatcher = WebhookDispatcher([Endpoint("http://127.0.0.1:9/hook")], ":memory:")
+    dispatcher.publish("pii_detected", {"pii_count": 1})
+    assert len(dispatcher.buffer) == 1
+    assert dispatcher.db_thread.submit(dispatcher.queue.counts).result() == {}
+    dispatcher.db_thread.submit(dispatcher.queue.close).result()
+    dispatcher.db_thread.shutdown()
+
+
+def test_recover_returns_inflight_rows_to_pending(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    queue = DeliveryQueue(path)
+    queue.enqueue("hook", "escalation_detected", {"n": 1}, coalesce_key="call_1")
+    queue.enqueue("hook", "batch_complete", {"n": 2})
+    assert len(queue.claim("hook")) == 2
+    # A newer event for call_1 arrives while the first is inflight
+    queue.enqueue("hook", "escalation_detected", {"n": 3}, coalesce_key="call_1")
+    queue.close()
+
+    restarted = DeliveryQueue(path)
+    restarted.recover()
+    assert restarted.counts() == {"pending": 2}
+    assert sorted(row["data"]["n"] for row in restarted.claim("hook")) == [2, 3]
+    restarted.close()
+
+
+def test_retry_marks_rows_dead_after_max_attempts():
+    queue = DeliveryQueue(":memory:", max_attempts=2)
+    queue.enqueue("hook", "pii_detected", {})
+    queue.retry(queue.claim("hook"), 0, "HTTP 503")
+    assert queue.counts() == {"pending": 1}
+    queue.retry(queue.claim("hook"), 0, "HTTP 503")
+    assert queue.counts() == {"dead": 1}
+    queue.close()
+
+
+def test_connection_pool_reuses_keep_alive_connection():
+    async def scenario():
+        receiver = LocalReceiver()
+        url = await receiver.start()
+        pool = ConnectionPool(url, size=2)
+        for i in range(3):
+            status, _ = await pool.post(json.dumps({"events": [{"n": i}]}).encode(), {})
+            assert status == 200
+        await pool.close()
+        await receiver.close()
+        return receiver, pool
+
+    receiver, pool = run(scenario())
+    assert receiver.requests == 3
+    assert receiver.connections == 1 and pool.opened == 1
@@ -0,0 +1,125 @@
+import asyncio
+import random
+import time
+
+import numpy as np
+import pytest
+
+from core.demo_data import demo_workflow_interactions
+from core.workflows import INSTANCE_DTYPE, RUNNING, WAITING, Workflow, WorkflowRuntime, compile_workflow
+
+INSTRUCTIONS = ("When a customer expresses frustration, analyze sentiment, check account history, "
+                "and either resolve with empathy or escalate to specialized team based on complexity.")
+CALM = {"text": "Thanks, can you update my address?", "action": "Account Updates", "account": {}}
+ANGRY = {"text": "This is unacceptable, I'm furious and want a manager!", "action": "Account Updates", "account": {}}
+
+
+def run(runtime, name, interactions):
+    return asyncio.run(runtime.run(name, interactions))
+
+
+def test_instructions_compile_to_ordered_steps():
+    workflow = compile_workflow("handler", INSTRUCTIONS)
+    assert workflow.steps == ("analyze_sentiment", "lookup_account", "resolve", "escalate")
+    assert compile_workflow("refunds", "Issue a refund, then check the order").steps == \
+        ("resolve", "lookup_account", "escalate")
+    with pytest.raises(ValueError):
+        compile_workflow("bad", INSTRUCTIONS, autonomy_level="Reckless")
+    with pytest.raises(ValueError):
+        Workflow("bad", ["dance"])
+
+
+def test_instances_resolve_or_escalate():
+    runtime = WorkflowRuntime()
+    runtime.deploy(compile_workflow("handler", INSTRUCTIONS, allowed_actions=["Account Updates"]))
+    refund = dict(CALM, action="Refunds < $100")
+    frequent = dict(CALM, account={"recent_contacts": 8})
+    indexes = run(runtime, "handler", [CALM, ANGRY, refund, frequent, dict(CALM, account=None)])
+    assert [runtime.status("handler", i) for i in indexes] == ["resolved", "waiting", "waiting", "waiting", "waiting"]
+    assert runtime.counts() == {"running": 0, "waiting": 4, "resolved": 1, "failed": 0}
+
+
+def test_supervised_workflows_never_resolve_alone():
+    runtime = WorkflowRuntime()
+    runtime.deploy(compile_workflow("handler", INSTRUCTIONS, "Supervised", allowed_actions=["Account Updates"]))
+    run(runtime, "handler", [CALM])
+    assert runtime.counts("handler")["waiting"] == 1
+
+
+def test_account_lookup_is_awaited_and_failures_are_isolated():
+    async def accounts(customer_id):
+        await asyncio.sleep(0.01)
+        if customer_id == "broken":
+            raise ConnectionError("CRM unavailable")
+        return {"recent_contacts": 0}
+
+    runtime = WorkflowRuntime(accounts=accounts)
+    runtime.deploy(compile_workflow("handler", INSTRUCTIONS, allowed_actions=["Account Updates"]))
+    run(runtime, "handler", [dict(CALM, customer_id="ok"), dict(CALM, customer_id="broken")])
+    assert runtime.counts()["resolved"] == 1 and runtime.counts()["failed"] == 1
+    assert runtime.errors == [("handler", 1, "ConnectionError: CRM unavailable")]
+
+
+def test_thousands_of_concurrent_instances():
+    async def accounts(customer_id):
+        await asyncio.sleep(0.05)
+        return {"recent_contacts": 0}
+
+    runtime = WorkflowRuntime(accounts=accounts)
+    runtime.deploy(compile_workflow("handler", INSTRUCTIONS, allowed_actions=["Account Updates"]))
+    started = time.perf_counter()
+    run(runtime, "handler", [CALM] * 5000)
+    # Lookups overlap on the event loop instead of taking 5000 x 50 ms
+    assert time.perf_counter() - started < 3
+    assert runtime.counts()["resolved"] == 5000
+    assert INSTANCE_DTYPE.itemsize == 10 and len(runtime.snapshot("handler")) == 50000
+
+
+def test_snapshot_restore_resumes_unfinished_instances():
+    gate = None
+
+    async def accounts(customer_id):
+        await gate.wait()
+        return {"recent_contacts": 0}
+
+    async def interrupted():
+        nonlocal gate
+        gate = asyncio.Event()
+        task = asyncio.ensure_future(runtime.run("handler", interactions))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    interactions = [CALM, ANGRY, CALM]
+    runtime = WorkflowRuntime(accounts=accounts)
+    runtime.deploy(compile_workflow("handler", INSTRUCTIONS, allowed_actions=["Account Updates"]))
+    asyncio.run(interrupted())
+    saved = runtime.snapshot("handler")
+    assert np.frombuffer(saved, dtype=INSTANCE_DTYPE)["status"].tolist() == [RUNNING, WAITING, RUNNING]
+
+    async def ready(customer_id):
+        return {"recent_contacts": 0}
+
+    restarted = WorkflowRuntime(accounts=ready)
+    restarted.deploy(compile_workflow("handler", INSTRUCTIONS, allowed_actions=["Account Updates"]))
+    restarted.restore("handler", saved)
+    asyncio.run(restarted.resume("handler", interactions))
+    assert restarted.counts() == {"running": 0, "waiting": 1, "resolved": 2, "failed": 0}
+
+
+def test_demo_traffic_mixes_outcomes():
+    runtime = WorkflowRuntime()
+    runtime.deploy(compile_workflow("handler", INSTRUCTIONS, allowed_actions=["Account Updates", "Technical Support"]))
+    run(runtime, "handler", demo_workflow_interactions(500, random.Random(0)))
+    counts = runtime.counts()
+    assert counts["resolved"] > 0 and counts["waiting"] > 0 and counts["failed"] == 0
+
+
+def test_resolve_step_is_gated_by_guardrails():
+    refund = dict(CALM, action="Refunds < $100", amount=40.0)
+    for level, status in (("Semi-autonomous", "waiting"), ("Fully Autonomous", "resolved")):
+        runtime = WorkflowRuntime()
+        workflow = runtime.deploy(compile_workflow("refunds", INSTRUCTIONS, level, allowed_actions=["Refunds < $100"]))
+        run(runtime, "refunds", [refund, dict(refund, amount=250.0)])
+        assert runtime.status("refunds", 0) == status and runtime.status("refunds", 1) == "waiting"
+        assert [record[6] for record in workflow.guardrails.audit][1] == "over_limit"